@@ -14,6 +14,12 @@ locals {
   ## Is the SNS topic policy to use
   sns_topic_policy = var.sns_topic_policy != null ? var.sns_topic_policy : data.aws_iam_policy_document.current.json
 
+  ## The parameters holding the account id to name mapping, read by the notify lambda
+  accounts_id_to_name_parameter_arns = compact([
+    var.accounts_id_to_name_parameter_arn,
+    var.accounts_id_to_name_shards == null ? null : format("arn:%s:ssm:%s:%s:parameter%s/*", data.aws_partition.current.partition, local.region, local.account_id, var.accounts_id_to_name_shards.parameter_path),
+  ])
+
   ## Indicates if we are enabling slack notifications
   enable_slack_config = var.slack != null ? true : false
   ## Indicates if we are looking up the slack secret
@@ -44,23 +44,40 @@ resource "aws_sns_topic_subscription" "subscribers" {
 module "notify" {
   source = "./modules/notify"
 
+  account_names_negative_ttl_seconds     = var.account_names_negative_ttl_seconds
+  account_names_ttl_seconds              = var.account_names_ttl_seconds
+  account_names_wait_seconds             = var.account_names_wait_seconds
   accounts_id_to_name_parameter_arn      = var.accounts_id_to_name_parameter_arn
+  accounts_id_to_name_shards             = var.accounts_id_to_name_shards
+  alarm_flap_suppression                 = var.alarm_flap_suppression
   aws_account_id                         = data.aws_caller_identity.current.account_id
   aws_partition                          = data.aws_partition.current.partition
   aws_region                             = data.aws_region.current.name
+  circuit_breaker                        = var.circuit_breaker
   cloudwatch_log_group_kms_key_id        = var.cloudwatch_log_group_kms_key_id
   cloudwatch_log_group_retention_in_days = var.cloudwatch_log_group_retention
   create_sns_topic                       = false
   delivery_channels                      = local.channels_config
+  delivery_concurrency                   = var.delivery_concurrency
+  delivery_safety_margin_ms              = var.delivery_safety_margin_ms
+  digest                                 = var.digest
   enable_slack                           = var.enable_slack
+  enable_stage_metrics                   = var.enable_stage_metrics
   enable_teams                           = var.enable_teams
+  fan_out                                = var.fan_out
+  idempotency                            = var.idempotency
   identity_center_role                   = var.identity_center_role
   identity_center_start_url              = var.identity_center_start_url
   powertools_service_name                = var.powertools_service_name
+  profiling                              = var.profiling
   recreate_missing_package               = false
   sns_topic_name                         = var.sns_topic_name
+  sqs_buffer                             = var.sqs_buffer
   tags                                   = var.tags
   trigger_on_package_timestamp           = true
+  webhook_connection                     = var.webhook_connection
+  webhook_rate_limits                    = var.webhook_rate_limits
+  webhook_url_cache_ttl_seconds          = var.webhook_url_cache_ttl_seconds
 
   # Additional IAM Policies to be attached to notify lambda
   lambda_policy_config = {
@@ -68,7 +85,25 @@ module "notify" {
       enabled   = true
       effect    = "Allow"
       actions   = ["ssm:GetParameter", "ssm:GetParameters"]
-      resources = [coalesce(var.accounts_id_to_name_parameter_arn, "*")]
+      resources = coalescelist(local.accounts_id_to_name_parameter_arns, ["*"])
+    }
+    alarm_states = {
+      enabled   = var.alarm_flap_suppression.state_table_name != null
+      effect    = "Allow"
+      actions   = ["dynamodb:GetItem", "dynamodb:PutItem"]
+      resources = ["arn:${data.aws_partition.current.partition}:dynamodb:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:table/${coalesce(var.alarm_flap_suppression.state_table_name, "none")}"]
+    }
+    delivered_posts = {
+      enabled   = var.idempotency.enabled && var.idempotency.table_name != null
+      effect    = "Allow"
+      actions   = ["dynamodb:BatchGetItem", "dynamodb:BatchWriteItem"]
+      resources = ["arn:${data.aws_partition.current.partition}:dynamodb:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:table/${coalesce(var.idempotency.table_name, "none")}"]
+    }
+    webhook_rates = {
+      enabled   = var.webhook_rate_limits.shared_table_name != null
+      effect    = "Allow"
+      actions   = ["dynamodb:UpdateItem"]
+      resources = ["arn:${data.aws_partition.current.partition}:dynamodb:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:table/${coalesce(var.webhook_rate_limits.shared_table_name, "none")}"]
     }
     layers = {
       enabled   = true
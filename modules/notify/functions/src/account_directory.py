@@ -0,0 +1,356 @@
+import array
+import bisect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from aws_lambda_powertools import Logger
+
+logger = Logger()
+
+# The total time lookups will wait on the account mapping to load, before falling back
+#  to the raw account id
+ACCOUNT_NAMES_WAIT_SECONDS = float(os.environ.get("ACCOUNT_NAMES_WAIT_SECONDS", "1"))
+# How long the mapping is used before it is refreshed in the background
+ACCOUNT_NAMES_TTL = float(os.environ.get("ACCOUNT_NAMES_TTL", "3600"))
+# How long an unknown account id is remembered as unknown, before it may trigger a refresh
+ACCOUNT_NAMES_NEGATIVE_TTL = float(os.environ.get("ACCOUNT_NAMES_NEGATIVE_TTL", "300"))
+
+
+class AccountIndex(Mapping[str, str]):
+    """
+    Compact, read only account id to name mapping
+
+    The account ids are held as a sorted array of integers and looked up by bisection,
+    rather than as a dict of strings, keeping large organisations cheap to hold in memory.
+    """
+
+    def __init__(self, mapping: Mapping[str, Any]):
+        entries = sorted((int(account_id), name) for account_id, name in mapping.items() if account_id.isdigit())
+        self.ids = array.array("Q", (account_id for account_id, _ in entries))
+        self.names: List[str] = [name for _, name in entries]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return (f"{account_id:012d}" for account_id in self.ids)
+
+    def __contains__(self, account_id: object) -> bool:
+        return self.get(str(account_id)) is not None
+
+    def __getitem__(self, account_id: str) -> str:
+        name = self.get(account_id)
+        if name is None:
+            raise KeyError(account_id)
+
+        return name
+
+    def get(self, account_id: str, default: Optional[str] = None) -> Optional[str]:  # type: ignore[override]
+        """
+        Get the name of the account
+
+        :params account_id: the account id
+        :params default: returned when the account is not in the index
+        :returns: the account name
+        """
+        if not account_id.isdigit():
+            return default
+
+        key = int(account_id)
+        idx = bisect.bisect_left(self.ids, key)
+        if idx < len(self.ids) and self.ids[idx] == key:
+            return self.names[idx]
+
+        return default
+
+
+class WaitBudget:
+    """
+    Total time the lookups of an invocation may wait on account names to load
+
+    The budget restarts with each batch, so a slow load delays at most one message of
+    the batch, while the accounts first referenced by a later batch are still waited on.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline: Optional[float] = None
+
+    def restart(self) -> None:
+        """
+        Restart the budget, spent again from the next lookup which waits
+        """
+        self.deadline = None
+
+    def remaining(self) -> float:
+        """
+        Start spending the budget, if not already started
+
+        :returns: the seconds of the budget remaining
+        """
+        if self.deadline is None:
+            self.deadline = time.monotonic() + self.seconds
+
+        return max(self.deadline - time.monotonic(), 0)
+
+
+class AccountDirectory:
+    """
+    Maps account ids to account names, loading the mapping off the hot path
+
+    The mapping is loaded by a background thread started during the lambda init phase,
+    so only the messages that need an account name ever wait on it; and then only for a
+    bounded budget, after which the raw account id is shown instead.
+
+    Once loaded, lookups are always answered from memory (stale-while-revalidate); an
+    expired mapping, or an account id missing from it, triggers a refresh in the
+    background so newly vended accounts are named without recycling the container.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Mapping[str, str]],
+        wait_seconds: float = ACCOUNT_NAMES_WAIT_SECONDS,
+        ttl: float = ACCOUNT_NAMES_TTL,
+        negative_ttl: float = ACCOUNT_NAMES_NEGATIVE_TTL,
+        budget: Optional[WaitBudget] = None,
+    ):
+        self.loader = loader
+        self.budget = budget or WaitBudget(wait_seconds)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.names: Mapping[str, str] = {}
+        self.loaded_at = 0.0
+        self.unknown: Dict[str, float] = {}
+        self.loaded = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Start loading the mapping in the background, unless a load is in progress
+        """
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self.load, name="account-directory", daemon=True)
+            self.thread.start()
+
+    def adopt(self, thread: threading.Thread) -> bool:
+        """
+        Have the mapping loaded by a thread loading several mappings at once
+
+        :params thread: the (not yet started) thread which will call update
+        :returns: False if a load is already in progress
+        """
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return False
+            self.thread = thread
+            return True
+
+    def is_stale(self) -> bool:
+        """
+        :returns: True if the mapping has loaded and its ttl expired
+        """
+        return self.loaded.is_set() and time.monotonic() - self.loaded_at > self.ttl
+
+    def load(self) -> None:
+        """
+        Load the mapping
+        """
+        try:
+            names: Optional[Mapping[str, str]] = self.loader()
+        except Exception as e:
+            logger.exception(f"Error loading account names: {e}")
+            names = None
+
+        self.update(names)
+
+    def update(self, names: Optional[Mapping[str, str]]) -> None:
+        """
+        Replace the mapping; a failed (None) or empty refresh keeps the previous mapping
+
+        :params names: the loaded mapping, or None if the load failed
+        """
+        try:
+            if names is not None and (names or not self.names):
+                self.names = names
+                # forget the unknown account ids the refreshed mapping now names
+                for account_id in [i for i in self.unknown if i in names]:
+                    self.unknown.pop(account_id, None)
+                logger.debug("Loaded account names", count=len(names))
+            elif names is not None:
+                logger.warning("Refreshed account names are empty, keeping previous")
+        finally:
+            self.loaded_at = time.monotonic()
+            self.loaded.set()
+
+    def wait(self) -> bool:
+        """
+        Wait for the mapping to load, within the remaining wait budget
+
+        :returns: True if the mapping has loaded
+        """
+        if self.loaded.is_set():
+            return True
+
+        self.start()
+        # the budget is shared by the lookups of the batch, so a slow load delays at most
+        #  one message
+        return self.loaded.wait(timeout=self.budget.remaining())
+
+    def get(self, account_id: str, default: str = "") -> str:
+        """
+        Get the name of the account
+
+        :params account_id: the account id
+        :params default: returned when the account is not in the mapping
+        :returns: the account name, or the raw account id if the mapping did not load in time
+        """
+        if not self.wait():
+            logger.warning("Account names not loaded in time", account_id=account_id)
+            return account_id
+
+        now = time.monotonic()
+        name = self.names.get(account_id)
+        if name is not None:
+            if self.is_stale():
+                self.start()
+            return name
+
+        # an unknown account id triggers at most one refresh per negative ttl
+        if self.unknown.get(account_id, 0) <= now:
+            self.unknown[account_id] = now + self.negative_ttl
+            if now - self.loaded_at > min(self.negative_ttl, self.ttl):
+                logger.info("Unknown account id, refreshing", account_id=account_id)
+                self.start()
+
+        return default
+
+    def prefetch(self, account_ids: Iterable[str]) -> None:
+        """
+        The mapping is a single parameter, already loading from the init phase; only the
+        wait budget restarts for the new batch
+
+        :params account_ids: the account ids the incoming messages reference
+        """
+        self.budget.restart()
+
+
+class ShardedAccountDirectory:
+    """
+    Maps account ids to account names, held as several parameters under a path
+
+    Each shard holds the accounts whose ids start with the same digits, named by that
+    prefix, e.g. /myorg/accounts/01 for account 012345678901. Only the shards the
+    incoming messages reference are loaded, fetched together in a single bulk request.
+    """
+
+    def __init__(
+        self,
+        parameter_path: str,
+        prefix_length: int,
+        fetch: Callable[[List[str]], Mapping[str, Mapping[str, Any]]],
+        wait_seconds: float = ACCOUNT_NAMES_WAIT_SECONDS,
+        ttl: float = ACCOUNT_NAMES_TTL,
+        negative_ttl: float = ACCOUNT_NAMES_NEGATIVE_TTL,
+    ):
+        self.parameter_path = parameter_path.rstrip("/")
+        self.prefix_length = prefix_length
+        self.fetch = fetch
+        self.budget = WaitBudget(wait_seconds)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.shards: Dict[str, AccountDirectory] = {}
+        self.lock = threading.Lock()
+
+    def shard_key(self, account_id: str) -> str:
+        return account_id[: self.prefix_length]
+
+    def parameter_name(self, shard_key: str) -> str:
+        return f"{self.parameter_path}/{shard_key}"
+
+    def shard(self, shard_key: str) -> AccountDirectory:
+        """
+        Get the directory of the shard, created (but not loaded) on first use
+        """
+        with self.lock:
+            if shard_key not in self.shards:
+                self.shards[shard_key] = AccountDirectory(
+                    loader=lambda: self.fetch_shards([shard_key])[shard_key],
+                    ttl=self.ttl,
+                    negative_ttl=self.negative_ttl,
+                    budget=self.budget,
+                )
+            return self.shards[shard_key]
+
+    def fetch_shards(self, shard_keys: List[str]) -> Dict[str, AccountIndex]:
+        """
+        Fetch the shards in bulk; a shard without a parameter holds no accounts
+
+        :params shard_keys: the keys of the shards to fetch
+        :returns: the index of each shard
+        """
+        names = [self.parameter_name(key) for key in shard_keys]
+        parameters = self.fetch(names)
+        logger.debug("Fetched account name shards", shards=shard_keys)
+
+        return {key: AccountIndex(parameters.get(name, {})) for key, name in zip(shard_keys, names)}
+
+    def load_shards(self, shards: Dict[str, AccountDirectory]) -> None:
+        try:
+            indexes: Dict[str, AccountIndex] = self.fetch_shards(list(shards))
+        except Exception as e:
+            logger.exception(f"Error loading account name shards: {e}")
+            indexes = {}
+
+        for key, shard in shards.items():
+            shard.update(indexes.get(key))
+
+    def start(self) -> None:
+        """
+        Nothing is loaded until a message references an account
+        """
+
+    def prefetch(self, account_ids: Iterable[str]) -> None:
+        """
+        Start loading, in a single background request, the shards of the account ids
+        which are not yet loaded or whose ttl expired
+
+        The wait budget restarts for the new batch, shared by the lookups of its shards.
+
+        :params account_ids: the account ids the incoming messages reference
+        """
+        self.budget.restart()
+        keys = {self.shard_key(account_id) for account_id in account_ids}
+        pending = [key for key in sorted(keys) if key not in self.shards or self.shards[key].is_stale()]
+        if not pending:
+            return
+
+        adopted: Dict[str, AccountDirectory] = {}
+        thread = threading.Thread(
+            target=self.load_shards,
+            args=(adopted,),
+            name="account-directory-shards",
+            daemon=True,
+        )
+        for key in pending:
+            shard = self.shard(key)
+            if shard.adopt(thread):
+                adopted[key] = shard
+
+        if adopted:
+            thread.start()
+
+    def get(self, account_id: str, default: str = "") -> str:
+        """
+        Get the name of the account, loading its shard if not prefetched
+
+        :params account_id: the account id
+        :params default: returned when the account is not in the mapping
+        :returns: the account name, or the raw account id if the shard did not load in time
+        """
+        return self.shard(self.shard_key(account_id)).get(account_id, default)
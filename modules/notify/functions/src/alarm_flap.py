@@ -0,0 +1,340 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+
+logger = Logger()
+
+# The hysteresis window; a flapping alarm's transitions within this many seconds of its
+#  last post are suppressed, zero disables suppression
+FLAP_SUPPRESSION_SECONDS = int(os.environ.get("FLAP_SUPPRESSION_SECONDS", "0"))
+# An optional DynamoDB table holding the last posted state of each alarm, shared by all
+#  the containers; else the state is held in memory per container
+FLAP_STATE_TABLE = os.environ.get("FLAP_STATE_TABLE", "")
+# How long the table remembers an alarm, once it stops changing state
+FLAP_STATE_TTL = int(os.environ.get("FLAP_STATE_TTL", "86400"))
+# The most alarms remembered in memory per container
+FLAP_STATE_MAX_ALARMS = 10000
+
+# The states always posted, however often the alarm changes; a firing alarm is never
+#  held back
+FLAP_ALWAYS_POSTED = ("ALARM",)
+
+
+class AlarmState:
+    """The last posted transition of an alarm"""
+
+    state: str
+    at_epoch: int
+    previous_at: Optional[int]
+    flaps: int
+
+    def __init__(
+        self,
+        state: str,
+        at_epoch: int,
+        previous_at: Optional[int] = None,
+        flaps: int = 0,
+    ):
+        self.state = state
+        self.at_epoch = at_epoch
+        # when the transition posted before this one happened
+        self.previous_at = previous_at
+        # the transitions suppressed since this one was posted
+        self.flaps = flaps
+
+
+class AlarmStateStore(ABC):
+    """Remembers the last posted transition of each alarm"""
+
+    @abstractmethod
+    def get(self, alarm_arn: str) -> Optional[AlarmState]:
+        """
+        :params alarm_arn: the arn of the alarm
+        :returns: the last posted transition, or None if not remembered
+        """
+
+    @abstractmethod
+    def put(self, alarm_arn: str, alarmState: AlarmState) -> bool:
+        """
+        :params alarm_arn: the arn of the alarm
+        :params alarmState: the transition to remember
+        :returns: False if a later transition has since been remembered
+        """
+
+
+class InMemoryAlarmStateStore(AlarmStateStore):
+    """
+    Alarm states held for the life of the container, least recently used evicted first
+    """
+
+    def __init__(self, max_alarms: int = FLAP_STATE_MAX_ALARMS):
+        self.max_alarms = max_alarms
+        self.states: "OrderedDict[str, AlarmState]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, alarm_arn: str) -> Optional[AlarmState]:
+        with self.lock:
+            alarmState = self.states.get(alarm_arn)
+            if alarmState is not None:
+                self.states.move_to_end(alarm_arn)
+            return alarmState
+
+    def put(self, alarm_arn: str, alarmState: AlarmState) -> bool:
+        with self.lock:
+            last = self.states.get(alarm_arn)
+            if last is not None and last.at_epoch > alarmState.at_epoch:
+                return False
+
+            self.states[alarm_arn] = alarmState
+            self.states.move_to_end(alarm_arn)
+            while len(self.states) > self.max_alarms:
+                self.states.popitem(last=False)
+            return True
+
+
+class TableAlarmStateStore(AlarmStateStore):
+    """
+    Alarm states held in a DynamoDB table, shared by all the containers
+
+    The table is keyed by the string attribute "alarm_arn", with "expires_at" as its time
+    to live attribute. A transition is only written over an earlier one, so containers
+    racing on the same alarm never regress its state.
+    """
+
+    def __init__(self, table_name: str, client: Optional[Any] = None, ttl: int = FLAP_STATE_TTL):
+        self.table_name = table_name
+        self.client = client
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+    def get_client(self) -> Any:
+        """Get the DynamoDB client, importing boto3 and creating the client on first use
+
+        :returns: DynamoDB client
+        """
+        with self.lock:
+            if self.client is None:
+                import boto3
+
+                self.client = boto3.client("dynamodb")
+
+        return self.client
+
+    def get(self, alarm_arn: str) -> Optional[AlarmState]:
+        response = self.get_client().get_item(
+            TableName=self.table_name,
+            Key={"alarm_arn": {"S": alarm_arn}},
+            ConsistentRead=True,
+        )
+        item = response.get("Item")
+        if item is None:
+            return None
+
+        previous_at = item.get("previous_at")
+        return AlarmState(
+            state=item["state"]["S"],
+            at_epoch=int(item["at_epoch"]["N"]),
+            previous_at=int(previous_at["N"]) if previous_at else None,
+            flaps=int(item.get("flaps", {}).get("N", "0")),
+        )
+
+    def put(self, alarm_arn: str, alarmState: AlarmState) -> bool:
+        item = {
+            "alarm_arn": {"S": alarm_arn},
+            "state": {"S": alarmState.state},
+            "at_epoch": {"N": str(alarmState.at_epoch)},
+            "flaps": {"N": str(alarmState.flaps)},
+            "expires_at": {"N": str(int(time.time()) + self.ttl)},
+        }
+        if alarmState.previous_at is not None:
+            item["previous_at"] = {"N": str(alarmState.previous_at)}
+
+        try:
+            self.get_client().put_item(
+                TableName=self.table_name,
+                Item=item,
+                ConditionExpression="attribute_not_exists(alarm_arn) OR at_epoch <= :at",
+                ExpressionAttributeValues={":at": {"N": str(alarmState.at_epoch)}},
+            )
+        except Exception as e:
+            error = getattr(e, "response", {}).get("Error", {})
+            if error.get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
+        return True
+
+
+def get_alarm_state_store() -> AlarmStateStore:
+    """
+    :returns: the table store when a table is configured, else the in-memory store
+    """
+    if FLAP_STATE_TABLE:
+        return TableAlarmStateStore(table_name=FLAP_STATE_TABLE)
+
+    return InMemoryAlarmStateStore()
+
+
+class FlapSuppressor:
+    """
+    Suppresses the transitions of CloudWatch alarms flapping between states
+
+    An alarm is flapping once it has been posted twice within the window; its following
+    transitions within the window of the last post are suppressed, as are those back to
+    the state last posted, and their count is merged into the next transition posted.
+    Outside the window every transition is posted. Transitions into ALARM are always
+    posted, so a flapping alarm is at worst shown firing once it has recovered, never
+    the reverse.
+
+    Several transitions of the same alarm within a batch are merged into the latest, and
+    the latest into ALARM, if any, posted before it.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = FLAP_SUPPRESSION_SECONDS,
+        store: Optional[AlarmStateStore] = None,
+        always_posted: Tuple[str, ...] = FLAP_ALWAYS_POSTED,
+    ):
+        self.window_seconds = window_seconds
+        self.store = store or get_alarm_state_store()
+        self.always_posted = always_posted
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def is_flapping(self, last: AlarmState, at_epoch: int) -> bool:
+        """
+        :params last: the last posted transition of the alarm
+        :params at_epoch: when the new transition happened
+        :returns: True if the alarm was posted twice within the window of the transition
+        """
+        return (
+            at_epoch - last.at_epoch < self.window_seconds
+            and last.previous_at is not None
+            and last.at_epoch - last.previous_at < self.window_seconds
+        )
+
+    def admit(self, alarm_arn: str, state: str, at_epoch: int, merged: int = 0) -> Optional[int]:
+        """
+        Decide whether the transition of the alarm is posted, remembering the decision
+
+        :params alarm_arn: the arn of the alarm
+        :params state: the state the alarm changed to
+        :params at_epoch: when the alarm changed state
+        :params merged: the earlier transitions of the batch merged into this one
+        :returns: the count of transitions suppressed since the last post, or None if
+                  this transition is suppressed
+        """
+        try:
+            last = self.store.get(alarm_arn)
+        except Exception as e:
+            # posting a flap is better than losing a transition
+            logger.warning(f"Failed to get alarm state: {e}", alarm_arn=alarm_arn)
+            return merged
+
+        if last is not None:
+            if at_epoch == last.at_epoch and state == last.state:
+                # a retry of the transition posted, which may have failed to deliver
+                return merged
+            if at_epoch <= last.at_epoch:
+                logger.debug("Stale alarm transition", alarm_arn=alarm_arn)
+                return None
+            if state not in self.always_posted and (
+                self.is_flapping(last, at_epoch)
+                or (state == last.state and at_epoch - last.at_epoch < self.window_seconds)
+            ):
+                # the last posted state is kept, only counting the suppressed transition
+                last.flaps += 1 + merged
+                self.remember(alarm_arn, last)
+                logger.debug("Suppressed alarm transition", alarm_arn=alarm_arn, state=state)
+                return None
+
+        alarmState = AlarmState(
+            state=state,
+            at_epoch=at_epoch,
+            previous_at=last.at_epoch if last is not None else None,
+        )
+        if not self.remember(alarm_arn, alarmState):
+            logger.debug("Alarm transition superseded", alarm_arn=alarm_arn)
+            return None
+
+        return (last.flaps if last is not None else 0) + merged
+
+    def remember(self, alarm_arn: str, alarmState: AlarmState) -> bool:
+        """
+        :returns: False if a later transition of the alarm has since been remembered
+        """
+        try:
+            return self.store.put(alarm_arn, alarmState)
+        except Exception as e:
+            logger.warning(f"Failed to put alarm state: {e}", alarm_arn=alarm_arn)
+            return True
+
+    def filter(self, parsedMessages: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """
+        Filter the flapping alarm transitions out of the batch
+
+        :params parsedMessages: the parsed messages of the batch, in the order received
+        :returns: the index of each message posted, in the order received but for the
+                  transitions of an alarm, in the order they happened, with the count of
+                  transitions suppressed since the alarm was last posted
+        """
+        if not self.enabled:
+            return [(idx, 0) for idx in range(len(parsedMessages))]
+
+        alarms: Dict[str, List[int]] = {}
+        for idx, parsedMessage in enumerate(parsedMessages):
+            if parsedMessage.get("alarm_arn"):
+                alarms.setdefault(parsedMessage["alarm_arn"], []).append(idx)
+
+        posted: List[Tuple[Tuple[int, int], int, int]] = [
+            ((idx, 0), idx, 0) for idx, parsedMessage in enumerate(parsedMessages) if not parsedMessage.get("alarm_arn")
+        ]
+        for alarm_arn, indexes in alarms.items():
+            merges = self.merge([parsedMessages[idx] for idx in indexes])
+            for order, (position, merged) in enumerate(merges):
+                idx = indexes[position]
+                flaps = self.admit(
+                    alarm_arn=alarm_arn,
+                    state=parsedMessages[idx]["state"],
+                    at_epoch=parsedMessages[idx]["at_epoch"],
+                    merged=merged,
+                )
+                if flaps is not None:
+                    posted.append(((indexes[0], order), idx, flaps))
+
+        return [(idx, flaps) for _, idx, flaps in sorted(posted)]
+
+    def merge(self, transitions: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """
+        Merge the transitions of an alarm within a batch into the latest; the latest into
+        ALARM is never merged away into a later transition, so is kept before it
+
+        :params transitions: the parsed transitions of the alarm, in the order received
+        :returns: the position of each transition kept, in the order they happened, with
+                  the count of the transitions merged into it
+        """
+        # in the order they happened, the last received of any tie
+        ordered = sorted(range(len(transitions)), key=lambda pos: (transitions[pos]["at_epoch"], pos))
+        kept = [len(ordered) - 1]
+        firing = [order for order, pos in enumerate(ordered) if transitions[pos]["state"] in self.always_posted]
+        if firing and firing[-1] != kept[0]:
+            kept.insert(0, firing[-1])
+
+        merges: List[Tuple[int, int]] = []
+        previous = -1
+        for order in kept:
+            merges.append((ordered[order], order - previous - 1))
+            previous = order
+        return merges
+
+
+# Create a singleton instance
+flap_suppressor = FlapSuppressor()
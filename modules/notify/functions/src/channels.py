@@ -0,0 +1,22 @@
+from delivery_channel import DeliveryChannel
+from msg_render_slack import SlackRender
+from msg_render_teams import TeamsRender
+
+# The vendor webhooks, shared by the lambda of each vendor and the fan-out lambda; each
+#  lambda decrypts the webhook urls of the channels it posts to
+
+# Slack will return HTTP(200) on success
+slack = DeliveryChannel(
+    name="slack",
+    webhookUrlEnv="SLACK_WEBHOOK_URL",
+    renderer=SlackRender(),
+    successCode=200,
+)
+
+# Teams will return HTTP(202) on success - or will it?
+teams = DeliveryChannel(
+    name="teams",
+    webhookUrlEnv="TEAMS_WEBHOOK_URL",
+    renderer=TeamsRender(),
+    successCode=202,
+)
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional, Tuple
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+from rate_limit import webhook_key
+
+logger = Logger()
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+metrics = Metrics(namespace=powertools_namespace)
+
+# Whether posts to a webhook failing repeatedly fail fast, until it recovers
+CIRCUIT_BREAKER_ENABLED = os.environ.get("CIRCUIT_BREAKER_ENABLED", "false").lower() == "true"
+# The consecutive failed posts to a webhook which open its circuit
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+# How long the circuit stays open, before a single probe post is let through
+CIRCUIT_OPEN_SECONDS = float(os.environ.get("CIRCUIT_OPEN_SECONDS", "60"))
+
+# The response code of a post failed fast, without a request, while the circuit is open
+CIRCUIT_OPEN_CODE = 503
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails the posts to a webhook fast while the vendor is failing
+
+    Closed, posts are made as usual. Once the threshold of consecutive posts have
+    failed the circuit opens, and posts fail fast without a request. After the open
+    period it is half open; a single probe post is let through, closing the circuit if
+    it succeeds, else opening it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        :returns: True if the post may be made, False if it should fail fast
+        """
+        with self.lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+
+            if self.state == CircuitState.OPEN:
+                if self.clock() - self.opened_at < self.open_seconds:
+                    metrics.add_metric(name="CircuitFastFailed", unit=MetricUnit.Count, value=1)
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                logger.info("Circuit half open, probing the webhook")
+
+            # half open, only a single probe at a time
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def record(self, failed: Optional[bool]) -> None:
+        """
+        Record the outcome of a post the circuit allowed
+
+        :params failed: True if the vendor failed the post, None if it was not made
+        """
+        with self.lock:
+            probe = self.probing
+            self.probing = False
+            if failed is None:
+                return
+
+            if not failed:
+                if self.state != CircuitState.CLOSED:
+                    logger.info("Circuit closed, the webhook recovered")
+                self.state = CircuitState.CLOSED
+                self.failures = 0
+                return
+
+            self.failures += 1
+            if probe or self.failures >= self.failure_threshold:
+                if self.state != CircuitState.OPEN:
+                    logger.warning("Circuit opened", failures=self.failures)
+                    metrics.add_metric(name="CircuitOpened", unit=MetricUnit.Count, value=1)
+                self.state = CircuitState.OPEN
+                self.opened_at = self.clock()
+
+    def is_open(self) -> bool:
+        """
+        :returns: True if posts are failing fast, including while probing
+        """
+        return self.state != CircuitState.CLOSED
+
+    def retry_after(self) -> float:
+        """
+        :returns: the seconds until the circuit is half open
+        """
+        if self.state != CircuitState.OPEN:
+            return 0.0
+
+        return max(self.open_seconds - (self.clock() - self.opened_at), 0.0)
+
+
+class WebhookBreakers:
+    """
+    The circuit of each webhook, held for the life of the container so it spans warm
+    invocations
+    """
+
+    def __init__(
+        self,
+        enabled: bool = CIRCUIT_BREAKER_ENABLED,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self.lock = threading.Lock()
+
+    def get(self, vendor: str, url: str) -> Optional[CircuitBreaker]:
+        """
+        :params vendor: the name of the delivery channel
+        :params url: the webhook url
+        :returns: the circuit of the webhook, or None if disabled
+        """
+        if not self.enabled:
+            return None
+
+        key = (vendor, webhook_key(url))
+        with self.lock:
+            if key not in self.breakers:
+                self.breakers[key] = CircuitBreaker(
+                    failure_threshold=self.failure_threshold,
+                    open_seconds=self.open_seconds,
+                    clock=self.clock,
+                )
+            return self.breakers[key]
+
+    def is_open(self, vendor: str) -> bool:
+        """
+        :params vendor: the name of the delivery channel
+        :returns: True if a circuit of the channel is failing posts fast
+        """
+        return any(breaker.is_open() for (name, _), breaker in list(self.breakers.items()) if name == vendor)
+
+    def retry_after(self, vendor: str) -> float:
+        """
+        :params vendor: the name of the delivery channel
+        :returns: the seconds until the channel's open circuits are half open
+        """
+        return max(
+            (breaker.retry_after() for (name, _), breaker in list(self.breakers.items()) if name == vendor),
+            default=0.0,
+        )
+
+
+# Create a singleton instance
+webhook_breakers = WebhookBreakers()
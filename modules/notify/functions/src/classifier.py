@@ -0,0 +1,213 @@
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeGuard, Union
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+logger = Logger()
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+metrics = Metrics(namespace=powertools_namespace)
+
+# The route of messages no parser is registered for
+UNKNOWN_ROUTE = "unknown"
+
+
+class Notification:
+    """
+    The SNS notification being classified, as passed to the registered parsers
+    """
+
+    message: Union[str, Dict[str, Any]]
+    region: str
+    messageAttributes: Dict[str, Any]
+    subject: str
+
+    def __init__(
+        self,
+        message: Union[str, Dict[str, Any]],
+        region: str,
+        messageAttributes: Dict[str, Any],
+        subject: str,
+    ):
+        self.message = message
+        self.region = region
+        self.messageAttributes = messageAttributes
+        self.subject = subject
+
+
+class EventNotification(Notification):
+    """
+    A notification whose message is a JSON object, as passed to the parsers of events
+    """
+
+    message: Dict[str, Any]
+
+
+def is_event(notification: Notification) -> TypeGuard[EventNotification]:
+    return isinstance(notification.message, dict)
+
+
+Parser = Callable[[Notification], Dict[str, Any]]
+EventParser = Callable[[EventNotification], Dict[str, Any]]
+
+
+class PrefixTrie:
+    """
+    Character trie matching a subject to the longest registered prefix
+    """
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+
+    def insert(self, prefix: str, value: Any) -> None:
+        if not prefix:
+            raise ValueError("Prefix must not be empty")
+
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        # the empty string is never a character, so marks the end of a prefix
+        node[""] = value
+
+    def longest_prefix(self, text: str) -> Optional[Any]:
+        node = self.root
+        match = None
+        for char in text:
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            match = node.get("", match)
+
+        return match
+
+
+class Classifier:
+    """
+    Routes a notification to the parser registered for its event type
+
+    Rather than trying each event type in turn, the routes are held in lookup tables,
+    probed in order of precedence: keys present in the message, the exact subject, the
+    EventBridge detail-type, then the longest matching subject prefix.
+    """
+
+    def __init__(self):
+        self.keys: List[Tuple[str, str]] = []
+        self.subjects: Dict[str, str] = {}
+        self.detail_types: Dict[str, str] = {}
+        self.subject_prefixes = PrefixTrie()
+        self.parsers: Dict[str, Parser] = {}
+        self.matches: Dict[str, int] = {}
+
+    def register(
+        self,
+        route: str,
+        key: Optional[str] = None,
+        subject: Optional[str] = None,
+        detail_type: Optional[str] = None,
+        subject_prefix: Optional[str] = None,
+    ) -> Callable[[Parser], Parser]:
+        """
+        Register a parser for the notifications matching any of the given criteria
+
+        Used as a decorator, e.g. @classifier.register("aws_budget", subject_prefix="AWS Budgets:")
+
+        :params route: name of the route, reported in the metrics
+        :params key: a key present in the (JSON) message
+        :params subject: the exact subject of the notification
+        :params detail_type: the detail-type of the EventBridge event
+        :params subject_prefix: a prefix of the subject of the notification
+        :returns: decorator registering the parser
+        """
+
+        def decorator(parser: Parser) -> Parser:
+            if route in self.parsers:
+                raise ValueError(f"Route already registered: {route}")
+
+            self.parsers[route] = parser
+            if key is not None:
+                self.keys.append((key, route))
+            if subject is not None:
+                self.subjects[subject] = route
+            if detail_type is not None:
+                self.detail_types[detail_type] = route
+            if subject_prefix is not None:
+                self.subject_prefixes.insert(subject_prefix, route)
+            return parser
+
+        return decorator
+
+    def register_event(
+        self,
+        route: str,
+        key: Optional[str] = None,
+        subject: Optional[str] = None,
+        detail_type: Optional[str] = None,
+        subject_prefix: Optional[str] = None,
+    ) -> Callable[[EventParser], EventParser]:
+        """
+        Register a parser for the events matching any of the given criteria, as register
+
+        The parser is only passed notifications whose message is a JSON object; a
+        notification of any other message matching the criteria is a TypeError.
+
+        :returns: decorator registering the parser
+        """
+
+        def decorator(parser: EventParser) -> EventParser:
+            def parse(notification: Notification) -> Dict[str, Any]:
+                if not is_event(notification):
+                    raise TypeError(f"Message of route {route} is not a JSON object")
+                return parser(notification)
+
+            self.register(route, key, subject, detail_type, subject_prefix)(parse)
+            return parser
+
+        return decorator
+
+    def route(self, message: Union[str, Dict[str, Any]], subject: str) -> str:
+        """
+        Find the route of the notification
+
+        :params message: the notification message, decoded if JSON
+        :params subject: the notification subject
+        :returns: the name of the route
+        """
+        if isinstance(message, dict):
+            for key, keyed_route in self.keys:
+                if key in message:
+                    return keyed_route
+
+        route = self.subjects.get(subject)
+        if route is not None:
+            return route
+
+        if isinstance(message, dict):
+            route = self.detail_types.get(message.get("detail-type", ""))
+            if route is not None:
+                return route
+
+        return self.subject_prefixes.longest_prefix(subject) or UNKNOWN_ROUTE
+
+    def classify(self, notification: Notification) -> Tuple[str, Optional[Parser]]:
+        """
+        Find the route of the notification, recording the time taken and route matched
+
+        :params notification: the notification to classify
+        :returns: the name of the route, and its parser (None if unknown)
+        """
+        started = time.perf_counter()
+        route = self.route(notification.message, notification.subject)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.matches[route] = self.matches.get(route, 0) + 1
+        metrics.add_metric(name="ClassifyLatency", unit=MetricUnit.Milliseconds, value=elapsed)
+        metrics.add_metric(name=f"Route_{route}", unit=MetricUnit.Count, value=1)
+        logger.debug("Classified notification", route=route, elapsed_ms=elapsed)
+
+        return route, self.parsers.get(route)
+
+
+# Create a singleton instance
+classifier = Classifier()
@@ -0,0 +1,58 @@
+import os
+import time
+from typing import Any, Optional
+
+from aws_lambda_powertools import Logger
+
+logger = Logger()
+
+# The time kept back from the lambda timeout, to report the records left unsent rather
+#  than be killed mid send
+DELIVERY_SAFETY_MARGIN_MS = int(os.environ.get("DELIVERY_SAFETY_MARGIN_MS", "1000"))
+
+
+class InvocationDeadline:
+    """
+    The time by which the invocation must stop starting sends
+
+    Started from the lambda context at the top of each invocation; the delivery workers
+    derive their request timeouts from it, and stop starting sends once it has passed.
+    """
+
+    def __init__(self, safety_margin_ms: int = DELIVERY_SAFETY_MARGIN_MS):
+        self.safety_margin_ms = safety_margin_ms
+        self.at: Optional[float] = None
+
+    def start(self, context: Any) -> None:
+        """
+        Start the deadline of the invocation
+
+        :params context: the lambda context; without one there is no deadline
+        """
+        get_remaining_time = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining_time is None:
+            self.at = None
+            return
+
+        remaining_ms = get_remaining_time() - self.safety_margin_ms
+        self.at = time.monotonic() + max(remaining_ms, 0) / 1000
+        logger.debug("Invocation deadline", remaining_ms=remaining_ms)
+
+    def remaining(self) -> float:
+        """
+        :returns: the seconds until the deadline, infinite if not started
+        """
+        if self.at is None:
+            return float("inf")
+
+        return max(self.at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        """
+        :returns: True if no new sends should be started
+        """
+        return self.at is not None and time.monotonic() >= self.at
+
+
+# Create a singleton instance
+invocation_deadline = InvocationDeadline()
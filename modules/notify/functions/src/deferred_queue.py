@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from aws_lambda_powertools import Logger
+
+logger = Logger()
+
+# An optional SQS queue the records are deferred to while a webhook's circuit is open;
+#  the lambda drains it at the rate of its event source mapping
+DEFERRED_QUEUE_URL = os.environ.get("DEFERRED_QUEUE_URL", "")
+
+# The message attribute naming the channels a deferred record is still to be posted to
+DEFERRED_CHANNELS_ATTRIBUTE = "channels"
+# The longest SQS delays a message
+MAX_DELAY_SECONDS = 900
+# The most messages SQS sends in a single batch request
+SEND_BATCH = 10
+
+
+class DeferredQueue:
+    """
+    Holds the records which could not be posted while a webhook's circuit is open
+
+    Each record is sent as its SNS envelope, as the SNS subscription would, delayed
+    until the circuit is due to be half open, and with the channels it is still to be
+    posted to. Records received from the queue are never deferred again; failing them
+    returns them to the queue.
+    """
+
+    def __init__(self, queue_url: str = DEFERRED_QUEUE_URL, client: Optional[Any] = None):
+        self.queue_url = queue_url
+        self.client = client
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.queue_url)
+
+    def get_client(self) -> Any:
+        """Get the SQS client, importing boto3 and creating the client on first use
+
+        :returns: SQS client
+        """
+        with self.lock:
+            if self.client is None:
+                import boto3
+
+                self.client = boto3.client("sqs")
+
+        return self.client
+
+    def defer(self, snsRecords: List[Dict[str, Any]], channels: List[str], delay: float) -> List[str]:
+        """
+        Send the records to the queue
+
+        :params snsRecords: SNS records as returned by get_sns_records
+        :params channels: the channels the records are still to be posted to
+        :params delay: the seconds until the records may be posted again
+        :returns: the "itemIdentifier" of each record deferred
+        """
+        deferred: List[str] = []
+        pending = snsRecords
+        while pending:
+            batch, pending = pending[:SEND_BATCH], pending[SEND_BATCH:]
+            entries = [
+                {
+                    "Id": str(idx),
+                    "MessageBody": json.dumps(record["Sns"]),
+                    "DelaySeconds": min(int(delay), MAX_DELAY_SECONDS),
+                    "MessageAttributes": {
+                        DEFERRED_CHANNELS_ATTRIBUTE: {
+                            "DataType": "String",
+                            "StringValue": ",".join(channels),
+                        }
+                    },
+                }
+                for idx, record in enumerate(batch)
+            ]
+            try:
+                response = self.get_client().send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            except Exception as e:
+                logger.warning(f"Failed to defer records: {e}")
+                continue
+
+            deferred += [batch[int(entry["Id"])]["itemIdentifier"] for entry in response.get("Successful", [])]
+
+        return deferred
+
+
+# Create a singleton instance
+deferred_queue = DeferredQueue()
@@ -0,0 +1,222 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+from deadline import invocation_deadline
+from stage_metrics import stage_metrics
+
+logger = Logger()
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+metrics = Metrics(namespace=powertools_namespace)
+
+# The maximum number of concurrent posts to the vendor within an invocation
+DELIVERY_CONCURRENCY = int(os.environ.get("DELIVERY_CONCURRENCY", "4"))
+
+# The facts identifying the same alarm or finding; posts sharing these facts are delivered
+#  in the order they were received, so a resolved alarm never lands before it was raised
+ORDERING_KEY_FACTS = {
+    "CloudWatch": ("alarm_arn",),
+    "GuardDuty": ("id",),
+    "Health": ("account_id", "region", "code"),
+    "Backup": ("backup_id",),
+    "SecurityHub": ("account_id", "region", "ruleId"),
+    "DMS": ("source_id",),
+    "CostAnomaly": ("anomaly_id",),
+}
+
+
+class Delivery:
+    """A rendered SNS record waiting to be posted to the vendor"""
+
+    itemIdentifier: str
+    orderingKey: str
+    body: bytes
+    record: Dict[str, Any]
+    digested: List[str]
+    action: str
+    timings: Dict[str, float]
+    status: Optional[int]
+
+    def __init__(
+        self,
+        itemIdentifier: str,
+        orderingKey: str,
+        record: Dict[str, Any],
+        body: bytes = b"",
+        digested: Optional[List[str]] = None,
+        action: str = "",
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.itemIdentifier = itemIdentifier
+        self.orderingKey = orderingKey
+        self.body = body
+        # the other records summarised by a digest, delivered (or failed) with this record
+        self.digested = digested or []
+        self.record = record
+        self.action = action
+        # the milliseconds each stage took, and the vendor's response code once posted
+        self.timings = timings or {}
+        self.status = None
+
+
+def get_ordering_key(parsedMessage: Dict[str, Any], itemIdentifier: str) -> str:
+    """
+    Get the key to preserve delivery order on
+
+    :params parsedMessage: the parsed message with "action" detailing message type
+    :params itemIdentifier: identifier of the record, used when the message has no natural key
+    :returns: ordering key
+    """
+    action = parsedMessage["action"]
+    facts = ORDERING_KEY_FACTS.get(action)
+    if not facts:
+        return itemIdentifier
+
+    return ":".join([action] + [str(parsedMessage.get(fact, "")) for fact in facts])
+
+
+def send_delivery(
+    delivery: Delivery,
+    vendor_send_to_function: Callable,
+    rendererSuccessCode: int,
+) -> bool:
+    """
+    Post a single delivery to the vendor
+
+    :params delivery: the rendered record
+    :params vendor_send_to_function: function posting the encoded body to the vendor
+    :params rendererSuccessCode: HTTP status code returned by the vendor on success
+    :returns: True if the vendor accepted the post
+    """
+    started = time.perf_counter()
+    try:
+        response = vendor_send_to_function(body=delivery.body)
+    except Exception as e:
+        logger.exception(f"Failed to post to vendor: {e}", record=delivery.record)
+        return False
+    finally:
+        delivery.timings["deliver"] = (time.perf_counter() - started) * 1000
+
+    delivery.status = response.code
+    if response.code != rendererSuccessCode:
+        logger.error(
+            "Unexpected vendor response",
+            code={"expected": rendererSuccessCode, "received": response.code},
+            info=response.info,
+            record=delivery.record,
+        )
+        return False
+
+    return True
+
+
+def deliver(
+    deliveries: List[Delivery],
+    vendor_send_to_function: Callable,
+    rendererSuccessCode: int,
+    max_workers: int = DELIVERY_CONCURRENCY,
+    probe: bool = False,
+) -> List[bool]:
+    """
+    Post the deliveries to the vendor through a bounded pool of workers
+
+    Deliveries sharing an ordering key are posted one after another by the same worker,
+    different keys are posted concurrently. Once a delivery failed, the later deliveries
+    sharing its key are failed unsent, so the retry posts them in order. When probing,
+    the first delivery is posted on its own, and the rest are only posted once the
+    vendor accepted it, else they are failed unsent. Once the invocation deadline has
+    passed no new posts are started; the deliveries left unsent are failed, to be
+    retried.
+
+    :params deliveries: the rendered records, in the order received
+    :params vendor_send_to_function: function posting the encoded body to the vendor
+    :params rendererSuccessCode: HTTP status code returned by the vendor on success
+    :params max_workers: the maximum number of concurrent posts
+    :params probe: whether the first delivery is posted before the others
+    :returns: success or failure of each delivery, in the order given
+    """
+    if probe and deliveries:
+        # the rest wait on the first post, so a vendor still failing is only posted once
+        first = deliver(deliveries[:1], vendor_send_to_function, rendererSuccessCode)
+        if not first[0]:
+            log_unsent(deliveries[1:], held=True)
+            return first + [False] * (len(deliveries) - 1)
+        return first + deliver(deliveries[1:], vendor_send_to_function, rendererSuccessCode, max_workers)
+
+    queues: Dict[str, List[int]] = {}
+    for idx, delivery in enumerate(deliveries):
+        queues.setdefault(delivery.orderingKey, []).append(idx)
+
+    results: List[bool] = [False] * len(deliveries)
+    unsent: List[int] = []
+    held: List[int] = []
+
+    def send_queue(queue: List[int]) -> None:
+        pending = list(queue)
+        while pending:
+            idx = pending.pop(0)
+            if invocation_deadline.expired():
+                unsent.append(idx)
+                continue
+            results[idx] = send_delivery(
+                delivery=deliveries[idx],
+                vendor_send_to_function=vendor_send_to_function,
+                rendererSuccessCode=rendererSuccessCode,
+            )
+            if not results[idx]:
+                # posting the later deliveries would overtake the one to be retried
+                held.extend(pending)
+                return
+
+    workers = min(max(max_workers, 1), len(queues))
+    if workers <= 1:
+        for queue in queues.values():
+            send_queue(queue)
+    else:
+        logger.debug("Delivering concurrently", workers=workers, queues=len(queues))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the results so any unexpected worker exception is raised here
+            list(executor.map(send_queue, queues.values()))
+
+    log_unsent([deliveries[idx] for idx in sorted(held)], held=True)
+    log_unsent([deliveries[idx] for idx in sorted(unsent)], held=False)
+
+    return results
+
+
+def log_unsent(deliveries: List[Delivery], held: bool) -> None:
+    """
+    :params deliveries: the deliveries left unsent
+    :params held: True if they waited on a failed delivery, else the deadline passed
+    """
+    if not deliveries:
+        return
+
+    unsent = [delivery.itemIdentifier for delivery in deliveries]
+    if held:
+        logger.warning("Delivery failed, the deliveries waiting on it left unsent", held=unsent)
+        return
+
+    logger.warning("Invocation deadline reached, deliveries left unsent", unsent=unsent)
+    metrics.add_metric(name="UnsentRecords", unit=MetricUnit.Count, value=len(unsent))
+
+
+def add_delivery_metrics(deliveries: List[Delivery], channel: str) -> None:
+    """
+    Add the stage timings, payload size and response code of each delivery posted
+
+    :params deliveries: the deliveries, once delivered
+    :params channel: the name of the delivery channel
+    """
+    for delivery in deliveries:
+        stage_metrics.emit(
+            action=delivery.action,
+            channel=channel,
+            timings=delivery.timings,
+            payload_bytes=len(delivery.body),
+            status=delivery.status,
+        )
@@ -0,0 +1,212 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from aws_lambda_powertools import Logger
+
+from circuit_breaker import CIRCUIT_OPEN_CODE, webhook_breakers
+from deadline import invocation_deadline
+from delivery import Delivery, add_delivery_metrics, deliver
+from msg_parser import (
+    defer_undelivered_records,
+    get_delivered_records,
+    is_drained,
+    mark_delivered_records,
+    parse_sns_records,
+    render_parsed_record,
+)
+from rate_limit import webhook_rate_limiter
+from render import Render
+from webhook_client import VendorResponse, webhook_client
+from webhook_url import WEBHOOK_URL_INVALID_CODES, webhook_urls
+
+logger = Logger()
+
+
+class DeliveryChannel:
+    """A vendor webhook the rendered notifications are posted to"""
+
+    name: str
+    webhookUrlEnv: str
+    renderer: Render
+    successCode: int
+
+    def __init__(self, name: str, webhookUrlEnv: str, renderer: Render, successCode: int) -> None:
+        self.name = name
+        self.webhookUrlEnv = webhookUrlEnv
+        self.renderer = renderer
+        self.successCode = successCode
+
+    def send(self, body: bytes) -> VendorResponse:
+        """
+        Send notification payload to the vendor
+
+        :params body: formatted message payload, encoded as JSON
+        :returns: the response code and info from the vendor
+        """
+        url = webhook_urls.get(self.webhookUrlEnv)
+
+        logger.debug(
+            f"{self.name.capitalize()} endpoint payload",
+            endpoint_url=url,
+            payload_bytes=len(body),
+        )
+
+        breaker = webhook_breakers.get(self.name, url)
+        if breaker is not None and not breaker.allow():
+            return VendorResponse(code=CIRCUIT_OPEN_CODE, info="Circuit open, not posted")
+
+        # waiting on the vendor's rate, and the request itself, end by the deadline
+        remaining = invocation_deadline.remaining()
+        try:
+            response = webhook_rate_limiter.post(
+                vendor=self.name,
+                url=url,
+                send=lambda: webhook_client.post(
+                    url=url,
+                    body=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=invocation_deadline.remaining(),
+                ),
+                max_wait=min(webhook_rate_limiter.max_wait, remaining),
+            )
+        except Exception:
+            if breaker is not None:
+                breaker.record(failed=True)
+            raise
+
+        if breaker is not None:
+            breaker.record(failed=None if response is None else response.status >= 500)
+        if response is None:
+            # not posted, the record is failed to be retried by a later invocation
+            return VendorResponse(code=429, info="Rate limited before posting")
+
+        info = response.data.decode("utf-8", errors="replace")
+        if response.status in WEBHOOK_URL_INVALID_CODES:
+            webhook_urls.invalidate(self.webhookUrlEnv)
+        if response.status >= 300:
+            logger.error(
+                f"Failed to post to {self.name}",
+                code=response.status,
+                reason=response.reason,
+                info=info,
+                endpoint_url=url,
+                payload=body.decode("utf-8"),
+            )
+        else:
+            logger.debug(
+                f"Successfully posted to {self.name} with response",
+                code=response.status,
+            )
+
+        return VendorResponse(code=response.status, info=info)
+
+
+def pending_channels(
+    covered: List[str], record: Dict[str, Any], channels: List[DeliveryChannel], delivered: Dict[str, List[str]]
+) -> List[DeliveryChannel]:
+    """
+    :params covered: the "itemIdentifier" of the record, and of the records it digests
+    :params record: SNS record as returned by get_sns_records
+    :params channels: the channels to deliver to
+    :params delivered: the "itemIdentifier" of the records each channel already accepted
+    :returns: the channels yet to accept the record, and it is to be delivered to
+    """
+    return [
+        channel
+        for channel in channels
+        if any(i not in delivered[channel.name] for i in covered)
+        and channel.name in record.get("channels", [channel.name])
+    ]
+
+
+def record_channel_results(
+    snsRecords: List[Dict[str, Any]],
+    channels: List[DeliveryChannel],
+    deliveries: Dict[str, List[Delivery]],
+    results: List[List[bool]],
+) -> Dict[str, List[str]]:
+    """
+    Add the delivery metrics of each channel, and remember the records it accepted
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :params channels: the channels delivered to
+    :params deliveries: the deliveries made to each channel
+    :params results: whether each delivery was accepted, in the order of the channels
+    :returns: the "itemIdentifier" of the records each channel left undelivered
+    """
+    undelivered: Dict[str, List[str]] = {}
+    for channel, channel_results in zip(channels, results):
+        add_delivery_metrics(deliveries[channel.name], channel=channel.name)
+        accepted: List[str] = []
+        undelivered[channel.name] = []
+        for delivery, is_delivered in zip(deliveries[channel.name], channel_results):
+            covered = [delivery.itemIdentifier] + delivery.digested
+            if is_delivered:
+                accepted += covered
+            else:
+                undelivered[channel.name] += covered
+
+        mark_delivered_records(snsRecords, channel=channel.name, itemIdentifiers=accepted)
+
+    return undelivered
+
+
+def fan_out_sns(snsRecords: List[Dict[str, Any]], channels: List[DeliveryChannel]) -> List[str]:
+    """
+    Parse each SNS record once, render it for every channel, then deliver to the channels
+    concurrently
+
+    A record is failed if any channel failed to deliver it; when retried, it is only
+    delivered to the channels which did not accept it, as remembered by the delivery
+    ledger.
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :params channels: the channels to deliver to
+    :returns: the "itemIdentifier" of each record that failed
+    """
+    deliveries: Dict[str, List[Delivery]] = {channel.name: [] for channel in channels}
+
+    logger.debug("Number of SNS records", num_records=len(snsRecords))
+    delivered = get_delivered_records(snsRecords, channels=[c.name for c in channels])
+    snsRecords = [
+        record for record in snsRecords if any(record["itemIdentifier"] not in delivered[c.name] for c in channels)
+    ]
+    parsedRecords, failed_records = parse_sns_records(snsRecords)
+
+    for record, parsedMessage in parsedRecords:
+        covered = [record["itemIdentifier"]] + parsedMessage.digested
+        pending = pending_channels(covered, record=record, channels=channels, delivered=delivered)
+        try:
+            rendered = [
+                render_parsed_record(record=record, parsedMessage=parsedMessage, renderer=channel.renderer)
+                for channel in pending
+            ]
+        except Exception as e:
+            logger.exception(f"Failed to process SNS record: {e}", record=record)
+            failed_records += covered
+            continue
+
+        for channel, delivery in zip(pending, rendered):
+            deliveries[channel.name].append(delivery)
+
+    def deliver_channel(channel: DeliveryChannel) -> List[bool]:
+        return deliver(
+            deliveries=deliveries[channel.name],
+            vendor_send_to_function=channel.send,
+            rendererSuccessCode=channel.successCode,
+            probe=drained,
+        )
+
+    drained = is_drained(snsRecords)
+    # each channel is a different vendor host, with its own pool of delivery workers
+    with ThreadPoolExecutor(max_workers=max(len(channels), 1)) as executor:
+        results = list(executor.map(deliver_channel, channels))
+
+    undelivered = record_channel_results(snsRecords, channels=channels, deliveries=deliveries, results=results)
+    deferred = defer_undelivered_records(snsRecords, undelivered=undelivered)
+    for itemIdentifiers in undelivered.values():
+        for itemIdentifier in itemIdentifiers:
+            if itemIdentifier not in failed_records and itemIdentifier not in deferred:
+                failed_records.append(itemIdentifier)
+
+    return failed_records
@@ -0,0 +1,143 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+
+from notification_document import Field, Link, NotificationDocument
+
+logger = Logger()
+
+# Whether bursts of similar notifications within a batch are posted as a single digest
+DIGEST_ENABLED = os.environ.get("DIGEST_ENABLED", "false").lower() == "true"
+# The fewest similar notifications posted as a digest; smaller groups are posted as is
+DIGEST_MIN_RECORDS = int(os.environ.get("DIGEST_MIN_RECORDS", "3"))
+# The most notifications listed in a digest, the rest are linked to in the console
+DIGEST_MAX_ITEMS = int(os.environ.get("DIGEST_MAX_ITEMS", "10"))
+# The priorities always posted on their own, e.g. CRITICAL,ERROR
+DIGEST_IMMEDIATE_PRIORITIES = [
+    priority.strip().upper()
+    for priority in os.environ.get("DIGEST_IMMEDIATE_PRIORITIES", "").split(",")
+    if priority.strip()
+]
+
+# The notifications which are never digested
+DIGEST_EXCLUDED_ACTIONS = ("Unknown",)
+
+DigestKey = Tuple[str, str, str]
+
+
+class Digester:
+    """
+    Coalesces bursts of similar notifications into a single summary post
+
+    The window is the batch of records the lambda is invoked with; so digests need the
+    SQS buffer, with a batching window, in front of the lambda. Notifications are
+    similar when they share the action, account and priority.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = DIGEST_ENABLED,
+        min_records: int = DIGEST_MIN_RECORDS,
+        max_items: int = DIGEST_MAX_ITEMS,
+        immediate_priorities: List[str] = DIGEST_IMMEDIATE_PRIORITIES,
+    ):
+        self.enabled = enabled
+        self.min_records = max(min_records, 2)
+        self.max_items = max(max_items, 1)
+        self.immediate_priorities = immediate_priorities
+
+    def key(self, parsedMessage: Dict[str, Any]) -> Optional[DigestKey]:
+        """
+        :params parsedMessage: the parsed message with "action" detailing message type
+        :returns: the key the message is grouped on, or None if posted on its own
+        """
+        action = parsedMessage["action"]
+        priority = parsedMessage.get("priority") or ""
+        if action in DIGEST_EXCLUDED_ACTIONS or priority in self.immediate_priorities:
+            return None
+
+        return (action, parsedMessage.get("account_id") or "", priority)
+
+    def group(self, parsedMessages: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group the similar messages of the batch
+
+        :params parsedMessages: the parsed messages of the batch, in the order received
+        :returns: the indexes of the messages of each post, in the order of their first
+        """
+        if not self.enabled:
+            return [[idx] for idx in range(len(parsedMessages))]
+
+        groups: Dict[Any, List[int]] = {}
+        for idx, parsedMessage in enumerate(parsedMessages):
+            key = self.key(parsedMessage)
+            groups.setdefault(idx if key is None else key, []).append(idx)
+
+        posts: List[List[int]] = []
+        for indexes in groups.values():
+            if len(indexes) >= self.min_records:
+                posts.append(indexes)
+            else:
+                posts.extend([idx] for idx in indexes)
+
+        return sorted(posts, key=lambda indexes: indexes[0])
+
+    def document(
+        self,
+        parsedMessages: List[Dict[str, Any]],
+        documents: List[NotificationDocument],
+        console_url: Optional[str] = None,
+    ) -> NotificationDocument:
+        """
+        Build the summary of a group of similar messages
+
+        :params parsedMessages: the parsed messages of the group
+        :params documents: the document of each message
+        :params console_url: the console page listing the notifications, if known
+        :returns: notification document listing the messages, up to the cap
+        """
+        first = parsedMessages[0]
+        count = len(documents)
+        account = first.get("account_name") or first.get("account_id")
+        title = f"{first['action']}: {count} notifications"
+        if account:
+            title = f"{title} in {account}"
+
+        listed = documents[: self.max_items]
+        fields = [
+            Field(
+                document.title,
+                document.link.url if document.link else document.fallback,
+                short=False,
+            )
+            for document in listed
+        ]
+
+        hidden = count - len(listed)
+        text = f"{count} similar notifications arrived together"
+        link: Optional[Link] = None
+        url = console_url or (documents[0].link.url if documents[0].link else None)
+        if url is not None:
+            link = Link(f"+{hidden} more" if hidden else "The Console", url)
+            if hidden:
+                text = f"{text}, +{hidden} more in the console"
+        elif hidden:
+            fields.append(Field(None, f"+{hidden} more", short=False))
+
+        logger.debug("Digested notifications", title=title, count=count)
+
+        return NotificationDocument(
+            action="Digest",
+            title=title,
+            fallback=title,
+            priority=documents[0].priority,
+            emblem=documents[0].emblem,
+            text=text,
+            link=link,
+            fields=fields,
+        )
+
+
+# Create a singleton instance
+digester = Digester()
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from aws_lambda_powertools import Logger
+
+logger = Logger()
+
+# Whether the posts already delivered are remembered, so retried records skip them
+IDEMPOTENCY_ENABLED = os.environ.get("IDEMPOTENCY_ENABLED", "false").lower() == "true"
+# An optional DynamoDB table remembering the delivered posts across containers; else
+#  they are only remembered in memory by the warm container
+IDEMPOTENCY_TABLE = os.environ.get("IDEMPOTENCY_TABLE", "")
+# How long a delivered post is remembered; at least as long as records may be retried
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", "86400"))
+# The most delivered posts remembered in memory per container
+IDEMPOTENCY_MAX_ENTRIES = 10000
+
+# The most keys DynamoDB reads, or writes, in a single batch request
+TABLE_READ_BATCH = 100
+TABLE_WRITE_BATCH = 25
+
+
+def get_message_id(record: Dict[str, Any]) -> str:
+    """
+    :params record: SNS record as returned by get_sns_records
+    :returns: the SNS message id, or the record identifier if the envelope was stripped
+    """
+    return record["Sns"].get("MessageId") or record["itemIdentifier"]
+
+
+def delivery_key(channel: str, record: Dict[str, Any]) -> str:
+    """
+    :params channel: the name of the delivery channel
+    :params record: SNS record as returned by get_sns_records
+    :returns: the key the delivery of the record to the channel is remembered by
+    """
+    return f"{channel}:{get_message_id(record)}"
+
+
+class DeliveryLedger:
+    """
+    Remembers the records delivered to each channel, so a retried record is not posted
+    again to a channel which already accepted it
+
+    SNS retries the whole invocation when any record fails, and SQS redelivers a record
+    until every channel accepts it. The delivered keys are held in memory, least
+    recently used evicted first, and optionally in a DynamoDB table keyed by the string
+    "id" with "expires_at" as its time to live attribute; the table is only read for the
+    keys the container does not remember. The ledger fails open, as a duplicate post is
+    better than a lost one.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = IDEMPOTENCY_ENABLED,
+        table_name: str = IDEMPOTENCY_TABLE,
+        client: Optional[Any] = None,
+        ttl: int = IDEMPOTENCY_TTL,
+        max_entries: int = IDEMPOTENCY_MAX_ENTRIES,
+    ):
+        self.enabled = enabled
+        self.table_name = table_name
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, float]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_client(self) -> Any:
+        """Get the DynamoDB client, importing boto3 and creating the client on first use
+
+        :returns: DynamoDB client
+        """
+        with self.lock:
+            if self.client is None:
+                import boto3
+
+                self.client = boto3.client("dynamodb")
+
+        return self.client
+
+    def remembered(self, key: str) -> bool:
+        with self.lock:
+            expires_at = self.entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                self.entries.pop(key, None)
+                return False
+
+            self.entries.move_to_end(key)
+            return True
+
+    def remember(self, keys: Iterable[str]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self.lock:
+            for key in keys:
+                self.entries[key] = expires_at
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delivered(self, keys: List[str]) -> Set[str]:
+        """
+        Get the keys already delivered
+
+        :params keys: the delivery keys of the records to be posted
+        :returns: the keys delivered by an earlier invocation
+        """
+        if not self.enabled:
+            return set()
+
+        found = {key for key in keys if self.remembered(key)}
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if not self.table_name or not missing:
+            return found
+
+        try:
+            stored = self.get_stored(missing)
+        except Exception as e:
+            logger.warning(f"Failed to get delivered records: {e}")
+            return found
+
+        self.remember(stored)
+        return found | stored
+
+    def get_stored(self, keys: List[str]) -> Set[str]:
+        """
+        :params keys: the delivery keys to look up in the table
+        :returns: the keys held by the table and not yet expired
+        """
+        now = int(time.time())
+        stored: Set[str] = set()
+        pending = keys
+        while pending:
+            batch, pending = pending[:TABLE_READ_BATCH], pending[TABLE_READ_BATCH:]
+            request: Optional[Dict[str, Any]] = {self.table_name: {"Keys": [{"id": {"S": key}} for key in batch]}}
+            while request:
+                response = self.get_client().batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    # expired items are only removed by DynamoDB eventually
+                    if int(item["expires_at"]["N"]) > now:
+                        stored.add(item["id"]["S"])
+                request = response.get("UnprocessedKeys") or None
+
+        return stored
+
+    def mark_delivered(self, keys: List[str]) -> None:
+        """
+        Remember the keys the channels accepted
+
+        :params keys: the delivery keys of the records delivered
+        """
+        if not self.enabled or not keys:
+            return
+
+        self.remember(keys)
+        if not self.table_name:
+            return
+
+        ttl = {"N": str(int(time.time()) + self.ttl)}
+        try:
+            pending = keys
+            while pending:
+                batch, pending = pending[:TABLE_WRITE_BATCH], pending[TABLE_WRITE_BATCH:]
+                request: Optional[Dict[str, Any]] = {
+                    self.table_name: [{"PutRequest": {"Item": {"id": {"S": key}, "expires_at": ttl}}} for key in batch]
+                }
+                while request:
+                    response = self.get_client().batch_write_item(RequestItems=request)
+                    request = response.get("UnprocessedItems") or None
+        except Exception as e:
+            logger.warning(f"Failed to put delivered records: {e}")
+
+
+# Create a singleton instance
+delivery_ledger = DeliveryLedger()
@@ -3,19 +3,29 @@ import base64
 import json
 import os
 import re
+import threading
 import urllib.parse
 from datetime import datetime
 from enum import Enum
 from math import floor
-from typing import Any, Callable, Dict, Optional, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
-import boto3
 from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from account_directory import AccountDirectory, AccountIndex, ShardedAccountDirectory
+from alarm_flap import flap_suppressor
+from circuit_breaker import webhook_breakers
+from classifier import EventNotification, Notification, classifier
+from deferred_queue import DEFERRED_CHANNELS_ATTRIBUTE, deferred_queue
+from delivery import Delivery, add_delivery_metrics, deliver, get_ordering_key
+from digest import digester
+from idempotency import delivery_key, delivery_ledger
+from notification_document import Field, NotificationDocument, build_document, code
 from render import Render
-from ssm_param import get_parameter
+from ssm_param import get_parameter, get_parameters
+from stage_metrics import stage, stage_metrics
 
 logger = Logger()
 powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
@@ -33,26 +43,88 @@ if IDENTITY_CENTER_URL.endswith("/"):
 if IDENTITY_CENTER_URL.endswith("console"):
     IDENTITY_CENTER_URL = IDENTITY_CENTER_URL[:-8]
 
-# Create client so its cached/frozen between invocations
-KMS_CLIENT = boto3.client("kms", region_name=REGION)
+# Created on first use, as only KMS encrypted webhook urls need boto3; then cached/frozen
+#  between invocations
+KMS_CLIENT: Optional[Any] = None
+KMS_CLIENT_LOCK = threading.Lock()
 
 
-def get_account_mappings() -> dict:
+def get_kms_client() -> Any:
+    """Get the KMS client, importing boto3 and creating the client on first use
+
+    :returns: KMS client
+    """
+    global KMS_CLIENT
+    with KMS_CLIENT_LOCK:
+        if KMS_CLIENT is None:
+            import boto3
+
+            KMS_CLIENT = boto3.client("kms", region_name=REGION)
+
+    return KMS_CLIENT
+
+
+# The account id to name mapping may, optionally, be sharded across the parameters under a path
+ACCOUNTS_ID_TO_NAME_PARAMETER_PATH = os.environ.get("ACCOUNTS_ID_TO_NAME_PARAMETER_PATH", "")
+ACCOUNTS_ID_TO_NAME_SHARD_PREFIX_LENGTH = int(os.environ.get("ACCOUNTS_ID_TO_NAME_SHARD_PREFIX_LENGTH", "2"))
+
+# Keys of the messages holding the account id, found without parsing the message
+ACCOUNT_ID_PATTERN = re.compile(r'"(?:AWSAccountId|accountId|account)"\s*:\s*"(\d{12})"')
+
+
+def get_account_mappings() -> AccountIndex:
     try:
         parameter_arn = os.environ.get("ACCOUNTS_ID_TO_NAME_PARAMETER_ARN")
         if not parameter_arn:
-            logger.error(
-                "Missing required environment variable: ACCOUNTS_ID_TO_NAME_PARAMETER_ARN"
-            )
-            return {}
+            logger.error("Missing required environment variable: ACCOUNTS_ID_TO_NAME_PARAMETER_ARN")
+            return AccountIndex({})
 
-        return get_parameter(parameter_arn)
+        return AccountIndex(get_parameter(parameter_arn))
     except Exception as e:
         logger.exception(f"Error retrieving account mappings: {e}")
-        return {}
+        return AccountIndex({})
+
+
+def get_account_directory() -> Union[AccountDirectory, ShardedAccountDirectory]:
+    if ACCOUNTS_ID_TO_NAME_PARAMETER_PATH:
+        return ShardedAccountDirectory(
+            parameter_path=ACCOUNTS_ID_TO_NAME_PARAMETER_PATH,
+            prefix_length=ACCOUNTS_ID_TO_NAME_SHARD_PREFIX_LENGTH,
+            fetch=get_parameters,
+        )
+
+    return AccountDirectory(loader=get_account_mappings)
+
+
+def get_account_name(account_id: str) -> str:
+    """
+    Look up the name of the account, timed as the enrich stage of the record
+
+    :params account_id: the AWS account id
+    :returns: the account name, empty if unknown
+    """
+    with stage("enrich"):
+        return ACCOUNT_ID_TO_NAME.get(account_id, "")
+
+
+def get_referenced_account_ids(record: Dict[str, Any]) -> List[str]:
+    """
+    Find the account ids a record references, without parsing its message
+
+    :params record: SNS record
+    :returns: the account ids
+    """
+    account_ids = ACCOUNT_ID_PATTERN.findall(record["Sns"].get("Message") or "")
+    attribute = record["Sns"].get("MessageAttributes", {}).get("AccountId", {})
+    if attribute.get("Value"):
+        account_ids.append(attribute["Value"])
+
+    return account_ids
 
 
-ACCOUNT_ID_TO_NAME = get_account_mappings()
+# Loaded in the background from the init phase; only the lookups wait on it
+ACCOUNT_ID_TO_NAME = get_account_directory()
+ACCOUNT_ID_TO_NAME.start()
 
 
 class AwsService(Enum):
@@ -70,9 +142,7 @@ def decrypt_url(encrypted_url: str) -> str:
     :returns: plaintext URL
     """
     try:
-        decrypted_payload = KMS_CLIENT.decrypt(
-            CiphertextBlob=base64.b64decode(encrypted_url)
-        )
+        decrypted_payload = get_kms_client().decrypt(CiphertextBlob=base64.b64decode(encrypted_url))
         return decrypted_payload["Plaintext"].decode()
     except Exception as e:
         raise e
@@ -100,7 +170,7 @@ def get_service_url(region: str, service: str) -> str:
         raise
 
 
-def get_target_url(account_id: str, absoluteUrl: str = None) -> str:
+def get_target_url(account_id: Optional[str], absoluteUrl: str = None) -> str:
     """Redirect via identity center if defined
 
     :param account_id: the originating account id to use when using Identity Center redirects
@@ -113,6 +183,32 @@ def get_target_url(account_id: str, absoluteUrl: str = None) -> str:
         return f"{absoluteUrl}"
 
 
+# The console page listing the notifications of each action, linked from their digests
+DIGEST_CONSOLE_PAGES = {
+    "CloudWatch": ("cloudwatch", "#alarmsV2:"),
+    "GuardDuty": ("guardduty", "#/findings"),
+    "SecurityHub": ("securityhub", "#findings"),
+}
+
+
+def get_console_url(parsedMessage: Dict[str, Any]) -> Optional[str]:
+    """Get the console page listing notifications like the one given
+
+    :param parsedMessage: the parsed message with "action" detailing message type
+    :returns: AWS console url, or None if the action has no such page
+    """
+    page = DIGEST_CONSOLE_PAGES.get(parsedMessage["action"])
+    if page is None:
+        return None
+
+    service, fragment = page
+    region = parsedMessage.get("alarm_arn_region") or parsedMessage.get("region", REGION)
+    return get_target_url(
+        account_id=parsedMessage.get("account_id"),
+        absoluteUrl=f"{get_service_url(region=region, service=service)}{fragment}",
+    )
+
+
 class AwsAction(Enum):
     """The individual AWS service types parsed"""
 
@@ -152,7 +248,7 @@ def parse_cloudwatch_alarm(message: Dict[str, Any], snsRegion: str) -> Dict[str,
     atEpoch = atDT.timestamp()
     description = message["AlarmDescription"]
     account_id = message["AWSAccountId"]
-    account_name = ACCOUNT_ID_TO_NAME.get(account_id, "")
+    account_name = get_account_name(account_id)
     reason = message["NewStateReason"]
     state = message["NewStateValue"]
     old_state = message["OldStateValue"]
@@ -185,6 +281,11 @@ def parse_cloudwatch_alarm(message: Dict[str, Any], snsRegion: str) -> Dict[str,
     }
 
 
+@classifier.register_event("cloudwatch_alarm", key="AlarmName")
+def route_cloudwatch_alarm(notification: EventNotification) -> Dict[str, Any]:
+    return parse_cloudwatch_alarm(notification.message, snsRegion=notification.region)
+
+
 class GuardDutylarmPriority(Enum):
     """Maps GuardDuty finding severity to normalised priority"""
 
@@ -221,7 +322,7 @@ def parse_guardduty_finding(message: Dict[str, Any], snsRegion: str) -> Dict[str
     first_seen = service["eventFirstSeen"]
     last_seen = service["eventLastSeen"]
     account_id = detail["accountId"]
-    account_name = ACCOUNT_ID_TO_NAME.get(account_id, "")
+    account_name = get_account_name(account_id)
     count = service["count"]
     guard_duty_id = detail["id"]
 
@@ -253,6 +354,11 @@ def parse_guardduty_finding(message: Dict[str, Any], snsRegion: str) -> Dict[str
     }
 
 
+@classifier.register_event("guardduty_finding", detail_type="GuardDuty Finding")
+def route_guardduty_finding(notification: EventNotification) -> Dict[str, Any]:
+    return parse_guardduty_finding(message=notification.message, snsRegion=notification.region)
+
+
 class AwsHealthCategoryPriroity(Enum):
     """Maps AWS Health eventTypeCategory to to a normalised priority"""
 
@@ -274,7 +380,7 @@ def parse_aws_health(message: Dict[str, Any], snsRegion: str) -> Dict[str, Any]:
     resources = ",".join(message.setdefault("resources", ["<unknown>"]))
     service = detail.get("service", "<unknown>")
     account_id = message["account"]
-    account_name = ACCOUNT_ID_TO_NAME.get(account_id, "")
+    account_name = get_account_name(account_id)
     category = detail["eventTypeCategory"]
     code = detail.get("eventTypeCode")
     description = detail["eventDescription"][0]["latestDescription"]
@@ -309,6 +415,11 @@ def parse_aws_health(message: Dict[str, Any], snsRegion: str) -> Dict[str, Any]:
     }
 
 
+@classifier.register_event("aws_health", detail_type="AWS Health Event")
+def route_aws_health(notification: EventNotification) -> Dict[str, Any]:
+    return parse_aws_health(message=notification.message, snsRegion=notification.region)
+
+
 def aws_backup_field_parser(message: str) -> Dict[str, str]:
     """
     Parser for AWS Backup event message. It extracts the fields and returns a dictionary.
@@ -359,7 +470,7 @@ def parse_aws_backup(message: str, messageAttributes: Dict[str, Any]) -> Dict[st
 
     start_time = messageAttributes["StartTime"]["Value"]  # ISO timestamp
     account_id = messageAttributes["AccountId"]["Value"]
-    account_name = ACCOUNT_ID_TO_NAME.get(account_id, "")
+    account_name = get_account_name(account_id)
     backup_id = messageAttributes["Id"]["Value"]
     status = messageAttributes["State"]["Value"]
     region = backup_fields["Resource ARN"].split(":")[3]
@@ -385,6 +496,14 @@ def parse_aws_backup(message: str, messageAttributes: Dict[str, Any]) -> Dict[st
     }
 
 
+@classifier.register("aws_backup", subject="Notification from AWS Backup")
+def route_aws_backup(notification: Notification) -> Dict[str, Any]:
+    return parse_aws_backup(
+        message=str(notification.message),
+        messageAttributes=notification.messageAttributes,
+    )
+
+
 def parse_aws_budget(subject: str, message: str) -> Dict[str, Any]:
     """
     Parse AWS Budget alert into normalised facts
@@ -405,6 +524,11 @@ def parse_aws_budget(subject: str, message: str) -> Dict[str, Any]:
     }
 
 
+@classifier.register("aws_budget", subject_prefix="AWS Budgets:")
+def route_aws_budget(notification: Notification) -> Dict[str, Any]:
+    return parse_aws_budget(subject=notification.subject, message=str(notification.message))
+
+
 def parse_aws_savings_plan(subject: str, message: str) -> Dict[str, Any]:
     """
     Parse AWS Savings Plan alert into normalised facts
@@ -425,6 +549,11 @@ def parse_aws_savings_plan(subject: str, message: str) -> Dict[str, Any]:
     }
 
 
+@classifier.register("aws_savings_plan", subject_prefix="Savings Plans Coverage Alert:")
+def route_aws_savings_plan(notification: Notification) -> Dict[str, Any]:
+    return parse_aws_savings_plan(subject=notification.subject, message=str(notification.message))
+
+
 class SecurityHubPriority(Enum):
     """Maps SecurityHub severity state to a normalised 3 level priority"""
 
@@ -435,9 +564,7 @@ class SecurityHubPriority(Enum):
     CRITICAL = "CRITICAL"
 
 
-def parse_security_hub_finding(
-    message: Dict[str, Any], snsRegion: str
-) -> Dict[str, Any]:
+def parse_security_hub_finding(message: Dict[str, Any], snsRegion: str) -> Dict[str, Any]:
     """Format Secuirty Hub finding event into Security Hub finding facts format
 
     :params message: SNS message body containing Security Hub event
@@ -523,6 +650,11 @@ def parse_security_hub_finding(
     }
 
 
+@classifier.register_event("security_hub_finding", subject="Security Hub Finding")
+def route_security_hub_finding(notification: EventNotification) -> Dict[str, Any]:
+    return parse_security_hub_finding(message=notification.message, snsRegion=notification.region)
+
+
 def parse_dms_notification(message: Dict[str, Any], snsRegion: str) -> Dict[str, Any]:
     """Format DMS notification event into DMS Notification facts format
 
@@ -558,6 +690,11 @@ def parse_dms_notification(message: Dict[str, Any], snsRegion: str) -> Dict[str,
     }
 
 
+@classifier.register_event("dms_notification", subject="DMS Notification Message")
+def route_dms_notification(notification: EventNotification) -> Dict[str, Any]:
+    return parse_dms_notification(message=notification.message, snsRegion=notification.region)
+
+
 class CostAnomalyPriority(Enum):
     """Maps Cost Anomaly severity state to a normalised 3 level priority"""
 
@@ -636,17 +773,36 @@ def parse_cost_anomaly(message: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+@classifier.register_event("cost_anomaly", subject_prefix="AWS Cost Management:")
+def route_cost_anomaly(notification: EventNotification) -> Dict[str, Any]:
+    return parse_cost_anomaly(message=notification.message)
+
+
 class AwsParsedMessage:
     parsedMsg: Dict[str, Any]
     originalMsg: Dict[str, Any]
     actionType: str
+    document: NotificationDocument
+    digested: List[str]
+    timings: Dict[str, float]
 
     def __init__(
-        self, parsed: Dict[str, Any], original: Dict[str, Any], actionType: str
+        self,
+        parsed: Dict[str, Any],
+        original: Dict[str, Any],
+        actionType: str,
+        document: NotificationDocument,
+        digested: Optional[List[str]] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Any:
         self.parsedMsg = parsed
         self.originalMsg = original
         self.actionType = actionType
+        self.document = document
+        # the "itemIdentifier" of the other records, when a digest of several
+        self.digested = digested or []
+        # the milliseconds each stage of parsing took, when timed
+        self.timings = timings or {}
 
 
 def get_message_payload(
@@ -664,108 +820,465 @@ def get_message_payload(
     :returns: facts dictionary object ("action" given the fact type)
     """
 
-    if isinstance(message, str):
-        try:
-            message = json.loads(message)
-        except json.JSONDecodeError:
-            pass
+    with stage("classify"):
+        if isinstance(message, str):
+            try:
+                message = json.loads(message)
+            except json.JSONDecodeError:
+                pass
 
-    message = cast(Dict[str, Any], message)
+        message = cast(Dict[str, Any], message)
 
-    # to handle manual posting of messages via SNS, handle the case where subject is not defined
-    if subject == None:
-        subject = ""
+        # to handle manual posting of messages via SNS, handle the case where subject is not defined
+        if subject == None:
+            subject = ""
 
-    if "AlarmName" in message:
-        parsedMsg = parse_cloudwatch_alarm(message, snsRegion=region)
+        notification = Notification(
+            message=message,
+            region=region,
+            messageAttributes=messageAttributes,
+            subject=subject,
+        )
+        _, parser = classifier.classify(notification)
 
-    elif subject == "Security Hub Finding":
-        parsedMsg = parse_security_hub_finding(message=message, snsRegion=region)
+    with stage("parse"):
+        if parser is None:
+            parsedMsg = {
+                "action": AwsAction.UNKNOWN.value,
+            }
+        else:
+            parsedMsg = parser(notification)
 
-    elif subject == "DMS Notification Message":
-        parsedMsg = parse_dms_notification(message=message, snsRegion=region)
+        metricType = parsedMsg["action"]
+        metrics.add_metric(name=f"{metricType}", unit=MetricUnit.Count, value=1)
 
-    elif (
-        isinstance(message, Dict) and message.get("detail-type") == "GuardDuty Finding"
-    ):
-        parsedMsg = parse_guardduty_finding(message=message, snsRegion=region)
+        # formatted once, however many channels the message is rendered for
+        document = build_document(parsedMessage=parsedMsg, originalMessage=message, subject=subject)
 
-    elif isinstance(message, Dict) and message.get("detail-type") == "AWS Health Event":
-        parsedMsg = parse_aws_health(message=message, snsRegion=region)
+    return AwsParsedMessage(
+        parsed=parsedMsg,
+        original=message,
+        actionType=parsedMsg["action"],
+        document=document,
+    )
 
-    elif subject == "Notification from AWS Backup":
-        parsedMsg = parse_aws_backup(
-            message=str(message), messageAttributes=messageAttributes
-        )
 
-    elif subject.startswith("AWS Budgets:"):
-        parsedMsg = parse_aws_budget(subject=subject, message=str(message))
+def get_sns_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalise lambda event records into SNS records
 
-    elif subject.startswith("Savings Plans Coverage Alert:"):
-        parsedMsg = parse_aws_savings_plan(subject=subject, message=str(message))
+    Records arrive either directly from the SNS subscription, or when the SQS buffer is
+    enabled, as SQS messages whose body is the SNS notification envelope.
 
-    elif subject.startswith("AWS Cost Management:"):
-        parsedMsg = parse_cost_anomaly(message=message)
+    :params records: the lambda event records
+    :returns: SNS records, each with the "itemIdentifier" used to report batch failures
+    """
+    snsRecords: List[Dict[str, Any]] = []
+
+    for record in records:
+        if record.get("eventSource") == "aws:sqs":
+            try:
+                sns = json.loads(record["body"])
+            except json.JSONDecodeError:
+                sns = None
+
+            # raw message delivery strips the SNS envelope; rebuild what we can from the queue
+            if not isinstance(sns, dict) or "Message" not in sns:
+                sns = {
+                    "Message": record["body"],
+                    "TopicArn": record["eventSourceARN"],
+                }
+
+            snsRecord = {
+                "EventSource": "aws:sqs",
+                "itemIdentifier": record["messageId"],
+                "Sns": sns,
+            }
+            # a record from the deferred queue, still to be posted to these channels
+            channels = record.get("messageAttributes", {}).get(DEFERRED_CHANNELS_ATTRIBUTE, {}).get("stringValue")
+            if channels:
+                snsRecord["channels"] = channels.split(",")
 
-    else:
-        parsedMsg = {
-            "action": AwsAction.UNKNOWN.value,
-        }
+            snsRecords.append(snsRecord)
+        else:
+            snsRecords.append(
+                {
+                    **record,
+                    "itemIdentifier": record["Sns"].get("MessageId"),
+                }
+            )
 
-    metricType = parsedMsg["action"]
-    metrics.add_metric(name=f"{metricType}", unit=MetricUnit.Count, value=1)
+    return snsRecords
 
-    return AwsParsedMessage(
-        parsed=parsedMsg, original=message, actionType=parsedMsg["action"]
-    )
+
+def get_batch_response(event: Dict[str, Any], failed_records: List[str]) -> Dict[str, Any]:
+    """
+    Build the lambda response for the records that failed to deliver
+
+    SQS supports partial batch responses, so only the failed records are returned to the
+    queue. SNS does not; any failure must fail the whole invocation for SNS to retry.
+
+    :params event: the lambda event
+    :params failed_records: the "itemIdentifier" of each record that failed
+    :returns: lambda response
+    """
+    records = event.get("Records", [])
+    if records and records[0].get("eventSource") == "aws:sqs":
+        return {"batchItemFailures": [{"itemIdentifier": itemIdentifier} for itemIdentifier in failed_records]}
+
+    if failed_records:
+        raise Exception("Failed to process all SNS records")
+
+    return {}
+
+
+def prefetch_account_names(snsRecords: List[Dict[str, Any]]) -> None:
+    """
+    Start loading the account names of the whole batch, while the records are parsed
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    """
+    ACCOUNT_ID_TO_NAME.prefetch([a for record in snsRecords for a in get_referenced_account_ids(record)])
 
 
 def parse_sns(
-    snsRecords: Union[str, Dict],
+    snsRecords: List[Dict[str, Any]],
     vendor_send_to_function: Callable,
     renderer: Render,
     rendererSuccessCode: int,
-) -> bool:
-    is_no_error = True
+    channel: Optional[str] = None,
+) -> List[str]:
+    """
+    Parse and render each SNS record, then deliver the rendered posts to the vendor
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :params vendor_send_to_function: function posting the encoded body to the vendor
+    :params renderer: vendor specific render
+    :params rendererSuccessCode: HTTP status code returned by the vendor on success
+    :params channel: the name of the delivery channel, if the posts delivered are to be
+                     remembered so retried records skip them
+    :returns: the "itemIdentifier" of each record that failed
+    """
+    deliveries: List[Delivery] = []
 
     logger.debug("Number of SNS records", num_records=len(snsRecords))
 
+    if channel is not None:
+        delivered = get_delivered_records(snsRecords, channels=[channel])[channel]
+        snsRecords = [r for r in snsRecords if r["itemIdentifier"] not in delivered]
+
+    parsedRecords, failed_records = parse_sns_records(snsRecords)
+
+    for record, parsedMessage in parsedRecords:
+        try:
+            deliveries.append(render_parsed_record(record=record, parsedMessage=parsedMessage, renderer=renderer))
+        except Exception as e:
+            logger.exception(f"Failed to process SNS record: {e}", record=record)
+            failed_records += [record["itemIdentifier"]] + parsedMessage.digested
+
+    results = deliver(
+        deliveries=deliveries,
+        vendor_send_to_function=vendor_send_to_function,
+        rendererSuccessCode=rendererSuccessCode,
+        probe=is_drained(snsRecords),
+    )
+    add_delivery_metrics(deliveries, channel=channel or "unknown")
+
+    accepted: List[str] = []
+    undelivered: List[str] = []
+    for delivery, is_delivered in zip(deliveries, results):
+        if is_delivered:
+            accepted += [delivery.itemIdentifier] + delivery.digested
+        else:
+            undelivered += [delivery.itemIdentifier] + delivery.digested
+
+    if channel is not None:
+        mark_delivered_records(snsRecords, channel=channel, itemIdentifiers=accepted)
+        deferred = defer_undelivered_records(snsRecords, undelivered={channel: undelivered})
+        undelivered = [i for i in undelivered if i not in deferred]
+
+    return failed_records + undelivered
+
+
+def is_drained(snsRecords: List[Dict[str, Any]]) -> bool:
+    """
+    The records drained from the deferred queue are posted behind a single probe, so a
+    webhook still failing is not flooded by them
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :returns: True if the records were received from the deferred queue
+    """
+    return any("channels" in record for record in snsRecords)
+
+
+def defer_undelivered_records(snsRecords: List[Dict[str, Any]], undelivered: Dict[str, List[str]]) -> List[str]:
+    """
+    Defer the records left undelivered only by channels whose circuit is open, rather
+    than fail them
+
+    A record any channel failed to deliver with its circuit closed is failed as usual,
+    as are the records already received from the deferred queue.
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :params undelivered: the "itemIdentifier" of each channel's undelivered records
+    :returns: the "itemIdentifier" of each record deferred
+    """
+    if not deferred_queue.enabled:
+        return []
+
+    open_channels = [c for c in undelivered if webhook_breakers.is_open(c)]
+    if not open_channels:
+        return []
+
+    failed_by: Dict[str, List[str]] = {}
+    for channel, itemIdentifiers in undelivered.items():
+        for itemIdentifier in itemIdentifiers:
+            failed_by.setdefault(itemIdentifier, []).append(channel)
+
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for record in snsRecords:
+        failed = failed_by.get(record["itemIdentifier"])
+        if not failed or "channels" in record:
+            continue
+        if all(channel in open_channels for channel in failed):
+            groups.setdefault(tuple(failed), []).append(record)
+
+    deferred: List[str] = []
+    for group, records in groups.items():
+        deferred += deferred_queue.defer(
+            records,
+            channels=list(group),
+            delay=max(webhook_breakers.retry_after(c) for c in group),
+        )
+
+    if deferred:
+        logger.info("Deferred records while the circuit is open", deferred=deferred)
+        metrics.add_metric(name="DeferredRecords", unit=MetricUnit.Count, value=len(deferred))
+
+    return deferred
+
+
+def get_delivered_records(snsRecords: List[Dict[str, Any]], channels: List[str]) -> Dict[str, List[str]]:
+    """
+    Get the records an earlier invocation already delivered to each channel
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :params channels: the names of the delivery channels
+    :returns: the "itemIdentifier" of the records delivered, for each channel
+    """
+    delivered: Dict[str, List[str]] = {channel: [] for channel in channels}
+    if not delivery_ledger.enabled:
+        return delivered
+
+    keys = {
+        (channel, record["itemIdentifier"]): delivery_key(channel, record)
+        for channel in channels
+        for record in snsRecords
+    }
+    found = delivery_ledger.delivered(list(keys.values()))
+    for (channel, itemIdentifier), key in keys.items():
+        if key in found:
+            delivered[channel].append(itemIdentifier)
+
+    skipped = sum(len(itemIdentifiers) for itemIdentifiers in delivered.values())
+    if skipped:
+        logger.info("Skipping records already delivered", delivered=delivered)
+        metrics.add_metric(name="DuplicateDeliveriesSkipped", unit=MetricUnit.Count, value=skipped)
+
+    return delivered
+
+
+def mark_delivered_records(snsRecords: List[Dict[str, Any]], channel: str, itemIdentifiers: List[str]) -> None:
+    """
+    Remember the records the channel accepted, so their retries are not posted again
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :params channel: the name of the delivery channel
+    :params itemIdentifiers: the "itemIdentifier" of the records accepted
+    """
+    if not delivery_ledger.enabled:
+        return
+
+    accepted = set(itemIdentifiers)
+    delivery_ledger.mark_delivered(
+        [delivery_key(channel, record) for record in snsRecords if record["itemIdentifier"] in accepted]
+    )
+
+
+def parse_sns_records(
+    snsRecords: List[Dict[str, Any]],
+) -> Tuple[List[Tuple[Dict[str, Any], AwsParsedMessage]], List[str]]:
+    """
+    Parse the SNS records, suppress the flapping alarms, then digest any burst of
+    similar notifications
+
+    :params snsRecords: SNS records as returned by get_sns_records
+    :returns: each record to post with its parsed message, and the "itemIdentifier" of
+              each record that failed to parse
+    """
+    failed_records: List[str] = []
+    parsedRecords: List[Tuple[Dict[str, Any], AwsParsedMessage]] = []
+
+    prefetch_account_names(snsRecords)
+
     for record in snsRecords:
-        sns = record["Sns"]
-        subject = sns["Subject"]
-        message = sns["Message"]
-        region = sns["TopicArn"].split(":")[3]
-        messageAttributes = sns["MessageAttributes"]
+        try:
+            parsedRecords.append((record, parse_sns_record(record)))
+        except Exception as e:
+            logger.exception(f"Failed to process SNS record: {e}", record=record)
+            failed_records.append(record["itemIdentifier"])
+
+    return (
+        digest_parsed_records(suppress_flapping_alarms(parsedRecords)),
+        failed_records,
+    )
+
+
+def suppress_flapping_alarms(
+    parsedRecords: List[Tuple[Dict[str, Any], AwsParsedMessage]],
+) -> List[Tuple[Dict[str, Any], AwsParsedMessage]]:
+    """
+    Drop the transitions of flapping alarms, and the earlier transitions of any alarm
+    changing state several times within the batch
+
+    The dropped records have been handled, so are neither posted nor failed; the count of
+    transitions dropped since the alarm was last posted is shown on its next post.
+
+    :params parsedRecords: each record with its parsed message, in the order received
+    :returns: each record to post with its parsed message
+    """
+    posts: List[Tuple[Dict[str, Any], AwsParsedMessage]] = []
+    for idx, flaps in flap_suppressor.filter([p.parsedMsg for _, p in parsedRecords]):
+        record, parsedMessage = parsedRecords[idx]
+        if flaps:
+            parsedMessage.document.fields.append(Field("Suppressed Changes", code(str(flaps))))
+        posts.append((record, parsedMessage))
+
+    suppressed = len(parsedRecords) - len(posts)
+    if suppressed:
+        metrics.add_metric(name="SuppressedTransitions", unit=MetricUnit.Count, value=suppressed)
+
+    return posts
+
+
+def digest_parsed_records(
+    parsedRecords: List[Tuple[Dict[str, Any], AwsParsedMessage]],
+) -> List[Tuple[Dict[str, Any], AwsParsedMessage]]:
+    """
+    Replace each burst of similar notifications with a single digest
+
+    A digest is posted as its first record; the other records it summarises are
+    delivered, or failed, with it.
+
+    :params parsedRecords: each record with its parsed message, in the order received
+    :returns: each record to post with its parsed message
+    """
+    posts: List[Tuple[Dict[str, Any], AwsParsedMessage]] = []
+    for indexes in digester.group([p.parsedMsg for _, p in parsedRecords]):
+        if len(indexes) == 1:
+            posts.append(parsedRecords[indexes[0]])
+            continue
+
+        records = [parsedRecords[idx][0] for idx in indexes]
+        messages = [parsedRecords[idx][1] for idx in indexes]
+        first = messages[0].parsedMsg
+        document = digester.document(
+            parsedMessages=[m.parsedMsg for m in messages],
+            documents=[m.document for m in messages],
+            console_url=get_console_url(first),
+        )
+        metrics.add_metric(name="Digests", unit=MetricUnit.Count, value=1)
+        metrics.add_metric(name="DigestedRecords", unit=MetricUnit.Count, value=len(records))
+        posts.append(
+            (
+                records[0],
+                AwsParsedMessage(
+                    parsed={
+                        "action": "Digest",
+                        "digest_action": first["action"],
+                        "account_id": first.get("account_id"),
+                        "priority": first.get("priority"),
+                        "count": len(records),
+                    },
+                    original=messages[0].originalMsg,
+                    actionType="Digest",
+                    document=document,
+                    digested=[r["itemIdentifier"] for r in records[1:]],
+                ),
+            )
+        )
 
+    return posts
+
+
+def render_sns_record(record: Dict[str, Any], renderer: Render) -> Delivery:
+    """
+    Parse and render a single SNS record
+
+    :params record: SNS record
+    :params renderer: vendor specific render
+    :returns: the rendered record ready for delivery
+    """
+    return render_parsed_record(record=record, parsedMessage=parse_sns_record(record), renderer=renderer)
+
+
+def parse_sns_record(record: Dict[str, Any]) -> AwsParsedMessage:
+    """
+    Parse a single SNS record into facts
+
+    :params record: SNS record
+    :returns: the parsed message
+    """
+    sns = record["Sns"]
+    # subject and attributes are optional when the record has been buffered through SQS
+    subject = sns.get("Subject")
+    message = sns["Message"]
+    region = sns["TopicArn"].split(":")[3]
+    messageAttributes = sns.get("MessageAttributes", {})
+
+    timer = stage_metrics.timer()
+    with stage_metrics.timing(timer):
         parserResults = get_message_payload(
             message=message,
             region=region,
             messageAttributes=messageAttributes,
             subject=subject,
         )
+    if timer is not None:
+        parserResults.timings = timer.elapsed
 
-        if parserResults.actionType == AwsAction.UNKNOWN.value:
-            logger.warning(
-                "Unexpected event type",
-                record=record,
-            )
-
-        payload = renderer.payload(
-            parsedMessage=parserResults.parsedMsg,
-            originalMessage=parserResults.originalMsg,
-            subject=subject,
+    if parserResults.actionType == AwsAction.UNKNOWN.value:
+        logger.warning(
+            "Unexpected event type",
+            record=record,
         )
-        response = vendor_send_to_function(payload=payload)
-
-        response_code = json.loads(response)["code"]
-        if response_code != rendererSuccessCode:
-            is_no_error = False
-            response_info = json.loads(response)["info"]
-            logger.error(
-                "Unexpected vendor response",
-                code={"expected": rendererSuccessCode, "received": response_code},
-                info=response_info,
-                record=record,
-            )
 
-    return is_no_error
+    return parserResults
+
+
+def render_parsed_record(record: Dict[str, Any], parsedMessage: AwsParsedMessage, renderer: Render) -> Delivery:
+    """
+    Render the facts of a parsed SNS record for a vendor
+
+    :params record: SNS record
+    :params parsedMessage: the parsed message of the record
+    :params renderer: vendor specific render
+    :returns: the rendered record ready for delivery
+    """
+
+    timer = stage_metrics.timer()
+    with stage_metrics.timing(timer), stage("render"):
+        body = renderer.body(document=parsedMessage.document)
+
+    return Delivery(
+        itemIdentifier=record["itemIdentifier"],
+        orderingKey=get_ordering_key(
+            parsedMessage=parsedMessage.parsedMsg,
+            itemIdentifier=record["itemIdentifier"],
+        ),
+        body=body,
+        digested=parsedMessage.digested,
+        record=record,
+        action=parsedMessage.actionType,
+        timings={**parsedMessage.timings, **(timer.elapsed if timer else {})},
+    )
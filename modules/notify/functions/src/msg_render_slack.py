@@ -1,13 +1,13 @@
-import json
+import copy
 from enum import Enum
-from typing import Any, Dict, Optional, Self, Union
+from typing import Any, Dict, List, Optional, Self
 
 from aws_lambda_powertools import Logger
 
 logger = Logger()
 
-from notification_emblems import __ATTENTION_URL__, __WARNING_URL__
-from render import Render
+from notification_document import Field, FieldLayout, NotificationDocument
+from render import PayloadBudget, Render
 
 """
 Using Slack legacy webhook posts format: https://api.slack.com/reference/messaging/attachments.
@@ -17,6 +17,12 @@ With legacy format, continuing to use attachment colour bar.
 """
 
 
+# Slack truncates or rejects posts beyond ~40k characters of text; the room kept for the
+#  summary of the fields left out
+SLACK_TEXT_LIMIT = 40000
+SLACK_TRUNCATION_RESERVE = 256
+
+
 class SlackPriorityColor(Enum):
     """Maps Aws  notification state to Slack message format color"""
 
@@ -31,6 +37,127 @@ class SlackPriorityColor(Enum):
     CRITICAL = "danger"
 
 
+class SlackStyle(Enum):
+    """The attachments a notification type is posted as"""
+
+    # an attachment of the icon and title, then one of the text and fields
+    TITLED = "titled"
+    # a single attachment of the title, text and fields
+    SINGLE = "single"
+    # an attachment of the icon and title, then the text as a markdown field
+    NOTE = "note"
+    # a single attachment listing the fields of an unrecognised message
+    PLAIN = "plain"
+
+
+class SlackLayout:
+    """How a notification type is laid out in Slack"""
+
+    style: SlackStyle
+    fields: List[FieldLayout]
+
+    def __init__(self, style: SlackStyle, fields: Optional[List[FieldLayout]] = None):
+        self.style = style
+        self.fields = fields or []
+
+
+SLACK_LAYOUTS: Dict[str, SlackLayout] = {
+    "CloudWatch": SlackLayout(
+        SlackStyle.TITLED,
+        [
+            FieldLayout("When", "`{at}`", short=False),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account ID", "`{account_id}`"),
+            FieldLayout("Region", "`{alarm_arn_region}`"),
+            FieldLayout("Region Locale", "`{region}`"),
+            FieldLayout("Alarm reason", "{reason}", short=False),
+            FieldLayout("Current State", "`{state}`"),
+            FieldLayout("Old State", "`{old_state}`"),
+        ],
+    ),
+    "GuardDuty": SlackLayout(
+        SlackStyle.TITLED,
+        [
+            FieldLayout("Finding Type", "`{type}`", short=False),
+            FieldLayout("First Seen", "`{first_seen}`"),
+            FieldLayout("Last Seen", "`{last_seen}`"),
+            FieldLayout("Severity/Score", "`{severity}/{severity_score}`"),
+            FieldLayout("Count", "`{count}`"),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account ID", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+        ],
+    ),
+    "Health": SlackLayout(
+        SlackStyle.TITLED,
+        [
+            FieldLayout("Affected Service", "`{service}`"),
+            FieldLayout("Category", "`{category}`"),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Start Time", "`{start_time}`"),
+            FieldLayout("End Time", "`{end_time}`"),
+            FieldLayout("Code", "`{code}`", short=False),
+            FieldLayout("Region", "`{region}`", short=False),
+            FieldLayout("Affected Resources", "{resources}", short=False),
+        ],
+    ),
+    "Backup": SlackLayout(
+        SlackStyle.TITLED,
+        [
+            FieldLayout("Backup Id", "`{backup_id}`", short=False),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Status", "`{status}`"),
+            FieldLayout("Priority", "`{priority}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Start Time", "`{start_time}`"),
+        ],
+    ),
+    "SecurityHub": SlackLayout(
+        SlackStyle.TITLED,
+        [
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account ID", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Severity", "`{severity}`"),
+            FieldLayout("Provider", "`{ruleProvider} v{providerVersion}`"),
+            FieldLayout("Category", "`{providerCategory}`"),
+            FieldLayout("Rule Id", "`{ruleId}`", short=False),
+        ],
+    ),
+    "Budget": SlackLayout(SlackStyle.NOTE),
+    "SavingsPlan": SlackLayout(SlackStyle.NOTE),
+    "DMS": SlackLayout(
+        SlackStyle.SINGLE,
+        [
+            FieldLayout("When", "`{at}`"),
+            FieldLayout("When (Epoch)", "`{at_epoch}`"),
+            FieldLayout("Source", "`{source}`"),
+            FieldLayout("Source ID", "`{source_id}`"),
+        ],
+    ),
+    "CostAnomaly": SlackLayout(
+        SlackStyle.TITLED,
+        [
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account ID", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Service", "`{service}`"),
+            FieldLayout("Started At", "`{started}`"),
+            FieldLayout("Ended At", "`{ended}`"),
+            FieldLayout("Expended Spend ($)", "`{expected_spend}`"),
+            FieldLayout("Actual Spend ($)", "`{actual_spend}`"),
+            FieldLayout("Impact", "`{total_impact}`"),
+            FieldLayout("ID", "`{anomaly_id}`", short=False),
+        ],
+    ),
+    "Unknown": SlackLayout(SlackStyle.PLAIN),
+}
+# The layout of the notifications without their own, e.g. a digest
+DEFAULT_LAYOUT = SlackLayout(SlackStyle.TITLED)
+
+
 class SlackRender(Render):
     """
     Render for slack payload
@@ -39,729 +166,191 @@ class SlackRender(Render):
     def __init__(self: Self):
         super(SlackRender, self).__init__()
 
-    def __format_cloudwatch_alarm(self: Self, alarm: Dict[str, Any]) -> Dict[str, Any]:
-        """Format CloudWatch alarm facts into Slack message format
+    def __format_field(self: Self, field: Field) -> Dict[str, Any]:
+        """Format a field into a Slack attachment field
 
-        :params message: CloudWatch facts
-        :returns: formatted Slack message payload
-        """
-        imageIconItems = []
-        if alarm["priority"] == "ERROR":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[alarm["priority"]].value,
-                    "image_url": __ATTENTION_URL__,
-                    "title": f"CloudWatch: {alarm['name']}",
-                    "title_link": f"{alarm['url']}",
-                }
-            )
-        elif alarm["priority"] == "WARNING":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[alarm["priority"]].value,
-                    "image_url": __WARNING_URL__,
-                    "title": f"CloudWatch: {alarm['name']}",
-                    "title_link": f"{alarm['url']}",
-                }
-            )
-        else:
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[alarm["priority"]].value,
-                    "title": f"CloudWatch: {alarm['name']}",
-                    "title_link": f"{alarm['url']}",
-                }
-            )
-
-        return imageIconItems + [
-            {
-                "color": SlackPriorityColor[alarm["priority"]].value,
-                "fallback": "Alarm %s triggered" % (alarm["name"]),
-                "text": f"{alarm['description']}",
-                "ts": alarm["at_epoch"],
-                "fields": [
-                    {
-                        "title": "When",
-                        "value": f"`{alarm['at']}`",
-                        "short": False,
-                    },
-                    {
-                        "title": "Account Name",
-                        "value": f"`{alarm['account_name']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account ID",
-                        "value": f"`{alarm['account_id']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Region",
-                        "value": f"`{alarm['alarm_arn_region']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Region Locale",
-                        "value": f"`{alarm['region']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Alarm reason",
-                        "value": f"{alarm['reason']}",
-                        "short": False,
-                    },
-                    {
-                        "title": "Current State",
-                        "value": f"`{alarm['state']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Old State",
-                        "value": f"`{alarm['old_state']}`",
-                        "short": True,
-                    },
-                ],
-            }
-        ]
-
-    def __format_guard_duty_finding(
-        self: Self, finding: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format GuardDuty alarm facts into Slack message format
-
-        :params message: GuardDuty facts
-        :returns: formatted Slack message payload
-        """
-        imageIconItems = []
-        if finding["priority"] == "HIGH":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[finding["priority"]].value,
-                    "image_url": __ATTENTION_URL__,
-                    "title": f"GuardDuty: {finding['title']}",
-                    "title_link": f"{finding['url']}#/findings?search=id%3D{finding['id']}",
-                }
-            )
-        elif finding["priority"] == "MEDIUM":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[finding["priority"]].value,
-                    "image_url": __WARNING_URL__,
-                    "title": f"GuardDuty: {finding['title']}",
-                    "title_link": f"{finding['url']}#/findings?search=id%3D{finding['id']}",
-                }
-            )
-        else:
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[finding["priority"]].value,
-                    "title": f"GuardDuty: {finding['title']}",
-                    "title_link": f"{finding['url']}#/findings?search=id%3D{finding['id']}",
-                }
-            )
-
-        return imageIconItems + [
-            {
-                "color": SlackPriorityColor[finding["priority"]].value,
-                "fallback": f"GuardDuty Finding: {finding['title']}",
-                "text": f"{finding['description']}",
-                "ts": finding["at_epoch"],
-                "fields": [
-                    {
-                        "title": "Finding Type",
-                        "value": f"`{finding['type']}`",
-                        "short": False,
-                    },
-                    {
-                        "title": "First Seen",
-                        "value": f"`{finding['first_seen']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Last Seen",
-                        "value": f"`{finding['last_seen']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Severity/Score",
-                        "value": f"`{finding['severity']}/{finding['severity_score']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Count",
-                        "value": f"`{finding['count']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account Name",
-                        "value": f"`{finding['account_name']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account ID",
-                        "value": f"`{finding['account_id']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Region",
-                        "value": f"`{finding['region']}`",
-                        "short": True,
-                    },
-                ],
-            }
-        ]
-
-    def __format_health_check_alert(
-        self: Self, alert: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format AWS Healthcheck facts into Slack message format
-
-        :params message: HealthCheck facts
-        :returns: formatted Slack message payload
-        """
-        imageIconItems = []
-        if alert["priority"] == "HIGH":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[alert["priority"]].value,
-                    "image_url": __ATTENTION_URL__,
-                    "title": f"AWS Health: {alert['service']}",
-                    "title_link": f"{alert['url']}",
-                }
-            )
-        elif alert["priority"] == "MEDIUM":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[alert["priority"]].value,
-                    "image_url": __WARNING_URL__,
-                    "title": f"AWS Health: {alert['service']}",
-                    "title_link": f"{alert['url']}",
-                }
-            )
-        else:
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[alert["priority"]].value,
-                    "title": f"AWS Health: {alert['service']}",
-                    "title_link": f"{alert['url']}",
-                }
-            )
-
-        return imageIconItems + [
-            {
-                "color": SlackPriorityColor[alert["priority"]].value,
-                "fallback": f"New AWS Health Event for {alert['service']}",
-                "text": f"{alert['description']}",
-                "ts": alert["at_epoch"],
-                "fields": [
-                    {
-                        "title": "Affected Service",
-                        "value": f"`{alert['service']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Category",
-                        "value": f"`{alert['category']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account Name",
-                        "value": f"`{alert['account_name']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account Id",
-                        "value": f"`{alert['account_id']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Start Time",
-                        "value": f"`{alert['start_time']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "End Time",
-                        "value": f"`{alert['end_time']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Code",
-                        "value": f"`{alert['code']}`",
-                        "short": False,
-                    },
-                    {
-                        "title": "Region",
-                        "value": f"`{alert['region']}`",
-                        "short": False,
-                    },
-                    {
-                        "title": "Affected Resources",
-                        "value": f"{alert['resources']}",
-                        "short": False,
-                    },
-                ],
-            }
-        ]
-
-    def __format_backup_status(self: Self, status: Dict[str, Any]) -> Dict[str, Any]:
-        """Format AWS Backup facts into teams message format
-
-        :params finding: Backup facts
-        :returns: formatted teams message payload
-        """
-        imageIconItems = []
-        if status["priority"] == "ERROR":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[status["priority"]].value,
-                    "image_url": __ATTENTION_URL__,
-                    "title": f"Backup : {status['backup_id']}",
-                    # "title_link": f"{status['url']}",
-                }
-            )
-        elif status["priority"] == "WARNING":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[status["priority"]].value,
-                    "image_url": __WARNING_URL__,
-                    "title": f"Backup : {status['backup_id']}",
-                    # "title_link": f"{status['url']}",
-                }
-            )
-        else:
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[status["priority"]].value,
-                    "title": f"Backup : {status['backup_id']}",
-                    # "title_link": f"{status['url']}",
-                }
-            )
-
-        fields: list[Dict[str, Any]] = []
-        backup_fields = status["backup_fields"]
-        for k, v in backup_fields.items():
-            fields.append(
-                {
-                    "title": k,
-                    "value": f"`{v}`",
-                    "short": False,
-                }
-            )
-
-        return imageIconItems + [
-            {
-                "color": SlackPriorityColor[status["priority"]].value,
-                "fallback": f"Backup event for {status['backup_id']}",
-                "text": f"{status['description']}",
-                # "ts": alert['at_epoch'],
-                "fields": [
-                    {
-                        "title": "Backup Id",
-                        "value": f"`{status['backup_id']}`",
-                        "short": False,
-                    },
-                    {
-                        "title": "Account Name",
-                        "value": f"`{status['account_name']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account Id",
-                        "value": f"`{status['account_id']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Status",
-                        "value": f"`{status['status']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Priority",
-                        "value": f"`{status['priority']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Region",
-                        "value": f"`{status['region']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Start Time",
-                        "value": f"`{status['start_time']}`",
-                        "short": True,
-                    },
-                ]
-                + fields,
-            }
-        ]
-
-    def __format_security_hub_status(
-        self: Self, finding: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format Security Hub finding  facts into Slack message format
-
-        :params finding: Security Hub facts
-        :returns: formatted Slack message payload
+        :params field: the field
+        :returns: Slack attachment field
         """
-        imageIconItems = []
-        if finding["priority"] == "CRITICAL" or finding["priority"] == "HIGH":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[finding["priority"]].value,
-                    "image_url": __ATTENTION_URL__,
-                    "title": f"Security Hub: {finding['source']}",
-                    "title_link": f"{finding['url']}",
-                }
-            )
-        elif finding["priority"] == "MEDIUM":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[finding["priority"]].value,
-                    "image_url": __WARNING_URL__,
-                    "title": f"Security Hub: {finding['source']}",
-                    "title_link": f"{finding['url']}",
-                }
-            )
-        else:
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[finding["priority"]].value,
-                    "title": f"Security Hub: {finding['source']}",
-                    "title_link": f"{finding['url']}",
-                }
-            )
-
-        resourcesField: list[Dict[str, Any]] = []
-        idx = 1
-        for resource in finding["resources"]:
-            resourceId = resource["id"]
-            resourceType = resource["type"]
-            resourcesField.append(
-                {
-                    "title": f"Type {idx}",
-                    "value": f"`{resourceType}`",
-                    "short": True,
-                }
-            )
-            resourcesField.append(
-                {
-                    "title": f"Arn {idx}",
-                    "value": f"`{resourceId}`",
-                    "short": False,
-                }
-            )
-            idx += 1
-
-        return imageIconItems + [
-            {
-                "color": SlackPriorityColor[finding["priority"]].value,
-                "fallback": "Security Hub finding %s triggered" % (finding["source"]),
-                "text": f"{finding['description']}",
-                # "ts": alarm['at_epoch'],
-                "fields": [
-                    {
-                        "title": "Account Name",
-                        "value": f"`{finding['account_name']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account ID",
-                        "value": f"`{finding['account_id']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Region",
-                        "value": f"`{finding['region']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Severity",
-                        "value": f"`{finding['severity']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Provider",
-                        "value": f"`{finding['ruleProvider']} v{finding['providerVersion']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Category",
-                        "value": f"`{finding['providerCategory']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Rule Id",
-                        "value": f"`{finding['ruleId']}`",
-                        "short": False,
-                    },
-                ]
-                + resourcesField,
-            }
-        ]
-
-    def __format_budget_alert(self: Self, alarm: Dict[str, Any]) -> Dict[str, Any]:
-        """Format Budget alarm facts into Slack message format
-
-        :params message: Budget facts
-        :returns: formatted Slack message payload
+        if field.title is None:
+            return {"value": field.value, "short": field.short}
+
+        return {"title": field.title, "value": field.value, "short": field.short}
+
+    def __fit_text(self: Self, document: NotificationDocument, budget: PayloadBudget) -> NotificationDocument:
+        """Spend the text budget on the title, fallback and text, cutting each short to the
+        room left
+
+        :params document: notification document
+        :params budget: the text budget
+        :returns: the document, or a copy with its text cut short
         """
-        return [
-            {
-                "color": SlackPriorityColor.HIGH.value,
-                "image_url": __WARNING_URL__,
-                "title": f"Budget: {alarm['subject']}",
-            },
-            {
-                "color": SlackPriorityColor.HIGH.value,
-                "fallback": "Budget %s triggered" % (alarm["subject"]),
-                "mrkdwn_in": ["value"],
-                "fields": [
-                    {
-                        "value": f"{alarm['info']}",
-                        "short": False,
-                    }
-                ],
-            },
-        ]
-
-    def __format_savings_plan_alert(
-        self: Self, alarm: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format Savings Plan alarm facts into Slack message format
-
-        :params message: Savings Plans facts
-        :returns: formatted Slack message payload
+        title = budget.shorten(document.title)
+        fallback = budget.shorten(document.fallback)
+        text = None if document.text is None else budget.shorten(document.text)
+        if (title, fallback, text) == (document.title, document.fallback, document.text):
+            return document
+
+        document = copy.copy(document)
+        document.title, document.fallback, document.text = title, fallback, text
+        return document
+
+    def __format_fields(
+        self: Self, document: NotificationDocument, layout: SlackLayout, budget: PayloadBudget
+    ) -> List[Dict[str, Any]]:
+        """Format the fields of the layout, the listed fields, then the resources, into
+        Slack attachment fields
+
+        The field which does not fit the text budget is cut short, and those after it
+        are summarised instead.
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the text budget left
+        :returns: Slack attachment fields
         """
-        return [
-            {
-                "color": SlackPriorityColor.HIGH.value,
-                "image_url": __WARNING_URL__,
-                "title": f"Savings Plan: {alarm['subject']}",
-            },
-            {
-                "color": SlackPriorityColor.HIGH.value,
-                "fallback": "Savings Plan %s triggered" % (alarm["subject"]),
-                "mrkdwn_in": ["value"],
-                "fields": [
-                    {
-                        "value": f"{alarm['info']}",
-                        "short": False,
-                    }
-                ],
-            },
-        ]
-
-    def __format_DMS_notification(self: Self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """Format DMS notification facts into Slack message format
-
-        :params message: DMS notificatoin facts
-        :returns: formatted Slack message payload
+        fields: List[Dict[str, Any]] = []
+        for isResource, entry in document.entries(layout.fields):
+            if budget.fit(sum(len(field.title or "") + len(field.value) for field in entry)):
+                fields += [self.__format_field(field) for field in entry]
+                continue
+
+            # a resource is never split, so is left out whole
+            value = None if isResource else budget.cut(entry[0].value, overhead=len(entry[0].title or ""))
+            if value is not None:
+                fields.append(self.__format_field(Field(entry[0].title, value, short=entry[0].short)))
+            break
+
+        summary = document.truncation(layout.fields, budget.entries)
+        if summary is not None:
+            fields.append(self.__format_field(summary))
+
+        return fields
+
+    def __format_titled(
+        self: Self, document: NotificationDocument, layout: SlackLayout, budget: PayloadBudget
+    ) -> List[Dict[str, Any]]:
+        """Format the icon and title attachment, then the text and fields attachment
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the text budget left
+        :returns: Slack attachments
         """
-        return [
-            {
-                "color": SlackPriorityColor.WARNING.value,
-                "fallback": "DMS Notification %s triggered" % (event["title"]),
-                "title": f"DMS Notification: {event['title']}",
-                "title_link": f"{event['url']}",
-                "text": f"{event['documentation']}",
-                "ts": event["at_epoch"],
-                "fields": [
-                    {
-                        "title": "When",
-                        "value": f"`{event['at']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "When (Epoch)",
-                        "value": f"`{event['at_epoch']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Source",
-                        "value": f"`{event['source']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Source ID",
-                        "value": f"`{event['source_id']}`",
-                        "short": True,
-                    },
-                ],
-            }
-        ]
-
-    def __format_cost_anomaly(self: Self, anomaly: Dict[str, Any]) -> Dict[str, Any]:
-        """Format Costing Anomaly facts into slack message format
-
-        :params anomaly: cost anomaly facts
-        :returns: formatted slack message payload
+        titleItem: Dict[str, Any] = {}
+        factsItem: Dict[str, Any] = {}
+        if document.priority is not None:
+            titleItem["color"] = factsItem["color"] = SlackPriorityColor[document.priority].value
+        if document.emblem is not None:
+            titleItem["image_url"] = document.emblem
+        titleItem["title"] = document.title
+        if document.link is not None:
+            titleItem["title_link"] = document.link.url
+
+        factsItem["fallback"] = document.fallback
+        if document.text is not None:
+            factsItem["text"] = document.text
+        if document.timestamp is not None:
+            factsItem["ts"] = document.timestamp
+        factsItem["fields"] = self.__format_fields(document=document, layout=layout, budget=budget)
+
+        return [titleItem, factsItem]
+
+    def __format_single(
+        self: Self, document: NotificationDocument, layout: SlackLayout, budget: PayloadBudget
+    ) -> List[Dict[str, Any]]:
+        """Format the title, text and fields into a single attachment
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the text budget left
+        :returns: Slack attachments
         """
-        imageIconItems = []
-        if anomaly["priority"] == "ERROR":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[anomaly["priority"]].value,
-                    "image_url": __ATTENTION_URL__,
-                    "title": f"Cost Anomaly: {anomaly['usage']}",
-                    "title_link": f"{anomaly['url']}",
-                }
-            )
-        elif anomaly["priority"] == "WARNING":
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[anomaly["priority"]].value,
-                    "image_url": __WARNING_URL__,
-                    "title": f"Cost Anomaly: {anomaly['usage']}",
-                    "title_link": f"{anomaly['url']}",
-                }
-            )
-        else:
-            imageIconItems.append(
-                {
-                    "color": SlackPriorityColor[anomaly["priority"]].value,
-                    "title": f"Cost Anomaly: {anomaly['usage']}",
-                    "title_link": f"{anomaly['url']}",
-                }
-            )
-
-        return imageIconItems + [
-            {
-                "color": SlackPriorityColor[anomaly["priority"]].value,
-                "fallback": "Cost Anomaly:  %s triggered" % (anomaly["usage"]),
-                "text": f"{anomaly['monitor_name']}",
-                # "ts": alarm['at_epoch'],
-                "fields": [
-                    {
-                        "title": "Account Name",
-                        "value": f"`{anomaly['account_name']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Account ID",
-                        "value": f"`{anomaly['account_id']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Region",
-                        "value": f"`{anomaly['region']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Service",
-                        "value": f"`{anomaly['service']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Started At",
-                        "value": f"`{anomaly['started']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Ended At",
-                        "value": f"`{anomaly['ended']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Expended Spend ($)",
-                        "value": f"`{anomaly['expected_spend']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Actual Spend ($)",
-                        "value": f"`{anomaly['actual_spend']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "Impact",
-                        "value": f"`{anomaly['total_impact']}`",
-                        "short": True,
-                    },
-                    {
-                        "title": "ID",
-                        "value": f"`{anomaly['anomaly_id']}`",
-                        "short": False,
-                    },
-                ],
-            }
-        ]
-
-    def __format_default(
-        self: Self, message: Union[str, Dict], subject: Optional[str] = None
-    ) -> Dict[str, Any]:
+        item: Dict[str, Any] = {}
+        if document.priority is not None:
+            item["color"] = SlackPriorityColor[document.priority].value
+        item["fallback"] = document.fallback
+        item["title"] = document.title
+        if document.link is not None:
+            item["title_link"] = document.link.url
+        if document.text is not None:
+            item["text"] = document.text
+        if document.timestamp is not None:
+            item["ts"] = document.timestamp
+        item["fields"] = self.__format_fields(document=document, layout=layout, budget=budget)
+
+        return [item]
+
+    def __format_note(
+        self: Self, document: NotificationDocument, layout: SlackLayout, budget: PayloadBudget
+    ) -> List[Dict[str, Any]]:
+        """Format the icon and title attachment, then the text as a markdown field
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the text budget left
+        :returns: Slack attachments
         """
-        Default formatter, converting event into Slack message format
-
-        :params message: SNS message body containing message/event
-        :returns: formatted Slack message payload
+        titleItem: Dict[str, Any] = {}
+        noteItem: Dict[str, Any] = {}
+        if document.priority is not None:
+            titleItem["color"] = noteItem["color"] = SlackPriorityColor[document.priority].value
+        if document.emblem is not None:
+            titleItem["image_url"] = document.emblem
+        titleItem["title"] = document.title
+
+        noteItem["fallback"] = document.fallback
+        noteItem["mrkdwn_in"] = ["value"]
+        noteItem["fields"] = [self.__format_field(Field(None, document.text or "", short=False))]
+        noteItem["fields"] += self.__format_fields(document=document, layout=layout, budget=budget)
+
+        return [titleItem, noteItem]
+
+    def __format_plain(
+        self: Self, document: NotificationDocument, layout: SlackLayout, budget: PayloadBudget
+    ) -> List[Dict[str, Any]]:
+        """Format the fields of an unrecognised message into a single attachment
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the text budget left
+        :returns: Slack attachments
         """
-
-        attachment = {
-            "fallback": "A new message",
-            "text": "AWS notification",
-            "title": subject if subject else "Message",
+        item: Dict[str, Any] = {
+            "fallback": document.fallback,
+            "text": document.text,
+            "title": document.title,
             "mrkdwn_in": ["value"],
         }
-        fields = []
-
-        if type(message) is dict:
-            for k, v in message.items():
-                value = f"{json.dumps(v)}" if isinstance(v, (dict, list)) else str(v)
-                fields.append(
-                    {"title": k, "value": f"`{value}`", "short": len(value) < 25}
-                )
-        else:
-            fields.append({"value": message, "short": False})
-
+        fields = self.__format_fields(document=document, layout=layout, budget=budget)
         if fields:
-            attachment["fields"] = fields  # type: ignore
+            item["fields"] = fields
 
-        return [attachment]
+        return [item]
 
-    def payload(
-        self: Self,
-        parsedMessage: Union[str, Dict],
-        originalMessage: Union[str, Dict],
-        subject: Optional[str] = None,
-    ) -> Dict:
+    def payload(self: Self, document: NotificationDocument) -> Dict:
         """
-        Given the parsed AWS message, format into Slack message payload
+        Given the notification document, format into Slack message payload
 
         Note - uses legacy attachments: https://api.slack.com/reference/messaging/attachments.
         Should migrate to newer "blocks".
 
-        :params parsedMessage: the parsed message with "action" detailing message type
+        :params document: notification document
         :returns: Slack message payload
         """
-
-        payload = {}
-
-        attachments = None
-        logger.debug("Successfully parsed SNS record", parsed=parsedMessage)
-        match (parsedMessage["action"]):
-            case "CloudWatch":
-                attachments = self.__format_cloudwatch_alarm(alarm=parsedMessage)
-            case "GuardDuty":
-                attachments = self.__format_guard_duty_finding(finding=parsedMessage)
-            case "Health":
-                attachments = self.__format_health_check_alert(alert=parsedMessage)
-            case "Backup":
-                attachments = self.__format_backup_status(status=parsedMessage)
-            case "SecurityHub":
-                attachments = self.__format_security_hub_status(finding=parsedMessage)
-            case "Budget":
-                attachments = self.__format_budget_alert(alarm=parsedMessage)
-            case "SavingsPlan":
-                attachments = self.__format_savings_plan_alert(alarm=parsedMessage)
-            case "DMS":
-                attachments = self.__format_DMS_notification(event=parsedMessage)
-            case "CostAnomaly":
-                attachments = self.__format_cost_anomaly(anomaly=parsedMessage)
-            case "Unknown":
-                attachments = self.__format_default(
-                    message=originalMessage, subject=subject
-                )
-
-        if attachments:
-            payload["attachments"] = attachments  # type: ignore
-
-        return payload
+        logger.debug("Rendering notification", action=document.action)
+
+        layout = SLACK_LAYOUTS.get(document.action, DEFAULT_LAYOUT)
+        budget = PayloadBudget(limit=SLACK_TEXT_LIMIT, reserve=SLACK_TRUNCATION_RESERVE)
+        document = self.__fit_text(document=document, budget=budget)
+        match (layout.style):
+            case SlackStyle.TITLED:
+                attachments = self.__format_titled(document=document, layout=layout, budget=budget)
+            case SlackStyle.SINGLE:
+                attachments = self.__format_single(document=document, layout=layout, budget=budget)
+            case SlackStyle.NOTE:
+                attachments = self.__format_note(document=document, layout=layout, budget=budget)
+            case SlackStyle.PLAIN:
+                attachments = self.__format_plain(document=document, layout=layout, budget=budget)
+
+        return {"attachments": attachments}
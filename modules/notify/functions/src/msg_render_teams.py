@@ -1,13 +1,23 @@
 import json
 from enum import Enum
-from typing import Any, Dict, Optional, Self, Union
+from typing import Dict, List, Optional, Self, Tuple, Union
 
 from aws_lambda_powertools import Logger
 
 logger = Logger()
 
+from notification_document import Field, FieldLayout, NotificationDocument, code
 from notification_emblems import __ATTENTION_URL__, __WARNING_URL__
-from render import Render
+from render import (
+    PayloadBudget,
+    PayloadTemplate,
+    Render,
+    clip,
+    encode_string,
+    encoded_size,
+    slot,
+    string_size,
+)
 
 """
 2024-Sept-03
@@ -17,6 +27,12 @@ You need a Microsoft account to use - it will store you card templates under you
 """
 
 
+# Teams rejects cards larger than ~28KB; the room kept for the summary of the facts
+#  left out
+TEAMS_PAYLOAD_LIMIT = 28000
+TEAMS_TRUNCATION_RESERVE = 512
+
+
 class TeamsPriorityColor(Enum):
     """Maps Aws  notification state to teams message format color"""
 
@@ -33,6 +49,219 @@ class TeamsPriorityColor(Enum):
     CRITICAL = "Attention"
 
 
+class TeamsStyle(Enum):
+    """The card a notification type is posted as"""
+
+    # the icon, title and blocks of facts, then the console link
+    CARD = "card"
+    # the icon, title and text as rich text
+    NOTE = "note"
+    # the title and facts of an unrecognised message
+    PLAIN = "plain"
+
+
+class Block(Enum):
+    """A block of the card laid out from the document"""
+
+    # the text of the notification, as inline code
+    TEXT = "text"
+    # the facts of the layout, the listed fields, and the resources without a block
+    FACTS = "facts"
+    # the resources, as numbered type and arn facts
+    RESOURCES = "resources"
+
+
+class TeamsLayout:
+    """How a notification type is laid out in Teams"""
+
+    style: TeamsStyle
+    title: Optional[str]
+    facts: List[FieldLayout]
+    blocks: List[Union[Block, str]]
+    color: Optional[str]
+    link_wrap: bool
+
+    def __init__(
+        self,
+        style: TeamsStyle,
+        title: Optional[str] = None,
+        facts: Optional[List[FieldLayout]] = None,
+        blocks: Optional[List[Union[Block, str]]] = None,
+        color: Optional[str] = None,
+        link_wrap: bool = True,
+    ):
+        self.style = style
+        # a format string over the facts of the document; the document title if None
+        self.title = title
+        self.facts = facts or []
+        # the blocks in order; a string is a TextBlock worded from the facts
+        self.blocks = blocks or [Block.TEXT, Block.FACTS]
+        # the title colour; the colour of the document icon if None
+        self.color = color
+        self.link_wrap = link_wrap
+
+
+TEAMS_LAYOUTS: Dict[str, TeamsLayout] = {
+    "CloudWatch": TeamsLayout(
+        TeamsStyle.CARD,
+        title="CloudWatch: `{name}`",
+        facts=[
+            FieldLayout("At", "`{at}`"),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Region", "`{alarm_arn_region}`"),
+            FieldLayout("Region Locale", "`{region}`"),
+            FieldLayout("New State", "`{state}`"),
+            FieldLayout("Old State", "`{old_state}`"),
+        ],
+        blocks=[Block.TEXT, Block.FACTS, "`{reason}`"],
+        link_wrap=False,
+    ),
+    "GuardDuty": TeamsLayout(
+        TeamsStyle.CARD,
+        title="`GuardDuty: {title}`",
+        facts=[
+            FieldLayout("ID", "`{id}`"),
+            FieldLayout("Severity/Score", "`{severity}/{severity_score}`"),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("First Seen", "`{first_seen}`"),
+            FieldLayout("Last Seen", "`{last_seen}`"),
+            FieldLayout("Count", "`{count}`"),
+        ],
+        link_wrap=False,
+    ),
+    "Health": TeamsLayout(
+        TeamsStyle.CARD,
+        title="`AWS Health: {service}`",
+        facts=[
+            FieldLayout("Category", "`{category}`"),
+            FieldLayout("Priority", "`{priority}`"),
+            FieldLayout("Code", "`{code}`"),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Start Time", "`{start_time}`"),
+            FieldLayout("End Time", "`{end_time}`"),
+            FieldLayout("Affected Resources", "`{resources}`"),
+        ],
+    ),
+    "Backup": TeamsLayout(
+        TeamsStyle.CARD,
+        title="`AWS Backup: {backup_id}`",
+        facts=[
+            FieldLayout("Backup Id", "`{backup_id}`"),
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Status", "`{status}`"),
+            FieldLayout("Priority", "`{priority}`"),
+            FieldLayout("Start Time", "`{start_time}`"),
+        ],
+    ),
+    "SecurityHub": TeamsLayout(
+        TeamsStyle.CARD,
+        facts=[
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Severity", "`{severity}`"),
+            FieldLayout("Source", "`{source}`"),
+            FieldLayout("Provider", "`{ruleProvider} v{providerVersion}`"),
+            FieldLayout("Category", "`{providerCategory}`"),
+            FieldLayout("Rule", "`{ruleId}`"),
+        ],
+        blocks=[Block.FACTS, Block.TEXT, Block.RESOURCES],
+    ),
+    "Budget": TeamsLayout(TeamsStyle.NOTE, title="Budget Alarm: {subject}"),
+    "SavingsPlan": TeamsLayout(TeamsStyle.NOTE, title="Savings Plan Alarm: {subject}"),
+    "DMS": TeamsLayout(
+        TeamsStyle.CARD,
+        facts=[
+            FieldLayout("At", "`{at}`"),
+            FieldLayout("At (Epoch)", "`{at_epoch}`"),
+            FieldLayout("Source", "`{source}`"),
+            FieldLayout("Source Id", "`{source_id}`"),
+        ],
+        blocks=[Block.FACTS, Block.TEXT],
+        color="default",
+    ),
+    "CostAnomaly": TeamsLayout(
+        TeamsStyle.CARD,
+        facts=[
+            FieldLayout("Account Name", "`{account_name}`"),
+            FieldLayout("Account Id", "`{account_id}`"),
+            FieldLayout("Region", "`{region}`"),
+            FieldLayout("Service", "`{service}`"),
+            FieldLayout("ID", "`{anomaly_id}`"),
+            FieldLayout("Started At", "`{started}`"),
+            FieldLayout("Ended At", "`{ended}`"),
+            FieldLayout("Expended Spend ($)", "`{expected_spend}`"),
+            FieldLayout("Actual Spend ($)", "`{actual_spend}`"),
+            FieldLayout("Impact", "`{total_impact}`"),
+        ],
+        blocks=[Block.FACTS, Block.TEXT],
+    ),
+    "Unknown": TeamsLayout(TeamsStyle.PLAIN),
+}
+# The layout of the notifications without their own, e.g. a digest
+DEFAULT_LAYOUT = TeamsLayout(TeamsStyle.CARD)
+
+
+def card_template(fallback: bool) -> PayloadTemplate:
+    """
+    :params fallback: whether the card has a fallback text
+    :returns: the template of the message, its card body a slot
+    """
+    content = {"$schema": "http://adaptivecards.io/schemas/adaptive-card.json", "type": "AdaptiveCard"}
+    if fallback:
+        content["fallbackText"] = slot("fallback")
+    content["version"] = "1.2"
+    content["body"] = [slot("body")]  # type: ignore[assignment]
+    return PayloadTemplate(
+        {
+            "type": "message",
+            "attachments": [{"contentType": "application/vnd.microsoft.card.adaptive", "content": content}],
+        }
+    )
+
+
+# The card is compiled into templates at import time; rendering only fills their slots
+CARD_TEMPLATE = card_template(fallback=False)
+NOTE_CARD_TEMPLATE = card_template(fallback=True)
+CONTAINER_TEMPLATE = PayloadTemplate({"type": "Container", "items": [slot("items")]})
+IMAGE_TEMPLATE = PayloadTemplate({"type": "Image", "url": slot("url"), "width": "50px", "height": "50px"})
+TITLE_TEMPLATE = PayloadTemplate(
+    {
+        "type": "TextBlock",
+        "text": slot("text"),
+        "weight": "Bolder",
+        "size": "Large",
+        "wrap": True,
+        "color": slot("color"),
+    }
+)
+PLAIN_TITLE_TEMPLATE = PayloadTemplate(
+    {"type": "TextBlock", "text": slot("text"), "weight": "Bolder", "size": "medium"}
+)
+TEXT_TEMPLATE = PayloadTemplate({"type": "TextBlock", "text": slot("text"), "wrap": True})
+RICH_TEXT_TEMPLATE = PayloadTemplate({"type": "RichTextBlock", "inlines": [{"type": "TextRun", "text": slot("text")}]})
+FACT_SET_TEMPLATE = PayloadTemplate({"type": "FactSet", "facts": [slot("facts")]})
+RESOURCE_SET_TEMPLATE = PayloadTemplate({"type": "FactSet", "facts": [slot("facts")], "wrap": True})
+FACT_TEMPLATE = PayloadTemplate({"title": slot("title"), "value": slot("value")})
+UNTITLED_FACT_TEMPLATE = PayloadTemplate({"value": slot("value"), "short": slot("short")})
+LINK_TEMPLATE = PayloadTemplate(
+    {"type": "Container", "items": [{"type": "TextBlock", "text": slot("text"), "wrap": True}]}
+)
+UNWRAPPED_LINK_TEMPLATE = PayloadTemplate({"type": "Container", "items": [{"type": "TextBlock", "text": slot("text")}]})
+# the colour of each icon; without, the default colour
+EMBLEM_COLORS = {
+    __ATTENTION_URL__: TeamsPriorityColor.ERROR.value,
+    __WARNING_URL__: TeamsPriorityColor.WARNING.value,
+}
+
+
 class TeamsRender(Render):
     """
     Render for Teams payload
@@ -41,976 +270,237 @@ class TeamsRender(Render):
     def __init__(self: Self):
         super(TeamsRender, self).__init__()
 
-    def __format_cloudwatch_alarm(self: Self, alarm: Dict[str, Any]) -> Dict[str, Any]:
-        """Format CloudWatch alarm facts into teams message format
+    def __format_fact(self: Self, field: Field) -> str:
+        """Format a field into a fact
 
-        :params alarm: CloudWatch facts
-        :returns: formatted teams message payload
+        :params field: the field
+        :returns: the encoded fact
         """
+        if field.title is None:
+            return UNTITLED_FACT_TEMPLATE.render(value=encode_string(field.value), short=json.dumps(field.short))
 
-        imageIconItems = []
-        postColor = TeamsPriorityColor.NO_ERROR.value
-        if alarm["priority"] == "ERROR":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __ATTENTION_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.ERROR.value
-        elif alarm["priority"] == "WARNING":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __WARNING_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.WARNING.value
-
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": imageIconItems
-                                + [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"CloudWatch: `{alarm['name']}`",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": postColor,
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{alarm['description']}`",
-                                        "wrap": True,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "At",
-                                                "value": f"`{alarm['at']}`",
-                                            },
-                                            {
-                                                "title": "Account Name",
-                                                "value": f"`{alarm['account_name']}`",
-                                            },
-                                            {
-                                                "title": "Account Id",
-                                                "value": f"`{alarm['account_id']}`",
-                                            },
-                                            {
-                                                "title": "Region",
-                                                "value": f"`{alarm['alarm_arn_region']}`",
-                                            },
-                                            {
-                                                "title": "Region Locale",
-                                                "value": f"`{alarm['region']}`",
-                                            },
-                                            {
-                                                "title": "New State",
-                                                "value": f"`{alarm['state']}`",
-                                            },
-                                            {
-                                                "title": "Old State",
-                                                "value": f"`{alarm['old_state']}`",
-                                            },
-                                        ],
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{alarm['reason']}`",
-                                        "wrap": True,
-                                    },
-                                ],
-                            },
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"[The Alarm]({alarm['url']})",
-                                    }
-                                ],
-                            },
-                        ],
-                    },
-                }
-            ],
-        }
+        return FACT_TEMPLATE.render(title=encode_string(field.title), value=encode_string(field.value))
 
-    def __format_guard_duty_finding(
-        self: Self, finding: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format GuardDuty facts into teams message format
+    def __format_facts(
+        self: Self, document: NotificationDocument, layout: TeamsLayout, budget: PayloadBudget
+    ) -> Tuple[List[str], List[str], Optional[str]]:
+        """Format the facts of the layout, the listed fields, then the resources
 
-        :params finding: GuardDuty facts
-        :returns: formatted teams message payload
-        """
+        The resources are kept apart when the layout has a block of its own for them.
+        The fact which does not fit the budget is cut short, and those after it are
+        summarised instead.
 
-        imageIconItems = []
-        postColor = TeamsPriorityColor.NO_ERROR.value
-        if finding["priority"] == "HIGH":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __ATTENTION_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.ERROR.value
-        elif finding["priority"] == "MEDIUM":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __WARNING_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.WARNING.value
-
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": imageIconItems
-                                + [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`GuardDuty: {finding['title']}`",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": postColor,
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{finding['description']}`",
-                                        "wrap": True,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "ID",
-                                                "value": f"`{finding['id']}`",
-                                            },
-                                            {
-                                                "title": "Severity/Score",
-                                                "value": f"`{finding['severity']}/{finding['severity_score']}`",
-                                            },
-                                            {
-                                                "title": "Account Name",
-                                                "value": f"`{finding['account_name']}`",
-                                            },
-                                            {
-                                                "title": "Account Id",
-                                                "value": f"`{finding['account_id']}`",
-                                            },
-                                            {
-                                                "title": "Region",
-                                                "value": f"`{finding['region']}`",
-                                            },
-                                            {
-                                                "title": "First Seen",
-                                                "value": f"`{finding['first_seen']}`",
-                                            },
-                                            {
-                                                "title": "Last Seen",
-                                                "value": f"`{finding['last_seen']}`",
-                                            },
-                                            {
-                                                "title": "Count",
-                                                "value": f"`{finding['count']}`",
-                                            },
-                                        ],
-                                    },
-                                ],
-                            },
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"[The Finding]({finding['url']}#/findings?search=id%3D{finding['id']})",
-                                    }
-                                ],
-                            },
-                        ],
-                    },
-                }
-            ],
-        }
-
-    def __format_health_check_alert(
-        self: Self, alert: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format AWS HealthCheck facts into teams message format
-
-        :params finding: Healthcheck facts
-        :returns: formatted teams message payload
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the room left in the card
+        :returns: the encoded facts, the encoded resources, and the encoded summary TextBlock if any
         """
-
-        imageIconItems = []
-        postColor = TeamsPriorityColor.NO_ERROR.value
-        if alert["priority"] == "HIGH":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __ATTENTION_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.ERROR.value
-        elif alert["priority"] == "MEDIUM":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __WARNING_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.WARNING.value
-
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": imageIconItems
-                                + [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`AWS Health: {alert['service']}`",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": postColor,
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{alert['description']}`",
-                                        "wrap": True,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "Category",
-                                                "value": f"`{alert['category']}`",
-                                            },
-                                            {
-                                                "title": "Priority",
-                                                "value": f"`{alert['priority']}`",
-                                            },
-                                            {
-                                                "title": "Code",
-                                                "value": f"`{alert['code']}`",
-                                            },
-                                            {
-                                                "title": "Account Name",
-                                                "value": f"`{alert['account_name']}`",
-                                            },
-                                            {
-                                                "title": "Account Id",
-                                                "value": f"`{alert['account_id']}`",
-                                            },
-                                            {
-                                                "title": "Region",
-                                                "value": f"`{alert['region']}`",
-                                            },
-                                            {
-                                                "title": "Start Time",
-                                                "value": f"`{alert['start_time']}`",
-                                            },
-                                            {
-                                                "title": "End Time",
-                                                "value": f"`{alert['end_time']}`",
-                                            },
-                                            {
-                                                "title": "Affected Resources",
-                                                "value": f"`{alert['resources']}`",
-                                            },
-                                        ],
-                                    },
-                                ],
-                            },
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"[The Healthcheck]({alert['url']})",
-                                        "wrap": True,
-                                    }
-                                ],
-                            },
-                        ],
-                    },
-                }
-            ],
-        }
-
-    def __format_backup_status(self: Self, status: Dict[str, Any]) -> Dict[str, Any]:
-        """Format AWS Backup facts into teams message format
-
-        :params finding: Backup facts
-        :returns: formatted teams message payload
+        facts: List[str] = []
+        resources: List[str] = []
+        apart = Block.RESOURCES in layout.blocks
+        for isResource, entry in document.entries(layout.facts):
+            parts = [self.__format_fact(field) for field in entry]
+            if budget.fit(sum(encoded_size(part) + 1 for part in parts)):
+                (resources if isResource and apart else facts).extend(parts)
+                continue
+
+            # a resource is never split, so is left out whole
+            if not isResource:
+                field = entry[0]
+                overhead = encoded_size(self.__format_fact(Field(field.title, "", short=field.short))) + 1
+                value = budget.cut(field.value, overhead=overhead, size=string_size)
+                if value is not None:
+                    facts.append(self.__format_fact(Field(field.title, value, short=field.short)))
+            break
+
+        summary = document.truncation(layout.facts, budget.entries)
+        if summary is None:
+            return facts, resources, None
+
+        return facts, resources, TEXT_TEMPLATE.render(text=encode_string(summary.value))
+
+    def __format_title(self: Self, document: NotificationDocument, layout: TeamsLayout) -> Tuple[str, str]:
+        """
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :returns: the title of the card, and its colour
         """
+        title = layout.title.format_map(document.facts) if layout.title else document.title
+        color = layout.color or EMBLEM_COLORS.get(document.emblem or "", TeamsPriorityColor.NO_ERROR.value)
+        return title, color
 
-        imageIconItems = []
-        postColor = TeamsPriorityColor.NO_ERROR.value
-        if status["priority"] == "ERROR":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __ATTENTION_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.ERROR.value
-        elif status["priority"] == "WARNING":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __WARNING_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.WARNING.value
-
-        facts: list[Dict[str, Any]] = []
-        backup_fields = status["backup_fields"]
-        for k, v in backup_fields.items():
-            facts.append(
-                {
-                    "title": k,
-                    "value": f"`{v}`",
-                }
-            )
-
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": imageIconItems
-                                + [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`AWS Backup: {status['backup_id']}`",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": postColor,
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{status['description']}`",
-                                        "wrap": True,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "Backup Id",
-                                                "value": f"`{status['backup_id']}`",
-                                            },
-                                            {
-                                                "title": "Account Name",
-                                                "value": f"`{status['account_name']}`",
-                                            },
-                                            {
-                                                "title": "Account Id",
-                                                "value": f"`{status['account_id']}`",
-                                            },
-                                            {
-                                                "title": "Region",
-                                                "value": f"`{status['region']}`",
-                                            },
-                                            {
-                                                "title": "Status",
-                                                "value": f"`{status['status']}`",
-                                            },
-                                            {
-                                                "title": "Priority",
-                                                "value": f"`{status['priority']}`",
-                                            },
-                                            {
-                                                "title": "Start Time",
-                                                "value": f"`{status['start_time']}`",
-                                            },
-                                        ]
-                                        + facts,
-                                    },
-                                ],
-                            }
-                        ],
-                    },
-                }
-            ],
-        }
+    def __format_link(
+        self: Self, document: NotificationDocument, layout: TeamsLayout, budget: PayloadBudget
+    ) -> List[str]:
+        """Format the console link, if any
 
-    def __format_security_hub_status(
-        self: Self, finding: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format AWS Security Hub finding facts into teams message format
+        A link cut short is broken, so the link is left out if it does not fit whole.
 
-        :params finding: budget facts
-        :returns: formatted teams message payload
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :params budget: the room left in the card
+        :returns: the encoded link container, if any
         """
-        imageIconItems = []
-        postColor = TeamsPriorityColor.NO_ERROR.value
-        if finding["priority"] == "CRITICAL" or finding["priority"] == "HIGH":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __ATTENTION_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.ERROR.value
-        elif finding["priority"] == "MEDIUM":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __WARNING_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.WARNING.value
-
-        resourcesField: list[Dict[str, Any]] = []
-        idx = 1
-        for resource in finding["resources"]:
-            resourceId = resource["id"]
-            resourceType = resource["type"]
-            resourcesField.append(
-                {
-                    "title": f"Type {idx}",
-                    "value": f"`{resourceType}`",
-                }
-            )
-            resourcesField.append(
-                {
-                    "title": f"Arn {idx}",
-                    "value": f"`{resourceId}`",
-                }
-            )
-            idx += 1
-
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": imageIconItems
-                                + [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"Security Hub: {finding['source']}",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": postColor,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "Account Name",
-                                                "value": f"`{finding['account_name']}`",
-                                            },
-                                            {
-                                                "title": "Account Id",
-                                                "value": f"`{finding['account_id']}`",
-                                            },
-                                            {
-                                                "title": "Region",
-                                                "value": f"`{finding['region']}`",
-                                            },
-                                            {
-                                                "title": "Severity",
-                                                "value": f"`{finding['severity']}`",
-                                            },
-                                            {
-                                                "title": "Source",
-                                                "value": f"`{finding['source']}`",
-                                            },
-                                            {
-                                                "title": "Provider",
-                                                "value": f"`{finding['ruleProvider']} v{finding['providerVersion']}`",
-                                            },
-                                            {
-                                                "title": "Category",
-                                                "value": f"`{finding['providerCategory']}`",
-                                            },
-                                            {
-                                                "title": "Rule",
-                                                "value": f"`{finding['ruleId']}`",
-                                            },
-                                        ],
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{finding['description']}`",
-                                        "wrap": True,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [] + resourcesField,
-                                        "wrap": True,
-                                    },
-                                ],
-                            },
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"[The Finding]({finding['url']})",
-                                        "wrap": True,
-                                    }
-                                ],
-                            },
-                        ],
-                    },
-                }
-            ],
-        }
-
-    def __format_budget_alert(self: Self, alarm: Dict[str, Any]) -> Dict[str, Any]:
-        """Format Budget alarm facts into Slack message format
-
-        :params message: Budget facts
-        :returns: formatted Slack message payload
+        if document.link is None:
+            return []
+
+        template = LINK_TEMPLATE if layout.link_wrap else UNWRAPPED_LINK_TEMPLATE
+        link = template.render(text=encode_string(f"[{document.link.label}]({document.link.url})"))
+        if encoded_size(link) >= budget.remaining:
+            return []
+
+        budget.spend(encoded_size(link) + 1)
+        return [link]
+
+    def __format_block(
+        self: Self, document: NotificationDocument, block: Union[Block, str], budget: PayloadBudget
+    ) -> Union[Block, str]:
+        """Format a text block, cut short to the room left in the card
+
+        :params document: notification document
+        :params block: the block of the layout
+        :params budget: the room left in the card
+        :returns: the encoded TextBlock, or the block of facts, formatted later
         """
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "fallbackText": f"Budget Alarm: {alarm['subject']}",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "Image",
-                                        "url": __WARNING_URL__,
-                                        "width": "50px",
-                                        "height": "50px",
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"Budget Alarm: {alarm['subject']}",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": TeamsPriorityColor.WARNING.value,
-                                    },
-                                    {
-                                        "type": "RichTextBlock",
-                                        "inlines": [
-                                            {
-                                                "type": "TextRun",
-                                                "text": f"{alarm['info']}",
-                                            }
-                                        ],
-                                    },
-                                ],
-                            }
-                        ],
-                    },
-                }
-            ],
-        }
+        if block is Block.TEXT:
+            text = code(budget.shorten(document.text or "", size=string_size))
+        elif isinstance(block, str):
+            text = budget.shorten(block.format_map(document.facts), size=string_size)
+        else:
+            return block
 
-    def __format_savings_plan_alert(
-        self: Self, alarm: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Format Savings Plan alarm facts into Slack message format
+        return TEXT_TEMPLATE.render(text=encode_string(text))
 
-        :params message: Savings Plans facts
-        :returns: formatted Slack message payload
-        """
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "fallbackText": f"Savings Plan Alarm: {alarm['subject']}",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "Image",
-                                        "url": __WARNING_URL__,
-                                        "width": "50px",
-                                        "height": "50px",
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"Savings Plan Alarm: {alarm['subject']}",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": TeamsPriorityColor.WARNING.value,
-                                    },
-                                    {
-                                        "type": "RichTextBlock",
-                                        "inlines": [
-                                            {
-                                                "type": "TextRun",
-                                                "text": f"{alarm['info']}",
-                                            }
-                                        ],
-                                    },
-                                ],
-                            }
-                        ],
-                    },
-                }
-            ],
-        }
+    def __format_card(self: Self, document: NotificationDocument, layout: TeamsLayout) -> List[str]:
+        """Format the icon, title and blocks, then the console link
 
-    def __format_DMS_notification(self: Self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """Format DMS notificatoin facts into teams message format
+        The title, then the text blocks, are cut short to the room left in the card; the
+        facts are fitted into the room they leave.
 
-        :params alarm: DMS notification facts
-        :returns: formatted teams message payload
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :returns: the encoded card body
         """
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"DMS Notification: {event['title']}",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": "default",
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "At",
-                                                "value": f"`{event['at']}`",
-                                            },
-                                            {
-                                                "title": "At (Epoch)",
-                                                "value": f"`{event['at_epoch']}`",
-                                            },
-                                            {
-                                                "title": "Source",
-                                                "value": f"`{event['source']}`",
-                                            },
-                                            {
-                                                "title": "Source Id",
-                                                "value": f"`{event['source_id']}`",
-                                            },
-                                        ],
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{event['documentation']}`",
-                                        "wrap": True,
-                                    },
-                                ],
-                            },
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"[The Event]({event['url']})",
-                                        "wrap": True,
-                                    }
-                                ],
-                            },
-                        ],
-                    },
-                }
-            ],
-        }
-
-    def __format_cost_anomaly(self: Self, anomaly: Dict[str, Any]) -> Dict[str, Any]:
-        """Format Costing Anomaly facts into teams message format
-
-        :params anomaly: cost anomaly facts
-        :returns: formatted teams message payload
+        title, color = self.__format_title(document=document, layout=layout)
+
+        items: List[str] = []
+        if document.emblem is not None:
+            items.append(IMAGE_TEMPLATE.render(url=encode_string(document.emblem)))
+
+        budget = PayloadBudget(limit=TEAMS_PAYLOAD_LIMIT, reserve=TEAMS_TRUNCATION_RESERVE)
+        budget.spend(
+            sum(encoded_size(part) + 1 for part in items)
+            + len(CARD_TEMPLATE.template)
+            + len(CONTAINER_TEMPLATE.template)
+            + len(TITLE_TEMPLATE.template)
+            + len(TEXT_TEMPLATE.template) * len(layout.blocks)
+            + len(FACT_SET_TEMPLATE.template)
+            + len(RESOURCE_SET_TEMPLATE.template)
+        )
+        links = self.__format_link(document=document, layout=layout, budget=budget)
+        title = budget.shorten(title, size=string_size)
+        items.append(TITLE_TEMPLATE.render(text=encode_string(title), color=encode_string(color)))
+        # the blocks of facts are formatted once the room left by the rest is known
+        blocks = [self.__format_block(document=document, block=block, budget=budget) for block in layout.blocks]
+        facts, resources, summary = self.__format_facts(document=document, layout=layout, budget=budget)
+
+        for block in blocks:
+            if isinstance(block, str):
+                items.append(block)
+            elif block is Block.FACTS:
+                items.append(FACT_SET_TEMPLATE.render(facts=",".join(facts)))
+            else:
+                items.append(RESOURCE_SET_TEMPLATE.render(facts=",".join(resources)))
+        if summary is not None:
+            items.append(summary)
+
+        return [CONTAINER_TEMPLATE.render(items=",".join(items))] + links
+
+    def __format_note(self: Self, document: NotificationDocument, layout: TeamsLayout) -> Tuple[str, List[str]]:
+        """Format the icon, title and the text as rich text
+
+        The title, then the text, are cut short to the room left in the card.
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :returns: the encoded fallback text, and the encoded card body
         """
-        imageIconItems = []
-        postColor = TeamsPriorityColor.NO_ERROR.value
-        if anomaly["priority"] == "ERROR":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __ATTENTION_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.ERROR.value
-        elif anomaly["priority"] == "WARNING":
-            imageIconItems.append(
-                {
-                    "type": "Image",
-                    "url": __WARNING_URL__,
-                    "width": "50px",
-                    "height": "50px",
-                }
-            )
-            postColor = TeamsPriorityColor.WARNING.value
-
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": imageIconItems
-                                + [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"Cost Anomaly: {anomaly['usage']}",
-                                        "weight": "Bolder",
-                                        "size": "Large",
-                                        "wrap": True,
-                                        "color": postColor,
-                                    },
-                                    {
-                                        "type": "FactSet",
-                                        "facts": [
-                                            {
-                                                "title": "Account Name",
-                                                "value": f"`{anomaly['account_name']}`",
-                                            },
-                                            {
-                                                "title": "Account Id",
-                                                "value": f"`{anomaly['account_id']}`",
-                                            },
-                                            {
-                                                "title": "Region",
-                                                "value": f"`{anomaly['region']}`",
-                                            },
-                                            {
-                                                "title": "Service",
-                                                "value": f"`{anomaly['service']}`",
-                                            },
-                                            {
-                                                "title": "ID",
-                                                "value": f"`{anomaly['anomaly_id']}`",
-                                            },
-                                            {
-                                                "title": "Started At",
-                                                "value": f"`{anomaly['started']}`",
-                                            },
-                                            {
-                                                "title": "Ended At",
-                                                "value": f"`{anomaly['ended']}`",
-                                            },
-                                            {
-                                                "title": "Expended Spend ($)",
-                                                "value": f"`{anomaly['expected_spend']}`",
-                                            },
-                                            {
-                                                "title": "Actual Spend ($)",
-                                                "value": f"`{anomaly['actual_spend']}`",
-                                            },
-                                            {
-                                                "title": "Impact",
-                                                "value": f"`{anomaly['total_impact']}`",
-                                            },
-                                        ],
-                                    },
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"`{anomaly['monitor_name']}`",
-                                        "wrap": True,
-                                    },
-                                ],
-                            },
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": f"[The Anomaly]({anomaly['url']})",
-                                        "wrap": True,
-                                    }
-                                ],
-                            },
-                        ],
-                    },
-                }
-            ],
-        }
-
-    def __format_default(
-        self: Self, message: Union[str, Dict], subject: Optional[str] = None
-    ) -> Dict[str, Any]:
+        title, color = self.__format_title(document=document, layout=layout)
+
+        items: List[str] = []
+        if document.emblem is not None:
+            items.append(IMAGE_TEMPLATE.render(url=encode_string(document.emblem)))
+
+        budget = PayloadBudget(limit=TEAMS_PAYLOAD_LIMIT)
+        budget.spend(
+            sum(encoded_size(part) + 1 for part in items)
+            + len(NOTE_CARD_TEMPLATE.template)
+            + len(CONTAINER_TEMPLATE.template)
+            + len(TITLE_TEMPLATE.template)
+            + len(RICH_TEXT_TEMPLATE.template)
+        )
+        # the title is also the fallback text, so is spent twice
+        title = encode_string(clip(title, max(budget.remaining // 2, 0), size=string_size))
+        budget.spend(encoded_size(title) * 2)
+        items.append(TITLE_TEMPLATE.render(text=title, color=encode_string(color)))
+        text = budget.shorten(document.text or "", size=string_size)
+        items.append(RICH_TEXT_TEMPLATE.render(text=encode_string(text)))
+
+        return title, [CONTAINER_TEMPLATE.render(items=",".join(items))]
+
+    def __format_plain(self: Self, document: NotificationDocument, layout: TeamsLayout) -> List[str]:
+        """Format the title and facts of an unrecognised message
+
+        The title is cut short to the room left in the card; the facts are fitted into
+        the room it leaves.
+
+        :params document: notification document
+        :params layout: the layout of the notification type
+        :returns: the encoded card body
         """
-        Default formatter, converting event into teams message format
-
-        :params message: SNS message body containing message/event
-        :returns: formatted teams message payload
+        budget = PayloadBudget(limit=TEAMS_PAYLOAD_LIMIT, reserve=TEAMS_TRUNCATION_RESERVE)
+        budget.spend(
+            len(CARD_TEMPLATE.template)
+            + len(CONTAINER_TEMPLATE.template)
+            + len(PLAIN_TITLE_TEMPLATE.template)
+            + len(FACT_SET_TEMPLATE.template)
+        )
+        title = budget.shorten(document.title, size=string_size)
+        items = [PLAIN_TITLE_TEMPLATE.render(text=encode_string(title))]
+
+        facts, _, summary = self.__format_facts(document=document, layout=layout, budget=budget)
+        items.append(FACT_SET_TEMPLATE.render(facts=",".join(facts)))
+        if summary is not None:
+            items.append(summary)
+
+        return [CONTAINER_TEMPLATE.render(items=",".join(items))]
+
+    def body(self: Self, document: NotificationDocument) -> bytes:
         """
+        Given the notification document, write the encoded teams message payload
 
-        title = subject if subject else "Message"
-        facts = []
+        :params document: notification document
+        :returns: the encoded teams message payload
+        """
+        logger.debug("Rendering notification", action=document.action)
 
-        if type(message) is dict:
-            for k, v in message.items():
-                value = f"{json.dumps(v)}" if isinstance(v, (dict, list)) else str(v)
-                facts.append({"title": k, "value": f"`{value}`"})
-        else:
-            facts.append({"value": message, "short": False})
+        layout = TEAMS_LAYOUTS.get(document.action, DEFAULT_LAYOUT)
+        match (layout.style):
+            case TeamsStyle.CARD:
+                card = CARD_TEMPLATE.render(body=",".join(self.__format_card(document=document, layout=layout)))
+            case TeamsStyle.NOTE:
+                fallback, body = self.__format_note(document=document, layout=layout)
+                card = NOTE_CARD_TEMPLATE.render(fallback=fallback, body=",".join(body))
+            case TeamsStyle.PLAIN:
+                card = CARD_TEMPLATE.render(body=",".join(self.__format_plain(document=document, layout=layout)))
 
-        return {
-            "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.2",
-                        "body": [
-                            {
-                                "type": "Container",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "text": title,
-                                        "weight": "Bolder",
-                                        "size": "medium",
-                                    },
-                                    {"type": "FactSet", "facts": facts},
-                                ],
-                            }
-                        ],
-                    },
-                }
-            ],
-        }
+        return card.encode("utf-8")
 
-    # on quick inspection it looks as though this method content is duplicated and can be moved into
-    #  the base class. However, formatting is very specific to each provider and thus it is not
-    #  abstracted here.
-    def payload(
-        self: Self,
-        parsedMessage: Union[str, Dict],
-        originalMessage: Union[str, Dict],
-        subject: Optional[str] = None,
-    ) -> Dict:
+    def payload(self: Self, document: NotificationDocument) -> Dict:
         """
-        Given the parsed AWS message, format into teams message payload
+        Given the notification document, format into teams message payload
 
-        :params parsedMessage: the parsed message with "action" detailing message type
+        :params document: notification document
         :returns: teams message payload
         """
-
-        logger.debug("Successfully parsed SNS record", parsed=parsedMessage)
-        match (parsedMessage["action"]):
-            case "CloudWatch":
-                payload = self.__format_cloudwatch_alarm(alarm=parsedMessage)
-            case "GuardDuty":
-                payload = self.__format_guard_duty_finding(finding=parsedMessage)
-            case "Health":
-                payload = self.__format_health_check_alert(alert=parsedMessage)
-            case "Backup":
-                payload = self.__format_backup_status(status=parsedMessage)
-            case "SecurityHub":
-                payload = self.__format_security_hub_status(finding=parsedMessage)
-            case "Budget":
-                payload = self.__format_budget_alert(alarm=parsedMessage)
-            case "SavingsPlan":
-                payload = self.__format_savings_plan_alert(alarm=parsedMessage)
-            case "DMS":
-                payload = self.__format_DMS_notification(event=parsedMessage)
-            case "CostAnomaly":
-                payload = self.__format_cost_anomaly(anomaly=parsedMessage)
-            case "Unknown":
-                payload = self.__format_default(
-                    message=originalMessage, subject=subject
-                )
-
-        return payload
+        return json.loads(self.body(document=document))
@@ -0,0 +1,424 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional, Self, Tuple, Union
+
+from notification_emblems import __ATTENTION_URL__, __WARNING_URL__
+
+"""
+The channel neutral notification document.
+
+The parsed facts of each message are gathered once into a document: its title, priority,
+icon, text, console link, timestamp, listed fields and resources. The vendor renders
+then only project the document into their own payload format, each laying out the facts
+of a notification type under its own titles and in its own order; adding a channel is a
+new set of layouts, not another copy of the formatting of every event type.
+"""
+
+# The most text any vendor accepts; the fields of an unrecognised message are only
+#  formatted up to this size, whatever the size of the message
+DOCUMENT_TEXT_LIMIT = 40000
+
+
+class Field:
+    """A titled fact of the notification, its value already formatted for display"""
+
+    title: Optional[str]
+    value: str
+    short: bool
+
+    def __init__(self, title: Optional[str], value: str, short: bool = True):
+        self.title = title
+        self.value = value
+        self.short = short
+
+
+class FieldLayout:
+    """Where a channel shows a fact: its title, and the value worded from the facts"""
+
+    title: str
+    value: str
+    short: bool
+
+    def __init__(self, title: str, value: str, short: bool = True):
+        self.title = title
+        # a format string over the facts of the document, e.g. "`{account_id}`"
+        self.value = value
+        self.short = short
+
+    def field(self: Self, facts: Dict[str, Any]) -> Field:
+        """
+        :params facts: the parsed facts of the notification
+        :returns: the field, its value worded from the facts
+        """
+        return Field(self.title, self.value.format_map(facts), short=self.short)
+
+
+class Resource:
+    """A resource the notification concerns, e.g. of a Security Hub finding"""
+
+    type: str
+    id: str
+
+    def __init__(self, type: str, id: str):
+        self.type = type
+        self.id = id
+
+
+class Link:
+    """The console link of the notification"""
+
+    label: str
+    url: str
+
+    def __init__(self, label: str, url: str):
+        self.label = label
+        self.url = url
+
+
+class NotificationDocument:
+    """
+    Channel neutral notification, built once per parsed message
+    """
+
+    action: str
+    title: str
+    fallback: str
+    priority: Optional[str]
+    emblem: Optional[str]
+    text: Optional[str]
+    link: Optional[Link]
+    timestamp: Optional[int]
+    facts: Dict[str, Any]
+    fields: List[Field]
+    resources: List[Resource]
+    omitted: int
+
+    def __init__(
+        self,
+        action: str,
+        title: str,
+        fallback: str,
+        priority: Optional[str] = None,
+        emblem: Optional[str] = None,
+        text: Optional[str] = None,
+        link: Optional[Link] = None,
+        timestamp: Optional[int] = None,
+        facts: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[Field]] = None,
+        resources: Optional[List[Resource]] = None,
+        omitted: int = 0,
+    ):
+        self.action = action
+        self.title = title
+        self.fallback = fallback
+        self.priority = priority
+        self.emblem = emblem
+        self.text = text
+        self.link = link
+        self.timestamp = timestamp
+        # the parsed facts, laid out by each channel as the fields of its notification type
+        self.facts = facts or {}
+        # the fields listed after those of the layout, e.g. the keys of an unknown message
+        self.fields = fields or []
+        self.resources = resources or []
+        # the fields left out of the document when it was built
+        self.omitted = omitted
+
+    def resource_fields(self: Self) -> List[Field]:
+        """
+        :returns: the resources of the notification, as numbered type and arn fields
+        """
+        return [
+            field for idx, resource in enumerate(self.resources, start=1) for field in resource_entry(idx, resource)
+        ]
+
+    def entries(self: Self, layout: List[FieldLayout]) -> Iterator[Tuple[bool, List[Field]]]:
+        """
+        Iterate the fields of the layout, the listed fields, then the resources,
+        formatting each only when reached
+
+        A resource is a single entry of its type and arn fields, so is never split.
+
+        :params layout: the fields of the notification type, as the channel shows them
+        :returns: iterator of whether each entry is a resource, and its fields
+        """
+        for fieldLayout in layout:
+            yield False, [fieldLayout.field(self.facts)]
+        for field in self.fields:
+            yield False, [field]
+        for idx, resource in enumerate(self.resources, start=1):
+            yield True, resource_entry(idx, resource)
+
+    def truncation(self: Self, layout: List[FieldLayout], entries: int) -> Optional[Field]:
+        """
+        Summarise the entries left out, when only the first were rendered
+
+        :params layout: the fields of the notification type, as the channel shows them
+        :params entries: the number of entries rendered
+        :returns: the summary field, or None if nothing was left out
+        """
+        listed = len(layout) + len(self.fields)
+        fields = max(listed - entries, 0) + self.omitted
+        resources = len(self.resources) - max(entries - listed, 0)
+
+        summary: List[str] = []
+        if fields:
+            summary.append(f"+{fields} more fields")
+        if resources:
+            summary.append(f"+{resources} more resources")
+        if not summary:
+            return None
+
+        return Field(None, ", ".join(summary), short=False)
+
+
+def resource_entry(idx: int, resource: Resource) -> List[Field]:
+    """
+    :params idx: the number of the resource, from 1
+    :params resource: the resource
+    :returns: the type and arn fields of the resource
+    """
+    return [
+        Field(f"Type {idx}", code(resource.type)),
+        Field(f"Arn {idx}", code(resource.id), short=False),
+    ]
+
+
+def code(value: Any) -> str:
+    """
+    :params value: the fact value
+    :returns: the value formatted as inline code
+    """
+    return f"`{value}`"
+
+
+def get_emblem(priority: str, attention: Tuple[str, ...], warning: Tuple[str, ...]) -> Optional[str]:
+    """
+    Get the icon shown with the notification, if it needs attention
+
+    :params priority: the normalised priority of the notification
+    :params attention: the priorities shown with the attention icon
+    :params warning: the priorities shown with the warning icon
+    :returns: the icon url, or None
+    """
+    if priority in attention:
+        return __ATTENTION_URL__
+    if priority in warning:
+        return __WARNING_URL__
+    return None
+
+
+def build_cloudwatch_alarm(alarm: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of CloudWatch alarm facts
+
+    :params alarm: CloudWatch facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=alarm["action"],
+        title=f"CloudWatch: {alarm['name']}",
+        fallback=f"Alarm {alarm['name']} triggered",
+        priority=alarm["priority"],
+        emblem=get_emblem(alarm["priority"], ("ERROR",), ("WARNING",)),
+        text=f"{alarm['description']}",
+        link=Link("The Alarm", f"{alarm['url']}"),
+        timestamp=alarm["at_epoch"],
+        facts=alarm,
+    )
+
+
+def build_guard_duty_finding(finding: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of GuardDuty finding facts
+
+    :params finding: GuardDuty facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=finding["action"],
+        title=f"GuardDuty: {finding['title']}",
+        fallback=f"GuardDuty Finding: {finding['title']}",
+        priority=finding["priority"],
+        emblem=get_emblem(finding["priority"], ("HIGH",), ("MEDIUM",)),
+        text=f"{finding['description']}",
+        link=Link("The Finding", f"{finding['url']}#/findings?search=id%3D{finding['id']}"),
+        timestamp=finding["at_epoch"],
+        facts=finding,
+    )
+
+
+def build_health_check_alert(alert: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of AWS Health facts
+
+    :params alert: Health facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=alert["action"],
+        title=f"AWS Health: {alert['service']}",
+        fallback=f"New AWS Health Event for {alert['service']}",
+        priority=alert["priority"],
+        emblem=get_emblem(alert["priority"], ("HIGH",), ("MEDIUM",)),
+        text=f"{alert['description']}",
+        link=Link("The Healthcheck", f"{alert['url']}"),
+        timestamp=alert["at_epoch"],
+        facts=alert,
+    )
+
+
+def build_backup_status(status: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of AWS Backup facts
+
+    :params status: Backup facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=status["action"],
+        title=f"Backup : {status['backup_id']}",
+        fallback=f"Backup event for {status['backup_id']}",
+        priority=status["priority"],
+        emblem=get_emblem(status["priority"], ("ERROR",), ("WARNING",)),
+        text=f"{status['description']}",
+        facts=status,
+        fields=[Field(k, code(v), short=False) for k, v in status["backup_fields"].items()],
+    )
+
+
+def build_security_hub_status(finding: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of Security Hub finding facts
+
+    :params finding: Security Hub facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=finding["action"],
+        title=f"Security Hub: {finding['source']}",
+        fallback=f"Security Hub finding {finding['source']} triggered",
+        priority=finding["priority"],
+        emblem=get_emblem(finding["priority"], ("CRITICAL", "HIGH"), ("MEDIUM",)),
+        text=f"{finding['description']}",
+        link=Link("The Finding", f"{finding['url']}"),
+        facts=finding,
+        resources=[Resource(type=resource["type"], id=resource["id"]) for resource in finding["resources"]],
+    )
+
+
+def build_budget_alert(alarm: Dict[str, Any], name: str) -> NotificationDocument:
+    """Build the document of Budget or Savings Plan alarm facts
+
+    :params alarm: Budget facts
+    :params name: the name of the alarm type
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=alarm["action"],
+        title=f"{name}: {alarm['subject']}",
+        fallback=f"{name} {alarm['subject']} triggered",
+        priority="HIGH",
+        emblem=__WARNING_URL__,
+        text=f"{alarm['info']}",
+        facts=alarm,
+    )
+
+
+def build_DMS_notification(event: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of DMS notification facts
+
+    :params event: DMS notification facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=event["action"],
+        title=f"DMS Notification: {event['title']}",
+        fallback=f"DMS Notification {event['title']} triggered",
+        priority="WARNING",
+        text=f"{event['documentation']}",
+        link=Link("The Event", f"{event['url']}"),
+        timestamp=event["at_epoch"],
+        facts=event,
+    )
+
+
+def build_cost_anomaly(anomaly: Dict[str, Any]) -> NotificationDocument:
+    """Build the document of Cost Anomaly facts
+
+    :params anomaly: cost anomaly facts
+    :returns: notification document
+    """
+    return NotificationDocument(
+        action=anomaly["action"],
+        title=f"Cost Anomaly: {anomaly['usage']}",
+        fallback=f"Cost Anomaly:  {anomaly['usage']} triggered",
+        priority=anomaly["priority"],
+        emblem=get_emblem(anomaly["priority"], ("ERROR",), ("WARNING",)),
+        text=f"{anomaly['monitor_name']}",
+        link=Link("The Anomaly", f"{anomaly['url']}"),
+        facts=anomaly,
+    )
+
+
+def build_default(message: Union[str, Dict], subject: Optional[str] = None) -> NotificationDocument:
+    """
+    Default builder, listing the (unrecognised) message as is
+
+    :params message: SNS message body containing message/event
+    :params subject: Optional subject line from SNS message
+    :returns: notification document
+    """
+    fields: List[Field] = []
+    omitted = 0
+    if type(message) is dict:
+        size = 0
+        for k, v in message.items():
+            # beyond what any vendor accepts, the remaining keys are only counted
+            if size > DOCUMENT_TEXT_LIMIT:
+                omitted += 1
+                continue
+            value = f"{json.dumps(v)}" if isinstance(v, (dict, list)) else str(v)
+            fields.append(Field(k, code(value), short=len(value) < 25))
+            size += len(k) + len(value)
+    else:
+        fields.append(Field(None, f"{message}", short=False))
+
+    return NotificationDocument(
+        action="Unknown",
+        title=subject if subject else "Message",
+        fallback="A new message",
+        text="AWS notification",
+        fields=fields,
+        omitted=omitted,
+    )
+
+
+def build_document(
+    parsedMessage: Dict[str, Any],
+    originalMessage: Union[str, Dict],
+    subject: Optional[str] = None,
+) -> NotificationDocument:
+    """
+    Given the parsed AWS message, build the channel neutral notification document
+
+    :params parsedMessage: the parsed message with "action" detailing message type
+    :params originalMessage: the SNS message body, listed as is when the type is unknown
+    :params subject: Optional subject line from SNS message
+    :returns: notification document
+    """
+    match (parsedMessage["action"]):
+        case "CloudWatch":
+            return build_cloudwatch_alarm(alarm=parsedMessage)
+        case "GuardDuty":
+            return build_guard_duty_finding(finding=parsedMessage)
+        case "Health":
+            return build_health_check_alert(alert=parsedMessage)
+        case "Backup":
+            return build_backup_status(status=parsedMessage)
+        case "SecurityHub":
+            return build_security_hub_status(finding=parsedMessage)
+        case "Budget":
+            return build_budget_alert(alarm=parsedMessage, name="Budget")
+        case "SavingsPlan":
+            return build_budget_alert(alarm=parsedMessage, name="Savings Plan")
+        case "DMS":
+            return build_DMS_notification(event=parsedMessage)
+        case "CostAnomaly":
+            return build_cost_anomaly(anomaly=parsedMessage)
+        case _:
+            return build_default(message=originalMessage, subject=subject)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Notify Fan-out
+--------------
+
+Receives event payloads that are parsed once, then sent to both Slack and Teams
+
+"""
+
+import os
+from typing import Any, Dict, List
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+logger = Logger()
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+metrics = Metrics(namespace=powertools_namespace)
+from aws_lambda_powertools.metrics import MetricUnit
+
+from channels import slack, teams
+from deadline import invocation_deadline
+from delivery_channel import DeliveryChannel, fan_out_sns
+from msg_parser import get_batch_response, get_sns_records
+from profiler import invocation_profiler
+from stage_metrics import stage_metrics
+from webhook_client import webhook_client
+from webhook_url import webhook_urls
+
+# decrypt both webhook urls at once during the init phase, rather than on the first post
+webhook_urls.prefetch([slack.webhookUrlEnv, teams.webhookUrlEnv])
+
+# The channels may be suspended individually, while keeping the single subscription
+ENABLE_SLACK = os.environ.get("ENABLE_SLACK", "true").lower() == "true"
+ENABLE_TEAMS = os.environ.get("ENABLE_TEAMS", "true").lower() == "true"
+
+CHANNELS: List[DeliveryChannel] = [
+    channel for channel, enabled in ((slack, ENABLE_SLACK), (teams, ENABLE_TEAMS)) if enabled
+]
+
+
+# note - this lambda is invoked as event from SNS (or SQS buffering SNS) - no sensible correlation id to assume
+@metrics.log_metrics(capture_cold_start_metric=True)
+@invocation_profiler.profile
+def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Lambda function to parse notification events and forward to Slack and Teams
+
+    :param event: lambda expected event object
+    :param context: lambda expected context object
+    :returns: partial batch response when invoked from SQS
+    """
+    invocation_deadline.start(context)
+    metrics.add_metric(name="Invocations", unit=MetricUnit.Count, value=1)
+
+    logger.debug("The event", event=event, channels=[c.name for c in CHANNELS])
+
+    failed_records: List[str] = fan_out_sns(
+        snsRecords=get_sns_records(event["Records"]),
+        channels=CHANNELS,
+    )
+    if failed_records:
+        logger.error(
+            "Failed to process event",
+            event=event,
+            context=context,
+            failed_records=failed_records,
+        )
+
+    webhook_client.add_connection_metrics()
+    stage_metrics.flush()
+
+    return get_batch_response(event=event, failed_records=failed_records)
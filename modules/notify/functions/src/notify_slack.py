@@ -1,18 +1,14 @@
 # -*- coding: utf-8 -*-
 """
-    Notify Slack
-    ------------
+Notify Slack
+------------
 
-    Receives event payloads that are parsed and sent to Slack
+Receives event payloads that are parsed and sent to Slack
 
 """
 
-import json
 import os
-import urllib.parse
-import urllib.request
-from typing import Any, Dict
-from urllib.error import HTTPError
+from typing import Any, Dict, List
 
 from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -22,79 +18,60 @@ powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
 metrics = Metrics(namespace=powertools_namespace)
 from aws_lambda_powertools.metrics import MetricUnit
 
-from msg_parser import decrypt_url, parse_sns
-from msg_render_slack import SlackRender
-from render import Render
+from channels import slack
+from deadline import invocation_deadline
+from msg_parser import get_batch_response, get_sns_records, parse_sns
+from profiler import invocation_profiler
+from stage_metrics import stage_metrics
+from webhook_client import VendorResponse, webhook_client
+from webhook_url import webhook_urls
 
+# decrypt the webhook url during the init phase, rather than on the first post
+webhook_urls.prefetch(["SLACK_WEBHOOK_URL"])
 
-def send_slack_notification(payload: Dict[str, Any]) -> str:
+
+def send_slack_notification(body: bytes) -> VendorResponse:
     """
     Send notification payload to Slack
 
-    :params payload: formatted Slack message payload
-    :returns: { code: integer, info: string}
+    :params body: formatted Slack message payload, encoded as JSON
+    :returns: the response code and info from Slack
     """
-
-    slack_url = os.environ["SLACK_WEBHOOK_URL"]
-    if not slack_url.startswith("http"):
-        slack_url = decrypt_url(slack_url)
-
-    data = urllib.parse.urlencode({"payload": json.dumps(payload)}).encode("utf-8")
-    req = urllib.request.Request(slack_url)
-
-    logger.debug(
-        "Slack endpoint payload",
-        endpoint_url=slack_url,
-        payload=payload,
-    )
-
-    try:
-        result = urllib.request.urlopen(req, data)
-        logger.debug(
-            "Successfully posted to slack with response", code=result.getcode()
-        )
-        return json.dumps({"code": result.getcode(), "info": result.info().as_string()})
-
-    except HTTPError as e:
-        logger.error(
-            "Failed to post to slack",
-            code=e.code,
-            reason=e.reason,
-            endpoint_url=slack_url,
-            payload=payload,
-        )
-        return json.dumps({"code": e.getcode(), "info": e.info().as_string()})
+    return slack.send(body=body)
 
 
-# note - this lambda is invoked as event from SNS - no sensible correlation id to assume
+# note - this lambda is invoked as event from SNS (or SQS buffering SNS) - no sensible correlation id to assume
 @metrics.log_metrics(capture_cold_start_metric=True)
-def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> str:
+@invocation_profiler.profile
+def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
     """
     Lambda function to parse notification events and forward to Slack
 
     :param event: lambda expected event object
     :param context: lambda expected context object
-    :returns: none
+    :returns: partial batch response when invoked from SQS
     """
+    invocation_deadline.start(context)
     metrics.add_metric(name="Invocations", unit=MetricUnit.Count, value=1)
 
     logger.debug("The event", event=event)
 
-    renderer: Render = SlackRender()
-
-    # Slack will return HTTP(200) on success
-    parse_sns_status: bool = parse_sns(
-        snsRecords=event["Records"],
+    failed_records: List[str] = parse_sns(
+        snsRecords=get_sns_records(event["Records"]),
         vendor_send_to_function=send_slack_notification,
-        renderer=renderer,
-        rendererSuccessCode=200,
+        renderer=slack.renderer,
+        rendererSuccessCode=slack.successCode,
+        channel=slack.name,
     )
-    if not parse_sns_status:
+    if failed_records:
         logger.error(
             "Failed to process event",
             event=event,
             context=context,
+            failed_records=failed_records,
         )
-        raise Exception("Failed to process all SNS records")
 
-    return {}
+    webhook_client.add_connection_metrics()
+    stage_metrics.flush()
+
+    return get_batch_response(event=event, failed_records=failed_records)
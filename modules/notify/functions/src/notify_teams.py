@@ -1,18 +1,15 @@
 # -*- coding: utf-8 -*-
 """
-    Notify Teams
-    ------------
+Notify Teams
+------------
 
-    Receives event payloads that are parsed and sent to Teams
+Receives event payloads that are parsed and sent to Teams
 
 """
 
-import json
 import os
 from enum import Enum
-from typing import Any, Dict
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Any, Dict, List
 
 from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -22,84 +19,62 @@ powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
 metrics = Metrics(namespace=powertools_namespace)
 from aws_lambda_powertools.metrics import MetricUnit
 
-from msg_parser import decrypt_url, parse_sns
-from msg_render_teams import TeamsRender
-from render import Render
+from channels import teams
+from deadline import invocation_deadline
+from msg_parser import get_batch_response, get_sns_records, parse_sns
+from profiler import invocation_profiler
+from stage_metrics import stage_metrics
+from webhook_client import VendorResponse, webhook_client
+from webhook_url import webhook_urls
+
+# decrypt the webhook url during the init phase, rather than on the first post
+webhook_urls.prefetch(["TEAMS_WEBHOOK_URL"])
 
 LOG_EVENTS = True if os.environ.get("LOG_EVENTS", "False") == "True" else False
 
 
-def send_teams_notification(payload: Dict[str, Any]) -> str:
+def send_teams_notification(body: bytes) -> VendorResponse:
     """
     Send notification payload to teams
 
-    :params payload: formatted teams message payload
-    :returns: { code: integer, info: string}
+    :params body: formatted teams message payload, encoded as JSON
+    :returns: the response code and info from teams
     """
-    teams_url = os.environ["TEAMS_WEBHOOK_URL"]
-    if not teams_url.startswith("http"):
-        teams_url = decrypt_url(teams_url)
-
-    logger.debug(
-        "Teams endpoint payload",
-        endpoint_url=teams_url,
-        payload=payload,
-    )
-
-    req = Request(
-        teams_url,
-        json.dumps(payload).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-    )
-    try:
-        response = urlopen(req)
-        response.read()
-        logger.debug(
-            "Successfully posted to slack with response", code=response.getcode()
-        )
-        return json.dumps(
-            {"code": response.getcode(), "info": response.info().as_string()}
-        )
-    except HTTPError as e:
-        logger.error(
-            "Failed to post to teams",
-            code=e.code,
-            reason=e.reason,
-            endpoint_url=teams_url,
-            payload=payload,
-        )
-        return json.dumps({"code": e.getcode(), "info": e.info().as_string()})
+    return teams.send(body=body)
 
 
-# note - this lambda is invoked as event from SNS - no sensible correlation id to assume
+# note - this lambda is invoked as event from SNS (or SQS buffering SNS) - no sensible correlation id to assume
 @metrics.log_metrics(capture_cold_start_metric=True)
-def lambda_handler(event: Dict[str, Any], context: Dict[str, Any]) -> str:
+@invocation_profiler.profile
+def lambda_handler(event: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     """
     Lambda function to parse notification events and forward to teams
 
     :param event: lambda expected event object
     :param context: lambda expected context object
-    :returns: none
+    :returns: partial batch response when invoked from SQS
     """
+    invocation_deadline.start(context)
     metrics.add_metric(name="NotificationsInvocations", unit=MetricUnit.Count, value=1)
 
     logger.debug("The event", event=event)
 
-    renderer: Render = TeamsRender()
-
-    # Teams will return HTTP(202) on success - or will it?
-    parse_sns_status: bool = parse_sns(
-        event["Records"],
+    failed_records: List[str] = parse_sns(
+        get_sns_records(event["Records"]),
         send_teams_notification,
-        renderer,
-        202,
+        teams.renderer,
+        teams.successCode,
+        channel=teams.name,
     )
-    if not parse_sns_status:
+    if failed_records:
         logger.error(
             "Failed to process event",
             event=event,
             context=context,
+            failed_records=failed_records,
         )
-        raise Exception("Failed to process all SNS records")
 
-    return {}
+    webhook_client.add_connection_metrics()
+    stage_metrics.flush()
+
+    return get_batch_response(event=event, failed_records=failed_records)
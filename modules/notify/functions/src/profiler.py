@@ -0,0 +1,164 @@
+import cProfile
+import functools
+import itertools
+import os
+import pstats
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_lambda_powertools import Logger
+
+logger = Logger()
+
+# The profiling of invocations; "off", "cpu" for cProfile, "memory" for tracemalloc, or
+#  "all" for both. Off, the handlers are not wrapped at all
+PROFILING_MODE = os.environ.get("PROFILING_MODE", "off").lower()
+# Profile one in this many invocations, at random, so a busy function is not slowed
+#  throughout
+PROFILING_SAMPLE_RATE = int(os.environ.get("PROFILING_SAMPLE_RATE", "1"))
+# The number of functions and allocation sites in the summary logged
+PROFILING_TOP = int(os.environ.get("PROFILING_TOP", "15"))
+
+# The modes profiling the functions called, and the memory allocated
+CPU_MODES = ("cpu", "all")
+MEMORY_MODES = ("memory", "all")
+
+
+def summarise_profile(profile: cProfile.Profile, top: int) -> List[Dict[str, Any]]:
+    """
+    :params profile: the profile of the invocation
+    :params top: the number of functions to summarise
+    :returns: the functions taking the most cumulative time, slowest first
+    """
+    stats = pstats.Stats(profile).sort_stats(pstats.SortKey.CUMULATIVE).get_stats_profile()
+    functions: List[Dict[str, Any]] = []
+    # the profiles are in the order sorted, timed to the millisecond
+    for name, function in itertools.islice(stats.func_profiles.items(), top):
+        functions.append(
+            {
+                "function": f"{os.path.basename(function.file_name)}:{function.line_number}({name})",
+                # the total calls, followed by the primitive calls when recursive
+                "calls": int(function.ncalls.split("/")[0]),
+                "tottime_ms": round(function.tottime * 1000, 3),
+                "cumtime_ms": round(function.cumtime * 1000, 3),
+            }
+        )
+    return functions
+
+
+def summarise_snapshot(snapshot: tracemalloc.Snapshot, top: int) -> List[Dict[str, Any]]:
+    """
+    :params snapshot: the allocations made by the invocation, still held at its end
+    :params top: the number of allocation sites to summarise
+    :returns: the lines holding the most memory, largest first
+    """
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    sites: List[Dict[str, Any]] = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+        )
+    return sites
+
+
+class InvocationProfiler:
+    """
+    Profiles a sample of the invocations of a handler, logging a summary of each
+
+    Only the handler's own thread is profiled by cProfile; the posts made by the
+    delivery workers show as the time the handler waited on them. tracemalloc traces
+    the allocations of every thread.
+    """
+
+    def __init__(
+        self,
+        mode: str = PROFILING_MODE,
+        sample_rate: int = PROFILING_SAMPLE_RATE,
+        top: int = PROFILING_TOP,
+        sampler: Callable[[int], int] = random.randrange,
+    ):
+        self.cpu = mode in CPU_MODES
+        self.memory = mode in MEMORY_MODES
+        self.sample_rate = max(sample_rate, 1)
+        self.top = top
+        self.sampler = sampler
+
+    @property
+    def enabled(self) -> bool:
+        """
+        :returns: True if any invocations are profiled
+        """
+        return self.cpu or self.memory
+
+    def profile(self, handler: Callable) -> Callable:
+        """
+        Decorate the handler, profiling a sample of its invocations
+
+        :params handler: the lambda handler
+        :returns: the handler unchanged if disabled, else the handler profiled
+        """
+        if not self.enabled:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if self.sampler(self.sample_rate) != 0:
+                return handler(*args, **kwargs)
+            return self.run(handler, *args, **kwargs)
+
+        return wrapper
+
+    def run(self, handler: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Invoke the handler profiled, logging the summary once it returns or raises
+
+        :params handler: the lambda handler
+        :returns: the result of the handler
+        """
+        started = time.perf_counter()
+        profile: Optional[cProfile.Profile] = None
+        if self.cpu:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                # another profiler, e.g. a debugger, is already active on the thread
+                logger.warning(f"Unable to profile the invocation: {e}")
+                profile = None
+
+        # tracing already, e.g. under a test, leaves the tracing to its owner
+        tracing = self.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+            summary: Dict[str, Any] = {"duration_ms": round(duration_ms, 3)}
+            if tracing:
+                snapshot = tracemalloc.take_snapshot()
+                summary["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                summary["allocations"] = summarise_snapshot(snapshot, self.top)
+            if profile is not None:
+                summary["functions"] = summarise_profile(profile, self.top)
+            logger.info("Invocation profile", **summary)
+
+
+# Create a singleton instance
+invocation_profiler = InvocationProfiler()
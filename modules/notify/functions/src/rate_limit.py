@@ -0,0 +1,307 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+logger = Logger()
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+metrics = Metrics(namespace=powertools_namespace)
+
+# The sustained posts per second, and the burst above it, each vendor accepts per
+#  webhook; a rate of zero disables the pacing
+SLACK_WEBHOOK_RATE = float(os.environ.get("SLACK_WEBHOOK_RATE", "1"))
+SLACK_WEBHOOK_BURST = int(os.environ.get("SLACK_WEBHOOK_BURST", "4"))
+TEAMS_WEBHOOK_RATE = float(os.environ.get("TEAMS_WEBHOOK_RATE", "4"))
+TEAMS_WEBHOOK_BURST = int(os.environ.get("TEAMS_WEBHOOK_BURST", "4"))
+# The longest a post waits on the rate limit, or a Retry-After, before it is failed to
+#  be retried by a later invocation
+WEBHOOK_MAX_WAIT_SECONDS = float(os.environ.get("WEBHOOK_MAX_WAIT_SECONDS", "5"))
+# An optional DynamoDB table counting the posts to each webhook per second, sharing the
+#  rate between the concurrent lambda containers
+WEBHOOK_RATE_TABLE = os.environ.get("WEBHOOK_RATE_TABLE", "")
+
+VENDOR_RATES: Dict[str, Tuple[float, int]] = {
+    "slack": (SLACK_WEBHOOK_RATE, SLACK_WEBHOOK_BURST),
+    "teams": (TEAMS_WEBHOOK_RATE, TEAMS_WEBHOOK_BURST),
+}
+
+# The wait assumed when the vendor throttles without a Retry-After
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+# The most times a throttled post is retried within the invocation
+WEBHOOK_THROTTLED_RETRIES = 2
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> float:
+    """
+    Parse the Retry-After header, given either as seconds or as an HTTP date
+
+    :params value: the header value, if any
+    :params now: the current epoch time, defaults to the time now
+    :returns: the seconds to wait before posting again
+    """
+    if not value:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.warning("Unexpected Retry-After header", retry_after=value)
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(at.timestamp() - now, 0.0)
+
+
+class TokenBucket:
+    """
+    Paces the posts to a webhook at a sustained rate, allowing a burst above it
+
+    Each post reserves the next slot under the lock, then waits for it outside the lock,
+    so the delivery workers sharing the webhook are spaced out rather than racing. A
+    rate of zero only holds back the posts while paused.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        # how far ahead of the sustained rate a burst may run
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self.clock = clock
+        # the theoretical time the next post is due at the sustained rate
+        self.due = 0.0
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Reserve a slot to post in
+
+        :params max_wait: the longest the post may wait for its slot
+        :returns: the seconds to wait for the slot, or None if not reserved in time
+        """
+        with self.lock:
+            now = self.clock()
+            start = max(now, self.paused_until)
+            due = max(self.due, start)
+            wait = max(start, due - self.tolerance) - now
+            if wait > max_wait:
+                return None
+
+            self.due = due + self.interval
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every post to the webhook, as the vendor asked with a Retry-After
+
+        :params seconds: how long to hold back
+        """
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class SharedRateCounter:
+    """
+    Counts the posts to each webhook per second in a DynamoDB table, so the concurrent
+    lambda containers share the vendor's rate
+
+    The table is keyed by the string attribute "id", with "expires_at" as its time to
+    live attribute. The counter fails open, only the local pacing then applies.
+    """
+
+    def __init__(self, table_name: str, client: Optional[Any] = None):
+        self.table_name = table_name
+        self.client = client
+        self.lock = threading.Lock()
+
+    def get_client(self) -> Any:
+        """Get the DynamoDB client, importing boto3 and creating the client on first use
+
+        :returns: DynamoDB client
+        """
+        with self.lock:
+            if self.client is None:
+                import boto3
+
+                self.client = boto3.client("dynamodb")
+
+        return self.client
+
+    def acquire(self, key: str, limit: int, second: int) -> bool:
+        """
+        Count a post to the webhook within the second, unless the limit is reached
+
+        :params key: identifies the webhook
+        :params limit: the most posts to the webhook within a second
+        :params second: the epoch second of the post
+        :returns: False if the webhook's limit for the second is already reached
+        """
+        try:
+            self.get_client().update_item(
+                TableName=self.table_name,
+                Key={"id": {"S": f"{key}:{second}"}},
+                UpdateExpression="ADD posts :one SET expires_at = :expires_at",
+                ConditionExpression="attribute_not_exists(posts) OR posts < :limit",
+                ExpressionAttributeValues={
+                    ":one": {"N": "1"},
+                    ":limit": {"N": str(limit)},
+                    ":expires_at": {"N": str(second + 60)},
+                },
+            )
+        except Exception as e:
+            error = getattr(e, "response", {}).get("Error", {})
+            if error.get("Code") == "ConditionalCheckFailedException":
+                return False
+            logger.warning(f"Failed to count the webhook post: {e}")
+
+        return True
+
+
+class WebhookRateLimiter:
+    """
+    Paces the posts to each webhook url at its vendor's rate, within an invocation and,
+    with the shared counter, across the concurrent containers
+    """
+
+    def __init__(
+        self,
+        vendor_rates: Dict[str, Tuple[float, int]] = VENDOR_RATES,
+        max_wait: float = WEBHOOK_MAX_WAIT_SECONDS,
+        shared: Optional[SharedRateCounter] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.vendor_rates = vendor_rates
+        self.max_wait = max_wait
+        self.shared = shared
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, vendor: str, url: str) -> TokenBucket:
+        """
+        :params vendor: the name of the delivery channel
+        :params url: the webhook url
+        :returns: the bucket of the webhook
+        """
+        key = webhook_key(url)
+        with self.lock:
+            if key not in self.buckets:
+                rate, burst = self.vendor_rates.get(vendor, (0, 0))
+                self.buckets[key] = TokenBucket(rate=rate, burst=burst, clock=self.clock)
+            return self.buckets[key]
+
+    def acquire(self, vendor: str, url: str, max_wait: float) -> bool:
+        """
+        Wait for the webhook's next slot to post in
+
+        :params vendor: the name of the delivery channel
+        :params url: the webhook url
+        :params max_wait: the longest to wait
+        :returns: False if no slot was available within the wait
+        """
+        deadline = self.clock() + max_wait
+        wait = self.bucket(vendor, url).reserve(max_wait=max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            self.sleep(wait)
+
+        rate, _ = self.vendor_rates.get(vendor, (0, 0))
+        if self.shared is None or rate <= 0:
+            return True
+
+        while not self.shared.acquire(webhook_key(url), limit=max(int(rate), 1), second=int(time.time())):
+            # wait for the next second, when the webhook's count starts again
+            wait = 1.0 - time.time() % 1.0
+            if self.clock() + wait > deadline:
+                return False
+            self.sleep(wait)
+
+        return True
+
+    def throttled(self, vendor: str, url: str, retry_after: float) -> None:
+        """
+        Hold back the webhook's posts after the vendor throttled a post
+
+        :params vendor: the name of the delivery channel
+        :params url: the webhook url
+        :params retry_after: the seconds the vendor asked to wait
+        """
+        logger.warning(f"Throttled by {vendor}", retry_after=retry_after)
+        metrics.add_metric(name="WebhookThrottled", unit=MetricUnit.Count, value=1)
+        self.bucket(vendor, url).pause(retry_after)
+
+    def post(
+        self,
+        vendor: str,
+        url: str,
+        send: Callable[[], Any],
+        max_wait: Optional[float] = None,
+    ) -> Optional[Any]:
+        """
+        Post to the webhook at its vendor's rate, retrying a throttled post after the
+        Retry-After the vendor asked for, when that is within the wait
+
+        :params vendor: the name of the delivery channel
+        :params url: the webhook url
+        :params send: posts to the webhook, returning the urllib3 response
+        :params max_wait: the longest to wait, defaults to the limiter's
+        :returns: the vendor's response, or None if the post could not be made in time
+        """
+        deadline = self.clock() + (self.max_wait if max_wait is None else max_wait)
+        response = None
+        for _ in range(WEBHOOK_THROTTLED_RETRIES + 1):
+            if not self.acquire(vendor, url, max_wait=max(deadline - self.clock(), 0)):
+                logger.warning(f"Rate limited posting to {vendor}")
+                metrics.add_metric(name="WebhookRateLimited", unit=MetricUnit.Count, value=1)
+                return response
+
+            response = send()
+            if response.status != 429:
+                return response
+
+            self.throttled(vendor, url, parse_retry_after(response.headers.get("Retry-After")))
+
+        return response
+
+
+def webhook_key(url: str) -> str:
+    """
+    :params url: the webhook url
+    :returns: an identifier of the webhook which does not reveal its url
+    """
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
+
+def get_shared_rate_counter() -> Optional[SharedRateCounter]:
+    """
+    :returns: the shared counter when a table is configured
+    """
+    if WEBHOOK_RATE_TABLE:
+        return SharedRateCounter(table_name=WEBHOOK_RATE_TABLE)
+
+    return None
+
+
+# Create a singleton instance
+webhook_rate_limiter = WebhookRateLimiter(shared=get_shared_rate_counter())
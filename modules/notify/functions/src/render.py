@@ -1,4 +1,171 @@
-from typing import Any, Dict, Optional, Self, Union
+import json
+import re
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, Optional, Self
+
+from notification_document import NotificationDocument
+from stage_metrics import stage
+
+# A slot of a payload template, as encoded in the template skeleton
+SLOT_PATTERN = re.compile(r'"@@(\w+)@@"')
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialise the rendered payload into the JSON request body posted to the vendor
+
+    :params payload: the rendered payload
+    :returns: the compact, UTF-8 encoded JSON
+    """
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Encodes a string filling a template slot as a JSON literal, as in encode_payload
+encode_string = encode_basestring
+
+
+def slot(name: str) -> str:
+    """
+    :params name: name of the slot
+    :returns: the placeholder marking the slot in a template skeleton
+    """
+    return f"@@{name}@@"
+
+
+class PayloadTemplate:
+    """
+    A payload skeleton encoded once, with slots filled by already encoded JSON
+
+    The constant parts of the payload are encoded when the template is compiled, so
+    rendering is a join of strings, rather than building and encoding a dict tree for
+    each message.
+    """
+
+    template: str
+    # fills the slots, given the encoded JSON of each slot by name; returns the payload
+    render: Callable[..., str]
+
+    def __init__(self, skeleton: Any):
+        encoded = json.dumps(skeleton, separators=(",", ":"), ensure_ascii=False)
+        # compiled into a format string: the JSON braces escaped, the slots as fields
+        escaped = encoded.replace("{", "{{").replace("}", "}}")
+        self.template = SLOT_PATTERN.sub(r"{\1}", escaped)
+        self.render = self.template.format
+
+
+def encoded_size(text: str) -> int:
+    """
+    :params text: the encoded JSON
+    :returns: its size in bytes, once UTF-8 encoded
+    """
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def string_size(text: str) -> int:
+    """
+    :params text: the text filling a template slot
+    :returns: its size in bytes, once encoded as a JSON literal
+    """
+    return encoded_size(encode_string(text))
+
+
+# Marks the text cut short to fit the payload
+ELLIPSIS = "\u2026"
+
+
+def clip(text: str, room: int, size: Callable[[str], int] = len) -> str:
+    """
+    :params text: the text
+    :params room: the room for the text
+    :params size: the size of the text, as rendered
+    :returns: the text, cut short with an ellipsis if it does not fit the room
+    """
+    if size(text) <= room:
+        return text
+
+    # a character may be several units of size, so search for the most characters kept
+    #  which fit, rather than cutting the overflow in units from the characters
+    keep, over = 0, len(text)
+    while over - keep > 1:
+        middle = (keep + over) // 2
+        if size(text[:middle] + ELLIPSIS) <= room:
+            keep = middle
+        else:
+            over = middle
+    return text[:keep] + ELLIPSIS
+
+
+class PayloadBudget:
+    """
+    The room left in a vendor payload, spent as the fields are rendered
+
+    The text always rendered is cut short to the room left. The fields are rendered in
+    order until the next no longer fits, which is cut short to the room left, if any;
+    room is kept in reserve for the summary of those left out after it. Only the
+    fields which fit are ever rendered, however large the notification.
+    """
+
+    remaining: int
+    entries: int
+    full: bool
+
+    def __init__(self, limit: int, reserve: int = 0):
+        self.remaining = limit - reserve
+        self.entries = 0
+        self.full = False
+
+    def spend(self, size: int) -> None:
+        """
+        Spend room on a part of the payload which is always rendered
+
+        :params size: the size of the part
+        """
+        self.remaining -= size
+
+    def shorten(self, text: str, size: Callable[[str], int] = len) -> str:
+        """
+        Spend room on text which is always rendered, cut short to the room left
+
+        :params text: the text
+        :params size: the size of the text, as rendered
+        :returns: the text, cut short with an ellipsis if larger than the room left
+        """
+        text = clip(text, max(self.remaining, 0), size)
+        self.remaining -= size(text)
+        return text
+
+    def fit(self, size: int) -> bool:
+        """
+        Spend room on the next entry, if it fits
+
+        :params size: the size of the entry
+        :returns: True if the entry fits, False once the budget is spent
+        """
+        if self.full or size > self.remaining:
+            self.full = True
+            return False
+
+        self.remaining -= size
+        self.entries += 1
+        return True
+
+    def cut(self, text: str, overhead: int, size: Callable[[str], int] = len) -> Optional[str]:
+        """
+        Spend the room left on the entry which did not fit, cut short
+
+        :params text: the text of the entry
+        :params overhead: the size of the rest of the entry
+        :params size: the size of the text, as rendered
+        :returns: the text cut short with an ellipsis, or None if there is no room for it
+        """
+        room = self.remaining - overhead
+        if room <= size(ELLIPSIS):
+            return None
+
+        text = clip(text, room, size)
+        self.remaining -= overhead + size(text)
+        self.entries += 1
+        return text
 
 
 class Render:
@@ -13,9 +180,16 @@ class Render:
   Must override this method
   """
 
-    def payload(
-        parsedMessage: Union[str, Dict],
-        originalMessage: Union[str, Dict],
-        subject: Optional[str] = None,
-    ) -> Dict:
+    def payload(self: Self, document: NotificationDocument) -> Dict:
         raise NotImplementedError
+
+    def body(self: Self, document: NotificationDocument) -> bytes:
+        """
+        Render the notification document into the request body posted to the vendor
+
+        :params document: notification document
+        :returns: the encoded payload
+        """
+        payload = self.payload(document=document)
+        with stage("serialise"):
+            return encode_payload(payload)
@@ -2,7 +2,7 @@ import json
 import logging
 import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import urllib3
 
@@ -16,6 +16,7 @@ class ParameterStoreClient:
         self.is_initialized = False
         self.max_init_time = max_init_time
         self.session_token = os.environ.get("AWS_SESSION_TOKEN")
+        self.ssm: Optional[Any] = None
 
     def initialize(self) -> bool:
         """
@@ -42,9 +43,7 @@ class ParameterStoreClient:
         logger.error("Failed to initialize extension")
         return False
 
-    def get_parameter(
-        self, parameter_arn: str, max_retries: int = 3, delay_seconds: int = 1
-    ) -> Dict[str, Any]:
+    def get_parameter(self, parameter_arn: str, max_retries: int = 3, delay_seconds: int = 1) -> Dict[str, Any]:
         """
         Get parameter using the extension
         """
@@ -57,15 +56,11 @@ class ParameterStoreClient:
             return self._fallback_get_parameter(parameter_arn)
 
         headers = {"X-Aws-Parameters-Secrets-Token": self.session_token}
-        endpoint = (
-            f"http://localhost:2773/systemsmanager/parameters/get?name={parameter_arn}"
-        )
+        endpoint = f"http://localhost:2773/systemsmanager/parameters/get?name={parameter_arn}"
 
         for attempt in range(max_retries):
             try:
-                logger.info(
-                    f"Retrieving parameter: {parameter_arn} (attempt {attempt + 1}/{max_retries})"
-                )
+                logger.info(f"Retrieving parameter: {parameter_arn} (attempt {attempt + 1}/{max_retries})")
                 response = self.http.request("GET", endpoint, headers=headers)
 
                 if response.status == 200:
@@ -73,9 +68,7 @@ class ParameterStoreClient:
                     logger.info("Parameter retrieved successfully")
                     return json.loads(parameter_data["Parameter"]["Value"])
 
-                logger.warning(
-                    f"Failed to retrieve parameter. Status: {response.status}"
-                )
+                logger.warning(f"Failed to retrieve parameter. Status: {response.status}")
 
                 if attempt < max_retries - 1:
                     wait_time = delay_seconds * (2**attempt)
@@ -106,6 +99,29 @@ class ParameterStoreClient:
             logger.error(f"Fallback failed: {str(e)}")
             return {}
 
+    def get_parameters(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several parameters in bulk, ten at a time
+
+        Parameters which do not exist are absent from the result.
+        """
+        import boto3
+
+        if self.ssm is None:
+            self.ssm = boto3.client("ssm")
+
+        parameters: Dict[str, Dict[str, Any]] = {}
+        pending = list(names)
+        while pending:
+            batch, pending = pending[:10], pending[10:]
+            response = self.ssm.get_parameters(Names=batch, WithDecryption=True)
+            for parameter in response["Parameters"]:
+                parameters[parameter["Name"]] = json.loads(parameter["Value"])
+            if response.get("InvalidParameters"):
+                logger.info(f"Parameters not found: {response['InvalidParameters']}")
+
+        return parameters
+
 
 # Create a singleton instance
 parameter_store = ParameterStoreClient()
@@ -117,3 +133,10 @@ def get_parameter(parameter_arn: str) -> Dict[str, Any]:
     Public function to get parameters
     """
     return parameter_store.get_parameter(parameter_arn)
+
+
+def get_parameters(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Public function to get several parameters in bulk
+    """
+    return parameter_store.get_parameters(names)
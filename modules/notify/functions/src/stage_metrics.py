@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from aws_lambda_powertools.metrics import EphemeralMetrics, MetricResolution, MetricUnit
+
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+
+# Whether the stages of each record are timed, emitted as high resolution metrics with
+#  the action and channel as dimensions; each combination is a custom metric
+STAGE_METRICS_ENABLED = os.environ.get("STAGE_METRICS_ENABLED", "false").lower() == "true"
+
+# The stages a record is timed through, in order, and their metric names
+STAGES = {
+    "classify": "ClassifyStageLatency",
+    "parse": "ParseStageLatency",
+    "enrich": "EnrichStageLatency",
+    "render": "RenderStageLatency",
+    "serialise": "SerialiseStageLatency",
+    "deliver": "DeliverStageLatency",
+}
+
+
+class StageTimer:
+    """
+    The time each stage of a record took
+
+    Stages may nest, e.g. the account lookup within parsing; the time of a nested stage
+    is not counted in the stage around it.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.elapsed: Dict[str, float] = {}
+        self.nested: List[float] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = self.clock()
+        self.nested.append(0.0)
+        try:
+            yield
+        finally:
+            total = self.clock() - started
+            self.add(name, total - self.nested.pop())
+            if self.nested:
+                self.nested[-1] += total
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        :params name: the name of the stage
+        :params seconds: the time the stage took
+        """
+        self.elapsed[name] = self.elapsed.get(name, 0.0) + seconds * 1000
+
+
+# The timer of the record being processed, if its stages are timed
+current_timer: ContextVar[Optional[StageTimer]] = ContextVar("current_timer", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a stage of the record being processed; does nothing unless it is timed
+
+    :params name: the name of the stage
+    """
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    with timer.stage(name):
+        yield
+
+
+class StageMetrics:
+    """
+    Emits the stage timings, payload size and webhook status of each delivery
+
+    The metrics of an invocation are held per action and channel, each combination
+    flushed as a single EMF blob at the end of the invocation, with a value for each
+    record.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = STAGE_METRICS_ENABLED,
+        namespace: str = powertools_namespace,
+    ):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.metrics: Dict[Tuple[str, str], EphemeralMetrics] = {}
+        self.lock = threading.Lock()
+
+    def timer(self) -> Optional[StageTimer]:
+        """
+        :returns: a timer for the stages of a record, or None if disabled
+        """
+        return StageTimer() if self.enabled else None
+
+    @contextmanager
+    def timing(self, timer: Optional[StageTimer]) -> Iterator[None]:
+        """
+        Time the stages within, as those of the record
+
+        :params timer: the timer of the record, or None if not timed
+        """
+        token = current_timer.set(timer)
+        try:
+            yield
+        finally:
+            current_timer.reset(token)
+
+    def emit(
+        self,
+        action: str,
+        channel: str,
+        timings: Dict[str, float],
+        payload_bytes: int,
+        status: Optional[int],
+    ) -> None:
+        """
+        Add the metrics of a delivery
+
+        :params action: the action of the notification, e.g. CloudWatch
+        :params channel: the name of the delivery channel
+        :params timings: the milliseconds each stage took
+        :params payload_bytes: the size of the request body
+        :params status: the webhook response code, None if not posted
+        """
+        if not self.enabled:
+            return
+
+        with self.lock:
+            key = (action or "Unknown", channel)
+            if key not in self.metrics:
+                self.metrics[key] = EphemeralMetrics(namespace=self.namespace)
+                self.metrics[key].add_dimension(name="action", value=key[0])
+                self.metrics[key].add_dimension(name="channel", value=channel)
+            metrics = self.metrics[key]
+
+            for name, ms in timings.items():
+                metrics.add_metric(
+                    name=STAGES[name],
+                    unit=MetricUnit.Milliseconds,
+                    value=ms,
+                    resolution=MetricResolution.High,
+                )
+            metrics.add_metric(
+                name="PayloadBytes",
+                unit=MetricUnit.Bytes,
+                value=payload_bytes,
+                resolution=MetricResolution.High,
+            )
+            if status is not None:
+                metrics.add_metric(name=f"WebhookStatus_{status}", unit=MetricUnit.Count, value=1)
+
+    def flush(self) -> None:
+        """
+        Publish the metrics of the invocation, per action and channel
+        """
+        with self.lock:
+            pending, self.metrics = self.metrics, {}
+
+        for metrics in pending.values():
+            metrics.flush_metrics()
+
+
+# Create a singleton instance
+stage_metrics = StageMetrics()
@@ -0,0 +1,135 @@
+import os
+from typing import Dict, Optional
+
+import urllib3
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+logger = Logger()
+powertools_namespace = os.environ["POWERTOOLS_SERVICE_NAME"]
+metrics = Metrics(namespace=powertools_namespace)
+
+# Explicit timeouts, so a slow webhook cannot hang the invocation
+WEBHOOK_CONNECT_TIMEOUT = float(os.environ.get("WEBHOOK_CONNECT_TIMEOUT", "2"))
+WEBHOOK_READ_TIMEOUT = float(os.environ.get("WEBHOOK_READ_TIMEOUT", "5"))
+# Enough connections per host for each of the concurrent delivery workers
+WEBHOOK_MAX_CONNECTIONS_PER_HOST = int(
+    os.environ.get("WEBHOOK_MAX_CONNECTIONS_PER_HOST") or os.environ.get("DELIVERY_CONCURRENCY", "4")
+)
+
+# The shortest timeout a request is made with, however close the invocation deadline
+MINIMUM_REQUEST_TIMEOUT = 0.05
+
+
+class VendorResponse:
+    """The outcome of posting to the vendor webhook"""
+
+    code: int
+    info: str
+
+    def __init__(self, code: int, info: str) -> None:
+        self.code = code
+        self.info = info
+
+
+class WebhookClient:
+    """
+    Pooled HTTPS client for posting to the vendor webhooks
+
+    Created once per container, so the connections (and their TLS sessions) to Slack
+    and Teams are kept alive and reused across warm invocations.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = WEBHOOK_CONNECT_TIMEOUT,
+        read_timeout: float = WEBHOOK_READ_TIMEOUT,
+        max_connections_per_host: int = WEBHOOK_MAX_CONNECTIONS_PER_HOST,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=max_connections_per_host,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            # only retry establishing the connection; a POST that reached the vendor is never resent
+            retries=urllib3.Retry(total=2, connect=2, read=False, redirect=False, status=0),
+        )
+        self.reported: Dict[str, int] = {"requests": 0, "new_connections": 0}
+
+    def post(
+        self,
+        url: str,
+        body: bytes,
+        headers: Dict[str, str],
+        timeout: Optional[float] = None,
+    ) -> urllib3.BaseHTTPResponse:
+        """
+        Post the body to the webhook, reusing a pooled connection where possible
+
+        :params url: the webhook url
+        :params body: the encoded request body
+        :params headers: the request headers
+        :params timeout: the seconds left to the invocation deadline, if any; the
+                         connect and read timeouts are capped to it
+        :returns: the response, with the body already read
+        """
+        if timeout is None:
+            return self.http.request("POST", url, body=body, headers=headers)
+
+        timeout = max(timeout, MINIMUM_REQUEST_TIMEOUT)
+        return self.http.request(
+            "POST",
+            url,
+            body=body,
+            headers=headers,
+            timeout=urllib3.Timeout(
+                connect=min(self.connect_timeout, timeout),
+                read=min(self.read_timeout, timeout),
+            ),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Totals of requests made and connections opened by the pools currently held
+
+        :returns: counts of requests, new connections and reused connections
+        """
+        requests = 0
+        new_connections = 0
+        for key in self.http.pools.keys():
+            pool = self.http.pools.get(key)
+            if pool is None:
+                continue
+            requests += pool.num_requests
+            new_connections += pool.num_connections
+
+        return {
+            "requests": requests,
+            "new_connections": new_connections,
+            "reused_connections": requests - new_connections,
+        }
+
+    def add_connection_metrics(self) -> None:
+        """
+        Add metrics for the connections opened and reused since last reported
+        """
+        stats = self.stats()
+        requests = stats["requests"] - self.reported["requests"]
+        new_connections = stats["new_connections"] - self.reported["new_connections"]
+        self.reported = stats
+
+        if requests <= 0:
+            return
+
+        logger.debug("Webhook connections", stats=stats)
+        metrics.add_metric(name="WebhookConnectionsNew", unit=MetricUnit.Count, value=new_connections)
+        metrics.add_metric(
+            name="WebhookConnectionsReused",
+            unit=MetricUnit.Count,
+            value=requests - new_connections,
+        )
+
+
+# Create a singleton instance
+webhook_client = WebhookClient()
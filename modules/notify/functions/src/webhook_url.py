@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from aws_lambda_powertools import Logger
+
+from msg_parser import decrypt_url
+
+logger = Logger()
+
+# How long a decrypted webhook url is reused before decrypting again
+WEBHOOK_URL_CACHE_TTL = int(os.environ.get("WEBHOOK_URL_CACHE_TTL", "900"))
+
+# Vendor responses indicating the webhook url itself is no longer valid
+WEBHOOK_URL_INVALID_CODES = (401, 403, 404, 410)
+
+
+class WebhookUrlCache:
+    """
+    Memoises the decrypted webhook urls for the life of the container
+
+    Webhook urls are optionally KMS encrypted; decrypting on every post adds a KMS round
+    trip to each message and consumes the KMS request quota during alert storms.
+    """
+
+    def __init__(
+        self,
+        decrypt: Callable[[str], str] = decrypt_url,
+        ttl: int = WEBHOOK_URL_CACHE_TTL,
+    ):
+        self.decrypt = decrypt
+        self.ttl = ttl
+        self.entries: Dict[str, Tuple[str, float]] = {}
+        self.locks: Dict[str, threading.Lock] = {}
+        self.lock = threading.Lock()
+
+    def get(self, env_name: str) -> str:
+        """
+        Get the plaintext webhook url held in the environment variable
+
+        :params env_name: name of the environment variable holding the (encrypted) url
+        :returns: plaintext url
+        """
+        value = os.environ[env_name]
+        if value.startswith("http"):
+            return value
+
+        entry = self.entries.get(value)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        # one decrypt per url, however many delivery workers are waiting on it
+        with self.lock:
+            url_lock = self.locks.setdefault(value, threading.Lock())
+        with url_lock:
+            entry = self.entries.get(value)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+
+            url = self.decrypt(value)
+            self.entries[value] = (url, time.monotonic() + self.ttl)
+            logger.debug("Decrypted webhook url", env_name=env_name)
+            return url
+
+    def invalidate(self, env_name: str) -> None:
+        """
+        Forget the decrypted url, so the next post decrypts again
+
+        :params env_name: name of the environment variable holding the (encrypted) url
+        """
+        value = os.environ.get(env_name, "")
+        if self.entries.pop(value, None):
+            logger.info("Invalidated cached webhook url", env_name=env_name)
+
+    def prefetch(self, env_names: List[str]) -> None:
+        """
+        Decrypt the webhook urls concurrently, typically during the lambda init phase
+
+        Failures are logged and left for the first post to retry.
+
+        :params env_names: names of the environment variables holding the (encrypted) urls
+        """
+
+        encrypted = [env_name for env_name in env_names if not (os.environ.get(env_name) or "http").startswith("http")]
+
+        def fetch(env_name: str) -> None:
+            try:
+                self.get(env_name)
+            except Exception as e:
+                logger.warning(f"Failed to prefetch webhook url: {e}", env_name=env_name)
+
+        if len(encrypted) <= 1:
+            for env_name in encrypted:
+                fetch(env_name)
+            return
+
+        with ThreadPoolExecutor(max_workers=len(encrypted)) as executor:
+            list(executor.map(fetch, encrypted))
+
+
+# Create a singleton instance
+webhook_urls = WebhookUrlCache()
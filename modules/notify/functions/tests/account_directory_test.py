@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Account Directory Test
+----------------------
+
+Unit tests for the account id to name lookups in `account_directory.py`
+
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+from account_directory import AccountDirectory, AccountIndex, ShardedAccountDirectory
+
+
+def test_account_directory_lookup():
+    directory = AccountDirectory(loader=lambda: {"123456789012": "production"})
+    directory.start()
+
+    assert directory.get("123456789012", "") == "production"
+    assert directory.get("210987654321", "") == ""
+
+
+def test_account_directory_slow_load_falls_back_to_account_id():
+    """
+    Lookups wait at most the shared budget, then show the raw account id
+    """
+    release = threading.Event()
+
+    def loader():
+        release.wait()
+        return {"123456789012": "production"}
+
+    directory = AccountDirectory(loader=loader, wait_seconds=0.05)
+
+    assert directory.get("123456789012", "") == "123456789012"
+    # the budget is spent, later lookups no longer wait
+    assert directory.get("123456789012", "") == "123456789012"
+
+    release.set()
+    directory.thread.join()
+    assert directory.get("123456789012", "") == "production"
+
+
+def test_account_directory_failed_load():
+    def loader():
+        raise RuntimeError("throttled")
+
+    directory = AccountDirectory(loader=loader)
+
+    assert directory.get("123456789012", "") == ""
+
+
+def _counting_loader(mappings):
+    """
+    Loader returning each of the mappings in turn, counting the loads
+    """
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return mappings[min(len(loads), len(mappings)) - 1]
+
+    return loader, loads
+
+
+def test_account_directory_refreshes_when_stale():
+    """
+    An expired mapping is still used, while it refreshes in the background
+    """
+    loader, loads = _counting_loader([{"1": "before"}, {"1": "after"}])
+    directory = AccountDirectory(loader=loader, ttl=0)
+    directory.start()
+
+    assert directory.get("1", "") == "before"
+    directory.thread.join()
+    assert len(loads) == 2
+    assert directory.get("1", "") == "after"
+
+
+def test_account_directory_negative_caching():
+    """
+    An unknown account id triggers one refresh, until the negative ttl expires
+    """
+    loader, loads = _counting_loader([{"1": "one"}, {"1": "one", "2": "two"}])
+    directory = AccountDirectory(loader=loader, ttl=3600, negative_ttl=3600)
+    directory.start()
+    directory.thread.join()
+
+    # loaded just now, so the unknown id is remembered without refreshing
+    assert directory.get("2", "") == ""
+    assert directory.get("2", "") == ""
+    assert len(loads) == 1
+
+    directory.unknown.clear()
+    directory.loaded_at -= 3601
+    assert directory.get("2", "") == ""
+    directory.thread.join()
+    assert len(loads) == 2
+    assert directory.get("2", "") == "two"
+    assert directory.unknown == {}
+
+
+def test_account_directory_keeps_mapping_on_failed_refresh():
+    loader, loads = _counting_loader([{"1": "one"}, {}])
+    directory = AccountDirectory(loader=loader, ttl=0)
+    directory.start()
+    directory.thread.join()
+
+    directory.get("1", "")
+    directory.thread.join()
+    assert len(loads) == 2
+    assert directory.get("1", "") == "one"
+
+
+def test_account_index():
+    index = AccountIndex({"012345678901": "production", "210987654321": "staging"})
+
+    assert len(index) == 2
+    assert index.get("012345678901") == "production"
+    assert index.get("12345678901") == "production"
+    assert index.get("012345678902", "") == ""
+    assert index.get("not-an-id", "") == ""
+    assert "210987654321" in index
+
+
+def test_sharded_account_directory_loads_referenced_shards_in_bulk():
+    """
+    Only the shards of the referenced accounts are fetched, together in one request
+    """
+    parameters = {
+        "/accounts/01": {"012345678901": "production"},
+        "/accounts/21": {"210987654321": "staging"},
+        "/accounts/99": {"999999999999": "unreferenced"},
+    }
+    fetched = []
+
+    def fetch(names):
+        fetched.append(names)
+        return {name: parameters[name] for name in names if name in parameters}
+
+    directory = ShardedAccountDirectory(parameter_path="/accounts/", prefix_length=2, fetch=fetch)
+    directory.prefetch(["012345678901", "210987654321", "012345678902", "555555555555"])
+    directory.shard("01").thread.join()
+
+    assert fetched == [["/accounts/01", "/accounts/21", "/accounts/55"]]
+    assert directory.get("012345678901", "") == "production"
+    assert directory.get("210987654321", "") == "staging"
+    assert directory.get("555555555555", "") == ""
+    assert len(fetched) == 1
+
+    # a shard not prefetched is loaded on first use
+    assert directory.get("999999999999", "") == "unreferenced"
+    assert fetched[1] == ["/accounts/99"]
+
+
+def test_sharded_account_directory_budget_restarts_each_batch():
+    """
+    A shard first referenced by a later batch is waited on, after an earlier batch
+    spent its budget on a slow shard
+    """
+    release = threading.Event()
+    parameters = {
+        "/accounts/01": {"012345678901": "production"},
+        "/accounts/21": {"210987654321": "staging"},
+    }
+
+    def fetch(names):
+        if "/accounts/01" in names:
+            release.wait()
+        time.sleep(0.05)
+        return {name: parameters[name] for name in names if name in parameters}
+
+    directory = ShardedAccountDirectory(parameter_path="/accounts", prefix_length=2, fetch=fetch, wait_seconds=0.5)
+    directory.prefetch(["012345678901"])
+    assert directory.get("012345678901", "") == "012345678901"
+
+    directory.prefetch(["210987654321"])
+    assert directory.get("210987654321", "") == "staging"
+
+    release.set()
+    directory.shard("01").thread.join()
+    assert directory.get("012345678901", "") == "production"
+
+
+def test_account_index_is_a_mapping():
+    index = AccountIndex({"012345678901": "production"})
+
+    assert dict(index) == {"012345678901": "production"}
+    assert index["012345678901"] == "production"
+    with pytest.raises(KeyError):
+        index["210987654321"]
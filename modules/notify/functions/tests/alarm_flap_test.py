@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Alarm Flap Test
+---------------
+
+Unit tests for suppressing flapping CloudWatch alarms in `alarm_flap.py`
+
+"""
+
+import ast
+import json
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import msg_parser
+from alarm_flap import (
+    AlarmState,
+    AlarmStateStore,
+    FlapSuppressor,
+    InMemoryAlarmStateStore,
+    TableAlarmStateStore,
+)
+from msg_render_slack import SlackRender
+from webhook_client import VendorResponse
+
+ARN = "arn:aws:cloudwatch:eu-west-2:123456789012:alarm:noisy"
+
+
+class ConditionalCheckFailed(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class LocalTable:
+    """Local stand-in for the DynamoDB client, holding the items in a dict"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, TableName, Key, ConsistentRead):
+        item = self.items.get(Key["alarm_arn"]["S"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, TableName, Item, ConditionExpression, ExpressionAttributeValues):
+        last = self.items.get(Item["alarm_arn"]["S"])
+        at = int(ExpressionAttributeValues[":at"]["N"])
+        if last is not None and int(last["at_epoch"]["N"]) > at:
+            raise ConditionalCheckFailed()
+        self.items[Item["alarm_arn"]["S"]] = Item
+
+
+def _suppressor(store=None, window: int = 300):
+    return FlapSuppressor(window_seconds=window, store=store or InMemoryAlarmStateStore())
+
+
+def _posted(suppressor, transitions):
+    return [suppressor.admit(ARN, state=state, at_epoch=at) for state, at in transitions]
+
+
+def test_flapping_alarm_is_suppressed():
+    suppressor = _suppressor()
+
+    assert _posted(
+        suppressor,
+        [
+            ("ALARM", 0),
+            ("OK", 30),
+            ("ALARM", 60),
+            ("OK", 90),
+            ("ALARM", 120),
+            ("OK", 150),
+        ],
+    ) == [0, 0, 0, None, 1, None]
+
+    # once the window has passed, the next transition shows the suppressed count
+    assert suppressor.admit(ARN, state="OK", at_epoch=500) == 1
+
+
+def test_transitions_outside_the_window_are_posted():
+    suppressor = _suppressor()
+
+    assert _posted(
+        suppressor,
+        [("ALARM", 0), ("OK", 30), ("ALARM", 60), ("OK", 90), ("ALARM", 3630)],
+    ) == [0, 0, 0, None, 1]
+
+
+def test_return_to_posted_state_outside_the_window_is_posted():
+    suppressor = _suppressor()
+
+    assert _posted(suppressor, [("ALARM", 0), ("OK", 30), ("INSUFFICIENT_DATA", 60)]) == [0, 0, None]
+    # back to the state last posted, within the window then long after it
+    assert _posted(suppressor, [("OK", 90), ("OK", 5000)]) == [None, 2]
+
+
+def test_lone_recovery_is_posted():
+    suppressor = _suppressor()
+
+    assert _posted(suppressor, [("ALARM", 0), ("OK", 30)]) == [0, 0]
+
+
+def test_alarm_is_never_held_back():
+    suppressor = _suppressor()
+
+    assert _posted(
+        suppressor,
+        [("ALARM", 0), ("OK", 10), ("INSUFFICIENT_DATA", 20), ("ALARM", 30)],
+    ) == [0, 0, None, 1]
+
+
+def test_stale_and_retried_transitions():
+    suppressor = _suppressor()
+
+    assert suppressor.admit(ARN, state="ALARM", at_epoch=100) == 0
+    # redelivered after failing to post
+    assert suppressor.admit(ARN, state="ALARM", at_epoch=100) == 0
+    # arrived out of order
+    assert suppressor.admit(ARN, state="OK", at_epoch=50) is None
+
+
+def test_disabled_posts_everything():
+    suppressor = _suppressor(window=0)
+    messages = [{"alarm_arn": ARN, "state": "ALARM", "at_epoch": 0}] * 3
+
+    assert suppressor.filter(messages) == [(0, 0), (1, 0), (2, 0)]
+
+
+def test_batch_merged_into_latest_transition():
+    suppressor = _suppressor()
+    messages = [
+        {"alarm_arn": ARN, "state": "OK", "at_epoch": 20},
+        {"action": "GuardDuty"},
+        {"alarm_arn": ARN, "state": "ALARM", "at_epoch": 10},
+        {"alarm_arn": ARN + "-other", "state": "ALARM", "at_epoch": 0},
+    ]
+
+    # the alarm is never merged away into the later recovery, so is posted before it
+    assert suppressor.filter(messages) == [(2, 0), (0, 0), (1, 0), (3, 0)]
+
+
+def test_batch_merges_transitions_around_alarm():
+    suppressor = _suppressor()
+    messages = [
+        {"alarm_arn": ARN, "state": "OK", "at_epoch": 0},
+        {"alarm_arn": ARN, "state": "ALARM", "at_epoch": 10},
+        {"alarm_arn": ARN, "state": "INSUFFICIENT_DATA", "at_epoch": 20},
+        {"alarm_arn": ARN, "state": "OK", "at_epoch": 30},
+    ]
+
+    assert suppressor.merge(messages) == [(1, 1), (3, 1)]
+    assert suppressor.filter(messages) == [(1, 1), (3, 1)]
+
+
+def test_table_store_never_regresses():
+    table = LocalTable()
+    store = TableAlarmStateStore(table_name="alarm-states", client=table)
+
+    assert store.get(ARN) is None
+    assert store.put(ARN, AlarmState(state="ALARM", at_epoch=100, previous_at=40))
+    assert not store.put(ARN, AlarmState(state="OK", at_epoch=90))
+
+    alarmState = store.get(ARN)
+    assert (alarmState.state, alarmState.at_epoch, alarmState.previous_at) == (
+        "ALARM",
+        100,
+        40,
+    )
+    assert "expires_at" in table.items[ARN]
+
+
+def test_table_store_shared_between_containers():
+    table = LocalTable()
+    first = _suppressor(store=TableAlarmStateStore("alarm-states", client=table))
+    second = _suppressor(store=TableAlarmStateStore("alarm-states", client=table))
+
+    assert first.admit(ARN, state="ALARM", at_epoch=0) == 0
+    assert second.admit(ARN, state="OK", at_epoch=30) == 0
+    assert first.admit(ARN, state="ALARM", at_epoch=60) == 0
+    assert second.admit(ARN, state="OK", at_epoch=90) is None
+
+
+@pytest.fixture
+def suppressing(monkeypatch):
+    monkeypatch.setattr(msg_parser, "flap_suppressor", _suppressor())
+
+
+def _alarm_record(itemIdentifier: str, state: str, at: str):
+    with open("./tests/messages/cloudwatch_alarm.json", "r") as ofile:
+        record = ast.literal_eval(ofile.read())["Records"][0]
+
+    message = json.loads(record["Sns"]["Message"])
+    message["NewStateValue"] = state
+    message["StateChangeTime"] = at
+    return {
+        **record,
+        "itemIdentifier": itemIdentifier,
+        "Sns": {**record["Sns"], "Message": json.dumps(message)},
+    }
+
+
+def test_parse_sns_posts_latest_transition(suppressing):
+    sent = []
+
+    def send(body):
+        sent.append(json.loads(body))
+        return VendorResponse(code=200, info="")
+
+    failed = msg_parser.parse_sns(
+        snsRecords=[
+            _alarm_record("first", "ALARM", "2024-01-01T00:00:00.000+0000"),
+            _alarm_record("second", "OK", "2024-01-01T00:00:30.000+0000"),
+            _alarm_record("third", "ALARM", "2024-01-01T00:01:00.000+0000"),
+        ],
+        vendor_send_to_function=send,
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+    )
+
+    assert failed == []
+    assert len(sent) == 1
+    fields = {f.get("title"): f["value"] for f in sent[0]["attachments"][1]["fields"]}
+    assert fields["Current State"] == "`ALARM`"
+    assert fields["Suppressed Changes"] == "`2`"
+
+
+def test_store_missing_a_method_is_not_created():
+    class GetOnlyStore(AlarmStateStore):
+        def get(self, alarm_arn):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyStore()
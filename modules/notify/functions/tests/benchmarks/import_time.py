@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+"""
+    Import Time Benchmark
+    ---------------------
+
+    Measures the cold import of the lambda handlers, i.e. the lambda init phase, each
+    run in a fresh interpreter using `python -X importtime`
+
+    With `--aws-stub` the webhook urls are KMS encrypted and the account names held in
+    SSM, as deployed, with the KMS and SSM calls made during the init phase answered
+    by a local stub rather than AWS.
+
+    Compare against an earlier revision by checking it out alongside, e.g.
+
+        $ git worktree add /tmp/before HEAD~1
+        $ python tests/benchmarks/import_time.py \
+            --baseline /tmp/before/modules/notify/functions/src
+
+    or against the budget recorded in `import_budget.json`, failing if over, with
+
+        $ python tests/benchmarks/import_time.py --check
+        $ python tests/benchmarks/import_time.py --aws-stub --check
+
+    The budget of each handler is its import time relative to the reference import of
+    `aws_lambda_powertools`, timed in the same run, so the check holds on slower or
+    busier machines than the one it was recorded on. When a change to the startup
+    cost is intended, re-record both scenarios, and commit the budget file, with
+
+        $ python tests/benchmarks/import_time.py --update-budget
+        $ python tests/benchmarks/import_time.py --aws-stub --update-budget
+
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Optional, Type
+from urllib.parse import parse_qs, urlparse
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src")
+BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+HANDLERS = ["notify_slack", "notify_teams", "notify_fanout"]
+
+# The import the budgets are relative to, scaling with the speed of the machine
+REFERENCE = "aws_lambda_powertools"
+
+# Plaintext webhook urls and no account mapping, so nothing is fetched from AWS
+ENVIRONMENT = {
+    "AWS_REGION": "eu-west-2",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+    "POWERTOOLS_SERVICE_NAME": "notify_benchmark",
+    "SLACK_WEBHOOK_URL": "https://hooks.example.com/slack",
+    "TEAMS_WEBHOOK_URL": "https://hooks.example.com/teams",
+}
+
+# The port the Parameters and Secrets lambda extension listens on
+EXTENSION_PORT = 2773
+ACCOUNT_NAMES_PARAMETER = "arn:aws:ssm:eu-west-2:123456789012:parameter/notify/accounts"
+ACCOUNT_NAMES = {"123456789012": "benchmark"}
+
+
+class AwsStub:
+    """
+    Local stand-in for the KMS and SSM endpoints, and the Parameters and Secrets
+    extension, answering the calls the lambda makes during its init phase
+
+    The stub's ciphertext of a webhook url is the url itself, so Decrypt returns the
+    blob it was given.
+    """
+
+    def __init__(self):
+        self.servers: List[HTTPServer] = []
+        self.calls: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def count(self, call: str) -> None:
+        with self.lock:
+            self.calls[call] = self.calls.get(call, 0) + 1
+
+    def respond(self, target: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :params target: the X-Amz-Target of the call
+        :params request: the JSON request
+        :returns: the JSON response
+        """
+        self.count(target)
+        if target == "TrentService.Decrypt":
+            return {"KeyId": "stub", "Plaintext": request["CiphertextBlob"]}
+        if target == "AmazonSSM.GetParameter":
+            return {"Parameter": parameter(request["Name"])}
+        if target == "AmazonSSM.GetParameters":
+            return {
+                "Parameters": [parameter(name) for name in request["Names"]],
+                "InvalidParameters": [],
+            }
+
+        raise ValueError(f"Unexpected call: {target}")
+
+    def start(self) -> str:
+        """
+        Serve the AWS endpoints on a free local port, and the extension on its port
+        when free, in background threads
+
+        :returns: the endpoint url of the stub
+        """
+        handler = stub_handler(self)
+        for port in (0, EXTENSION_PORT):
+            try:
+                server = HTTPServer(("127.0.0.1", port), handler)
+            except OSError:
+                continue
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+
+        return f"http://127.0.0.1:{self.servers[0].server_address[1]}"
+
+    def stop(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def stub_handler(stub: AwsStub) -> Type[BaseHTTPRequestHandler]:
+    """
+    :params stub: the stub answering the calls
+    :returns: the request handler of the stub's servers
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def reply(self, status: int, body: Dict[str, Any]) -> None:
+            encoded = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-amz-json-1.1")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            stub.count(url.path)
+            if url.path == "/healthcheck":
+                self.reply(200, {})
+            else:
+                name = parse_qs(url.query)["name"][0]
+                self.reply(200, {"Parameter": parameter(name)})
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            try:
+                response = stub.respond(self.headers["X-Amz-Target"], request)
+            except Exception as e:
+                error = {"__type": "ValidationException", "message": str(e)}
+                self.reply(400, error)
+                return
+            self.reply(200, response)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def parameter(name: str) -> Dict[str, Any]:
+    """
+    :params name: the name of the parameter
+    :returns: the SSM parameter, holding the account names
+    """
+    return {"Name": name, "Type": "String", "Value": json.dumps(ACCOUNT_NAMES)}
+
+
+def aws_stub_environment(endpoint: str) -> Dict[str, str]:
+    """
+    :params endpoint: the endpoint url of the stub
+    :returns: the environment of a deployed lambda, its AWS calls made to the stub
+    """
+    return {
+        **ENVIRONMENT,
+        "SLACK_WEBHOOK_URL": base64.b64encode(ENVIRONMENT["SLACK_WEBHOOK_URL"].encode("utf-8")).decode(),
+        "TEAMS_WEBHOOK_URL": base64.b64encode(ENVIRONMENT["TEAMS_WEBHOOK_URL"].encode("utf-8")).decode(),
+        "ACCOUNTS_ID_TO_NAME_PARAMETER_ARN": ACCOUNT_NAMES_PARAMETER,
+        "AWS_ENDPOINT_URL_KMS": endpoint,
+        "AWS_ENDPOINT_URL_SSM": endpoint,
+        "AWS_ACCESS_KEY_ID": "stub",
+        "AWS_SECRET_ACCESS_KEY": "stub",
+        "AWS_SESSION_TOKEN": "stub",
+    }
+
+
+def import_once(src: str, handler: str, environment: Dict[str, str] = ENVIRONMENT) -> Dict[str, Any]:
+    """
+    Import the handler in a fresh interpreter
+
+    :params src: directory holding the lambda sources
+    :params handler: name of the handler module
+    :params environment: the lambda environment variables
+    :returns: the total import time (ms), and the self and cumulative time of each module
+    """
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(src)}
+    env.pop("ACCOUNTS_ID_TO_NAME_PARAMETER_ARN", None)
+    env.update(environment)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {handler}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules: Dict[str, Dict[str, float]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = {
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        }
+
+    return {"total_ms": modules[handler]["cumulative_ms"], "modules": modules}
+
+
+def benchmark(src: str, handler: str, runs: int, environment: Dict[str, str] = ENVIRONMENT) -> Dict[str, Any]:
+    """
+    Import the handler repeatedly, each run just after the reference import, reporting
+    the median of the runs
+
+    :params src: directory holding the lambda sources
+    :params handler: name of the handler module
+    :params runs: number of fresh interpreters to import in
+    :params environment: the lambda environment variables
+    :returns: the median total, its median ratio to the reference import, and the
+              median cumulative time of the slowest modules
+    """
+    # the first import compiles the bytecode, which is not part of the measure
+    import_once(src, handler, environment)
+    references: List[float] = []
+    samples: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        references.append(import_once(src, REFERENCE, environment)["total_ms"])
+        samples.append(import_once(src, handler, environment))
+
+    local = {f[:-3] for f in os.listdir(src) if f.endswith(".py")}
+    names = set().union(*(s["modules"] for s in samples))
+    cumulative = {
+        name: statistics.median(s["modules"].get(name, {}).get("cumulative_ms", 0) for s in samples) for name in names
+    }
+    top_level = {"boto3", "botocore", "urllib3", "aws_lambda_powertools"}
+
+    return {
+        "handler": handler,
+        "runs": runs,
+        "total_ms": statistics.median(s["total_ms"] for s in samples),
+        "reference_ms": statistics.median(references),
+        "ratio": statistics.median(s["total_ms"] / ms for s, ms in zip(samples, references)),
+        "boto3_loaded": any("boto3" in s["modules"] for s in samples),
+        "modules": {
+            name: round(ms, 2)
+            for name, ms in sorted(cumulative.items(), key=lambda i: -i[1])
+            if name in local or name in top_level
+        },
+    }
+
+
+def check_budget(report: List[Dict[str, Any]], budget: Dict[str, Any], scenario: str) -> List[str]:
+    """
+    Add the budget of each handler to the report, scaled to the reference import
+
+    :params report: the measures of each handler
+    :params budget: the budget file, holding the ratio of each handler per scenario
+    :params scenario: the environment the handlers were imported in
+    :returns: the handlers over their budget, beyond its tolerance
+    """
+    over: List[str] = []
+    budgets = budget.get("scenarios", {}).get(scenario, {})
+    for entry in report:
+        after = entry["after"]
+        ratio = budgets.get(after["handler"], {}).get("ratio")
+        if ratio is None:
+            continue
+
+        entry["budget_ms"] = ratio * after["reference_ms"]
+        if after["ratio"] > ratio * (1 + budget.get("tolerance", 0)):
+            over.append(after["handler"])
+
+    return over
+
+
+def update_budget(path: str, report: List[Dict[str, Any]], scenario: str) -> Dict[str, Any]:
+    """
+    Record the measures of each handler, relative to the reference import, as its
+    budget
+
+    :params path: the budget file
+    :params report: the measures of each handler
+    :params scenario: the environment the handlers were imported in
+    :returns: the updated budget
+    """
+    recorded: Dict[str, Any] = {}
+    if os.path.exists(path):
+        with open(path, "r") as ofile:
+            recorded = json.load(ofile)
+
+    budget = {
+        "tolerance": recorded.get("tolerance", 0.25),
+        "reference": REFERENCE,
+        "scenarios": recorded.get("scenarios", {}),
+    }
+    budgets = budget["scenarios"].setdefault(scenario, {})
+    for entry in report:
+        after = entry["after"]
+        budgets[after["handler"]] = {
+            "ratio": round(after["ratio"], 2),
+            "total_ms": round(after["total_ms"], 1),
+            "reference_ms": round(after["reference_ms"], 1),
+            "modules": after["modules"],
+        }
+
+    with open(path, "w") as ofile:
+        json.dump(budget, ofile, indent=2)
+        ofile.write("\n")
+
+    return budget
+
+
+def measure(
+    handlers: List[str], src: str, baseline: Optional[str], runs: int, environment: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """
+    :params handlers: names of the handler modules
+    :params src: directory holding the lambda sources
+    :params baseline: directory holding the lambda sources to compare against, if any
+    :params runs: number of fresh interpreters to import in
+    :params environment: the lambda environment variables
+    :returns: the measures of each handler, after and before
+    """
+    report = []
+    for handler in handlers:
+        entry = {"after": benchmark(src, handler, runs, environment)}
+        if baseline:
+            entry["before"] = benchmark(baseline, handler, runs, environment)
+        report.append(entry)
+
+    return report
+
+
+def print_entry(entry: Dict[str, Any], over: List[str], scenario: str) -> None:
+    """
+    :params entry: the measures of a handler, before and after, and its budget
+    :params over: the handlers over their budget
+    :params scenario: the environment the handlers were imported in
+    """
+    after = entry["after"]
+    print(f"{after['handler']} (median of {after['runs']} cold imports)")
+    for label in ("before", "after"):
+        if label not in entry:
+            continue
+        result = entry[label]
+        print(f"  {label:<8}{result['total_ms']:>9.1f} ms  boto3 loaded: {result['boto3_loaded']}")
+    if "before" in entry:
+        saved = entry["before"]["total_ms"] - after["total_ms"]
+        print(f"  saved   {saved:>9.1f} ms")
+    if "budget_ms" in entry:
+        state = "over" if after["handler"] in over else "within"
+        print(f"  budget  {entry['budget_ms']:>9.1f} ms  {state} ({scenario}, relative to {REFERENCE})")
+    for name, ms in after["modules"].items():
+        print(f"    {name:<28}{ms:>9.1f} ms")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--src", default=SRC, help="the lambda sources to measure")
+    parser.add_argument("--baseline", help="the lambda sources to compare against")
+    parser.add_argument("--handler", action="append", choices=HANDLERS)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--aws-stub",
+        action="store_true",
+        help="encrypted webhook urls and account names, answered by a local stub",
+    )
+    parser.add_argument("--budget", default=BUDGET, help="the budget file")
+    parser.add_argument("--check", action="store_true", help="fail if a handler is over its budget")
+    parser.add_argument("--update-budget", action="store_true", help="record the measures as budget")
+    parser.add_argument("--json", action="store_true", help="output as json")
+    args = parser.parse_args(argv)
+
+    scenario = "aws_stub" if args.aws_stub else "plaintext"
+    stub: Optional[AwsStub] = None
+    environment = ENVIRONMENT
+    if args.aws_stub:
+        stub = AwsStub()
+        environment = aws_stub_environment(stub.start())
+
+    try:
+        report = measure(args.handler or HANDLERS, args.src, args.baseline, args.runs, environment)
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    if args.update_budget:
+        update_budget(args.budget, report, scenario)
+
+    over: List[str] = []
+    if os.path.exists(args.budget):
+        with open(args.budget, "r") as ofile:
+            over = check_budget(report, json.load(ofile), scenario)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 1 if args.check and over else 0
+
+    for entry in report:
+        print_entry(entry, over, scenario)
+
+    if stub is not None:
+        print("AWS calls answered by the stub: " + json.dumps(stub.calls))
+    if over:
+        print(f"Over the import budget: {', '.join(over)}")
+
+    return 1 if args.check and over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+    Load Test
+    ---------
+
+    Drives the lambda handlers with synthetic batches of records at a target rate,
+    posting to a local stub webhook rather than Slack or Teams, and reports the
+    delivered records per second, the retries and the latency percentiles
+
+    The stub responds after a configurable latency, failing or throttling (429 with a
+    Retry-After) a share of the posts. Records are sent as SQS messages buffering the
+    SNS notifications; those the handler reports failed are sent again after the
+    retry delay, as SQS would once their visibility timeout expires. Each concurrent
+    invocation runs in a process of its own, as a lambda container, so the containers
+    share no deadline, circuit breakers or rate limiters. Runs offline, e.g.
+
+        $ python tests/benchmarks/load_test.py --handler notify_slack --rate 50 \
+            --latency-ms 80 --throttle-rate 0.05 --env SLACK_WEBHOOK_RATE=0
+
+"""
+
+import argparse
+import ast
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(TESTS, "..", "src")
+
+HANDLERS = ["notify_slack", "notify_teams", "notify_fanout"]
+
+# No account mapping, so nothing is fetched from AWS; the webhook urls are the stub's
+ENVIRONMENT = {
+    "AWS_REGION": "eu-west-2",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+    "POWERTOOLS_SERVICE_NAME": "notify_load_test",
+    "POWERTOOLS_LOG_LEVEL": "CRITICAL",
+}
+
+TOPIC_ARN = "arn:aws:sns:eu-west-2:123456789012:notify"
+QUEUE_ARN = "arn:aws:sqs:eu-west-2:123456789012:notify-buffer"
+
+# The lambda timeout the invocations are given, as deployed by the module
+LAMBDA_TIMEOUT_MS = 10000
+
+
+class StubWebhook:
+    """
+    Local HTTP server standing in for the Slack and Teams webhooks
+
+    Posts to `/slack` are accepted with a 200, and to `/teams` with a 202, after the
+    latency; a share of them are failed with a 500, or throttled with a 429.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 50,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        throttle_rate: float = 0,
+        retry_after: float = 1,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.counts = {"requests": 0, "accepted": 0, "throttled": 0, "errors": 0}
+        self.lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    def respond(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        :params path: the path posted to
+        :returns: the status, headers and body of the response
+        """
+        with self.lock:
+            self.counts["requests"] += 1
+            draw = self.random.random()
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+
+        time.sleep(delay / 1000)
+        if draw < self.throttle_rate:
+            outcome = "throttled"
+            response = (429, {"Retry-After": str(self.retry_after)}, b"rate_limited")
+        elif draw < self.throttle_rate + self.error_rate:
+            outcome = "errors"
+            response = (500, {}, b"internal_error")
+        else:
+            outcome = "accepted"
+            status = 202 if path.startswith("/teams") else 200
+            response = (status, {}, b"ok" if status == 200 else b"1")
+
+        with self.lock:
+            self.counts[outcome] += 1
+        return response
+
+    def start(self) -> str:
+        """
+        Serve on a free local port, in a background thread
+
+        :returns: the base url of the stub
+        """
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive, as the vendors are, so the pooled connections are reused
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, headers, body = stub.respond(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class Context:
+    """Stand-in for the lambda context, counting down the lambda timeout"""
+
+    function_name = "notify-load-test"
+    aws_request_id = "load-test"
+
+    def __init__(self, timeout_ms: int = LAMBDA_TIMEOUT_MS):
+        self.deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(int((self.deadline - time.monotonic()) * 1000), 0)
+
+
+# The handler of the container, imported by each worker process as it starts
+container_handler: Optional[Callable[[Dict[str, Any], Any], Dict[str, Any]]] = None
+
+
+def start_container(src: str, handler: str, environment: Dict[str, str]) -> None:
+    """
+    Import the handler in the worker process, as the lambda init phase would
+
+    :params src: the lambda sources to drive
+    :params handler: the name of the handler module
+    :params environment: the environment variables set for the handler
+    """
+    global container_handler
+
+    os.environ.update(environment)
+    sys.path.insert(0, src)
+    # the logs and the metrics flushed by each invocation are not part of the results
+    sys.stdout = open(os.devnull, "w")
+    warnings.filterwarnings("ignore", message="No application metrics to publish")
+    container_handler = importlib.import_module(handler).lambda_handler
+
+
+def invoke_container(records: List[Dict[str, Any]]) -> Tuple[List[str], float]:
+    """
+    :params records: the SQS records of the batch
+    :returns: the "itemIdentifier" of the failed records, and the invocation time (ms)
+    """
+    if container_handler is None:
+        raise RuntimeError("The container was not started")
+
+    started = time.monotonic()
+    response = container_handler({"Records": records}, Context())
+    failed = [f["itemIdentifier"] for f in response["batchItemFailures"]]
+    return failed, (time.monotonic() - started) * 1000
+
+
+def load_notifications() -> List[Dict[str, Any]]:
+    """
+    :returns: the SNS notifications of the fixtures, cycled through by the records
+    """
+    notifications: List[Dict[str, Any]] = []
+
+    messages = os.path.join(TESTS, "messages")
+    for file in sorted(os.listdir(messages)):
+        with open(os.path.join(messages, file), "r") as ofile:
+            records = ast.literal_eval(ofile.read())["Records"]
+        notifications += [record["Sns"] for record in records]
+
+    events = os.path.join(TESTS, "events")
+    for file in sorted(os.listdir(events)):
+        with open(os.path.join(events, file), "r") as ofile:
+            notifications.append({"Message": ofile.read(), "TopicArn": TOPIC_ARN})
+
+    return notifications
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    :params samples: the latencies (ms)
+    :returns: the p50, p95, p99 and max of the samples
+    """
+    if not samples:
+        return {}
+
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "p50": round(at(0.50), 1),
+        "p95": round(at(0.95), 1),
+        "p99": round(at(0.99), 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+class LoadTest:
+    """
+    Sends the records to the handler at the target rate, resending the failed records
+    """
+
+    def __init__(
+        self,
+        executor: ProcessPoolExecutor,
+        rate: float,
+        duration: float,
+        batch_size: int = 10,
+        retry_delay: float = 1,
+        max_attempts: int = 5,
+    ):
+        self.executor = executor
+        self.rate = rate
+        self.duration = duration
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.notifications = itertools.cycle(load_notifications())
+        # the time each record was first sent, and the attempts made
+        self.sent: Dict[str, Tuple[float, int]] = {}
+        self.retries: List[Tuple[float, Dict[str, Any]]] = []
+        self.invocations: List[float] = []
+        self.delivered: List[float] = []
+        self.counts = {"records": 0, "retries": 0, "dropped": 0, "errors": 0}
+        self.lock = threading.Lock()
+
+    def new_record(self) -> Dict[str, Any]:
+        notification = next(self.notifications)
+        messageId = str(uuid.uuid4())
+        sns = {
+            "Type": "Notification",
+            "TopicArn": TOPIC_ARN,
+            **notification,
+            "MessageId": messageId,
+        }
+        self.sent[messageId] = (time.monotonic(), 0)
+        self.counts["records"] += 1
+        return {
+            "eventSource": "aws:sqs",
+            "eventSourceARN": QUEUE_ARN,
+            "messageId": messageId,
+            "body": json.dumps(sns),
+        }
+
+    def invoke(self, records: List[Dict[str, Any]]) -> Future:
+        """
+        Invoke the handler of a container with the batch
+
+        :returns: the future of the invocation, queuing the failed records to be resent
+        """
+        future = self.executor.submit(invoke_container, records)
+        future.add_done_callback(lambda invocation: self.completed(records, invocation))
+        return future
+
+    def completed(self, records: List[Dict[str, Any]], invocation: Future) -> None:
+        """
+        Record the delivered records of the invocation, queuing the failed to be resent
+        """
+        finished = time.monotonic()
+        try:
+            failed_records, invocation_ms = invocation.result()
+            failed = set(failed_records)
+        except Exception:
+            failed = {record["messageId"] for record in records}
+            invocation_ms = None
+
+        with self.lock:
+            if invocation_ms is None:
+                self.counts["errors"] += 1
+            else:
+                self.invocations.append(invocation_ms)
+            for record in records:
+                first_sent, attempts = self.sent[record["messageId"]]
+                if record["messageId"] not in failed:
+                    self.delivered.append((finished - first_sent) * 1000)
+                elif attempts + 1 >= self.max_attempts:
+                    self.counts["dropped"] += 1
+                else:
+                    self.sent[record["messageId"]] = (first_sent, attempts + 1)
+                    self.retries.append((finished + self.retry_delay, record))
+
+    def due_retries(self, now: float) -> List[Dict[str, Any]]:
+        with self.lock:
+            due = [record for at, record in self.retries if at <= now]
+            self.retries = [(at, record) for at, record in self.retries if at > now]
+            self.counts["retries"] += len(due)
+        return due
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Send the batches for the duration, then until the retries are drained
+
+        :returns: the delivered records per second, the retries and the latencies
+        """
+        interval = self.batch_size / self.rate
+        started = time.monotonic()
+        futures: List[Future] = []
+        for tick in itertools.count():
+            now = time.monotonic()
+            if now - started < self.duration:
+                batch = [self.new_record() for _ in range(self.batch_size)]
+                futures.append(self.invoke(batch))
+            elif all(f.done() for f in futures) and not self.retries:
+                break
+
+            retries, size = self.due_retries(now), self.batch_size
+            while retries:
+                batch, retries = retries[:size], retries[size:]
+                futures.append(self.invoke(batch))
+
+            time.sleep(max(started + (tick + 1) * interval - time.monotonic(), 0))
+
+        elapsed = time.monotonic() - started
+
+        return {
+            "target_rate": self.rate,
+            "elapsed_seconds": round(elapsed, 2),
+            **self.counts,
+            "delivered": len(self.delivered),
+            "delivered_per_sec": round(len(self.delivered) / elapsed, 1),
+            "invocation_ms": percentiles(self.invocations),
+            "delivery_ms": percentiles(self.delivered),
+        }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--src", default=SRC, help="the lambda sources to drive")
+    parser.add_argument("--handler", choices=HANDLERS, default="notify_slack")
+    parser.add_argument("--rate", type=float, default=20, help="records per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4, help="containers")
+    parser.add_argument("--retry-delay", type=float, default=1, help="seconds")
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--retry-after", type=float, default=1, help="seconds")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--env", action="append", default=[], help="NAME=VALUE set for the handler")
+    parser.add_argument("--json", action="store_true", help="output as json")
+    args = parser.parse_args(argv)
+
+    stub = StubWebhook(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    url = stub.start()
+
+    environment = {
+        **ENVIRONMENT,
+        "SLACK_WEBHOOK_URL": f"{url}/slack",
+        "TEAMS_WEBHOOK_URL": f"{url}/teams",
+        "ACCOUNTS_ID_TO_NAME_PARAMETER_ARN": "",
+        **dict(e.split("=", 1) for e in args.env),
+    }
+
+    # spawned, so no container inherits the state of another, or the stub's threads
+    with ProcessPoolExecutor(
+        max_workers=args.concurrency,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=start_container,
+        initargs=(os.path.abspath(args.src), args.handler, environment),
+    ) as executor:
+        report = LoadTest(
+            executor=executor,
+            rate=args.rate,
+            duration=args.duration,
+            batch_size=args.batch_size,
+            retry_delay=args.retry_delay,
+            max_attempts=args.max_attempts,
+        ).run()
+    stub.stop()
+
+    report = {"handler": args.handler, **report, "stub": stub.counts}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{report['handler']} at {report['target_rate']:g} records/sec")
+    print(
+        f"  delivered {report['delivered']} of {report['records']} records"
+        f" in {report['elapsed_seconds']:g}s, {report['delivered_per_sec']:g}/sec"
+    )
+    print(f"  retries {report['retries']}, dropped {report['dropped']}," f" failed invocations {report['errors']}")
+    for name in ("invocation_ms", "delivery_ms"):
+        latency = "  ".join(f"{k} {v:g}" for k, v in report[name].items())
+        print(f"  {name:<15}{latency}")
+    print("  stub " + ", ".join(f"{k} {v}" for k, v in report["stub"].items()))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
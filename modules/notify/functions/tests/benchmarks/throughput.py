@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput Benchmark
+--------------------
+
+Replays every fixture in `tests/messages` and `tests/events` through the stages of
+the lambda, reporting the ops/sec, p50/p99 latency and peak allocation of each
+stage for each fixture:
+
+- classify: decoding the message and routing it to its parser
+- parse: the parser, and building the notification document
+- render: the vendor payload, for each vendor
+- serialise: encoding the payload into the request body; the renders filling
+  templates encode as they render, so only report the render
+
+Save the results to compare a release against, e.g.
+
+    $ python tests/benchmarks/throughput.py --output before.json
+    $ git checkout <release>
+    $ python tests/benchmarks/throughput.py --baseline before.json
+
+"""
+
+import argparse
+import ast
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(TESTS, "..", "src")
+
+# Plaintext webhook urls and no account mapping, so nothing is fetched from AWS
+ENVIRONMENT = {
+    "AWS_REGION": "eu-west-2",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+    "POWERTOOLS_SERVICE_NAME": "notify_benchmark",
+    "SLACK_WEBHOOK_URL": "https://hooks.example.com/slack",
+    "TEAMS_WEBHOOK_URL": "https://hooks.example.com/teams",
+}
+
+# The events not routed by their detail-type are routed by the SNS subject
+EVENT_SUBJECTS = {
+    "cost-anomaly.json": "AWS Cost Management: Anomaly detected",
+    "dms_notification.json": "DMS Notification Message",
+    "security_hub_finding.json": "Security Hub Finding",
+}
+
+# The runs measuring the allocations, which tracemalloc slows too much to time
+ALLOCATION_RUNS = 20
+
+
+def load_fixtures() -> List[Dict[str, Any]]:
+    """
+    :returns: each SNS message and EventBridge event of the fixtures, with its subject
+    """
+    fixtures: List[Dict[str, Any]] = []
+
+    messages = os.path.join(TESTS, "messages")
+    for file in sorted(os.listdir(messages)):
+        with open(os.path.join(messages, file), "r") as ofile:
+            records = ast.literal_eval(ofile.read())["Records"]
+        for idx, record in enumerate(records):
+            sns = record["Sns"]
+            suffix = f"#{idx}" if len(records) > 1 else ""
+            fixtures.append(
+                {
+                    "name": f"messages/{file}{suffix}",
+                    "message": sns["Message"],
+                    "subject": sns.get("Subject"),
+                    "region": sns["TopicArn"].split(":")[3],
+                    "messageAttributes": sns.get("MessageAttributes", {}),
+                }
+            )
+
+    events = os.path.join(TESTS, "events")
+    for file in sorted(os.listdir(events)):
+        with open(os.path.join(events, file), "r") as ofile:
+            fixtures.append(
+                {
+                    "name": f"events/{file}",
+                    # as published to SNS, the event arrives as its JSON encoding
+                    "message": ofile.read(),
+                    "subject": EVENT_SUBJECTS.get(file),
+                    "region": "eu-west-2",
+                    "messageAttributes": {},
+                }
+            )
+
+    return fixtures
+
+
+def measure(operation: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """
+    Time the operation, then measure its allocations
+
+    :params operation: the stage to measure
+    :params iterations: number of times to time the operation
+    :returns: the ops/sec, p50/p99 latency (us) and the median peak allocated (bytes)
+    """
+    operation()
+    samples: List[int] = []
+    for _ in range(iterations):
+        started = time.perf_counter_ns()
+        operation()
+        samples.append(time.perf_counter_ns() - started)
+
+    peaks: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_RUNS):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            operation()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "ops_per_sec": round(1e9 * len(samples) / sum(samples), 1),
+        "p50_us": round(quantiles[49] / 1000, 2),
+        "p99_us": round(quantiles[98] / 1000, 2),
+        "peak_alloc_bytes": int(statistics.median(peaks)),
+    }
+
+
+def benchmark_fixture(fixture: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    """
+    Measure each stage of the fixture, fed the output of the stage before
+
+    :params fixture: the fixture, as returned by load_fixtures
+    :params iterations: number of times to time each stage
+    :returns: the route of the fixture, its action and the measures of each stage
+    """
+    from classifier import Notification, classifier
+    from msg_parser import AwsAction  # registers the parsers with the classifier
+    from msg_render_slack import SlackRender
+    from msg_render_teams import TeamsRender
+    from notification_document import build_document
+    from render import Render, encode_payload
+
+    subject = fixture["subject"] or ""
+
+    def classify() -> Tuple[Notification, Tuple[str, Optional[Callable]]]:
+        message = fixture["message"]
+        try:
+            message = json.loads(message)
+        except json.JSONDecodeError:
+            pass
+        notification = Notification(
+            message=message,
+            region=fixture["region"],
+            messageAttributes=fixture["messageAttributes"],
+            subject=subject,
+        )
+        return notification, classifier.classify(notification)
+
+    notification, (route, parser) = classify()
+
+    def parse() -> Any:
+        if parser is None:
+            parsedMsg = {"action": AwsAction.UNKNOWN.value}
+        else:
+            parsedMsg = parser(notification)
+        return build_document(
+            parsedMessage=parsedMsg,
+            originalMessage=notification.message,
+            subject=subject,
+        )
+
+    document = parse()
+    stages = {
+        "classify": measure(classify, iterations),
+        "parse": measure(parse, iterations),
+    }
+    for renderer in (SlackRender(), TeamsRender()):
+        vendor = type(renderer).__name__[: -len("Render")].lower()
+        if type(renderer).body is not Render.body:
+            stages[f"render_{vendor}"] = measure(lambda: renderer.body(document=document), iterations)
+            continue
+
+        payload = renderer.payload(document=document)
+        stages[f"render_{vendor}"] = measure(lambda: renderer.payload(document=document), iterations)
+        stages[f"serialise_{vendor}"] = measure(lambda: encode_payload(payload), iterations)
+
+    return {
+        "fixture": fixture["name"],
+        "route": route,
+        "action": document.action,
+        "stages": stages,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """
+    Add the change in p50 latency against the baseline to each stage
+
+    :params report: the results of this run
+    :params baseline: the results saved by an earlier run
+    """
+    before = {
+        (entry["fixture"], stage): measures
+        for entry in baseline["fixtures"]
+        for stage, measures in entry["stages"].items()
+    }
+    for entry in report["fixtures"]:
+        for stage, measures in entry["stages"].items():
+            earlier = before.get((entry["fixture"], stage))
+            if earlier:
+                measures["p50_change"] = round(measures["p50_us"] / earlier["p50_us"] - 1, 3)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--src", default=SRC, help="the lambda sources to measure")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--fixture", action="append", help="only the named fixtures")
+    parser.add_argument("--output", help="save the results as json to the file")
+    parser.add_argument("--baseline", help="the json results to compare against")
+    args = parser.parse_args(argv)
+
+    for name, value in ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    os.environ.pop("ACCOUNTS_ID_TO_NAME_PARAMETER_ARN", None)
+    sys.path.insert(0, os.path.abspath(args.src))
+
+    fixtures = [f for f in load_fixtures() if not args.fixture or f["name"] in args.fixture]
+    # the metrics flushed by the stages are not part of the results
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = [benchmark_fixture(f, args.iterations) for f in fixtures]
+
+    report = {
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "fixtures": results,
+    }
+    if args.baseline:
+        with open(args.baseline, "r") as ofile:
+            compare(report, json.load(ofile))
+
+    if args.output:
+        with open(args.output, "w") as ofile:
+            json.dump(report, ofile, indent=2)
+
+    print(f"{'fixture / stage':<44}{'ops/sec':>10}{'p50 us':>9}{'p99 us':>9}{'bytes':>9}")
+    for entry in results:
+        print(f"{entry['fixture']} ({entry['action']})")
+        for stage, measures in entry["stages"].items():
+            change = measures.get("p50_change")
+            print(
+                f"  {stage:<42}{measures['ops_per_sec']:>10.0f}"
+                f"{measures['p50_us']:>9.1f}{measures['p99_us']:>9.1f}"
+                f"{measures['peak_alloc_bytes']:>9}" + ("" if change is None else f"  {change:+.1%}")
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
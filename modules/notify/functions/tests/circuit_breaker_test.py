@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Circuit Breaker Test
+--------------------
+
+Unit tests for failing fast on failing webhooks in `circuit_breaker.py`, and
+deferring the records in `deferred_queue.py`
+
+"""
+
+import ast
+import json
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import msg_parser
+from circuit_breaker import (
+    CIRCUIT_OPEN_CODE,
+    CircuitBreaker,
+    CircuitState,
+    WebhookBreakers,
+)
+from deferred_queue import DEFERRED_CHANNELS_ATTRIBUTE, DeferredQueue
+from delivery_channel import DeliveryChannel, fan_out_sns
+from msg_render_slack import SlackRender
+from msg_render_teams import TeamsRender
+from webhook_client import VendorResponse
+
+URL = "https://hooks.example.com/services/T000/B000/XXXX"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class LocalQueue:
+    """Local stand-in for the SQS client, holding the messages sent in a list"""
+
+    def __init__(self):
+        self.messages = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.messages += Entries
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries]}
+
+
+def _records(messages):
+    with open("./tests/messages/text_message.json", "r") as ofile:
+        record = ast.literal_eval(ofile.read())["Records"][0]
+
+    return msg_parser.get_sns_records(
+        [{**record, "Sns": {**record["Sns"], "Message": m, "MessageId": f"id-{m}"}} for m in messages]
+    )
+
+
+class _Channel(DeliveryChannel):
+    """Delivery channel recording the posts, failing fast while its circuit is open"""
+
+    def __init__(self, name, renderer, breakers, status=500):
+        super().__init__(name=name, webhookUrlEnv="UNUSED", renderer=renderer, successCode=200)
+        self.breakers = breakers
+        self.status = status
+        self.sent = []
+
+    def send(self, body):
+        breaker = self.breakers.get(self.name, URL)
+        if not breaker.allow():
+            return VendorResponse(code=CIRCUIT_OPEN_CODE, info="")
+        self.sent.append(json.loads(body))
+        breaker.record(failed=self.status >= 500)
+        return VendorResponse(code=self.status, info="")
+
+
+def test_opens_after_consecutive_failures():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=60, clock=clock)
+
+    for failed in [True, True, False, True, True]:
+        assert breaker.allow()
+        breaker.record(failed=failed)
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record(failed=True)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    clock.now += 20
+    assert breaker.retry_after() == 40
+
+
+def test_single_probe_when_half_open():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=60, clock=clock)
+    breaker.record(failed=True)
+
+    clock.now += 60
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # a failed probe opens the circuit again
+    breaker.record(failed=True)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record(failed=False)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_probe_not_made_is_released():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=60, clock=clock)
+    breaker.record(failed=True)
+
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record(failed=None)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_breakers_per_webhook():
+    breakers = WebhookBreakers(enabled=True, failure_threshold=1, clock=Clock())
+    breakers.get("slack", URL).record(failed=True)
+
+    assert breakers.is_open("slack")
+    assert not breakers.is_open("teams")
+    assert breakers.get("slack", URL + "/other").allow()
+    assert WebhookBreakers(enabled=False).get("slack", URL) is None
+
+
+def test_defer_sends_envelope_with_channels():
+    queue = LocalQueue()
+    records = _records(["first", "second"])
+
+    deferred = DeferredQueue(queue_url="deferred", client=queue).defer(records, channels=["slack", "teams"], delay=1200)
+
+    assert deferred == [r["itemIdentifier"] for r in records]
+    assert [json.loads(m["MessageBody"]) for m in queue.messages] == [r["Sns"] for r in records]
+    assert queue.messages[0]["DelaySeconds"] == 900
+    attribute = queue.messages[0]["MessageAttributes"][DEFERRED_CHANNELS_ATTRIBUTE]
+    assert attribute["StringValue"] == "slack,teams"
+
+
+def test_sqs_record_channels():
+    records = msg_parser.get_sns_records(
+        [
+            {
+                "eventSource": "aws:sqs",
+                "eventSourceARN": "arn:aws:sqs:eu-west-2:123456789012:deferred",
+                "messageId": "1",
+                "body": json.dumps({"Message": "hello"}),
+                "messageAttributes": {DEFERRED_CHANNELS_ATTRIBUTE: {"stringValue": "teams"}},
+            }
+        ]
+    )
+
+    assert records[0]["channels"] == ["teams"]
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    breakers = WebhookBreakers(enabled=True, failure_threshold=2, clock=Clock())
+    monkeypatch.setattr(msg_parser, "webhook_breakers", breakers)
+    return breakers
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = LocalQueue()
+    monkeypatch.setattr(msg_parser, "deferred_queue", DeferredQueue(queue_url="deferred", client=queue))
+    return queue
+
+
+def test_parse_sns_defers_while_open(breakers, queue):
+    records = _records(["first", "second", "third", "fourth"])
+    channel = _Channel("slack", SlackRender(), breakers)
+
+    failed = msg_parser.parse_sns(
+        snsRecords=records,
+        vendor_send_to_function=channel.send,
+        renderer=channel.renderer,
+        rendererSuccessCode=channel.successCode,
+        channel=channel.name,
+    )
+
+    # the posts once the circuit opened failed fast, and all were deferred
+    assert len(channel.sent) == 2
+    assert failed == []
+    assert len(queue.messages) == 4
+
+
+def test_parse_sns_fails_while_closed(breakers, queue):
+    records = _records(["first"])
+    channel = _Channel("slack", SlackRender(), breakers)
+
+    failed = msg_parser.parse_sns(
+        snsRecords=records,
+        vendor_send_to_function=channel.send,
+        renderer=channel.renderer,
+        rendererSuccessCode=channel.successCode,
+        channel=channel.name,
+    )
+
+    assert failed == ["id-first"]
+    assert queue.messages == []
+
+
+def test_fan_out_defers_to_failing_channel_only(breakers, queue):
+    records = _records(["first", "second"])
+    slack = _Channel("slack", SlackRender(), breakers, status=200)
+    teams = _Channel("teams", TeamsRender(), breakers)
+
+    assert fan_out_sns(snsRecords=records, channels=[slack, teams]) == []
+    assert len(slack.sent) == 2
+    attributes = [m["MessageAttributes"] for m in queue.messages]
+    assert [a[DEFERRED_CHANNELS_ATTRIBUTE]["StringValue"] for a in attributes] == [
+        "teams",
+        "teams",
+    ]
+
+    # received back from the queue, the records are only posted to teams
+    deferred = msg_parser.get_sns_records(
+        [
+            {
+                "eventSource": "aws:sqs",
+                "eventSourceARN": "arn:aws:sqs:eu-west-2:123456789012:deferred",
+                "messageId": m["Id"],
+                "body": m["MessageBody"],
+                "messageAttributes": {DEFERRED_CHANNELS_ATTRIBUTE: {"stringValue": "teams"}},
+            }
+            for m in queue.messages
+        ]
+    )
+    teams.status = 200
+    breakers.clock.now += 60
+    assert fan_out_sns(snsRecords=deferred, channels=[slack, teams]) == []
+    assert len(slack.sent) == 2
+    assert len(teams.sent) == 4
+
+
+def test_drain_waits_on_the_probe(breakers, queue):
+    records = _records(["first", "second", "third"])
+    teams = _Channel("teams", TeamsRender(), breakers)
+    for record in records:
+        record["channels"] = ["teams"]
+
+    # the webhook is still failing, so only the probe is posted and none are deferred
+    failed = fan_out_sns(snsRecords=records, channels=[teams])
+    assert len(teams.sent) == 1
+    assert failed == ["id-first", "id-second", "id-third"]
+    assert queue.messages == []
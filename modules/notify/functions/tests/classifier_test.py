@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Classifier Test
+---------------
+
+Unit tests for routing notifications to their parser in `classifier.py`
+
+"""
+
+import ast
+import json
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import msg_parser
+from classifier import UNKNOWN_ROUTE, Classifier, Notification, PrefixTrie
+
+
+def _notification(message, subject=""):
+    return Notification(message=message, region="eu-west-2", messageAttributes={}, subject=subject)
+
+
+def test_prefix_trie_longest_prefix():
+    trie = PrefixTrie()
+    trie.insert("AWS", "aws")
+    trie.insert("AWS Budgets:", "budget")
+
+    assert trie.longest_prefix("AWS Budgets: over budget") == "budget"
+    assert trie.longest_prefix("AWS Budgets") == "aws"
+    assert trie.longest_prefix("Amazon") is None
+    assert trie.longest_prefix("") is None
+
+
+def test_classifier_registration_and_precedence():
+    classifier = Classifier()
+
+    @classifier.register("alarm", key="AlarmName")
+    def alarm(notification):
+        return {"action": "alarm"}
+
+    @classifier.register("finding", subject="Finding", detail_type="Finding")
+    def finding(notification):
+        return {"action": "finding"}
+
+    @classifier.register("budget", subject_prefix="Budget:")
+    def budget(notification):
+        return {"action": "budget"}
+
+    assert classifier.route({"AlarmName": "x"}, "Finding") == "alarm"
+    assert classifier.route({}, "Finding") == "finding"
+    assert classifier.route({"detail-type": "Finding"}, "") == "finding"
+    assert classifier.route("text", "Budget: exceeded") == "budget"
+    # keys are only probed in JSON messages
+    assert classifier.route("AlarmName", "") == UNKNOWN_ROUTE
+
+    route, parser = classifier.classify(_notification({}, "Budget: exceeded"))
+    assert route == "budget"
+    assert parser(_notification({})) == {"action": "budget"}
+    assert classifier.classify(_notification("text"))[1] is None
+    assert classifier.matches == {"budget": 1, UNKNOWN_ROUTE: 1}
+
+    with pytest.raises(ValueError):
+        classifier.register("alarm", key="Other")(alarm)
+
+
+def test_event_parser_is_passed_a_json_message():
+    classifier = Classifier()
+
+    @classifier.register_event("finding", subject="Finding")
+    def finding(notification):
+        return {"action": notification.message["detail-type"]}
+
+    route, parser = classifier.classify(_notification({"detail-type": "finding"}, "Finding"))
+    assert route == "finding"
+    assert parser(_notification({"detail-type": "finding"})) == {"action": "finding"}
+
+    # routed by its subject, but the message is not an event
+    route, parser = classifier.classify(_notification("text", "Finding"))
+    with pytest.raises(TypeError):
+        parser(_notification("text", "Finding"))
+
+
+def test_classifier_routes_sample_messages():
+    """
+    Each sample message is routed to the parser of its event type
+    """
+    expected = {
+        "aws_health.json": "aws_health",
+        "backup.json": "aws_backup",
+        "budget.json": "aws_budget",
+        "cloudwatch_alarm.json": "cloudwatch_alarm",
+        "dms_notification.json": "dms_notification",
+        "glue_notification.json": UNKNOWN_ROUTE,
+        "guardduty_finding.json": "guardduty_finding",
+        "savings_plan.json": "aws_savings_plan",
+        "security_hub_finding.json": "security_hub_finding",
+        "text_message.json": UNKNOWN_ROUTE,
+    }
+    for filename, route in expected.items():
+        with open(os.path.join("./tests/messages", filename), "r") as ofile:
+            sns = ast.literal_eval(ofile.read())["Records"][0]["Sns"]
+        try:
+            message = json.loads(sns["Message"])
+        except json.JSONDecodeError:
+            message = sns["Message"]
+
+        assert msg_parser.classifier.route(message, sns.get("Subject") or "") == route
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Digest Test
+-----------
+
+Unit tests for coalescing bursts of notifications in `digest.py`
+
+"""
+
+import ast
+import json
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import msg_parser
+from digest import Digester
+from msg_render_slack import SlackRender
+from webhook_client import VendorResponse
+
+
+def _alarm_records(count: int, state: str = "ALARM"):
+    with open("./tests/messages/cloudwatch_alarm.json", "r") as ofile:
+        alarm = ast.literal_eval(ofile.read())["Records"][0]
+
+    records = []
+    for idx in range(count):
+        message = json.loads(alarm["Sns"]["Message"])
+        message["AlarmName"] = f"alarm-{idx}"
+        message["AlarmArn"] = message["AlarmArn"] + str(idx)
+        message["NewStateValue"] = state
+        records.append(
+            {
+                **alarm,
+                "itemIdentifier": f"alarm-{idx}",
+                "Sns": {**alarm["Sns"], "Message": json.dumps(message)},
+            }
+        )
+    return records
+
+
+def _text_record(itemIdentifier: str):
+    with open("./tests/messages/text_message.json", "r") as ofile:
+        record = ast.literal_eval(ofile.read())["Records"][0]
+    return {**record, "itemIdentifier": itemIdentifier}
+
+
+def _sender(code: int = 200):
+    sent = []
+
+    def send(body):
+        sent.append(json.loads(body))
+        return VendorResponse(code=code, info="")
+
+    return send, sent
+
+
+def test_group_disabled_posts_each_message():
+    digester = Digester(enabled=False)
+    messages = [{"action": "CloudWatch", "account_id": "1", "priority": "ERROR"}] * 4
+
+    assert digester.group(messages) == [[0], [1], [2], [3]]
+
+
+def test_group_by_action_account_and_priority():
+    digester = Digester(enabled=True, min_records=3)
+    alarm = {"action": "CloudWatch", "account_id": "1", "priority": "ERROR"}
+    messages = [
+        alarm,
+        {"action": "Unknown"},
+        alarm,
+        {**alarm, "account_id": "2"},
+        alarm,
+        {"action": "Unknown"},
+        {"action": "Unknown"},
+    ]
+
+    # the unknown messages are never digested, the lone alarm is posted as is
+    assert digester.group(messages) == [[0, 2, 4], [1], [3], [5], [6]]
+
+
+def test_group_immediate_priorities_posted_alone():
+    digester = Digester(enabled=True, min_records=2, immediate_priorities=["CRITICAL"])
+    messages = [
+        {"action": "SecurityHub", "account_id": "1", "priority": "CRITICAL"},
+        {"action": "SecurityHub", "account_id": "1", "priority": "CRITICAL"},
+        {"action": "SecurityHub", "account_id": "1", "priority": "LOW"},
+        {"action": "SecurityHub", "account_id": "1", "priority": "LOW"},
+    ]
+
+    assert digester.group(messages) == [[0], [1], [2, 3]]
+
+
+@pytest.fixture
+def digesting(monkeypatch):
+    monkeypatch.setattr(msg_parser, "digester", Digester(enabled=True, min_records=3, max_items=2))
+
+
+def test_parse_sns_posts_digest(digesting):
+    records = _alarm_records(5) + [_text_record("text")]
+    send, sent = _sender()
+
+    failed = msg_parser.parse_sns(
+        snsRecords=records,
+        vendor_send_to_function=send,
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+    )
+
+    assert failed == []
+    assert len(sent) == 2
+    title, facts = sent[0]["attachments"]
+    assert title["title"].startswith("CloudWatch: 5 notifications")
+    assert [f["title"] for f in facts["fields"]] == [
+        "CloudWatch: alarm-0",
+        "CloudWatch: alarm-1",
+    ]
+    # the rest are linked to in the console
+    assert "#alarmsV2:" in title["title_link"]
+    assert facts["text"].endswith("+3 more in the console")
+    assert sent[1]["attachments"][0]["title"] == "All Fine"
+
+
+def test_parse_sns_failed_digest_fails_all_records(digesting):
+    records = _alarm_records(3)
+    send, sent = _sender(code=500)
+
+    failed = msg_parser.parse_sns(
+        snsRecords=records,
+        vendor_send_to_function=send,
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+    )
+
+    assert len(sent) == 1
+    assert sorted(failed) == ["alarm-0", "alarm-1", "alarm-2"]
+
+
+def test_parse_sns_small_burst_not_digested(digesting):
+    send, sent = _sender()
+
+    msg_parser.parse_sns(
+        snsRecords=_alarm_records(2),
+        vendor_send_to_function=send,
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+    )
+
+    assert [p["attachments"][0]["title"] for p in sent] == [
+        "CloudWatch: alarm-0",
+        "CloudWatch: alarm-1",
+    ]
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Idempotency Test
+----------------
+
+Unit tests for skipping the posts already delivered in `idempotency.py`
+
+"""
+
+import ast
+import json
+import os
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import msg_parser
+from delivery_channel import DeliveryChannel, fan_out_sns
+from idempotency import DeliveryLedger, delivery_key
+from msg_render_slack import SlackRender
+from msg_render_teams import TeamsRender
+from webhook_client import VendorResponse
+
+
+class LocalTable:
+    """Local stand-in for the DynamoDB client, holding the items in a dict"""
+
+    def __init__(self, failing: bool = False):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.failing = failing
+
+    def batch_get_item(self, RequestItems):
+        if self.failing:
+            raise Exception("unavailable")
+        ((table, request),) = RequestItems.items()
+        keys = [key["id"]["S"] for key in request["Keys"]]
+        return {"Responses": {table: [self.items[k] for k in keys if k in self.items]}}
+
+    def batch_write_item(self, RequestItems):
+        ((_, requests),) = RequestItems.items()
+        for request in requests:
+            item = request["PutRequest"]["Item"]
+            self.items[item["id"]["S"]] = item
+        return {}
+
+
+def _records(messages):
+    with open("./tests/messages/text_message.json", "r") as ofile:
+        record = ast.literal_eval(ofile.read())["Records"][0]
+
+    return msg_parser.get_sns_records(
+        [{**record, "Sns": {**record["Sns"], "Message": m, "MessageId": f"id-{m}"}} for m in messages]
+    )
+
+
+class _Channel(DeliveryChannel):
+    """
+    Delivery channel recording the posts, rejecting those containing the failing marker
+    """
+
+    def __init__(self, name, renderer, failing="FAIL"):
+        super().__init__(name=name, webhookUrlEnv="UNUSED", renderer=renderer, successCode=200)
+        self.failing = failing
+        self.sent = []
+
+    def send(self, body):
+        self.sent.append(json.loads(body))
+        code = 500 if self.failing.encode("utf-8") in body else 200
+        return VendorResponse(code=code, info="")
+
+
+def test_disabled_remembers_nothing():
+    ledger = DeliveryLedger(enabled=False)
+    ledger.mark_delivered(["slack:1"])
+
+    assert ledger.delivered(["slack:1"]) == set()
+
+
+def test_remembered_in_memory():
+    ledger = DeliveryLedger(enabled=True, table_name="", max_entries=2)
+    ledger.mark_delivered(["slack:1", "slack:2", "slack:3"])
+
+    # the least recently used is evicted
+    assert ledger.delivered(["slack:1", "slack:2", "slack:3", "teams:3"]) == {
+        "slack:2",
+        "slack:3",
+    }
+
+
+def test_expired_entries_are_forgotten():
+    ledger = DeliveryLedger(enabled=True, table_name="", ttl=0)
+    ledger.mark_delivered(["slack:1"])
+
+    assert ledger.delivered(["slack:1"]) == set()
+
+
+def test_table_shared_between_containers():
+    table = LocalTable()
+    DeliveryLedger(enabled=True, table_name="delivered", client=table).mark_delivered(["slack:1"])
+    table.items["slack:2"] = {
+        "id": {"S": "slack:2"},
+        "expires_at": {"N": str(int(time.time()) - 1)},
+    }
+
+    ledger = DeliveryLedger(enabled=True, table_name="delivered", client=table)
+    assert ledger.delivered(["slack:1", "slack:2"]) == {"slack:1"}
+    # then remembered by the container
+    table.items.clear()
+    assert ledger.delivered(["slack:1"]) == {"slack:1"}
+
+
+def test_table_failure_fails_open():
+    ledger = DeliveryLedger(enabled=True, table_name="delivered", client=LocalTable(failing=True))
+
+    assert ledger.delivered(["slack:1"]) == set()
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    ledger = DeliveryLedger(enabled=True, table_name="")
+    monkeypatch.setattr(msg_parser, "delivery_ledger", ledger)
+    return ledger
+
+
+def test_parse_sns_retry_skips_delivered(ledger):
+    records = _records(["first", "FAIL", "third"])
+    channel = _Channel("slack", SlackRender())
+
+    def parse_sns():
+        return msg_parser.parse_sns(
+            snsRecords=records,
+            vendor_send_to_function=channel.send,
+            renderer=channel.renderer,
+            rendererSuccessCode=channel.successCode,
+            channel=channel.name,
+        )
+
+    assert parse_sns() == ["id-FAIL"]
+    assert len(channel.sent) == 3
+
+    channel.failing = "NOTHING"
+    assert parse_sns() == []
+    assert len(channel.sent) == 4
+    assert ledger.delivered([delivery_key("slack", r) for r in records]) == {
+        "slack:id-first",
+        "slack:id-FAIL",
+        "slack:id-third",
+    }
+
+
+def test_fan_out_retry_only_posts_to_failed_channel(ledger):
+    records = _records(["first", "second"])
+    slack = _Channel("slack", SlackRender())
+    teams = _Channel("teams", TeamsRender(), failing="second")
+
+    assert fan_out_sns(snsRecords=records, channels=[slack, teams]) == ["id-second"]
+
+    teams.failing = "NOTHING"
+    assert fan_out_sns(snsRecords=records, channels=[slack, teams]) == []
+    assert len(slack.sent) == 2
+    assert len(teams.sent) == 3
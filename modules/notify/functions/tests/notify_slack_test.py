@@ -1,23 +1,38 @@
 # -*- coding: utf-8 -*-
 """
-    Slack Notification Test
-    -----------------------
+Slack Notification Test
+-----------------------
 
-    Unit tests for `notify_slack.py`
+Unit tests for `notify_slack.py`
 
 """
 
 import ast
+import json
 import os
 import sys
 
 sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
 
-import msgParser
 import pytest
 
 import msg_parser
-import notify_slack
+from msg_render_slack import SlackRender
+from notification_document import build_document
+
+
+def get_slack_message_payload(message, region, subject=None, messageAttributes=None):
+    """
+    Parse the message and render the Slack payload posted for it
+    """
+    parsed = msg_parser.get_message_payload(
+        message=message,
+        region=region,
+        messageAttributes=messageAttributes or {},
+        subject=subject,
+    )
+    return SlackRender().payload(document=parsed.document)
 
 
 def test_sns_get_slack_message_payload_snapshots(snapshot, monkeypatch):
@@ -48,8 +63,11 @@ def test_sns_get_slack_message_payload_snapshots(snapshot, monkeypatch):
                 message = sns["Message"]
                 region = sns["TopicArn"].split(":")[3]
 
-                attachment = notify_slack.get_slack_message_payload(
-                    message=message, region=region, subject=subject
+                attachment = get_slack_message_payload(
+                    message=message,
+                    region=region,
+                    subject=subject,
+                    messageAttributes=sns.get("MessageAttributes", {}),
                 )
                 attachments.append(attachment)
 
@@ -75,11 +93,9 @@ def test_event_get_slack_message_payload_snapshots(snapshot, monkeypatch):
 
     for file in events:
         with open(os.path.join(_dir, file), "r") as ofile:
-            event = ast.literal_eval(ofile.read())
+            event = json.load(ofile)
 
-            attachment = notify_slack.get_slack_message_payload(
-                message=event, region="us-east-1", subject="bar"
-            )
+            attachment = get_slack_message_payload(message=event, region="us-east-1", subject="bar")
             attachments = [attachment]
 
             filename = os.path.basename(file)
@@ -94,9 +110,7 @@ def test_environment_variables_set(monkeypatch):
     monkeypatch.setenv("SLACK_CHANNEL", "slack_testing_sandbox")
     monkeypatch.setenv("SLACK_USERNAME", "notify_slack_test")
     monkeypatch.setenv("SLACK_EMOJI", ":aws:")
-    monkeypatch.setenv(
-        "SLACK_WEBHOOK_URL", "https://hooks.slack.com/services/YOUR/WEBOOK/URL"
-    )
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.slack.com/services/YOUR/WEBOOK/URL")
 
     with open(os.path.join("./tests/messages/text_message.json"), "r") as efile:
         event = ast.literal_eval(efile.read())
@@ -107,9 +121,7 @@ def test_environment_variables_set(monkeypatch):
             message = sns["Message"]
             region = sns["TopicArn"].split(":")[3]
 
-            notify_slack.get_slack_message_payload(
-                message=message, region=region, subject=subject
-            )
+            get_slack_message_payload(message=message, region=region, subject=subject)
 
 
 def test_environment_variables_missing():
@@ -119,9 +131,7 @@ def test_environment_variables_missing():
     """
     with pytest.raises(KeyError):
         # will raise before parsing/validation
-        notify_slack.get_slack_message_payload(
-            parsedMsg={}, originalMessage={}, subject="bar"
-        )
+        build_document(parsedMessage={}, originalMessage={}, subject="bar")
 
 
 @pytest.mark.parametrize(
@@ -150,7 +160,7 @@ def test_environment_variables_missing():
     ],
 )
 def test_get_service_url(region, service, expected):
-    assert msgParser.get_service_url(region=region, service=service) == expected
+    assert msg_parser.get_service_url(region=region, service=service) == expected
 
 
 def test_get_service_url_exception():
@@ -158,4 +168,4 @@ def test_get_service_url_exception():
     Should raise error since service is not defined in enum
     """
     with pytest.raises(KeyError):
-        msgParser.get_service_url(region="us-east-1", service="athena")
+        msg_parser.get_service_url(region="us-east-1", service="athena")
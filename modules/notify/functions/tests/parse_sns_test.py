@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Parse SNS Test
+--------------
+
+Unit tests for the record handling in `msg_parser.py`
+
+"""
+
+import ast
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import delivery
+import msg_parser
+from deadline import InvocationDeadline
+from delivery_channel import DeliveryChannel, fan_out_sns
+from msg_render_slack import SlackRender
+from msg_render_teams import TeamsRender
+from webhook_client import VendorResponse
+
+
+def _load_sns_records(filename: str):
+    with open(os.path.join("./tests/messages", filename), "r") as ofile:
+        return ast.literal_eval(ofile.read())["Records"]
+
+
+def _sqs_wrap(records):
+    """
+    Wrap SNS records as they are delivered through the SQS buffer
+    """
+    return [
+        {
+            "messageId": f"sqs-{idx}",
+            "eventSource": "aws:sqs",
+            "eventSourceARN": "arn:aws:sqs:eu-west-2:123456789012:notify-buffer",
+            "body": json.dumps(record["Sns"]),
+        }
+        for idx, record in enumerate(records)
+    ]
+
+
+def _sender(failing: str = "FAIL", delay: float = 0.0):
+    """
+    Vendor send function rejecting any payload containing the failing marker
+    """
+    sent = []
+
+    def send(body):
+        time.sleep(random.uniform(0, delay))
+        sent.append(json.loads(body))
+        code = 500 if failing.encode("utf-8") in body else 200
+        return VendorResponse(code=code, info="")
+
+    return send, sent
+
+
+def _text_records(messages):
+    record = _load_sns_records("text_message.json")[0]
+    return [{**record, "Sns": {**record["Sns"], "Message": m}} for m in messages]
+
+
+def test_get_sns_records_from_sqs():
+    """
+    SQS wrapped records are unwrapped to their SNS envelope
+    """
+    records = _load_sns_records("cloudwatch_alarm.json")
+    snsRecords = msg_parser.get_sns_records(_sqs_wrap(records))
+
+    assert len(snsRecords) == len(records)
+    for idx, record in enumerate(snsRecords):
+        assert record["itemIdentifier"] == f"sqs-{idx}"
+        assert record["Sns"] == records[idx]["Sns"]
+
+
+def test_get_sns_records_from_sqs_raw_delivery():
+    """
+    Raw message delivery has no SNS envelope; the queue ARN provides the region
+    """
+    snsRecords = msg_parser.get_sns_records(
+        [
+            {
+                "messageId": "raw",
+                "eventSource": "aws:sqs",
+                "eventSourceARN": "arn:aws:sqs:eu-west-2:123456789012:notify-buffer",
+                "body": "plain text",
+            }
+        ]
+    )
+
+    assert snsRecords[0]["Sns"]["Message"] == "plain text"
+    assert snsRecords[0]["Sns"]["TopicArn"].split(":")[3] == "eu-west-2"
+
+
+def test_parse_sns_reports_failed_records():
+    """
+    Only the records the vendor rejected are reported as failed
+    """
+    records = _sqs_wrap(_text_records(["first", "FAIL", "third"]))
+    send, sent = _sender()
+
+    failed = msg_parser.parse_sns(
+        snsRecords=msg_parser.get_sns_records(records),
+        vendor_send_to_function=send,
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+    )
+
+    assert len(sent) == 3
+    assert failed == ["sqs-1"]
+
+
+def test_deliver_preserves_order_per_key():
+    """
+    Posts for the same alarm are delivered in the order received, even when concurrent
+    """
+    alarm = _load_sns_records("cloudwatch_alarm.json")[0]
+    records = []
+    for idx in range(12):
+        message = json.loads(alarm["Sns"]["Message"])
+        message["AlarmArn"] = message["AlarmArn"] + str(idx % 3)
+        message["AlarmDescription"] = f"transition-{idx}"
+        records.append({**alarm, "Sns": {**alarm["Sns"], "Message": json.dumps(message)}})
+
+    send, sent = _sender(delay=0.01)
+    failed = msg_parser.parse_sns(
+        snsRecords=msg_parser.get_sns_records(_sqs_wrap(records)),
+        vendor_send_to_function=send,
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+    )
+
+    assert failed == []
+    # the alarm description is rendered as the text of the last attachment
+    delivered = [int(p["attachments"][-1]["text"].split("-")[1]) for p in sent]
+    for key in range(3):
+        order = [idx for idx in delivered if idx % 3 == key]
+        assert order == sorted(order)
+
+
+def test_deliver_reports_sender_exceptions():
+    """
+    A sender raising is a failed delivery, not a failed invocation
+    """
+
+    def send(body):
+        raise ConnectionError("unreachable")
+
+    deliveries = [delivery.Delivery(itemIdentifier=str(idx), orderingKey=str(idx), record={}) for idx in range(3)]
+
+    assert delivery.deliver(deliveries, send, 200, max_workers=2) == [False] * 3
+
+
+def test_deliver_holds_back_after_failure_per_key():
+    """
+    Once a post failed, the later posts for the same alarm are failed unsent, so an OK
+    is never delivered before the ALARM it resolves
+    """
+    sent = []
+
+    def send(body):
+        sent.append(body)
+        return VendorResponse(code=500 if body == b"ALARM" else 200, info="")
+
+    deliveries = [
+        delivery.Delivery(itemIdentifier="1", orderingKey="alarm", record={}, body=b"ALARM"),
+        delivery.Delivery(itemIdentifier="2", orderingKey="other", record={}, body=b"OTHER"),
+        delivery.Delivery(itemIdentifier="3", orderingKey="alarm", record={}, body=b"OK"),
+    ]
+
+    assert delivery.deliver(deliveries, send, 200, max_workers=2) == [False, True, False]
+    assert sorted(sent) == [b"ALARM", b"OTHER"]
+
+
+class _Context:
+    """Lambda context with the remaining time fixed at creation"""
+
+    def __init__(self, remaining_ms: int):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def test_deliver_stops_at_deadline(monkeypatch):
+    """
+    No new posts are started once the deadline passed; the unsent deliveries are failed
+    """
+    deadline = InvocationDeadline(safety_margin_ms=1000)
+    deadline.start(_Context(remaining_ms=1250))
+    monkeypatch.setattr(delivery, "invocation_deadline", deadline)
+
+    sent = []
+
+    def send(body):
+        sent.append(body)
+        time.sleep(0.1)
+        return VendorResponse(code=200, info="")
+
+    deliveries = [delivery.Delivery(itemIdentifier=str(idx), orderingKey="same", record={}) for idx in range(6)]
+
+    results = delivery.deliver(deliveries, send, 200, max_workers=2)
+    assert 0 < len(sent) < 6
+    assert results == [True] * len(sent) + [False] * (6 - len(sent))
+
+
+def test_deadline_without_context():
+    deadline = InvocationDeadline()
+    deadline.start(context=None)
+
+    assert not deadline.expired()
+    assert deadline.remaining() == float("inf")
+
+    deadline.start(_Context(remaining_ms=500))
+    assert deadline.expired()
+    assert deadline.remaining() == 0
+
+
+def test_batch_response_sqs():
+    event = {"Records": _sqs_wrap(_load_sns_records("text_message.json"))}
+
+    assert msg_parser.get_batch_response(event, ["sqs-0"]) == {"batchItemFailures": [{"itemIdentifier": "sqs-0"}]}
+    assert msg_parser.get_batch_response(event, []) == {"batchItemFailures": []}
+
+
+def test_batch_response_sns():
+    """
+    SNS cannot partially retry; any failure fails the invocation
+    """
+    event = {"Records": _load_sns_records("text_message.json")}
+
+    assert msg_parser.get_batch_response(event, []) == {}
+    with pytest.raises(Exception):
+        msg_parser.get_batch_response(event, ["any"])
+
+
+def test_get_referenced_account_ids():
+    cloudwatch = _load_sns_records("cloudwatch_alarm.json")[0]
+    backup = _load_sns_records("backup.json")[0]
+
+    assert msg_parser.get_referenced_account_ids(cloudwatch) == [
+        json.loads(cloudwatch["Sns"]["Message"])["AWSAccountId"]
+    ]
+    assert backup["Sns"]["MessageAttributes"]["AccountId"]["Value"] in msg_parser.get_referenced_account_ids(backup)
+
+
+class _Channel(DeliveryChannel):
+    """
+    Delivery channel recording the posts, rejecting those containing the failing marker
+    """
+
+    def __init__(self, name, renderer, failing="FAIL"):
+        super().__init__(name=name, webhookUrlEnv="UNUSED", renderer=renderer, successCode=200)
+        self.sender, self.sent = _sender(failing=failing)
+
+    def send(self, body):
+        return self.sender(body)
+
+
+def test_fan_out_parses_once_and_delivers_to_each_channel(monkeypatch):
+    parsed = []
+    get_message_payload = msg_parser.get_message_payload
+
+    def counting_get_message_payload(**kwargs):
+        parsed.append(kwargs["message"])
+        return get_message_payload(**kwargs)
+
+    monkeypatch.setattr(msg_parser, "get_message_payload", counting_get_message_payload)
+
+    slack = _Channel("slack", SlackRender())
+    teams = _Channel("teams", TeamsRender(), failing="second")
+    records = msg_parser.get_sns_records(_sqs_wrap(_text_records(["first", "second", "FAIL"])))
+
+    failed = fan_out_sns(snsRecords=records, channels=[slack, teams])
+
+    assert len(parsed) == 3
+    assert len(slack.sent) == 3 and len(teams.sent) == 3
+    assert "type" not in slack.sent[0] and teams.sent[0]["type"] == "message"
+    assert failed == ["sqs-2", "sqs-1"]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Profiler Test
+-------------
+
+Unit tests for profiling a sample of the invocations in `profiler.py`
+
+"""
+
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+import profiler
+from profiler import InvocationProfiler
+
+
+def handler(event, context):
+    return {"held": [bytearray(1024) for _ in range(event["records"])]}
+
+
+class LocalLogger:
+    """Local stand-in for the logger, holding the summaries logged in a list"""
+
+    def __init__(self):
+        self.profiles = []
+
+    def info(self, message, **kwargs):
+        self.profiles.append(kwargs)
+
+    def warning(self, message, **kwargs):
+        pass
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    logger = LocalLogger()
+    monkeypatch.setattr(profiler, "logger", logger)
+    return logger.profiles
+
+
+def test_disabled_leaves_handler_unwrapped():
+    assert InvocationProfiler(mode="off").profile(handler) is handler
+
+
+def test_only_sampled_invocations_profiled(logged):
+    samples = iter([3, 0, 1])
+    profiler = InvocationProfiler(mode="cpu", sample_rate=4, sampler=lambda n: next(samples))
+    profiled = profiler.profile(handler)
+
+    for _ in range(3):
+        assert len(profiled({"records": 1}, None)["held"]) == 1
+    assert len(logged) == 1
+
+
+def test_cpu_summary_has_top_functions(logged):
+    profiled = InvocationProfiler(mode="cpu", top=3).profile(handler)
+    profiled({"records": 10}, None)
+
+    (profile,) = logged
+    assert "allocations" not in profile
+    assert len(profile["functions"]) <= 3
+    assert any(f["function"].endswith("(handler)") and f["calls"] == 1 for f in profile["functions"])
+
+
+def test_memory_summary_has_allocation_sites(logged):
+    profiled = InvocationProfiler(mode="memory").profile(handler)
+    profiled({"records": 100}, None)
+
+    (profile,) = logged
+    assert "functions" not in profile
+    assert profile["peak_bytes"] >= 100 * 1024
+    assert profile["allocations"][0]["site"].startswith("profiler_test.py:")
+    assert profile["allocations"][0]["size_bytes"] >= 100 * 1024
+
+
+def test_summary_logged_when_handler_raises(logged):
+    profiled = InvocationProfiler(mode="all").profile(handler)
+
+    with pytest.raises(KeyError):
+        profiled({}, None)
+    (profile,) = logged
+    assert "functions" in profile and "allocations" in profile
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limit Test
+---------------
+
+Unit tests for pacing the posts to the vendor webhooks in `rate_limit.py`
+
+"""
+
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+from rate_limit import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    SharedRateCounter,
+    TokenBucket,
+    WebhookRateLimiter,
+    parse_retry_after,
+)
+
+URL = "https://hooks.example.com/services/T000/B000/XXXX"
+
+
+class Clock:
+    """Clock advanced by the sleeps, rather than waiting"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(round(seconds, 3))
+        self.now += seconds
+
+
+class Response:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+class ConditionalCheckFailed(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class LocalTable:
+    """Local stand-in for the DynamoDB client, counting the posts in a dict"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+        key = Key["id"]["S"]
+        if self.counts.get(key, 0) >= int(ExpressionAttributeValues[":limit"]["N"]):
+            raise ConditionalCheckFailed()
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+
+def _limiter(clock, rates=None, max_wait=5.0, shared=None):
+    return WebhookRateLimiter(
+        vendor_rates=rates or {"slack": (1.0, 2)},
+        max_wait=max_wait,
+        shared=shared,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480) == 30.0
+    assert parse_retry_after(None) == DEFAULT_RETRY_AFTER_SECONDS
+    assert parse_retry_after("soon") == DEFAULT_RETRY_AFTER_SECONDS
+
+
+def test_bucket_bursts_then_paces():
+    clock = Clock()
+    bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+
+    waits = [bucket.reserve(max_wait=10) for _ in range(5)]
+    assert waits == [0.0, 0.0, 0.0, 0.5, 1.0]
+    # the slot is not reserved when it would wait too long
+    assert bucket.reserve(max_wait=1.0) is None
+
+
+def test_bucket_paused():
+    clock = Clock()
+    bucket = TokenBucket(rate=0, burst=0, clock=clock)
+
+    assert bucket.reserve(max_wait=0) == 0.0
+    bucket.pause(3)
+    assert bucket.reserve(max_wait=10) == 3.0
+
+
+def test_limiter_paces_each_webhook():
+    clock = Clock()
+    limiter = _limiter(clock)
+
+    for url in (URL, URL, URL, URL + "-other"):
+        assert limiter.acquire("slack", url, max_wait=5)
+    assert clock.slept == [1.0]
+
+
+def test_limiter_retries_throttled_post():
+    clock = Clock()
+    limiter = _limiter(clock)
+    responses = [Response(429, {"Retry-After": "2"}), Response(200)]
+
+    response = limiter.post("slack", URL, send=lambda: responses.pop(0))
+    assert response.status == 200
+    assert clock.slept == [2.0]
+
+
+def test_limiter_gives_up_beyond_wait():
+    clock = Clock()
+    limiter = _limiter(clock, max_wait=5)
+    sent = []
+
+    def send():
+        sent.append(clock())
+        return Response(429, {"Retry-After": "60"})
+
+    response = limiter.post("slack", URL, send=send)
+    assert response.status == 429
+    assert len(sent) == 1
+    # the webhook stays paused for the following posts
+    assert limiter.post("slack", URL, send=send) is None
+
+
+def test_limiter_shares_rate_between_containers():
+    table = LocalTable()
+    clock = Clock()
+    first = _limiter(clock, shared=SharedRateCounter("rates", client=table))
+    second = _limiter(clock, shared=SharedRateCounter("rates", client=table))
+
+    assert first.acquire("slack", URL, max_wait=0)
+    # the second container's bucket allows a burst, the shared count does not
+    assert not second.acquire("slack", URL, max_wait=0)
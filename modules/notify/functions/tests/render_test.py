@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Render Test
+-----------
+
+Unit tests for `notification_document.py` and the vendor renders
+
+"""
+
+import ast
+import json
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+from snapshots import snap_render_test
+
+import msg_parser
+import msg_render_slack
+import msg_render_teams
+import render
+from msg_render_slack import SlackRender
+from msg_render_teams import TeamsRender
+from notification_document import NotificationDocument, Resource, build_document
+from render import PayloadTemplate, encode_payload, encode_string, slot
+
+# The events not routed by their detail-type are routed by the SNS subject
+EVENT_SUBJECTS = {
+    "cost-anomaly.json": "AWS Cost Management: Anomaly detected",
+    "dms_notification.json": "DMS Notification Message",
+    "security_hub_finding.json": "Security Hub Finding",
+}
+
+
+def _render(message, subject, region="eu-west-2", messageAttributes=None):
+    parsed = msg_parser.get_message_payload(
+        message=message,
+        region=region,
+        messageAttributes=messageAttributes or {},
+        subject=subject,
+    )
+    return {
+        "slack": SlackRender().payload(document=parsed.document),
+        "teams": TeamsRender().payload(document=parsed.document),
+    }
+
+
+def test_sns_render_snapshots(snapshot):
+    """
+    Compare the rendered payloads of the SNS messages with snapshots stored
+
+    Run `pipenv run test:updatesnapshots` to update snapshot images
+    """
+    _dir = "./tests/messages"
+    for file in sorted(os.listdir(_dir)):
+        with open(os.path.join(_dir, file), "r") as ofile:
+            event = ast.literal_eval(ofile.read())
+
+        payloads = []
+        for record in event["Records"]:
+            sns = record["Sns"]
+            payloads.append(
+                _render(
+                    message=sns["Message"],
+                    subject=sns.get("Subject"),
+                    region=sns["TopicArn"].split(":")[3],
+                    messageAttributes=sns.get("MessageAttributes", {}),
+                )
+            )
+
+        snapshot.assert_match(payloads, f"message_{file}")
+
+
+def test_event_render_snapshots(snapshot):
+    """
+    Compare the rendered payloads of the EventBridge events with snapshots stored
+
+    Run `pipenv run test:updatesnapshots` to update snapshot images
+    """
+    _dir = "./tests/events"
+    for file in sorted(os.listdir(_dir)):
+        with open(os.path.join(_dir, file), "r") as ofile:
+            event = json.load(ofile)
+
+        snapshot.assert_match(_render(message=event, subject=EVENT_SUBJECTS.get(file)), f"event_{file}")
+
+
+def test_document_built_once_for_all_channels():
+    with open("./tests/events/security_hub_finding.json", "r") as ofile:
+        event = json.load(ofile)
+
+    parsed = msg_parser.get_message_payload(
+        message=event,
+        region="eu-west-2",
+        messageAttributes={},
+        subject="Security Hub Finding",
+    )
+    document = parsed.document
+    assert isinstance(document, NotificationDocument)
+    assert document.action == "SecurityHub"
+    assert document.resources
+
+    slack = SlackRender().payload(document=document)
+    teams = TeamsRender().payload(document=document)
+
+    # each channel lays out the facts its own way, but lists the same resources
+    slackTitles = [field.get("title") for field in slack["attachments"][1]["fields"]]
+    teamsItems = teams["attachments"][0]["content"]["body"][0]["items"]
+    teamsTitles = [fact["title"] for fact in teamsItems[-1]["facts"]]
+    resourceTitles = [field.title for field in document.resource_fields()]
+    first = len(slackTitles) - len(resourceTitles)
+    assert slackTitles[first:] == resourceTitles
+    assert teamsTitles == resourceTitles
+    assert resourceTitles[-2:] == [
+        f"Type {len(document.resources)}",
+        f"Arn {len(document.resources)}",
+    ]
+
+
+def test_resource_fields_are_numbered():
+    document = NotificationDocument(
+        action="SecurityHub",
+        title="Security Hub: test",
+        fallback="test",
+        resources=[
+            Resource(type="AwsS3Bucket", id="arn:aws:s3:::one"),
+            Resource(type="AwsS3Bucket", id="arn:aws:s3:::two"),
+        ],
+    )
+
+    fields = document.resource_fields()
+    assert [(f.title, f.value, f.short) for f in fields] == [
+        ("Type 1", "`AwsS3Bucket`", True),
+        ("Arn 1", "`arn:aws:s3:::one`", False),
+        ("Type 2", "`AwsS3Bucket`", True),
+        ("Arn 2", "`arn:aws:s3:::two`", False),
+    ]
+
+
+def test_default_document_lists_message():
+    document = build_document(parsedMessage={"action": "Unknown"}, originalMessage="plain text", subject=None)
+    assert document.title == "Message"
+
+    slack = SlackRender().payload(document=document)
+    assert slack["attachments"][0]["fields"] == [{"value": "plain text", "short": False}]
+
+    teams = TeamsRender().payload(document=document)
+    items = teams["attachments"][0]["content"]["body"][0]["items"]
+    assert items[-1] == {
+        "type": "FactSet",
+        "facts": [{"value": "plain text", "short": False}],
+    }
+    # no priority, so neither an icon nor a colour
+    assert "color" not in slack["attachments"][0]
+    assert "color" not in items[0]
+
+
+def test_payload_template_fills_slots():
+    template = PayloadTemplate({"type": "TextBlock", "text": slot("text"), "items": [slot("items")]})
+
+    assert (
+        template.render(text=encode_string('{"caf\u00e9"}'), items="1,2")
+        == '{"type":"TextBlock","text":"{\\"caf\u00e9\\"}","items":[1,2]}'
+    )
+
+
+def test_teams_body_is_the_recorded_card():
+    """
+    The card written from the templates is the card recorded in the snapshots, byte
+    for byte the encoded card payload
+    """
+    recorded = snap_render_test.snapshots
+
+    _dir = "./tests/messages"
+    for file in sorted(os.listdir(_dir)):
+        with open(os.path.join(_dir, file), "r") as ofile:
+            event = ast.literal_eval(ofile.read())
+
+        cards = recorded[f"test_sns_render_snapshots message_{file}"]
+        for record, card in zip(event["Records"], cards, strict=True):
+            sns = record["Sns"]
+            document = msg_parser.get_message_payload(
+                message=sns["Message"],
+                region=sns["TopicArn"].split(":")[3],
+                messageAttributes=sns.get("MessageAttributes", {}),
+                subject=sns.get("Subject"),
+            ).document
+
+            body = TeamsRender().body(document=document)
+            assert json.loads(body) == card["teams"], file
+            assert body == encode_payload(json.loads(body)), file
+
+    _dir = "./tests/events"
+    for file in sorted(os.listdir(_dir)):
+        with open(os.path.join(_dir, file), "r") as ofile:
+            event = json.load(ofile)
+
+        document = msg_parser.get_message_payload(
+            message=event,
+            region="eu-west-2",
+            messageAttributes={},
+            subject=EVENT_SUBJECTS.get(file),
+        ).document
+
+        body = TeamsRender().body(document=document)
+        card = recorded[f"test_event_render_snapshots event_{file}"]
+        assert json.loads(body) == card["teams"], file
+        assert body == encode_payload(json.loads(body)), file
+
+
+def _oversized_finding(resources: int):
+    with open("./tests/events/security_hub_finding.json", "r") as ofile:
+        event = json.load(ofile)
+
+    event["Resources"] = [
+        {
+            "Type": "AwsEc2Instance",
+            "Id": f"arn:aws:ec2:eu-west-2:123456789012:instance/i-{idx:017d}",
+        }
+        for idx in range(resources)
+    ]
+    return msg_parser.get_message_payload(
+        message=event,
+        region="eu-west-2",
+        messageAttributes={},
+        subject="Security Hub Finding",
+    ).document
+
+
+def test_oversized_finding_is_truncated_within_budget():
+    document = _oversized_finding(resources=5000)
+
+    slack = SlackRender().payload(document=document)
+    fields = slack["attachments"][1]["fields"]
+    text = sum(len(f.get("title", "")) + len(f["value"]) for f in fields)
+    assert text <= msg_render_slack.SLACK_TEXT_LIMIT
+    shown = sum(1 for f in fields if f.get("title", "").startswith("Arn "))
+    assert 0 < shown < 5000
+    assert fields[-1] == {"value": f"+{5000 - shown} more resources", "short": False}
+
+    body = TeamsRender().body(document=document)
+    assert len(body) <= msg_render_teams.TEAMS_PAYLOAD_LIMIT
+    card = json.loads(body)["attachments"][0]["content"]["body"][0]["items"]
+    facts = [fact for item in card if item["type"] == "FactSet" for fact in item["facts"]]
+    shown = sum(1 for fact in facts if fact["title"].startswith("Arn "))
+    assert 0 < shown < 5000
+    assert card[-1]["text"] == f"+{5000 - shown} more resources"
+    # a resource is never split across the truncation
+    assert facts[-1]["title"] == f"Arn {shown}"
+
+
+def test_small_finding_is_not_truncated():
+    document = _oversized_finding(resources=3)
+    layout = msg_render_slack.SLACK_LAYOUTS["SecurityHub"].fields
+    assert document.truncation(layout, len(layout) + 3) is None
+
+    fields = SlackRender().payload(document=document)["attachments"][1]["fields"]
+    assert fields[-1]["title"] == "Arn 3"
+
+
+def test_oversized_unknown_message_is_bounded():
+    message = {f"key{idx}": "x" * 100 for idx in range(2000)}
+    document = build_document(parsedMessage={"action": "Unknown"}, originalMessage=message, subject="big")
+    assert 0 < len(document.fields) < 2000
+    assert document.omitted == 2000 - len(document.fields)
+
+    fields = SlackRender().payload(document=document)["attachments"][0]["fields"]
+    assert fields[-1]["value"] == f"+{2000 - (len(fields) - 1)} more fields"
+
+    body = TeamsRender().body(document=document)
+    assert len(body) <= msg_render_teams.TEAMS_PAYLOAD_LIMIT
+
+
+def test_oversized_field_is_cut_short():
+    document = build_document(parsedMessage={"action": "Unknown"}, originalMessage="x" * 100000, subject=None)
+
+    slack = SlackRender().payload(document=document)
+    fields = slack["attachments"][0]["fields"]
+    # the message is cut short, rather than left out for a summary
+    assert len(fields) == 1
+    assert fields[0]["value"].startswith("xxx")
+    assert fields[0]["value"].endswith(render.ELLIPSIS)
+    assert len(fields[0]["value"]) <= msg_render_slack.SLACK_TEXT_LIMIT
+
+    body = TeamsRender().body(document=document)
+    assert len(body) <= msg_render_teams.TEAMS_PAYLOAD_LIMIT
+    items = json.loads(body)["attachments"][0]["content"]["body"][0]["items"]
+    assert len(items) == 2
+    assert items[1]["facts"][0]["value"].endswith(render.ELLIPSIS)
+
+
+def test_oversized_multibyte_field_fills_the_payload():
+    """
+    Text of multibyte characters is cut to the room left in bytes, rather than by a
+    character per byte of overflow
+    """
+    for char in ("€", "é"):
+        document = build_document(parsedMessage={"action": "Unknown"}, originalMessage=char * 20000, subject=None)
+
+        body = TeamsRender().body(document=document)
+        assert len(body) <= msg_render_teams.TEAMS_PAYLOAD_LIMIT
+        assert len(body) > msg_render_teams.TEAMS_PAYLOAD_LIMIT * 0.9
+        value = json.loads(body)["attachments"][0]["content"]["body"][0]["items"][1]["facts"][0]["value"]
+        assert value.startswith(char * 100)
+        assert value.endswith(render.ELLIPSIS)
+
+
+def test_oversized_text_and_title_are_cut_short():
+    with open("./tests/events/security_hub_finding.json", "r") as ofile:
+        event = json.load(ofile)
+    event["Description"] = "d" * 100000
+    event["GeneratorId"] = "g" * 100000
+
+    document = msg_parser.get_message_payload(
+        message=event,
+        region="eu-west-2",
+        messageAttributes={},
+        subject="Security Hub Finding",
+    ).document
+
+    slack = SlackRender().payload(document=document)
+    titleItem, factsItem = slack["attachments"]
+    assert titleItem["title"].endswith(render.ELLIPSIS)
+    text = len(titleItem["title"]) + len(factsItem["fallback"]) + len(factsItem["text"])
+    text += sum(len(f.get("title", "")) + len(f["value"]) for f in factsItem["fields"])
+    assert text <= msg_render_slack.SLACK_TEXT_LIMIT
+    # no room is left for the fields, so only their summary is shown
+    assert factsItem["fields"][-1]["value"].startswith("+")
+
+    body = TeamsRender().body(document=document)
+    assert len(body) <= msg_render_teams.TEAMS_PAYLOAD_LIMIT
+    items = json.loads(body)["attachments"][0]["content"]["body"][0]["items"]
+    assert items[1]["text"].endswith(render.ELLIPSIS)
+
+
+def test_clip_cuts_the_encoded_text_to_the_room():
+    assert render.clip("short", room=10) == "short"
+    assert render.clip("x" * 20, room=10) == "x" * 9 + render.ELLIPSIS
+
+    text = '"é' * 20
+    clipped = render.clip(text, room=30, size=render.string_size)
+    assert render.string_size(clipped) <= 30
+    assert clipped.endswith(render.ELLIPSIS)
+    # the most characters which fit are kept
+    assert render.string_size(text[: len(clipped)] + render.ELLIPSIS) > 30
+
+    clipped = render.clip("€" * 100, room=30, size=render.encoded_size)
+    assert clipped == "€" * 9 + render.ELLIPSIS
@@ -11,82 +11,206 @@ snapshots[
 ] = [
     {
         "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "AWS Health: EC2",
+                "title_link": "https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues",
+            },
             {
                 "color": "danger",
                 "fallback": "New AWS Health Event for EC2",
                 "fields": [
                     {"short": True, "title": "Affected Service", "value": "`EC2`"},
-                    {"short": True, "title": "Affected Region", "value": "`us-west-2`"},
+                    {"short": True, "title": "Category", "value": "`issue`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account Id", "value": "`123456789012`"},
+                    {
+                        "short": True,
+                        "title": "Start Time",
+                        "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                    },
+                    {"short": True, "title": "End Time", "value": "`<unknown>`"},
                     {
                         "short": False,
                         "title": "Code",
                         "value": "`AWS_EC2_INSTANCE_STORE_DRIVE_PERFORMANCE_DEGRADED`",
                     },
+                    {"short": False, "title": "Region", "value": "`us-west-2`"},
                     {
                         "short": False,
-                        "title": "Event Description",
-                        "value": "`A description of the event will be provided here`",
+                        "title": "Affected Resources",
+                        "value": "i-abcd1111",
                     },
+                ],
+                "text": "A description of the event will be provided here",
+                "ts": 1465108077.0,
+            },
+        ]
+    }
+]
+
+snapshots[
+    "test_event_get_slack_message_payload_snapshots event_cloudwatch_alarm.json"
+] = [
+    {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "CloudWatch: Example",
+                "title_link": "https://console.aws.amazon.com/cloudwatch/home?region=eu-west-1#alarm:alarmFilter=ANY;name=Example",
+            },
+            {
+                "color": "danger",
+                "fallback": "Alarm Example triggered",
+                "fields": [
                     {
                         "short": False,
-                        "title": "Affected Resources",
-                        "value": "`i-abcd1111`",
+                        "title": "When",
+                        "value": "`2017-01-12T16:30:42.236+0000`",
                     },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`735598076380`"},
+                    {"short": True, "title": "Region", "value": "`eu-west-1`"},
                     {
                         "short": True,
-                        "title": "Start Time",
-                        "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                        "title": "Region Locale",
+                        "value": "`EU - Ireland`",
                     },
-                    {"short": True, "title": "End Time", "value": "`<unknown>`"},
                     {
                         "short": False,
-                        "title": "Link to Event",
-                        "value": "https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues",
+                        "title": "Alarm reason",
+                        "value": "Threshold Crossed",
                     },
+                    {"short": True, "title": "Current State", "value": "`ALARM`"},
+                    {"short": True, "title": "Old State", "value": "`OK`"},
                 ],
-                "text": "New AWS Health Event for EC2",
+                "text": "Example alarm description.",
+                "ts": 1484238642,
+            },
+        ]
+    }
+]
+
+snapshots["test_event_get_slack_message_payload_snapshots event_cost-anomaly.json"] = [
+    {
+        "attachments": [
+            {
+                "fallback": "A new message",
+                "fields": [
+                    {"short": True, "title": "accountId", "value": "`536471746696`"},
+                    {"short": True, "title": "accountName", "value": "`appvia-io`"},
+                    {
+                        "short": True,
+                        "title": "anomalyStartDate",
+                        "value": "`2024-09-08T00:00:00Z`",
+                    },
+                    {
+                        "short": True,
+                        "title": "anomalyEndDate",
+                        "value": "`2024-09-11T00:00:00Z`",
+                    },
+                    {
+                        "short": False,
+                        "title": "anomalyId",
+                        "value": "`fd29c1a4-aacc-4317-a822-c8f81a65f023`",
+                    },
+                    {
+                        "short": True,
+                        "title": "dimensionalValue",
+                        "value": "`AWS Lambda`",
+                    },
+                    {
+                        "short": False,
+                        "title": "monitorArn",
+                        "value": "`arn:aws:ce::536471746696:anomalymonitor/b949dc85-ceb9-4633-8a98-2f944ede4fd6`",
+                    },
+                    {
+                        "short": False,
+                        "title": "monitorName",
+                        "value": "`AWS Service Cost Anomaly Monitor`",
+                    },
+                    {"short": True, "title": "monitorType", "value": "`DIMENSIONAL`"},
+                    {
+                        "short": False,
+                        "title": "anomalyScore",
+                        "value": '`{"maxScore": 0.49, "currentScore": 0.49}`',
+                    },
+                    {
+                        "short": False,
+                        "title": "impact",
+                        "value": '`{"maxImpact": 1.32, "totalExpectedSpend": 0.2, "totalActualSpend": 4.94, "totalImpact": 4.74, "totalImpactPercentage": 2370.0}`',
+                    },
+                    {
+                        "short": False,
+                        "title": "rootCauses",
+                        "value": '`[{"service": "AWS Lambda", "region": "eu-west-2", "linkedAccount": "012140491173", "linkedAccountName": "Audit", "usageType": "EUW2-Lambda-GB-Second"}]`',
+                    },
+                    {
+                        "short": False,
+                        "title": "anomalyDetailsLink",
+                        "value": "`https://console.aws.amazon.com/costmanagement/home#/anomaly-detection/monitors/b949dc85-ceb9-4633-8a98-2f944ede4fd6/anomalies/fd29c1a4-aacc-4317-a822-c8f81a65f023`",
+                    },
+                    {
+                        "short": False,
+                        "title": "subscriptionId",
+                        "value": "`ce0fd489-02a7-4128-b945-9d44cf0e51b6`",
+                    },
+                    {
+                        "short": False,
+                        "title": "subscriptionName",
+                        "value": "`AWS Service Cost Anomaly Monitor`",
+                    },
+                ],
+                "mrkdwn_in": ["value"],
+                "text": "AWS notification",
+                "title": "bar",
             }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+        ]
     }
 ]
 
 snapshots[
-    "test_event_get_slack_message_payload_snapshots event_cloudwatch_alarm.json"
+    "test_event_get_slack_message_payload_snapshots event_dms_notification.json"
 ] = [
     {
         "attachments": [
             {
-                "color": "danger",
-                "fallback": "Alarm Example triggered",
+                "fallback": "A new message",
                 "fields": [
-                    {"short": True, "title": "Alarm Name", "value": "`Example`"},
+                    {
+                        "short": True,
+                        "title": "Event Source",
+                        "value": "`replication-task`",
+                    },
+                    {
+                        "short": True,
+                        "title": "Event Time",
+                        "value": "`2019-02-12 15:45:24.091`",
+                    },
                     {
                         "short": False,
-                        "title": "Alarm Description",
-                        "value": "`Example alarm description.`",
+                        "title": "Identifier Link",
+                        "value": "`https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world`",
                     },
+                    {"short": True, "title": "SourceId", "value": "`hello-world`"},
                     {
                         "short": False,
-                        "title": "Alarm reason",
-                        "value": "`Threshold Crossed`",
+                        "title": "Event ID",
+                        "value": "`http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 `",
                     },
-                    {"short": True, "title": "Old State", "value": "`OK`"},
-                    {"short": True, "title": "Current State", "value": "`ALARM`"},
                     {
                         "short": False,
-                        "title": "Link to Alarm",
-                        "value": "https://console.aws.amazon.com/cloudwatch/home?region=us-east-1#alarm:alarmFilter=ANY;name=Example",
+                        "title": "Event Message",
+                        "value": "`Replication task has stopped.`",
                     },
                 ],
-                "text": "AWS CloudWatch notification - Example",
+                "mrkdwn_in": ["value"],
+                "text": "AWS notification",
+                "title": "bar",
             }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+        ]
     }
 ]
 
@@ -95,15 +219,16 @@ snapshots[
 ] = [
     {
         "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+            },
             {
                 "color": "danger",
                 "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
                 "fields": [
-                    {
-                        "short": False,
-                        "title": "Description",
-                        "value": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
-                    },
                     {
                         "short": False,
                         "title": "Finding Type",
@@ -119,21 +244,16 @@ snapshots[
                         "title": "Last Seen",
                         "value": "`2020-01-03T01:02:03Z`",
                     },
-                    {"short": True, "title": "Severity", "value": "`High`"},
-                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Severity/Score", "value": "`High/9`"},
                     {"short": True, "title": "Count", "value": "`1234`"},
-                    {
-                        "short": False,
-                        "title": "Link to Finding",
-                        "value": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
-                    },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
                 ],
-                "text": "AWS GuardDuty Finding - SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
     }
 ]
 
@@ -142,15 +262,15 @@ snapshots[
 ] = [
     {
         "attachments": [
+            {
+                "color": "#777777",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+            },
             {
                 "color": "#777777",
                 "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
                 "fields": [
-                    {
-                        "short": False,
-                        "title": "Description",
-                        "value": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
-                    },
                     {
                         "short": False,
                         "title": "Finding Type",
@@ -166,21 +286,16 @@ snapshots[
                         "title": "Last Seen",
                         "value": "`2020-01-03T01:02:03Z`",
                     },
-                    {"short": True, "title": "Severity", "value": "`Low`"},
-                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Severity/Score", "value": "`Low/2`"},
                     {"short": True, "title": "Count", "value": "`1234`"},
-                    {
-                        "short": False,
-                        "title": "Link to Finding",
-                        "value": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
-                    },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
                 ],
-                "text": "AWS GuardDuty Finding - SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
     }
 ]
 
@@ -189,15 +304,16 @@ snapshots[
 ] = [
     {
         "attachments": [
+            {
+                "color": "warning",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+            },
             {
                 "color": "warning",
                 "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
                 "fields": [
-                    {
-                        "short": False,
-                        "title": "Description",
-                        "value": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
-                    },
                     {
                         "short": False,
                         "title": "Finding Type",
@@ -213,127 +329,305 @@ snapshots[
                         "title": "Last Seen",
                         "value": "`2020-01-03T01:02:03Z`",
                     },
-                    {"short": True, "title": "Severity", "value": "`Medium`"},
-                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Severity/Score", "value": "`Medium/5`"},
                     {"short": True, "title": "Count", "value": "`1234`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
+                ],
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
+    }
+]
+
+snapshots[
+    "test_event_get_slack_message_payload_snapshots event_security_hub_finding.json"
+] = [
+    {
+        "attachments": [
+            {
+                "fallback": "A new message",
+                "fields": [
+                    {
+                        "short": False,
+                        "title": "FindingId",
+                        "value": "`arn:aws:securityhub:eu-west-2:123456789:subscription/nist-800-53/v/5.0.0/EC2.8/finding/89deac02-0ea8-49a2-a1e7-31b64bc037f2`",
+                    },
+                    {
+                        "short": False,
+                        "title": "Description",
+                        "value": "`This control checks whether your Amazon Elastic Compute Cloud (Amazon EC2) instance metadata version is configured with Instance Metadata Service Version 2 (IMDSv2). The control passes if HttpTokens is set to required for IMDSv2. The control fails if HttpTokens is set to optional.`",
+                    },
                     {
                         "short": False,
-                        "title": "Link to Finding",
-                        "value": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+                        "title": "GeneratorId",
+                        "value": "`nist-800-53/v/5.0.0/EC2.8`",
+                    },
+                    {"short": True, "title": "Severity", "value": "`HIGH`"},
+                    {"short": True, "title": "AccountName", "value": "`SupportProd`"},
+                    {
+                        "short": False,
+                        "title": "Resources",
+                        "value": '`[{"Partition": "aws", "Type": "AwsEc2Instance", "Details": {"AwsEc2Instance": {"VpcId": "vpc-738575683784", "MetadataOptions": {"HttpPutResponseHopLimit": 2, "HttpProtocolIpv6": "disabled", "HttpTokens": "optional", "InstanceMetadataTags": "disabled", "HttpEndpoint": "enabled"}, "VirtualizationType": "hvm", "NetworkInterfaces": [{"NetworkInterfaceId": "eni-070adc8dad15224ce"}, {"NetworkInterfaceId": "eni-0beb2cc73e332cca7"}], "ImageId": "ami-7e78237da982", "SubnetId": "subnet-7e782f2da982", "LaunchedAt": "2024-02-15T11:41:53.000Z", "Monitoring": {"State": "disabled"}, "IamInstanceProfileArn": "arn:aws:iam::123456789:instance-profile/eks-aaaabbbb-1111-1111-1111-fb829a08212d"}}, "Region": "eu-west-2", "Id": "arn:aws:ec2:eu-west-2:123456789:instance/i-1111aa22222ddd333333", "Tags": {"aws:autoscaling:groupName": "eks-compute-aaaabbbb-1111-1111-1111-fb829a08212d", "aws:ec2:fleet-id": "fleet-aaaabbbb-1111-1111-1111-fb829a08212d", "k8s.io/cluster-autoscaler/ws-supp-portal-eks": "owned", "aws:eks:cluster-name": "cluster1-eks", "eks:cluster-name": "cluster1-eks", "aws:ec2launchtemplate:version": "1", "eks:nodegroup-name": "compute", "k8s.io/cluster-autoscaler/enabled": "true", "kubernetes.io/cluster/ws-supp-portal-eks": "owned", "aws:ec2launchtemplate:id": "lt-aaaa1111eeee8765e"}}]`',
                     },
                 ],
-                "text": "AWS GuardDuty Finding - SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "mrkdwn_in": ["value"],
+                "text": "AWS notification",
+                "title": "bar",
             }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+        ]
+    }
+]
+
+snapshots["test_sns_get_slack_message_payload_snapshots message_aws_health.json"] = [
+    {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "AWS Health: EC2",
+                "title_link": "https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues",
+            },
+            {
+                "color": "danger",
+                "fallback": "New AWS Health Event for EC2",
+                "fields": [
+                    {"short": True, "title": "Affected Service", "value": "`EC2`"},
+                    {"short": True, "title": "Category", "value": "`issue`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account Id", "value": "`123456789012`"},
+                    {
+                        "short": True,
+                        "title": "Start Time",
+                        "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                    },
+                    {"short": True, "title": "End Time", "value": "`<unknown>`"},
+                    {
+                        "short": False,
+                        "title": "Code",
+                        "value": "`AWS_EC2_INSTANCE_STORE_DRIVE_PERFORMANCE_DEGRADED`",
+                    },
+                    {"short": False, "title": "Region", "value": "`us-west-2`"},
+                    {
+                        "short": False,
+                        "title": "Affected Resources",
+                        "value": "i-abcd1111",
+                    },
+                ],
+                "text": "A description of the event will be provided here",
+                "ts": 1465108077.0,
+            },
+        ]
     }
 ]
 
 snapshots["test_sns_get_slack_message_payload_snapshots message_backup.json"] = [
     {
         "attachments": [
+            {"color": "good", "title": "Backup : 1b2345b2-f22c-4dab-5eb6-bbc7890ed123"},
             {
+                "color": "good",
+                "fallback": "Backup event for 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
                 "fields": [
-                    {"title": "✅ An AWS Backup job was completed successfully"},
-                    {"short": False, "value": "BackupJob ID"},
-                    {"short": False, "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`"},
-                    {"short": False, "value": "Resource ARN"},
                     {
                         "short": False,
+                        "title": "Backup Id",
+                        "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                    },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account Id", "value": "`123456789012`"},
+                    {"short": True, "title": "Status", "value": "`COMPLETED`"},
+                    {"short": True, "title": "Priority", "value": "`NO_ERROR`"},
+                    {"short": True, "title": "Region", "value": "`us-west-1`"},
+                    {
+                        "short": True,
+                        "title": "Start Time",
+                        "value": "`2019-09-02T13:48:52.226Z`",
+                    },
+                    {
+                        "short": False,
+                        "title": "BackupJob ID",
+                        "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                    },
+                    {
+                        "short": False,
+                        "title": "Resource ARN",
                         "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
                     },
-                    {"short": False, "value": "Recovery point ARN"},
                     {
                         "short": False,
+                        "title": "Recovery point ARN",
                         "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012d`",
                     },
-                ]
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                ],
+                "text": "An AWS Backup job was completed successfully",
+            },
+        ]
     },
     {
         "attachments": [
             {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "Backup : 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+            },
+            {
+                "color": "danger",
+                "fallback": "Backup event for 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
                 "fields": [
-                    {"title": "⚠️ An AWS Backup job failed"},
-                    {"short": False, "value": "BackupJob ID"},
-                    {"short": False, "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`"},
-                    {"short": False, "value": "Resource ARN"},
                     {
                         "short": False,
+                        "title": "Backup Id",
+                        "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                    },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account Id", "value": "`123456789012`"},
+                    {"short": True, "title": "Status", "value": "`FAILED`"},
+                    {"short": True, "title": "Priority", "value": "`ERROR`"},
+                    {"short": True, "title": "Region", "value": "`us-west-1`"},
+                    {
+                        "short": True,
+                        "title": "Start Time",
+                        "value": "`2019-09-02T13:48:52.226Z`",
+                    },
+                    {
+                        "short": False,
+                        "title": "BackupJob ID",
+                        "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                    },
+                    {
+                        "short": False,
+                        "title": "Resource ARN",
                         "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
                     },
-                ]
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                ],
+                "text": "An AWS Backup job failed",
+            },
+        ]
     },
     {
         "attachments": [
             {
+                "color": "warning",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                "title": "Backup : 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+            },
+            {
+                "color": "warning",
+                "fallback": "Backup event for 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
                 "fields": [
-                    {"title": "⚠️ An AWS Backup job failed to complete in time"},
-                    {"short": False, "value": "BackupJob ID"},
-                    {"short": False, "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`"},
-                    {"short": False, "value": "Resource ARN"},
                     {
                         "short": False,
+                        "title": "Backup Id",
+                        "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                    },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account Id", "value": "`123456789012`"},
+                    {"short": True, "title": "Status", "value": "`EXPIRED`"},
+                    {"short": True, "title": "Priority", "value": "`WARNING`"},
+                    {"short": True, "title": "Region", "value": "`us-west-1`"},
+                    {
+                        "short": True,
+                        "title": "Start Time",
+                        "value": "`2019-09-02T13:48:52.226Z`",
+                    },
+                    {
+                        "short": False,
+                        "title": "BackupJob ID",
+                        "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                    },
+                    {
+                        "short": False,
+                        "title": "Resource ARN",
                         "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
                     },
-                ]
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                ],
+                "text": "An AWS Backup job failed to complete in time",
+            },
+        ]
     },
 ]
 
+snapshots["test_sns_get_slack_message_payload_snapshots message_budget.json"] = [
+    {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                "title": "Budget:  AWS Forecasted Cost Budget has exceeded your alert threshold",
+            },
+            {
+                "color": "danger",
+                "fallback": "Budget  AWS Forecasted Cost Budget has exceeded your alert threshold triggered",
+                "fields": [
+                    {
+                        "short": False,
+                        "value": """AWS Budget Notification August 01, 2024
+AWS Account 123456789
+
+Dear AWS Customer,
+
+You requested that we alert you when the FORECASTED Cost associated with your AWS Forecasted Cost Budget budget is greater than $1,987.12 for the current month. The FORECASTED Cost associated with this budget is $2,123.98. You can find additional details below and by accessing the AWS Budgets dashboard [1].
+
+Budget Name: AWS Forecasted Cost Budget
+Budget Type: Cost
+Budgeted Amount: $2,000.00
+Alert Type: FORECASTED
+Alert Threshold: > $2,1111.12
+FORECASTED Amount: $3,543.34
+
+[1] https://console.aws.amazon.com/billing/home#/budgets
+""",
+                    }
+                ],
+                "mrkdwn_in": ["value"],
+            },
+        ]
+    }
+]
+
 snapshots[
     "test_sns_get_slack_message_payload_snapshots message_cloudwatch_alarm.json"
 ] = [
     {
         "attachments": [
             {
-                "color": "good",
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "CloudWatch: DBMigrationRequired",
+                "title_link": "https://console.aws.amazon.com/cloudwatch/home?region=us-east-1#alarm:alarmFilter=ANY;name=DBMigrationRequired",
+            },
+            {
+                "color": "danger",
                 "fallback": "Alarm DBMigrationRequired triggered",
                 "fields": [
-                    {
-                        "short": True,
-                        "title": "Alarm Name",
-                        "value": "`DBMigrationRequired`",
-                    },
                     {
                         "short": False,
-                        "title": "Alarm Description",
-                        "value": '`App is reporting "A JPA error occurred(Unable to build EntityManagerFactory)"`',
+                        "title": "When",
+                        "value": "`2019-02-12T15:45:24.006+0000`",
                     },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`735598076380`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
                     {
-                        "short": False,
-                        "title": "Alarm reason",
-                        "value": "`Threshold Crossed: 1 datapoint [1.0 (12/02/19 15:44:00)] was not less than the threshold (1.0).`",
+                        "short": True,
+                        "title": "Region Locale",
+                        "value": "`US (Virginia)`",
                     },
-                    {"short": True, "title": "Old State", "value": "`ALARM`"},
-                    {"short": True, "title": "Current State", "value": "`OK`"},
                     {
                         "short": False,
-                        "title": "Link to Alarm",
-                        "value": "https://console.aws.amazon.com/cloudwatch/home?region=us-east-1#alarm:alarmFilter=ANY;name=DBMigrationRequired",
+                        "title": "Alarm reason",
+                        "value": "Threshold Crossed: 1 datapoint [1.0 (12/02/19 15:44:00)] was not less than the threshold (1.0).",
                     },
+                    {"short": True, "title": "Current State", "value": "`ALARM`"},
+                    {"short": True, "title": "Old State", "value": "`OK`"},
                 ],
-                "text": "AWS CloudWatch notification - DBMigrationRequired",
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                "text": 'App is reporting "A JPA error occurred(Unable to build EntityManagerFactory)"',
+                "ts": 1549986324,
+            },
+        ]
     }
 ]
 
@@ -343,43 +637,24 @@ snapshots[
     {
         "attachments": [
             {
-                "fallback": "A new message",
+                "color": "warning",
+                "fallback": "DMS Notification Replication task has stopped. triggered",
                 "fields": [
                     {
                         "short": True,
-                        "title": "Event Source",
-                        "value": "`replication-task`",
-                    },
-                    {
-                        "short": True,
-                        "title": "Event Time",
+                        "title": "When",
                         "value": "`2019-02-12 15:45:24.091`",
                     },
-                    {
-                        "short": False,
-                        "title": "Identifier Link",
-                        "value": "`https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world`",
-                    },
-                    {"short": True, "title": "SourceId", "value": "`hello-world`"},
-                    {
-                        "short": False,
-                        "title": "Event ID",
-                        "value": "`http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 `",
-                    },
-                    {
-                        "short": False,
-                        "title": "Event Message",
-                        "value": "`Replication task has stopped.`",
-                    },
+                    {"short": True, "title": "When (Epoch)", "value": "`1549986324`"},
+                    {"short": True, "title": "Source", "value": "`replication-task`"},
+                    {"short": True, "title": "Source ID", "value": "`hello-world`"},
                 ],
-                "mrkdwn_in": ["value"],
-                "text": "AWS notification",
-                "title": "DMS Notification Message",
+                "text": "http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 ",
+                "title": "DMS Notification: Replication task has stopped.",
+                "title_link": "https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world",
+                "ts": 1549986324,
             }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+        ]
     }
 ]
 
@@ -417,10 +692,7 @@ snapshots[
                 "text": "AWS notification",
                 "title": "Message",
             }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+        ]
     }
 ]
 
@@ -429,15 +701,16 @@ snapshots[
 ] = [
     {
         "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.amazonaws-us-gov.com/guardduty/home?region=us-gov-east-1#/findings?search=id%3Dsample-id-2",
+            },
             {
                 "color": "danger",
                 "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
                 "fields": [
-                    {
-                        "short": False,
-                        "title": "Description",
-                        "value": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
-                    },
                     {
                         "short": False,
                         "title": "Finding Type",
@@ -453,21 +726,99 @@ snapshots[
                         "title": "Last Seen",
                         "value": "`2020-01-03T01:02:03Z`",
                     },
-                    {"short": True, "title": "Severity", "value": "`High`"},
-                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Severity/Score", "value": "`High/9`"},
                     {"short": True, "title": "Count", "value": "`1234`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-gov-east-1`"},
+                ],
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
+    }
+]
+
+snapshots["test_sns_get_slack_message_payload_snapshots message_savings_plan.json"] = [
+    {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                "title": "Savings Plan:  AWS Savings Plan Cov... has dropped below your alert threshold",
+            },
+            {
+                "color": "danger",
+                "fallback": "Savings Plan  AWS Savings Plan Cov... has dropped below your alert threshold triggered",
+                "fields": [
+                    {
+                        "short": False,
+                        "value": """Savings Plans Alerts August 04, 2024
+AWS Account 123456789
+
+Dear AWS Customer,
+
+You requested that we alert you when the monthly Savings Plans Coverage associated with your AWS Savings Plan Coverage Budget budget falls below 100.0%. On August 01, 2024, the monthly coverage associated with your Savings Plans agreements was 0.0%. You can find additional details below and by accessing the budget details of AWS Savings Plan Coverage Budget [1].
+
+Budget Name: AWS Savings Plan Coverage Budget
+Budget Type: Savings Plans Coverage
+Budgeted Amount%: 100.00%
+Alert Threshold%: 100.0%
+Actual Coverage%: 0.0%
+
+Identify potential opportunities for cost savings by accessing AWS Cost Explorer's Savings Plan Purchase Recommendations [2].
+
+[1] https://console.aws.amazon.com/billing/home#/budgets/details?name=AWS Savings Plan Coverage Budget
+[2] https://console.aws.amazon.com/cost-reports/home?region=us-east-1#/savings-plans/recommendations
+""",
+                    }
+                ],
+                "mrkdwn_in": ["value"],
+            },
+        ]
+    }
+]
+
+snapshots[
+    "test_sns_get_slack_message_payload_snapshots message_security_hub_finding.json"
+] = [
+    {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "Security Hub: nist-800-53/v/5.0.0/EC2.8",
+                "title_link": "https://console.aws.amazon.com/securityhub/home?region=eu-west-2#findings?search=GeneratorId%3D%255Coperator%255C%253AEQUALS%255C%253Anist-800-53/v/5.0.0/EC2.8",
+            },
+            {
+                "color": "danger",
+                "fallback": "Security Hub finding nist-800-53/v/5.0.0/EC2.8 triggered",
+                "fields": [
+                    {"short": True, "title": "Account Name", "value": "`SupportProd`"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`eu-west-2`"},
+                    {"short": True, "title": "Severity", "value": "`HIGH`"},
+                    {
+                        "short": True,
+                        "title": "Provider",
+                        "value": "`nist-800-53 v5.0.0`",
+                    },
+                    {"short": True, "title": "Category", "value": "`EC2.8`"},
                     {
                         "short": False,
-                        "title": "Link to Finding",
-                        "value": "https://console.amazonaws-us-gov.com/guardduty/home?region=us-gov-east-1#/findings?search=id%3Dsample-id-2",
+                        "title": "Rule Id",
+                        "value": "`89deac02-0ea8-49a2-a1e7-31b64bc037f2`",
+                    },
+                    {"short": True, "title": "Type 1", "value": "`AwsEc2Instance`"},
+                    {
+                        "short": False,
+                        "title": "Arn 1",
+                        "value": "`arn:aws:ec2:eu-west-2:123456789:instance/i-1111aa22222ddd333333`",
                     },
                 ],
-                "text": "AWS GuardDuty Finding - SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
-            }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+                "text": "This control checks whether your Amazon Elastic Compute Cloud (Amazon EC2) instance metadata version is configured with Instance Metadata Service Version 2 (IMDSv2). The control passes if HttpTokens is set to required for IMDSv2. The control fails if HttpTokens is set to optional.",
+            },
+        ]
     }
 ]
 
@@ -491,9 +842,6 @@ Have a ~good~ amazing day! :)""",
                 "text": "AWS notification",
                 "title": "All Fine",
             }
-        ],
-        "channel": "slack_testing_sandbox",
-        "icon_emoji": ":aws:",
-        "username": "notify_slack_test",
+        ]
     }
 ]
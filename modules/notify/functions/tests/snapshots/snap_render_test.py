@@ -0,0 +1,2225 @@
+# -*- coding: utf-8 -*-
+# snapshottest: v1 - https://goo.gl/zC4yUc
+from __future__ import unicode_literals
+
+from snapshottest import Snapshot
+
+snapshots = Snapshot()
+
+snapshots["test_event_render_snapshots event_aws_health_event.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "AWS Health: EC2",
+                "title_link": "https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues",
+            },
+            {
+                "color": "danger",
+                "fallback": "New AWS Health Event for EC2",
+                "fields": [
+                    {"short": True, "title": "Affected Service", "value": "`EC2`"},
+                    {"short": True, "title": "Category", "value": "`issue`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account Id", "value": "`123456789012`"},
+                    {
+                        "short": True,
+                        "title": "Start Time",
+                        "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                    },
+                    {"short": True, "title": "End Time", "value": "`<unknown>`"},
+                    {
+                        "short": False,
+                        "title": "Code",
+                        "value": "`AWS_EC2_INSTANCE_STORE_DRIVE_PERFORMANCE_DEGRADED`",
+                    },
+                    {"short": False, "title": "Region", "value": "`us-west-2`"},
+                    {
+                        "short": False,
+                        "title": "Affected Resources",
+                        "value": "i-abcd1111",
+                    },
+                ],
+                "text": "A description of the event will be provided here",
+                "ts": 1465108077.0,
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "height": "50px",
+                                    "type": "Image",
+                                    "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                    "width": "50px",
+                                },
+                                {
+                                    "color": "Attention",
+                                    "size": "Large",
+                                    "text": "`AWS Health: EC2`",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "text": "`A description of the event will be provided here`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {"title": "Category", "value": "`issue`"},
+                                        {"title": "Priority", "value": "`HIGH`"},
+                                        {
+                                            "title": "Code",
+                                            "value": "`AWS_EC2_INSTANCE_STORE_DRIVE_PERFORMANCE_DEGRADED`",
+                                        },
+                                        {"title": "Account Name", "value": "``"},
+                                        {
+                                            "title": "Account Id",
+                                            "value": "`123456789012`",
+                                        },
+                                        {"title": "Region", "value": "`us-west-2`"},
+                                        {
+                                            "title": "Start Time",
+                                            "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                                        },
+                                        {"title": "End Time", "value": "`<unknown>`"},
+                                        {
+                                            "title": "Affected Resources",
+                                            "value": "`i-abcd1111`",
+                                        },
+                                    ],
+                                    "type": "FactSet",
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Healthcheck](https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues)",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_cloudwatch_alarm.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "CloudWatch: Example",
+                "title_link": "https://console.aws.amazon.com/cloudwatch/home?region=eu-west-1#alarm:alarmFilter=ANY;name=Example",
+            },
+            {
+                "color": "danger",
+                "fallback": "Alarm Example triggered",
+                "fields": [
+                    {
+                        "short": False,
+                        "title": "When",
+                        "value": "`2017-01-12T16:30:42.236+0000`",
+                    },
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`735598076380`"},
+                    {"short": True, "title": "Region", "value": "`eu-west-1`"},
+                    {
+                        "short": True,
+                        "title": "Region Locale",
+                        "value": "`EU - Ireland`",
+                    },
+                    {
+                        "short": False,
+                        "title": "Alarm reason",
+                        "value": "Threshold Crossed",
+                    },
+                    {"short": True, "title": "Current State", "value": "`ALARM`"},
+                    {"short": True, "title": "Old State", "value": "`OK`"},
+                ],
+                "text": "Example alarm description.",
+                "ts": 1484238642,
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "height": "50px",
+                                    "type": "Image",
+                                    "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                    "width": "50px",
+                                },
+                                {
+                                    "color": "Attention",
+                                    "size": "Large",
+                                    "text": "CloudWatch: `Example`",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "text": "`Example alarm description.`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {
+                                            "title": "At",
+                                            "value": "`2017-01-12T16:30:42.236+0000`",
+                                        },
+                                        {"title": "Account Name", "value": "``"},
+                                        {
+                                            "title": "Account Id",
+                                            "value": "`735598076380`",
+                                        },
+                                        {"title": "Region", "value": "`eu-west-1`"},
+                                        {
+                                            "title": "Region Locale",
+                                            "value": "`EU - Ireland`",
+                                        },
+                                        {"title": "New State", "value": "`ALARM`"},
+                                        {"title": "Old State", "value": "`OK`"},
+                                    ],
+                                    "type": "FactSet",
+                                },
+                                {
+                                    "text": "`Threshold Crossed`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Alarm](https://console.aws.amazon.com/cloudwatch/home?region=eu-west-1#alarm:alarmFilter=ANY;name=Example)",
+                                    "type": "TextBlock",
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_cost-anomaly.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "Cost Anomaly: EUW2-Lambda-GB-Second",
+                "title_link": "https://console.aws.amazon.com/costmanagement/home#/anomaly-detection/monitors/b949dc85-ceb9-4633-8a98-2f944ede4fd6/anomalies/fd29c1a4-aacc-4317-a822-c8f81a65f023",
+            },
+            {
+                "color": "danger",
+                "fallback": "Cost Anomaly:  EUW2-Lambda-GB-Second triggered",
+                "fields": [
+                    {"short": True, "title": "Account Name", "value": "`Audit`"},
+                    {"short": True, "title": "Account ID", "value": "`012140491173`"},
+                    {"short": True, "title": "Region", "value": "`eu-west-2`"},
+                    {"short": True, "title": "Service", "value": "`AWS Lambda`"},
+                    {
+                        "short": True,
+                        "title": "Started At",
+                        "value": "`2024-09-08T00:00:00Z`",
+                    },
+                    {
+                        "short": True,
+                        "title": "Ended At",
+                        "value": "`2024-09-11T00:00:00Z`",
+                    },
+                    {"short": True, "title": "Expended Spend ($)", "value": "`0.2`"},
+                    {"short": True, "title": "Actual Spend ($)", "value": "`4.94`"},
+                    {"short": True, "title": "Impact", "value": "`4.74`"},
+                    {
+                        "short": False,
+                        "title": "ID",
+                        "value": "`fd29c1a4-aacc-4317-a822-c8f81a65f023`",
+                    },
+                ],
+                "text": "AWS Service Cost Anomaly Monitor",
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "height": "50px",
+                                    "type": "Image",
+                                    "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                    "width": "50px",
+                                },
+                                {
+                                    "color": "Attention",
+                                    "size": "Large",
+                                    "text": "Cost Anomaly: EUW2-Lambda-GB-Second",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {"title": "Account Name", "value": "`Audit`"},
+                                        {
+                                            "title": "Account Id",
+                                            "value": "`012140491173`",
+                                        },
+                                        {"title": "Region", "value": "`eu-west-2`"},
+                                        {"title": "Service", "value": "`AWS Lambda`"},
+                                        {
+                                            "title": "ID",
+                                            "value": "`fd29c1a4-aacc-4317-a822-c8f81a65f023`",
+                                        },
+                                        {
+                                            "title": "Started At",
+                                            "value": "`2024-09-08T00:00:00Z`",
+                                        },
+                                        {
+                                            "title": "Ended At",
+                                            "value": "`2024-09-11T00:00:00Z`",
+                                        },
+                                        {
+                                            "title": "Expended Spend ($)",
+                                            "value": "`0.2`",
+                                        },
+                                        {
+                                            "title": "Actual Spend ($)",
+                                            "value": "`4.94`",
+                                        },
+                                        {"title": "Impact", "value": "`4.74`"},
+                                    ],
+                                    "type": "FactSet",
+                                },
+                                {
+                                    "text": "`AWS Service Cost Anomaly Monitor`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Anomaly](https://console.aws.amazon.com/costmanagement/home#/anomaly-detection/monitors/b949dc85-ceb9-4633-8a98-2f944ede4fd6/anomalies/fd29c1a4-aacc-4317-a822-c8f81a65f023)",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_dms_notification.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "warning",
+                "fallback": "DMS Notification Replication task has stopped. triggered",
+                "fields": [
+                    {
+                        "short": True,
+                        "title": "When",
+                        "value": "`2019-02-12 15:45:24.091`",
+                    },
+                    {"short": True, "title": "When (Epoch)", "value": "`1549986324`"},
+                    {"short": True, "title": "Source", "value": "`replication-task`"},
+                    {"short": True, "title": "Source ID", "value": "`hello-world`"},
+                ],
+                "text": "http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 ",
+                "title": "DMS Notification: Replication task has stopped.",
+                "title_link": "https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world",
+                "ts": 1549986324,
+            }
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "color": "default",
+                                    "size": "Large",
+                                    "text": "DMS Notification: Replication task has stopped.",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {
+                                            "title": "At",
+                                            "value": "`2019-02-12 15:45:24.091`",
+                                        },
+                                        {
+                                            "title": "At (Epoch)",
+                                            "value": "`1549986324`",
+                                        },
+                                        {
+                                            "title": "Source",
+                                            "value": "`replication-task`",
+                                        },
+                                        {
+                                            "title": "Source Id",
+                                            "value": "`hello-world`",
+                                        },
+                                    ],
+                                    "type": "FactSet",
+                                },
+                                {
+                                    "text": "`http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 `",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Event](https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world)",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_guardduty_finding_high.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+            },
+            {
+                "color": "danger",
+                "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "fields": [
+                    {
+                        "short": False,
+                        "title": "Finding Type",
+                        "value": "`Recon:EC2 PortProbeUnprotectedPort`",
+                    },
+                    {
+                        "short": True,
+                        "title": "First Seen",
+                        "value": "`2020-01-02T01:02:03Z`",
+                    },
+                    {
+                        "short": True,
+                        "title": "Last Seen",
+                        "value": "`2020-01-03T01:02:03Z`",
+                    },
+                    {"short": True, "title": "Severity/Score", "value": "`High/9`"},
+                    {"short": True, "title": "Count", "value": "`1234`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
+                ],
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "height": "50px",
+                                    "type": "Image",
+                                    "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                    "width": "50px",
+                                },
+                                {
+                                    "color": "Attention",
+                                    "size": "Large",
+                                    "text": "`GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed`",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "text": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {"title": "ID", "value": "`sample-id-2`"},
+                                        {
+                                            "title": "Severity/Score",
+                                            "value": "`High/9`",
+                                        },
+                                        {"title": "Account Name", "value": "``"},
+                                        {"title": "Account Id", "value": "`123456789`"},
+                                        {"title": "Region", "value": "`us-east-1`"},
+                                        {
+                                            "title": "First Seen",
+                                            "value": "`2020-01-02T01:02:03Z`",
+                                        },
+                                        {
+                                            "title": "Last Seen",
+                                            "value": "`2020-01-03T01:02:03Z`",
+                                        },
+                                        {"title": "Count", "value": "`1234`"},
+                                    ],
+                                    "type": "FactSet",
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Finding](https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2)",
+                                    "type": "TextBlock",
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_guardduty_finding_low.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "#777777",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+            },
+            {
+                "color": "#777777",
+                "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "fields": [
+                    {
+                        "short": False,
+                        "title": "Finding Type",
+                        "value": "`Recon:EC2 PortProbeUnprotectedPort`",
+                    },
+                    {
+                        "short": True,
+                        "title": "First Seen",
+                        "value": "`2020-01-02T01:02:03Z`",
+                    },
+                    {
+                        "short": True,
+                        "title": "Last Seen",
+                        "value": "`2020-01-03T01:02:03Z`",
+                    },
+                    {"short": True, "title": "Severity/Score", "value": "`Low/2`"},
+                    {"short": True, "title": "Count", "value": "`1234`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
+                ],
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "color": "Default",
+                                    "size": "Large",
+                                    "text": "`GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed`",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "text": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {"title": "ID", "value": "`sample-id-2`"},
+                                        {"title": "Severity/Score", "value": "`Low/2`"},
+                                        {"title": "Account Name", "value": "``"},
+                                        {"title": "Account Id", "value": "`123456789`"},
+                                        {"title": "Region", "value": "`us-east-1`"},
+                                        {
+                                            "title": "First Seen",
+                                            "value": "`2020-01-02T01:02:03Z`",
+                                        },
+                                        {
+                                            "title": "Last Seen",
+                                            "value": "`2020-01-03T01:02:03Z`",
+                                        },
+                                        {"title": "Count", "value": "`1234`"},
+                                    ],
+                                    "type": "FactSet",
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Finding](https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2)",
+                                    "type": "TextBlock",
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_guardduty_finding_medium.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "warning",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "title_link": "https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2",
+            },
+            {
+                "color": "warning",
+                "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                "fields": [
+                    {
+                        "short": False,
+                        "title": "Finding Type",
+                        "value": "`Recon:EC2 PortProbeUnprotectedPort`",
+                    },
+                    {
+                        "short": True,
+                        "title": "First Seen",
+                        "value": "`2020-01-02T01:02:03Z`",
+                    },
+                    {
+                        "short": True,
+                        "title": "Last Seen",
+                        "value": "`2020-01-03T01:02:03Z`",
+                    },
+                    {"short": True, "title": "Severity/Score", "value": "`Medium/5`"},
+                    {"short": True, "title": "Count", "value": "`1234`"},
+                    {"short": True, "title": "Account Name", "value": "``"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`us-east-1`"},
+                ],
+                "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                "ts": 1578013323.0,
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "height": "50px",
+                                    "type": "Image",
+                                    "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                                    "width": "50px",
+                                },
+                                {
+                                    "color": "Accent",
+                                    "size": "Large",
+                                    "text": "`GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed`",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "text": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {"title": "ID", "value": "`sample-id-2`"},
+                                        {
+                                            "title": "Severity/Score",
+                                            "value": "`Medium/5`",
+                                        },
+                                        {"title": "Account Name", "value": "``"},
+                                        {"title": "Account Id", "value": "`123456789`"},
+                                        {"title": "Region", "value": "`us-east-1`"},
+                                        {
+                                            "title": "First Seen",
+                                            "value": "`2020-01-02T01:02:03Z`",
+                                        },
+                                        {
+                                            "title": "Last Seen",
+                                            "value": "`2020-01-03T01:02:03Z`",
+                                        },
+                                        {"title": "Count", "value": "`1234`"},
+                                    ],
+                                    "type": "FactSet",
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Finding](https://console.aws.amazon.com/guardduty/home?region=us-east-1#/findings?search=id%3Dsample-id-2)",
+                                    "type": "TextBlock",
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_event_render_snapshots event_security_hub_finding.json"] = {
+    "slack": {
+        "attachments": [
+            {
+                "color": "danger",
+                "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                "title": "Security Hub: nist-800-53/v/5.0.0/EC2.8",
+                "title_link": "https://console.aws.amazon.com/securityhub/home?region=eu-west-2#findings?search=GeneratorId%3D%255Coperator%255C%253AEQUALS%255C%253Anist-800-53/v/5.0.0/EC2.8",
+            },
+            {
+                "color": "danger",
+                "fallback": "Security Hub finding nist-800-53/v/5.0.0/EC2.8 triggered",
+                "fields": [
+                    {"short": True, "title": "Account Name", "value": "`SupportProd`"},
+                    {"short": True, "title": "Account ID", "value": "`123456789`"},
+                    {"short": True, "title": "Region", "value": "`eu-west-2`"},
+                    {"short": True, "title": "Severity", "value": "`HIGH`"},
+                    {
+                        "short": True,
+                        "title": "Provider",
+                        "value": "`nist-800-53 v5.0.0`",
+                    },
+                    {"short": True, "title": "Category", "value": "`EC2.8`"},
+                    {
+                        "short": False,
+                        "title": "Rule Id",
+                        "value": "`89deac02-0ea8-49a2-a1e7-31b64bc037f2`",
+                    },
+                    {"short": True, "title": "Type 1", "value": "`AwsEc2Instance`"},
+                    {
+                        "short": False,
+                        "title": "Arn 1",
+                        "value": "`arn:aws:ec2:eu-west-2:123456789:instance/i-1111aa22222ddd333333`",
+                    },
+                ],
+                "text": "This control checks whether your Amazon Elastic Compute Cloud (Amazon EC2) instance metadata version is configured with Instance Metadata Service Version 2 (IMDSv2). The control passes if HttpTokens is set to required for IMDSv2. The control fails if HttpTokens is set to optional.",
+            },
+        ]
+    },
+    "teams": {
+        "attachments": [
+            {
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "body": [
+                        {
+                            "items": [
+                                {
+                                    "height": "50px",
+                                    "type": "Image",
+                                    "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                    "width": "50px",
+                                },
+                                {
+                                    "color": "Attention",
+                                    "size": "Large",
+                                    "text": "Security Hub: nist-800-53/v/5.0.0/EC2.8",
+                                    "type": "TextBlock",
+                                    "weight": "Bolder",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {
+                                            "title": "Account Name",
+                                            "value": "`SupportProd`",
+                                        },
+                                        {"title": "Account Id", "value": "`123456789`"},
+                                        {"title": "Region", "value": "`eu-west-2`"},
+                                        {"title": "Severity", "value": "`HIGH`"},
+                                        {
+                                            "title": "Source",
+                                            "value": "`nist-800-53/v/5.0.0/EC2.8`",
+                                        },
+                                        {
+                                            "title": "Provider",
+                                            "value": "`nist-800-53 v5.0.0`",
+                                        },
+                                        {"title": "Category", "value": "`EC2.8`"},
+                                        {
+                                            "title": "Rule",
+                                            "value": "`89deac02-0ea8-49a2-a1e7-31b64bc037f2`",
+                                        },
+                                    ],
+                                    "type": "FactSet",
+                                },
+                                {
+                                    "text": "`This control checks whether your Amazon Elastic Compute Cloud (Amazon EC2) instance metadata version is configured with Instance Metadata Service Version 2 (IMDSv2). The control passes if HttpTokens is set to required for IMDSv2. The control fails if HttpTokens is set to optional.`",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                },
+                                {
+                                    "facts": [
+                                        {
+                                            "title": "Type 1",
+                                            "value": "`AwsEc2Instance`",
+                                        },
+                                        {
+                                            "title": "Arn 1",
+                                            "value": "`arn:aws:ec2:eu-west-2:123456789:instance/i-1111aa22222ddd333333`",
+                                        },
+                                    ],
+                                    "type": "FactSet",
+                                    "wrap": True,
+                                },
+                            ],
+                            "type": "Container",
+                        },
+                        {
+                            "items": [
+                                {
+                                    "text": "[The Finding](https://console.aws.amazon.com/securityhub/home?region=eu-west-2#findings?search=GeneratorId%3D%255Coperator%255C%253AEQUALS%255C%253Anist-800-53/v/5.0.0/EC2.8)",
+                                    "type": "TextBlock",
+                                    "wrap": True,
+                                }
+                            ],
+                            "type": "Container",
+                        },
+                    ],
+                    "type": "AdaptiveCard",
+                    "version": "1.2",
+                },
+                "contentType": "application/vnd.microsoft.card.adaptive",
+            }
+        ],
+        "type": "message",
+    },
+}
+
+snapshots["test_sns_render_snapshots message_aws_health.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                    "title": "AWS Health: EC2",
+                    "title_link": "https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "New AWS Health Event for EC2",
+                    "fields": [
+                        {"short": True, "title": "Affected Service", "value": "`EC2`"},
+                        {"short": True, "title": "Category", "value": "`issue`"},
+                        {"short": True, "title": "Account Name", "value": "``"},
+                        {
+                            "short": True,
+                            "title": "Account Id",
+                            "value": "`123456789012`",
+                        },
+                        {
+                            "short": True,
+                            "title": "Start Time",
+                            "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                        },
+                        {"short": True, "title": "End Time", "value": "`<unknown>`"},
+                        {
+                            "short": False,
+                            "title": "Code",
+                            "value": "`AWS_EC2_INSTANCE_STORE_DRIVE_PERFORMANCE_DEGRADED`",
+                        },
+                        {"short": False, "title": "Region", "value": "`us-west-2`"},
+                        {
+                            "short": False,
+                            "title": "Affected Resources",
+                            "value": "i-abcd1111",
+                        },
+                    ],
+                    "text": "A description of the event will be provided here",
+                    "ts": 1465108077.0,
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Attention",
+                                        "size": "Large",
+                                        "text": "`AWS Health: EC2`",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "text": "`A description of the event will be provided here`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {"title": "Category", "value": "`issue`"},
+                                            {"title": "Priority", "value": "`HIGH`"},
+                                            {
+                                                "title": "Code",
+                                                "value": "`AWS_EC2_INSTANCE_STORE_DRIVE_PERFORMANCE_DEGRADED`",
+                                            },
+                                            {"title": "Account Name", "value": "``"},
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`123456789012`",
+                                            },
+                                            {"title": "Region", "value": "`us-west-2`"},
+                                            {
+                                                "title": "Start Time",
+                                                "value": "`Sat, 05 Jun 2016 15:10:09 GMT`",
+                                            },
+                                            {
+                                                "title": "End Time",
+                                                "value": "`<unknown>`",
+                                            },
+                                            {
+                                                "title": "Affected Resources",
+                                                "value": "`i-abcd1111`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            },
+                            {
+                                "items": [
+                                    {
+                                        "text": "[The Healthcheck](https://phd.aws.amazon.com/phd/home?region=us-west-2#/dashboard/open-issues)",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    }
+                                ],
+                                "type": "Container",
+                            },
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_backup.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "good",
+                    "title": "Backup : 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+                },
+                {
+                    "color": "good",
+                    "fallback": "Backup event for 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+                    "fields": [
+                        {
+                            "short": False,
+                            "title": "Backup Id",
+                            "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                        },
+                        {"short": True, "title": "Account Name", "value": "``"},
+                        {
+                            "short": True,
+                            "title": "Account Id",
+                            "value": "`123456789012`",
+                        },
+                        {"short": True, "title": "Status", "value": "`COMPLETED`"},
+                        {"short": True, "title": "Priority", "value": "`NO_ERROR`"},
+                        {"short": True, "title": "Region", "value": "`us-west-1`"},
+                        {
+                            "short": True,
+                            "title": "Start Time",
+                            "value": "`2019-09-02T13:48:52.226Z`",
+                        },
+                        {
+                            "short": False,
+                            "title": "BackupJob ID",
+                            "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                        },
+                        {
+                            "short": False,
+                            "title": "Resource ARN",
+                            "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
+                        },
+                        {
+                            "short": False,
+                            "title": "Recovery point ARN",
+                            "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012d`",
+                        },
+                    ],
+                    "text": "An AWS Backup job was completed successfully",
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "color": "Default",
+                                        "size": "Large",
+                                        "text": "`AWS Backup: 1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "text": "`An AWS Backup job was completed successfully`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "Backup Id",
+                                                "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                            },
+                                            {"title": "Account Name", "value": "``"},
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`123456789012`",
+                                            },
+                                            {"title": "Region", "value": "`us-west-1`"},
+                                            {"title": "Status", "value": "`COMPLETED`"},
+                                            {
+                                                "title": "Priority",
+                                                "value": "`NO_ERROR`",
+                                            },
+                                            {
+                                                "title": "Start Time",
+                                                "value": "`2019-09-02T13:48:52.226Z`",
+                                            },
+                                            {
+                                                "title": "BackupJob ID",
+                                                "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                            },
+                                            {
+                                                "title": "Resource ARN",
+                                                "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
+                                            },
+                                            {
+                                                "title": "Recovery point ARN",
+                                                "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012d`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    },
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                    "title": "Backup : 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "Backup event for 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+                    "fields": [
+                        {
+                            "short": False,
+                            "title": "Backup Id",
+                            "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                        },
+                        {"short": True, "title": "Account Name", "value": "``"},
+                        {
+                            "short": True,
+                            "title": "Account Id",
+                            "value": "`123456789012`",
+                        },
+                        {"short": True, "title": "Status", "value": "`FAILED`"},
+                        {"short": True, "title": "Priority", "value": "`ERROR`"},
+                        {"short": True, "title": "Region", "value": "`us-west-1`"},
+                        {
+                            "short": True,
+                            "title": "Start Time",
+                            "value": "`2019-09-02T13:48:52.226Z`",
+                        },
+                        {
+                            "short": False,
+                            "title": "BackupJob ID",
+                            "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                        },
+                        {
+                            "short": False,
+                            "title": "Resource ARN",
+                            "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
+                        },
+                    ],
+                    "text": "An AWS Backup job failed",
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Attention",
+                                        "size": "Large",
+                                        "text": "`AWS Backup: 1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "text": "`An AWS Backup job failed`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "Backup Id",
+                                                "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                            },
+                                            {"title": "Account Name", "value": "``"},
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`123456789012`",
+                                            },
+                                            {"title": "Region", "value": "`us-west-1`"},
+                                            {"title": "Status", "value": "`FAILED`"},
+                                            {"title": "Priority", "value": "`ERROR`"},
+                                            {
+                                                "title": "Start Time",
+                                                "value": "`2019-09-02T13:48:52.226Z`",
+                                            },
+                                            {
+                                                "title": "BackupJob ID",
+                                                "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                            },
+                                            {
+                                                "title": "Resource ARN",
+                                                "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    },
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "warning",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                    "title": "Backup : 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+                },
+                {
+                    "color": "warning",
+                    "fallback": "Backup event for 1b2345b2-f22c-4dab-5eb6-bbc7890ed123",
+                    "fields": [
+                        {
+                            "short": False,
+                            "title": "Backup Id",
+                            "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                        },
+                        {"short": True, "title": "Account Name", "value": "``"},
+                        {
+                            "short": True,
+                            "title": "Account Id",
+                            "value": "`123456789012`",
+                        },
+                        {"short": True, "title": "Status", "value": "`EXPIRED`"},
+                        {"short": True, "title": "Priority", "value": "`WARNING`"},
+                        {"short": True, "title": "Region", "value": "`us-west-1`"},
+                        {
+                            "short": True,
+                            "title": "Start Time",
+                            "value": "`2019-09-02T13:48:52.226Z`",
+                        },
+                        {
+                            "short": False,
+                            "title": "BackupJob ID",
+                            "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                        },
+                        {
+                            "short": False,
+                            "title": "Resource ARN",
+                            "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
+                        },
+                    ],
+                    "text": "An AWS Backup job failed to complete in time",
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Accent",
+                                        "size": "Large",
+                                        "text": "`AWS Backup: 1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "text": "`An AWS Backup job failed to complete in time`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "Backup Id",
+                                                "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                            },
+                                            {"title": "Account Name", "value": "``"},
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`123456789012`",
+                                            },
+                                            {"title": "Region", "value": "`us-west-1`"},
+                                            {"title": "Status", "value": "`EXPIRED`"},
+                                            {"title": "Priority", "value": "`WARNING`"},
+                                            {
+                                                "title": "Start Time",
+                                                "value": "`2019-09-02T13:48:52.226Z`",
+                                            },
+                                            {
+                                                "title": "BackupJob ID",
+                                                "value": "`1b2345b2-f22c-4dab-5eb6-bbc7890ed123`",
+                                            },
+                                            {
+                                                "title": "Resource ARN",
+                                                "value": "`arn:aws:ec2:us-west-1:123456789012:volume/vol-012f345df6789012e`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    },
+]
+
+snapshots["test_sns_render_snapshots message_budget.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                    "title": "Budget:  AWS Forecasted Cost Budget has exceeded your alert threshold",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "Budget  AWS Forecasted Cost Budget has exceeded your alert threshold triggered",
+                    "fields": [
+                        {
+                            "short": False,
+                            "value": """AWS Budget Notification August 01, 2024
+AWS Account 123456789
+
+Dear AWS Customer,
+
+You requested that we alert you when the FORECASTED Cost associated with your AWS Forecasted Cost Budget budget is greater than $1,987.12 for the current month. The FORECASTED Cost associated with this budget is $2,123.98. You can find additional details below and by accessing the AWS Budgets dashboard [1].
+
+Budget Name: AWS Forecasted Cost Budget
+Budget Type: Cost
+Budgeted Amount: $2,000.00
+Alert Type: FORECASTED
+Alert Threshold: > $2,1111.12
+FORECASTED Amount: $3,543.34
+
+[1] https://console.aws.amazon.com/billing/home#/budgets
+""",
+                        }
+                    ],
+                    "mrkdwn_in": ["value"],
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Accent",
+                                        "size": "Large",
+                                        "text": "Budget Alarm:  AWS Forecasted Cost Budget has exceeded your alert threshold",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "inlines": [
+                                            {
+                                                "text": """AWS Budget Notification August 01, 2024
+AWS Account 123456789
+
+Dear AWS Customer,
+
+You requested that we alert you when the FORECASTED Cost associated with your AWS Forecasted Cost Budget budget is greater than $1,987.12 for the current month. The FORECASTED Cost associated with this budget is $2,123.98. You can find additional details below and by accessing the AWS Budgets dashboard [1].
+
+Budget Name: AWS Forecasted Cost Budget
+Budget Type: Cost
+Budgeted Amount: $2,000.00
+Alert Type: FORECASTED
+Alert Threshold: > $2,1111.12
+FORECASTED Amount: $3,543.34
+
+[1] https://console.aws.amazon.com/billing/home#/budgets
+""",
+                                                "type": "TextRun",
+                                            }
+                                        ],
+                                        "type": "RichTextBlock",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "fallbackText": "Budget Alarm:  AWS Forecasted Cost Budget has exceeded your alert threshold",
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_cloudwatch_alarm.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                    "title": "CloudWatch: DBMigrationRequired",
+                    "title_link": "https://console.aws.amazon.com/cloudwatch/home?region=us-east-1#alarm:alarmFilter=ANY;name=DBMigrationRequired",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "Alarm DBMigrationRequired triggered",
+                    "fields": [
+                        {
+                            "short": False,
+                            "title": "When",
+                            "value": "`2019-02-12T15:45:24.006+0000`",
+                        },
+                        {"short": True, "title": "Account Name", "value": "``"},
+                        {
+                            "short": True,
+                            "title": "Account ID",
+                            "value": "`735598076380`",
+                        },
+                        {"short": True, "title": "Region", "value": "`us-east-1`"},
+                        {
+                            "short": True,
+                            "title": "Region Locale",
+                            "value": "`US (Virginia)`",
+                        },
+                        {
+                            "short": False,
+                            "title": "Alarm reason",
+                            "value": "Threshold Crossed: 1 datapoint [1.0 (12/02/19 15:44:00)] was not less than the threshold (1.0).",
+                        },
+                        {"short": True, "title": "Current State", "value": "`ALARM`"},
+                        {"short": True, "title": "Old State", "value": "`OK`"},
+                    ],
+                    "text": 'App is reporting "A JPA error occurred(Unable to build EntityManagerFactory)"',
+                    "ts": 1549986324,
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Attention",
+                                        "size": "Large",
+                                        "text": "CloudWatch: `DBMigrationRequired`",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "text": '`App is reporting "A JPA error occurred(Unable to build EntityManagerFactory)"`',
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "At",
+                                                "value": "`2019-02-12T15:45:24.006+0000`",
+                                            },
+                                            {"title": "Account Name", "value": "``"},
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`735598076380`",
+                                            },
+                                            {"title": "Region", "value": "`us-east-1`"},
+                                            {
+                                                "title": "Region Locale",
+                                                "value": "`US (Virginia)`",
+                                            },
+                                            {"title": "New State", "value": "`ALARM`"},
+                                            {"title": "Old State", "value": "`OK`"},
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                    {
+                                        "text": "`Threshold Crossed: 1 datapoint [1.0 (12/02/19 15:44:00)] was not less than the threshold (1.0).`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                ],
+                                "type": "Container",
+                            },
+                            {
+                                "items": [
+                                    {
+                                        "text": "[The Alarm](https://console.aws.amazon.com/cloudwatch/home?region=us-east-1#alarm:alarmFilter=ANY;name=DBMigrationRequired)",
+                                        "type": "TextBlock",
+                                    }
+                                ],
+                                "type": "Container",
+                            },
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_dms_notification.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "warning",
+                    "fallback": "DMS Notification Replication task has stopped. triggered",
+                    "fields": [
+                        {
+                            "short": True,
+                            "title": "When",
+                            "value": "`2019-02-12 15:45:24.091`",
+                        },
+                        {
+                            "short": True,
+                            "title": "When (Epoch)",
+                            "value": "`1549986324`",
+                        },
+                        {
+                            "short": True,
+                            "title": "Source",
+                            "value": "`replication-task`",
+                        },
+                        {"short": True, "title": "Source ID", "value": "`hello-world`"},
+                    ],
+                    "text": "http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 ",
+                    "title": "DMS Notification: Replication task has stopped.",
+                    "title_link": "https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world",
+                    "ts": 1549986324,
+                }
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "color": "default",
+                                        "size": "Large",
+                                        "text": "DMS Notification: Replication task has stopped.",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "At",
+                                                "value": "`2019-02-12 15:45:24.091`",
+                                            },
+                                            {
+                                                "title": "At (Epoch)",
+                                                "value": "`1549986324`",
+                                            },
+                                            {
+                                                "title": "Source",
+                                                "value": "`replication-task`",
+                                            },
+                                            {
+                                                "title": "Source Id",
+                                                "value": "`hello-world`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                    {
+                                        "text": "`http://docs.aws.amazon.com/dms/latest/userguide/CHAP_Events.html#DMS-EVENT-0079 `",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                ],
+                                "type": "Container",
+                            },
+                            {
+                                "items": [
+                                    {
+                                        "text": "[The Event](https://console.aws.amazon.com/dms/home?region=us-east-1#tasks:ids=hello-world)",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    }
+                                ],
+                                "type": "Container",
+                            },
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_glue_notification.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "fallback": "A new message",
+                    "fields": [
+                        {"short": True, "title": "version", "value": "`0`"},
+                        {
+                            "short": False,
+                            "title": "id",
+                            "value": "`ad3c3da1-148c-d5da-9a6a-79f1bc9a8a2e`",
+                        },
+                        {
+                            "short": True,
+                            "title": "detail-type",
+                            "value": "`Glue Job State Change`",
+                        },
+                        {"short": True, "title": "source", "value": "`aws.glue`"},
+                        {"short": True, "title": "account", "value": "`000000000000`"},
+                        {
+                            "short": True,
+                            "title": "time",
+                            "value": "`2021-06-18T12:34:06Z`",
+                        },
+                        {"short": True, "title": "region", "value": "`us-east-2`"},
+                        {"short": True, "title": "resources", "value": "`[]`"},
+                        {
+                            "short": False,
+                            "title": "detail",
+                            "value": '`{"jobName": "test_job", "severity": "ERROR", "state": "FAILED", "jobRunId": "jr_ca2144d747b45ad412d3c66a1b6934b6b27aa252be9a21a95c54dfaa224a1925", "message": "SystemExit: 1"}`',
+                        },
+                    ],
+                    "mrkdwn_in": ["value"],
+                    "text": "AWS notification",
+                    "title": "Message",
+                }
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "size": "medium",
+                                        "text": "Message",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                    },
+                                    {
+                                        "facts": [
+                                            {"title": "version", "value": "`0`"},
+                                            {
+                                                "title": "id",
+                                                "value": "`ad3c3da1-148c-d5da-9a6a-79f1bc9a8a2e`",
+                                            },
+                                            {
+                                                "title": "detail-type",
+                                                "value": "`Glue Job State Change`",
+                                            },
+                                            {"title": "source", "value": "`aws.glue`"},
+                                            {
+                                                "title": "account",
+                                                "value": "`000000000000`",
+                                            },
+                                            {
+                                                "title": "time",
+                                                "value": "`2021-06-18T12:34:06Z`",
+                                            },
+                                            {"title": "region", "value": "`us-east-2`"},
+                                            {"title": "resources", "value": "`[]`"},
+                                            {
+                                                "title": "detail",
+                                                "value": '`{"jobName": "test_job", "severity": "ERROR", "state": "FAILED", "jobRunId": "jr_ca2144d747b45ad412d3c66a1b6934b6b27aa252be9a21a95c54dfaa224a1925", "message": "SystemExit: 1"}`',
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_guardduty_finding.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                    "title": "GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                    "title_link": "https://console.amazonaws-us-gov.com/guardduty/home?region=us-gov-east-1#/findings?search=id%3Dsample-id-2",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "GuardDuty Finding: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed",
+                    "fields": [
+                        {
+                            "short": False,
+                            "title": "Finding Type",
+                            "value": "`Recon:EC2 PortProbeUnprotectedPort`",
+                        },
+                        {
+                            "short": True,
+                            "title": "First Seen",
+                            "value": "`2020-01-02T01:02:03Z`",
+                        },
+                        {
+                            "short": True,
+                            "title": "Last Seen",
+                            "value": "`2020-01-03T01:02:03Z`",
+                        },
+                        {"short": True, "title": "Severity/Score", "value": "`High/9`"},
+                        {"short": True, "title": "Count", "value": "`1234`"},
+                        {"short": True, "title": "Account Name", "value": "``"},
+                        {"short": True, "title": "Account ID", "value": "`123456789`"},
+                        {"short": True, "title": "Region", "value": "`us-gov-east-1`"},
+                    ],
+                    "text": "EC2 instance has an unprotected port which is being probed by a known malicious host.",
+                    "ts": 1578013323.0,
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Attention",
+                                        "size": "Large",
+                                        "text": "`GuardDuty: SAMPLE Unprotected port on EC2 instance i-123123123 is being probed`",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "text": "`EC2 instance has an unprotected port which is being probed by a known malicious host.`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {"title": "ID", "value": "`sample-id-2`"},
+                                            {
+                                                "title": "Severity/Score",
+                                                "value": "`High/9`",
+                                            },
+                                            {"title": "Account Name", "value": "``"},
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`123456789`",
+                                            },
+                                            {
+                                                "title": "Region",
+                                                "value": "`us-gov-east-1`",
+                                            },
+                                            {
+                                                "title": "First Seen",
+                                                "value": "`2020-01-02T01:02:03Z`",
+                                            },
+                                            {
+                                                "title": "Last Seen",
+                                                "value": "`2020-01-03T01:02:03Z`",
+                                            },
+                                            {"title": "Count", "value": "`1234`"},
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            },
+                            {
+                                "items": [
+                                    {
+                                        "text": "[The Finding](https://console.amazonaws-us-gov.com/guardduty/home?region=us-gov-east-1#/findings?search=id%3Dsample-id-2)",
+                                        "type": "TextBlock",
+                                    }
+                                ],
+                                "type": "Container",
+                            },
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_savings_plan.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                    "title": "Savings Plan:  AWS Savings Plan Cov... has dropped below your alert threshold",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "Savings Plan  AWS Savings Plan Cov... has dropped below your alert threshold triggered",
+                    "fields": [
+                        {
+                            "short": False,
+                            "value": """Savings Plans Alerts August 04, 2024
+AWS Account 123456789
+
+Dear AWS Customer,
+
+You requested that we alert you when the monthly Savings Plans Coverage associated with your AWS Savings Plan Coverage Budget budget falls below 100.0%. On August 01, 2024, the monthly coverage associated with your Savings Plans agreements was 0.0%. You can find additional details below and by accessing the budget details of AWS Savings Plan Coverage Budget [1].
+
+Budget Name: AWS Savings Plan Coverage Budget
+Budget Type: Savings Plans Coverage
+Budgeted Amount%: 100.00%
+Alert Threshold%: 100.0%
+Actual Coverage%: 0.0%
+
+Identify potential opportunities for cost savings by accessing AWS Cost Explorer's Savings Plan Purchase Recommendations [2].
+
+[1] https://console.aws.amazon.com/billing/home#/budgets/details?name=AWS Savings Plan Coverage Budget
+[2] https://console.aws.amazon.com/cost-reports/home?region=us-east-1#/savings-plans/recommendations
+""",
+                        }
+                    ],
+                    "mrkdwn_in": ["value"],
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-warning-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Accent",
+                                        "size": "Large",
+                                        "text": "Savings Plan Alarm:  AWS Savings Plan Cov... has dropped below your alert threshold",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "inlines": [
+                                            {
+                                                "text": """Savings Plans Alerts August 04, 2024
+AWS Account 123456789
+
+Dear AWS Customer,
+
+You requested that we alert you when the monthly Savings Plans Coverage associated with your AWS Savings Plan Coverage Budget budget falls below 100.0%. On August 01, 2024, the monthly coverage associated with your Savings Plans agreements was 0.0%. You can find additional details below and by accessing the budget details of AWS Savings Plan Coverage Budget [1].
+
+Budget Name: AWS Savings Plan Coverage Budget
+Budget Type: Savings Plans Coverage
+Budgeted Amount%: 100.00%
+Alert Threshold%: 100.0%
+Actual Coverage%: 0.0%
+
+Identify potential opportunities for cost savings by accessing AWS Cost Explorer's Savings Plan Purchase Recommendations [2].
+
+[1] https://console.aws.amazon.com/billing/home#/budgets/details?name=AWS Savings Plan Coverage Budget
+[2] https://console.aws.amazon.com/cost-reports/home?region=us-east-1#/savings-plans/recommendations
+""",
+                                                "type": "TextRun",
+                                            }
+                                        ],
+                                        "type": "RichTextBlock",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "fallbackText": "Savings Plan Alarm:  AWS Savings Plan Cov... has dropped below your alert threshold",
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_security_hub_finding.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "color": "danger",
+                    "image_url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                    "title": "Security Hub: nist-800-53/v/5.0.0/EC2.8",
+                    "title_link": "https://console.aws.amazon.com/securityhub/home?region=eu-west-2#findings?search=GeneratorId%3D%255Coperator%255C%253AEQUALS%255C%253Anist-800-53/v/5.0.0/EC2.8",
+                },
+                {
+                    "color": "danger",
+                    "fallback": "Security Hub finding nist-800-53/v/5.0.0/EC2.8 triggered",
+                    "fields": [
+                        {
+                            "short": True,
+                            "title": "Account Name",
+                            "value": "`SupportProd`",
+                        },
+                        {"short": True, "title": "Account ID", "value": "`123456789`"},
+                        {"short": True, "title": "Region", "value": "`eu-west-2`"},
+                        {"short": True, "title": "Severity", "value": "`HIGH`"},
+                        {
+                            "short": True,
+                            "title": "Provider",
+                            "value": "`nist-800-53 v5.0.0`",
+                        },
+                        {"short": True, "title": "Category", "value": "`EC2.8`"},
+                        {
+                            "short": False,
+                            "title": "Rule Id",
+                            "value": "`89deac02-0ea8-49a2-a1e7-31b64bc037f2`",
+                        },
+                        {"short": True, "title": "Type 1", "value": "`AwsEc2Instance`"},
+                        {
+                            "short": False,
+                            "title": "Arn 1",
+                            "value": "`arn:aws:ec2:eu-west-2:123456789:instance/i-1111aa22222ddd333333`",
+                        },
+                    ],
+                    "text": "This control checks whether your Amazon Elastic Compute Cloud (Amazon EC2) instance metadata version is configured with Instance Metadata Service Version 2 (IMDSv2). The control passes if HttpTokens is set to required for IMDSv2. The control fails if HttpTokens is set to optional.",
+                },
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "height": "50px",
+                                        "type": "Image",
+                                        "url": "https://raw.githubusercontent.com/appvia/terraform-aws-notifications/main/resources/posts-attention-icon.png",
+                                        "width": "50px",
+                                    },
+                                    {
+                                        "color": "Attention",
+                                        "size": "Large",
+                                        "text": "Security Hub: nist-800-53/v/5.0.0/EC2.8",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "Account Name",
+                                                "value": "`SupportProd`",
+                                            },
+                                            {
+                                                "title": "Account Id",
+                                                "value": "`123456789`",
+                                            },
+                                            {"title": "Region", "value": "`eu-west-2`"},
+                                            {"title": "Severity", "value": "`HIGH`"},
+                                            {
+                                                "title": "Source",
+                                                "value": "`nist-800-53/v/5.0.0/EC2.8`",
+                                            },
+                                            {
+                                                "title": "Provider",
+                                                "value": "`nist-800-53 v5.0.0`",
+                                            },
+                                            {"title": "Category", "value": "`EC2.8`"},
+                                            {
+                                                "title": "Rule",
+                                                "value": "`89deac02-0ea8-49a2-a1e7-31b64bc037f2`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                    {
+                                        "text": "`This control checks whether your Amazon Elastic Compute Cloud (Amazon EC2) instance metadata version is configured with Instance Metadata Service Version 2 (IMDSv2). The control passes if HttpTokens is set to required for IMDSv2. The control fails if HttpTokens is set to optional.`",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "title": "Type 1",
+                                                "value": "`AwsEc2Instance`",
+                                            },
+                                            {
+                                                "title": "Arn 1",
+                                                "value": "`arn:aws:ec2:eu-west-2:123456789:instance/i-1111aa22222ddd333333`",
+                                            },
+                                        ],
+                                        "type": "FactSet",
+                                        "wrap": True,
+                                    },
+                                ],
+                                "type": "Container",
+                            },
+                            {
+                                "items": [
+                                    {
+                                        "text": "[The Finding](https://console.aws.amazon.com/securityhub/home?region=eu-west-2#findings?search=GeneratorId%3D%255Coperator%255C%253AEQUALS%255C%253Anist-800-53/v/5.0.0/EC2.8)",
+                                        "type": "TextBlock",
+                                        "wrap": True,
+                                    }
+                                ],
+                                "type": "Container",
+                            },
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
+
+snapshots["test_sns_render_snapshots message_text_message.json"] = [
+    {
+        "slack": {
+            "attachments": [
+                {
+                    "fallback": "A new message",
+                    "fields": [
+                        {
+                            "short": False,
+                            "value": """This
+is
+a typical multi-line
+message from SNS!
+
+Have a ~good~ amazing day! :)""",
+                        }
+                    ],
+                    "mrkdwn_in": ["value"],
+                    "text": "AWS notification",
+                    "title": "All Fine",
+                }
+            ]
+        },
+        "teams": {
+            "attachments": [
+                {
+                    "content": {
+                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                        "body": [
+                            {
+                                "items": [
+                                    {
+                                        "size": "medium",
+                                        "text": "All Fine",
+                                        "type": "TextBlock",
+                                        "weight": "Bolder",
+                                    },
+                                    {
+                                        "facts": [
+                                            {
+                                                "short": False,
+                                                "value": """This
+is
+a typical multi-line
+message from SNS!
+
+Have a ~good~ amazing day! :)""",
+                                            }
+                                        ],
+                                        "type": "FactSet",
+                                    },
+                                ],
+                                "type": "Container",
+                            }
+                        ],
+                        "type": "AdaptiveCard",
+                        "version": "1.2",
+                    },
+                    "contentType": "application/vnd.microsoft.card.adaptive",
+                }
+            ],
+            "type": "message",
+        },
+    }
+]
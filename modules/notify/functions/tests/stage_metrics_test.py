@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Stage Metrics Test
+------------------
+
+Unit tests for timing the stages of each record in `stage_metrics.py`
+
+"""
+
+import ast
+import json
+import os
+import sys
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import delivery
+import msg_parser
+from msg_render_slack import SlackRender
+from stage_metrics import StageMetrics, StageTimer, current_timer, stage
+from webhook_client import VendorResponse
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_nested_stage_not_counted_twice():
+    clock = Clock()
+    timer = StageTimer(clock=clock)
+
+    with timer.stage("parse"):
+        clock.now += 0.002
+        with timer.stage("enrich"):
+            clock.now += 0.003
+        clock.now += 0.001
+        with timer.stage("enrich"):
+            clock.now += 0.004
+
+    assert timer.elapsed["enrich"] == 7.0
+    assert round(timer.elapsed["parse"], 6) == 3.0
+
+
+def test_stage_without_timer_does_nothing():
+    assert current_timer.get() is None
+    with stage("parse"):
+        pass
+
+    disabled = StageMetrics(enabled=False)
+    assert disabled.timer() is None
+    disabled.emit("CloudWatch", "slack", {"parse": 1.0}, 10, 200)
+    assert disabled.metrics == {}
+
+
+def test_emit_per_action_and_channel(capsys):
+    stage_metrics = StageMetrics(enabled=True, namespace="notify_test")
+    stage_metrics.emit("CloudWatch", "slack", {"parse": 1.5, "deliver": 20.0}, 10, 200)
+    stage_metrics.emit("CloudWatch", "slack", {"parse": 2.5, "deliver": 30.0}, 12, 429)
+    stage_metrics.emit("GuardDuty", "slack", {"parse": 4.0}, 14, None)
+    stage_metrics.flush()
+
+    blobs = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(b["action"], b["channel"]) for b in blobs] == [
+        ("CloudWatch", "slack"),
+        ("GuardDuty", "slack"),
+    ]
+    assert blobs[0]["ParseStageLatency"] == [1.5, 2.5]
+    assert blobs[0]["PayloadBytes"] == [10, 12]
+    assert blobs[0]["WebhookStatus_429"] == [1.0]
+    definitions = {m["Name"]: m for m in blobs[0]["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+    assert definitions["DeliverStageLatency"]["StorageResolution"] == 1
+    assert "WebhookStatus_200" in blobs[0]
+    assert "DeliverStageLatency" not in blobs[1]
+    assert stage_metrics.metrics == {}
+
+
+def test_parse_sns_times_each_stage(monkeypatch):
+    stage_metrics = StageMetrics(enabled=True, namespace="notify_test")
+    monkeypatch.setattr(msg_parser, "stage_metrics", stage_metrics)
+    monkeypatch.setattr(delivery, "stage_metrics", stage_metrics)
+
+    with open("./tests/messages/cloudwatch_alarm.json", "r") as ofile:
+        records = msg_parser.get_sns_records(ast.literal_eval(ofile.read())["Records"])
+
+    deliveries = []
+    monkeypatch.setattr(msg_parser, "add_delivery_metrics", lambda d, channel: deliveries.extend(d))
+    failed = msg_parser.parse_sns(
+        snsRecords=records,
+        vendor_send_to_function=lambda body: VendorResponse(code=200, info=""),
+        renderer=SlackRender(),
+        rendererSuccessCode=200,
+        channel="slack",
+    )
+
+    assert failed == []
+    assert set(deliveries[0].timings) == {
+        "classify",
+        "parse",
+        "enrich",
+        "render",
+        "serialise",
+        "deliver",
+    }
+    assert deliveries[0].status == 200
+
+    delivery.add_delivery_metrics(deliveries, channel="slack")
+    assert list(stage_metrics.metrics) == [("CloudWatch", "slack")]
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Webhook Test
+------------
+
+Unit tests for posting to the vendor webhooks, against a local stub webhook
+
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append("src")
+os.environ.setdefault("POWERTOOLS_SERVICE_NAME", "notify_test")
+
+import pytest
+
+from render import encode_payload
+from webhook_client import WebhookClient
+from webhook_url import WebhookUrlCache
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    """
+    Keep-alive webhook responding with the status code queued by the test
+    """
+
+    protocol_version = "HTTP/1.1"
+    replies: list = []
+    requests: list = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.requests.append((self.headers.get("Content-Type"), body))
+        code, headers = self.replies.pop(0) if self.replies else (200, {})
+        body = b"ok"
+        self.send_response(code)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhook)
+    StubWebhook.replies = []
+    StubWebhook.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/hook"
+    server.shutdown()
+    server.server_close()
+
+
+def test_webhook_client_reuses_connections(webhook):
+    """
+    Subsequent posts to the same host reuse the pooled connection
+    """
+    client = WebhookClient()
+
+    for _ in range(3):
+        response = client.post(url=webhook, body=b"{}", headers={"Content-Type": "application/json"})
+        assert response.status == 200
+
+    assert client.stats() == {
+        "requests": 3,
+        "new_connections": 1,
+        "reused_connections": 2,
+    }
+
+
+def test_webhook_url_cache(monkeypatch):
+    """
+    Encrypted webhook urls are decrypted once, until invalidated or expired
+    """
+    decrypted = []
+
+    def decrypt(value):
+        decrypted.append(value)
+        return f"https://hooks.example.com/{value}"
+
+    monkeypatch.setenv("TEST_WEBHOOK_URL", "Y2lwaGVydGV4dA==")
+    cache = WebhookUrlCache(decrypt=decrypt, ttl=60)
+
+    assert cache.get("TEST_WEBHOOK_URL") == "https://hooks.example.com/Y2lwaGVydGV4dA=="
+    cache.get("TEST_WEBHOOK_URL")
+    assert len(decrypted) == 1
+
+    cache.invalidate("TEST_WEBHOOK_URL")
+    cache.get("TEST_WEBHOOK_URL")
+    assert len(decrypted) == 2
+
+    expired = WebhookUrlCache(decrypt=decrypt, ttl=0)
+    expired.get("TEST_WEBHOOK_URL")
+    expired.get("TEST_WEBHOOK_URL")
+    assert len(decrypted) == 4
+
+
+def test_webhook_url_cache_plaintext(monkeypatch):
+    """
+    Plaintext webhook urls are never decrypted
+    """
+    monkeypatch.setenv("TEST_WEBHOOK_URL", "https://hooks.example.com/plain")
+    cache = WebhookUrlCache(decrypt=lambda value: pytest.fail("decrypted"), ttl=60)
+
+    cache.prefetch(["TEST_WEBHOOK_URL"])
+    assert cache.get("TEST_WEBHOOK_URL") == "https://hooks.example.com/plain"
+
+
+def test_fan_out_prefetch_decrypts_concurrently(monkeypatch):
+    """
+    The fan-out lambda decrypts both urls at once during init, rather than one after
+    the other
+    """
+    import notify_fanout
+    from webhook_url import webhook_urls
+
+    # each decrypt waits on the other, so neither completes unless both overlap
+    overlap = threading.Barrier(2, timeout=5)
+
+    def decrypt(value):
+        overlap.wait()
+        return f"https://hooks.example.com/{value}"
+
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "c2xhY2s=")
+    monkeypatch.setenv("TEAMS_WEBHOOK_URL", "dGVhbXM=")
+    monkeypatch.setattr(webhook_urls, "decrypt", decrypt)
+    monkeypatch.setattr(webhook_urls, "entries", {})
+
+    importlib.reload(notify_fanout)
+    assert not overlap.broken
+    assert webhook_urls.get("SLACK_WEBHOOK_URL") == "https://hooks.example.com/c2xhY2s="
+    assert webhook_urls.get("TEAMS_WEBHOOK_URL") == "https://hooks.example.com/dGVhbXM="
+
+
+def test_send_slack_notification(webhook, monkeypatch):
+    """
+    The encoded payload is posted as is, as JSON, and the response returned as a result
+    """
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", webhook)
+    import notify_slack
+
+    body = encode_payload({"text": "caf\u00e9 \u2615"})
+    StubWebhook.replies = [(200, {}), (404, {})]
+
+    response = notify_slack.send_slack_notification(body=body)
+    assert (response.code, response.info) == (200, "ok")
+    assert StubWebhook.requests == [("application/json", body)]
+    assert json.loads(body) == {"text": "caf\u00e9 \u2615"}
+
+    assert notify_slack.send_slack_notification(body=body).code == 404
+
+
+def test_send_retries_throttled_post(webhook, monkeypatch):
+    """
+    A post throttled by the vendor is retried after the Retry-After it asked for
+    """
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", webhook)
+    import notify_slack
+
+    StubWebhook.replies = [(429, {"Retry-After": "0"}), (200, {})]
+
+    response = notify_slack.send_slack_notification(body=b"{}")
+    assert response.code == 200
+    assert len(StubWebhook.requests) == 2
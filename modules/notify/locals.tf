@@ -9,8 +9,28 @@ locals {
   sns_topic_arn = try(aws_sns_topic.this[0].arn, "arn:${local.partition}:sns:${local.region}:${local.account_id}:${var.sns_topic_name}", "")
 
   lambda_handler = {
-    "slack" = try(split(".", basename(var.lambda_source_path))[0], "notify_slack"),
-    "teams" = try(split(".", basename(var.lambda_source_path))[0], "notify_teams")
+    "slack"  = try(split(".", basename(var.lambda_source_path))[0], "notify_slack"),
+    "teams"  = try(split(".", basename(var.lambda_source_path))[0], "notify_teams")
+    "fanout" = try(split(".", basename(var.lambda_source_path))[0], "notify_fanout")
+  }
+
+  ## The sources packaged for each distribution, beyond those shared by all
+  lambda_source_pattern = {
+    "slack"  = ".*slack\\.py"
+    "teams"  = ".*teams\\.py"
+    "fanout" = ".*(slack|teams|fanout)\\.py"
+  }
+
+  ## The name and description of the lambda function of each distribution
+  lambda_name = {
+    "slack"  = try(var.delivery_channels["slack"].lambda_name, "notify_slack")
+    "teams"  = try(var.delivery_channels["teams"].lambda_name, "notify_teams")
+    "fanout" = var.fan_out.lambda_name
+  }
+  lambda_description = {
+    "slack"  = try(var.delivery_channels["slack"].lambda_description, "")
+    "teams"  = try(var.delivery_channels["teams"].lambda_description, "")
+    "fanout" = var.fan_out.lambda_description
   }
 
   lambda_env_vars = {
@@ -24,6 +44,51 @@ locals {
       IDENTITY_CENTER_URL  = try(var.identity_center_start_url, "")
       IDENTITY_CENTER_ROLE = try(var.identity_center_role, "")
     }
+    "fanout" = {
+      SLACK_WEBHOOK_URL    = try(var.delivery_channels["slack"].webhook_url, "https://null")
+      TEAMS_WEBHOOK_URL    = try(var.delivery_channels["teams"].webhook_url, "https://null")
+      ENABLE_SLACK         = var.enable_slack
+      ENABLE_TEAMS         = var.enable_teams
+      IDENTITY_CENTER_URL  = try(var.identity_center_start_url, "")
+      IDENTITY_CENTER_ROLE = try(var.identity_center_role, "")
+      IDEMPOTENCY_ENABLED  = true
+    }
+  }
+
+  ## Environment variables tuning the delivery of posts, shared by all the distributions
+  delivery_env_vars = {
+    DELIVERY_CONCURRENCY             = var.delivery_concurrency
+    DELIVERY_SAFETY_MARGIN_MS        = var.delivery_safety_margin_ms
+    WEBHOOK_CONNECT_TIMEOUT          = var.webhook_connection.connect_timeout_seconds
+    WEBHOOK_READ_TIMEOUT             = var.webhook_connection.read_timeout_seconds
+    WEBHOOK_MAX_CONNECTIONS_PER_HOST = var.webhook_connection.max_connections_per_host
+    WEBHOOK_URL_CACHE_TTL            = var.webhook_url_cache_ttl_seconds
+    SLACK_WEBHOOK_RATE               = var.webhook_rate_limits.slack_per_second
+    SLACK_WEBHOOK_BURST              = var.webhook_rate_limits.slack_burst
+    TEAMS_WEBHOOK_RATE               = var.webhook_rate_limits.teams_per_second
+    TEAMS_WEBHOOK_BURST              = var.webhook_rate_limits.teams_burst
+    WEBHOOK_MAX_WAIT_SECONDS         = var.webhook_rate_limits.max_wait_seconds
+    WEBHOOK_RATE_TABLE               = var.webhook_rate_limits.shared_table_name != null ? var.webhook_rate_limits.shared_table_name : ""
+    ACCOUNT_NAMES_WAIT_SECONDS       = var.account_names_wait_seconds
+    ACCOUNT_NAMES_TTL                = var.account_names_ttl_seconds
+    ACCOUNT_NAMES_NEGATIVE_TTL       = var.account_names_negative_ttl_seconds
+    DIGEST_ENABLED                   = var.digest.enabled
+    DIGEST_MIN_RECORDS               = var.digest.min_records
+    DIGEST_MAX_ITEMS                 = var.digest.max_items
+    DIGEST_IMMEDIATE_PRIORITIES      = join(",", var.digest.immediate_priorities)
+    FLAP_SUPPRESSION_SECONDS         = var.alarm_flap_suppression.window_seconds
+    FLAP_STATE_TABLE                 = var.alarm_flap_suppression.state_table_name != null ? var.alarm_flap_suppression.state_table_name : ""
+    FLAP_STATE_TTL                   = var.alarm_flap_suppression.state_ttl_seconds
+    CIRCUIT_BREAKER_ENABLED          = var.circuit_breaker.enabled
+    CIRCUIT_FAILURE_THRESHOLD        = var.circuit_breaker.failure_threshold
+    CIRCUIT_OPEN_SECONDS             = var.circuit_breaker.open_seconds
+    IDEMPOTENCY_ENABLED              = var.idempotency.enabled
+    IDEMPOTENCY_TABLE                = var.idempotency.table_name != null ? var.idempotency.table_name : ""
+    IDEMPOTENCY_TTL                  = var.idempotency.ttl_seconds
+    STAGE_METRICS_ENABLED            = var.enable_stage_metrics
+    PROFILING_MODE                   = var.profiling.mode
+    PROFILING_SAMPLE_RATE            = var.profiling.sample_rate
+    PROFILING_TOP                    = var.profiling.top
   }
 
   lambda_env_vars_layer_parameters_secrets = {
@@ -37,6 +102,8 @@ locals {
     PARAMETERS_SECRETS_EXTENSION_MAX_CONNECTIONS = "3"
     PARAMETERS_SECRETS_EXTENSION_LOG_LEVEL       = "INFO"
     ACCOUNTS_ID_TO_NAME_PARAMETER_ARN            = try(var.accounts_id_to_name_parameter_arn, "")
+    ACCOUNTS_ID_TO_NAME_PARAMETER_PATH           = try(var.accounts_id_to_name_shards.parameter_path, "")
+    ACCOUNTS_ID_TO_NAME_SHARD_PREFIX_LENGTH      = try(var.accounts_id_to_name_shards.prefix_length, 2)
   }
 
   lambda_env_vars_layers_powertools = {
@@ -70,6 +137,10 @@ locals {
       filter = try(var.delivery_channels["teams"].filter_policy, null)
       scope  = try(var.delivery_channels["teams"].filter_policy_scope, null)
     }
+    "fanout" = {
+      filter = try(var.delivery_channels["slack"].filter_policy, null)
+      scope  = try(var.delivery_channels["slack"].filter_policy_scope, null)
+    }
   }
 
   # the enable_[slack|teams] variable controls the subscription between SNS and lambda only; it is
@@ -81,7 +152,25 @@ locals {
     "teams" = var.delivery_channels["teams"] != null ? true : false,
   }
 
-  distributions = toset([for x in ["slack", "teams"] : x if local.create_distribution[x] == true])
+  # when fanning out, a single distribution parses each notification once and delivers to both channels
+  enable_fan_out = var.fan_out.enabled && local.create_distribution["slack"] && local.create_distribution["teams"]
+
+  distributions = local.enable_fan_out ? toset(["fanout"]) : toset([for x in ["slack", "teams"] : x if local.create_distribution[x] == true])
+
+  # when the SQS buffer is enabled, each distribution has its own queue subscribed to the SNS topic
+  #  and the lambda is invoked by an event source mapping rather than a direct SNS subscription
+  enable_sqs_buffer = var.sqs_buffer.enabled
+  enable_subscription = {
+    "slack"  = var.enable_slack && local.create_distribution["slack"] == true && !local.enable_fan_out,
+    "teams"  = var.enable_teams && local.create_distribution["teams"] == true && !local.enable_fan_out,
+    "fanout" = (var.enable_slack || var.enable_teams) && local.enable_fan_out,
+  }
+  sqs_buffered_distributions = local.enable_sqs_buffer ? local.distributions : toset([])
+  enable_deferred_queue      = var.circuit_breaker.enabled && var.circuit_breaker.deferred_queue
+  deferred_distributions     = local.enable_deferred_queue ? local.distributions : toset([])
+
+  ## The dead letter queues keep the records for the longest SQS allows
+  dead_letter_retention_seconds = 1209600
 
   ## Lambda Layer
   # Filter only enabled policies
@@ -9,7 +9,7 @@ resource "aws_sns_topic" "this" {
 }
 
 resource "aws_sns_topic_subscription" "sns_notify_slack" {
-  count = var.enable_slack && local.create_distribution["slack"] == true ? 1 : 0
+  count = local.enable_subscription["slack"] && !local.enable_sqs_buffer ? 1 : 0
 
   topic_arn           = local.sns_topic_arn
   protocol            = "lambda"
@@ -19,7 +19,7 @@ resource "aws_sns_topic_subscription" "sns_notify_slack" {
 }
 
 resource "aws_sns_topic_subscription" "sns_notify_teams" {
-  count = var.enable_teams && local.create_distribution["teams"] == true ? 1 : 0
+  count = local.enable_subscription["teams"] && !local.enable_sqs_buffer ? 1 : 0
 
   topic_arn           = local.sns_topic_arn
   protocol            = "lambda"
@@ -28,6 +28,165 @@ resource "aws_sns_topic_subscription" "sns_notify_teams" {
   filter_policy_scope = local.subscription_policies["teams"].scope
 }
 
+resource "aws_sns_topic_subscription" "sns_notify_fanout" {
+  count = local.enable_subscription["fanout"] && !local.enable_sqs_buffer ? 1 : 0
+
+  topic_arn           = local.sns_topic_arn
+  protocol            = "lambda"
+  endpoint            = module.lambda["fanout"].lambda_function_arn
+  filter_policy       = local.subscription_policies["fanout"].filter
+  filter_policy_scope = local.subscription_policies["fanout"].scope
+
+  lifecycle {
+    precondition {
+      condition     = local.subscription_policies["slack"] == local.subscription_policies["teams"]
+      error_message = "When fan_out is enabled, the slack and teams delivery channels must share the same filter_policy and filter_policy_scope."
+    }
+  }
+}
+
+## Optional SQS buffer between the SNS topic and each lambda function
+resource "aws_sqs_queue" "buffer" {
+  for_each = local.sqs_buffered_distributions
+
+  name                       = format("%s-buffer", local.lambda_name[each.value])
+  kms_master_key_id          = var.sqs_buffer.kms_master_key_id
+  message_retention_seconds  = var.sqs_buffer.message_retention_seconds
+  sqs_managed_sse_enabled    = var.sqs_buffer.kms_master_key_id == null ? true : null
+  tags                       = var.tags
+  visibility_timeout_seconds = var.sqs_buffer.visibility_timeout_seconds
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.buffer_dlq[each.value].arn
+    maxReceiveCount     = var.sqs_buffer.max_receive_count
+  })
+}
+
+## The records which failed to post on every receive are kept for inspection, rather than retried forever
+resource "aws_sqs_queue" "buffer_dlq" {
+  for_each = local.sqs_buffered_distributions
+
+  name                      = format("%s-buffer-dlq", local.lambda_name[each.value])
+  kms_master_key_id         = var.sqs_buffer.kms_master_key_id
+  message_retention_seconds = local.dead_letter_retention_seconds
+  sqs_managed_sse_enabled   = var.sqs_buffer.kms_master_key_id == null ? true : null
+  tags                      = var.tags
+}
+
+resource "aws_sqs_queue_redrive_allow_policy" "buffer_dlq" {
+  for_each = local.sqs_buffered_distributions
+
+  queue_url = aws_sqs_queue.buffer_dlq[each.value].id
+  redrive_allow_policy = jsonencode({
+    redrivePermission = "byQueue"
+    sourceQueueArns   = [aws_sqs_queue.buffer[each.value].arn]
+  })
+}
+
+data "aws_iam_policy_document" "buffer" {
+  for_each = local.sqs_buffered_distributions
+
+  statement {
+    sid       = "AllowSNSPublish"
+    effect    = "Allow"
+    actions   = ["sqs:SendMessage"]
+    resources = [aws_sqs_queue.buffer[each.value].arn]
+
+    principals {
+      type        = "Service"
+      identifiers = ["sns.amazonaws.com"]
+    }
+
+    condition {
+      test     = "ArnEquals"
+      variable = "aws:SourceArn"
+      values   = [local.sns_topic_arn]
+    }
+  }
+}
+
+resource "aws_sqs_queue_policy" "buffer" {
+  for_each = local.sqs_buffered_distributions
+
+  queue_url = aws_sqs_queue.buffer[each.value].id
+  policy    = data.aws_iam_policy_document.buffer[each.value].json
+}
+
+resource "aws_sns_topic_subscription" "sqs_buffer" {
+  for_each = { for x in local.sqs_buffered_distributions : x => x if local.enable_subscription[x] }
+
+  topic_arn           = local.sns_topic_arn
+  protocol            = "sqs"
+  endpoint            = aws_sqs_queue.buffer[each.value].arn
+  filter_policy       = local.subscription_policies[each.value].filter
+  filter_policy_scope = local.subscription_policies[each.value].scope
+
+  depends_on = [aws_sqs_queue_policy.buffer]
+}
+
+resource "aws_lambda_event_source_mapping" "sqs_buffer" {
+  for_each = local.sqs_buffered_distributions
+
+  batch_size                         = var.sqs_buffer.batch_size
+  event_source_arn                   = aws_sqs_queue.buffer[each.value].arn
+  function_name                      = module.lambda[each.value].lambda_function_arn
+  function_response_types            = ["ReportBatchItemFailures"]
+  maximum_batching_window_in_seconds = var.sqs_buffer.maximum_batching_window_in_seconds
+}
+
+## Optional SQS queue the records are deferred to while a webhook's circuit is open
+## A batch failing its probe is received again once the circuit is due to be half open
+resource "aws_sqs_queue" "deferred" {
+  for_each = local.deferred_distributions
+
+  name                       = format("%s-deferred", local.lambda_name[each.value])
+  kms_master_key_id          = var.sqs_buffer.kms_master_key_id
+  message_retention_seconds  = var.sqs_buffer.message_retention_seconds
+  sqs_managed_sse_enabled    = var.sqs_buffer.kms_master_key_id == null ? true : null
+  tags                       = var.tags
+  visibility_timeout_seconds = max(var.sqs_buffer.visibility_timeout_seconds, var.circuit_breaker.open_seconds)
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.deferred_dlq[each.value].arn
+    maxReceiveCount     = var.circuit_breaker.drain_max_receive_count
+  })
+}
+
+## The deferred records the vendor never recovered for are kept for inspection, rather than drained forever
+resource "aws_sqs_queue" "deferred_dlq" {
+  for_each = local.deferred_distributions
+
+  name                      = format("%s-deferred-dlq", local.lambda_name[each.value])
+  kms_master_key_id         = var.sqs_buffer.kms_master_key_id
+  message_retention_seconds = local.dead_letter_retention_seconds
+  sqs_managed_sse_enabled   = var.sqs_buffer.kms_master_key_id == null ? true : null
+  tags                      = var.tags
+}
+
+resource "aws_sqs_queue_redrive_allow_policy" "deferred_dlq" {
+  for_each = local.deferred_distributions
+
+  queue_url = aws_sqs_queue.deferred_dlq[each.value].id
+  redrive_allow_policy = jsonencode({
+    redrivePermission = "byQueue"
+    sourceQueueArns   = [aws_sqs_queue.deferred[each.value].arn]
+  })
+}
+
+## The deferred records are drained at a bounded rate, so a recovering vendor is not flooded
+resource "aws_lambda_event_source_mapping" "deferred" {
+  for_each = local.deferred_distributions
+
+  batch_size              = var.circuit_breaker.drain_batch_size
+  event_source_arn        = aws_sqs_queue.deferred[each.value].arn
+  function_name           = module.lambda[each.value].lambda_function_arn
+  function_response_types = ["ReportBatchItemFailures"]
+
+  scaling_config {
+    maximum_concurrency = var.circuit_breaker.drain_concurrency
+  }
+}
+
 #trivy:ignore:avd-aws-0067
 module "lambda" {
   for_each = local.distributions
@@ -40,9 +199,9 @@ module "lambda" {
   attach_network_policy              = false
   attach_policy_json                 = false
   create                             = true
-  description                        = try(var.delivery_channels[each.value].lambda_description, "")
+  description                        = local.lambda_description[each.value]
   ephemeral_storage_size             = var.lambda_function_ephemeral_storage_size
-  function_name                      = try(var.delivery_channels[each.value].lambda_name, "notify_${each.value}")
+  function_name                      = local.lambda_name[each.value]
   handler                            = "${local.lambda_handler[each.value]}.lambda_handler"
   hash_extra                         = each.value
   kms_key_arn                        = var.kms_key_arn
@@ -59,20 +218,36 @@ module "lambda" {
   ## Related to the IAM
   create_role               = true
   lambda_role               = var.lambda_role
-  role_name                 = format("%s-%s", var.iam_role_name_prefix, var.delivery_channels[each.value].lambda_name)
+  role_name                 = format("%s-%s", var.iam_role_name_prefix, local.lambda_name[each.value])
   role_path                 = var.iam_role_path
   role_permissions_boundary = var.iam_role_boundary_policy_arn
   role_tags                 = var.tags
 
   ## Additional Policy Requirements
-  attach_policy_statements = length(local.enabled_policies) > 0
-  policy_statements = {
-    for policy_name, policy in local.enabled_policies : policy_name => {
-      effect    = policy.effect
-      actions   = policy.actions
-      resources = policy.resources
+  attach_policy_statements = length(local.enabled_policies) > 0 || local.enable_sqs_buffer || local.enable_deferred_queue
+  policy_statements = merge(
+    {
+      for policy_name, policy in local.enabled_policies : policy_name => {
+        effect    = policy.effect
+        actions   = policy.actions
+        resources = policy.resources
+      }
+    },
+    {
+      for name, queue in aws_sqs_queue.buffer : "sqs_buffer" => {
+        effect    = "Allow"
+        actions   = ["sqs:ChangeMessageVisibility", "sqs:DeleteMessage", "sqs:GetQueueAttributes", "sqs:ReceiveMessage"]
+        resources = [queue.arn]
+      } if name == each.value
+    },
+    {
+      for name, queue in aws_sqs_queue.deferred : "sqs_deferred" => {
+        effect    = "Allow"
+        actions   = ["sqs:ChangeMessageVisibility", "sqs:DeleteMessage", "sqs:GetQueueAttributes", "sqs:ReceiveMessage", "sqs:SendMessage"]
+        resources = [queue.arn]
+      } if name == each.value
     }
-  }
+  )
 
   ## Logging related
   use_existing_cloudwatch_log_group = false
@@ -92,7 +267,7 @@ module "lambda" {
         ssm_param\.py
         !.*msg_render_.*\.py
         !.*notify_.*\.py
-        .*${each.value}\.py
+        ${local.lambda_source_pattern[each.value]}
       END
     }
   ]
@@ -104,7 +279,9 @@ module "lambda" {
   environment_variables = {
     for k, v in merge(
       local.layer_env_vars,
-      local.lambda_env_vars[each.value]
+      local.delivery_env_vars,
+      local.lambda_env_vars[each.value],
+      { for name, queue in aws_sqs_queue.deferred : "DEFERRED_QUEUE_URL" => queue.url if name == each.value }
     ) : k => v == null ? null : tostring(v)
   }
 
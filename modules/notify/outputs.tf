@@ -35,3 +35,23 @@ output "notify_teams_lambda_function_version" {
   description = "Latest published version of your Lambda function"
   value       = try(module.lambda["teams"].lambda_function_version, "")
 }
+
+output "notify_fanout_lambda_function_arn" {
+  description = "The ARN of the Lambda function delivering to both Slack and Teams, when fan_out is enabled"
+  value       = try(module.lambda["fanout"].lambda_function_arn, "")
+}
+
+output "sqs_buffer_queue_arns" {
+  description = "The ARNs of the SQS queues buffering each distribution, when the SQS buffer is enabled"
+  value       = { for name, queue in aws_sqs_queue.buffer : name => queue.arn }
+}
+
+output "sqs_buffer_dead_letter_queue_arns" {
+  description = "The ARNs of the dead letter queues of the SQS buffer, holding the records which failed to post on every receive"
+  value       = { for name, queue in aws_sqs_queue.buffer_dlq : name => queue.arn }
+}
+
+output "deferred_dead_letter_queue_arns" {
+  description = "The ARNs of the dead letter queues of the deferred queues, holding the deferred records which failed to post on every receive"
+  value       = { for name, queue in aws_sqs_queue.deferred_dlq : name => queue.arn }
+}
@@ -174,3 +174,250 @@ variable "accounts_id_to_name_parameter_arn" {
     error_message = "The accounts_id_to_name_parameter_arn must be a valid SSM parameter ARN."
   }
 }
+
+variable "accounts_id_to_name_shards" {
+  description = "Optionally shard the account ID to name mapping across the parameters under a path, for organisations too large for a single parameter. Each parameter holds the accounts whose IDs start with the same digits and is named by that prefix, e.g. '/myorg/accounts_id_to_name/01' holds account 012345678901 when prefix_length is 2. Only the shards referenced by incoming messages are loaded. When set, this takes precedence over accounts_id_to_name_parameter_arn."
+  type = object({
+    parameter_path = string
+    prefix_length  = optional(number, 2)
+  })
+  default = null
+
+  validation {
+    condition     = var.accounts_id_to_name_shards == null ? true : can(regex("^/.+[^/]$", var.accounts_id_to_name_shards.parameter_path))
+    error_message = "The accounts_id_to_name_shards.parameter_path must be an SSM parameter path, e.g. /myorg/accounts_id_to_name"
+  }
+
+  validation {
+    condition     = var.accounts_id_to_name_shards == null ? true : var.accounts_id_to_name_shards.prefix_length >= 1 && var.accounts_id_to_name_shards.prefix_length <= 12
+    error_message = "The accounts_id_to_name_shards.prefix_length must be between 1 and 12"
+  }
+}
+
+variable "fan_out" {
+  description = "Optionally deploy a single lambda function which parses each notification once and delivers it to both Slack and Teams, rather than a lambda function per channel. Only applies when both channels are configured; the channels must then share the same subscription filter policy, if any"
+  type = object({
+    enabled = optional(bool, false)
+    # Whether to deliver to both channels from a single lambda function
+    lambda_name = optional(string, "notify-fanout")
+    # The name of the lambda function to create
+    lambda_description = optional(string, "Sends posts to slack and teams")
+    # The description for the lambda
+  })
+  default = {}
+}
+
+variable "idempotency" {
+  description = "Optionally remember the posts delivered to each channel, keyed on the SNS message id, so retried records are not posted again to a channel which already accepted them. Always enabled for the fan_out lambda function, which redelivers a record whole when only one channel failed it"
+  type = object({
+    enabled = optional(bool, false)
+    # Whether to skip the posts already delivered
+    table_name = optional(string)
+    # An optional DynamoDB table, keyed by the string "id" with the "expires_at" ttl attribute, remembering the delivered posts across the lambda containers; else remembered in memory per container
+    ttl_seconds = optional(number, 86400)
+    # How long a delivered post is remembered; at least as long as records may be retried
+  })
+  default = {}
+}
+
+variable "sqs_buffer" {
+  description = "Optionally buffer the SNS topic through an SQS queue, so the slack/teams lambda functions are invoked with batches of records and only failed records are retried"
+  type = object({
+    enabled = optional(bool, false)
+    # Whether to place an SQS queue between the SNS topic and the lambda functions
+    batch_size = optional(number, 10)
+    # The maximum number of records passed to the lambda function in a single invocation
+    maximum_batching_window_in_seconds = optional(number, 0)
+    # The maximum amount of time to gather records before invoking the lambda function
+    visibility_timeout_seconds = optional(number, 60)
+    # How long a record is hidden once received; should be at least six times the lambda timeout
+    message_retention_seconds = optional(number, 345600)
+    # How long undelivered records are retained on the queue
+    max_receive_count = optional(number, 5)
+    # How many times a record is received before it is moved to the dead letter queue
+    kms_master_key_id = optional(string)
+    # An optional KMS key for the queues, else SQS managed encryption is used
+  })
+  default = {}
+}
+
+variable "alarm_flap_suppression" {
+  description = "Optionally suppress the transitions of CloudWatch alarms flapping between states. An alarm posted twice within the window has its following transitions within the window suppressed, other than into ALARM; the count suppressed is shown on its next post"
+  type = object({
+    window_seconds = optional(number, 0)
+    # The hysteresis window in seconds, zero disables the suppression
+    state_table_name = optional(string)
+    # An optional DynamoDB table, keyed by the string "alarm_arn" with the "expires_at" ttl attribute, sharing the alarm states between the lambda containers; else held in memory per container
+    state_ttl_seconds = optional(number, 86400)
+    # How long the table remembers an alarm, once it stops changing state
+  })
+  default = {}
+
+  validation {
+    condition     = var.alarm_flap_suppression.window_seconds >= 0
+    error_message = "The alarm_flap_suppression window_seconds must be zero or more."
+  }
+}
+
+variable "digest" {
+  description = "Optionally coalesce bursts of similar notifications, those sharing the action, account and priority, within a batch of records into a single summary post. The batch is the window, so this requires the sqs_buffer with a batching window"
+  type = object({
+    enabled = optional(bool, false)
+    # Whether to post bursts of similar notifications as a single digest
+    min_records = optional(number, 3)
+    # The fewest similar notifications posted as a digest; smaller groups are posted as is
+    max_items = optional(number, 10)
+    # The most notifications listed in a digest, the rest are linked to in the console
+    immediate_priorities = optional(list(string), [])
+    # The priorities always posted on their own, e.g. ["CRITICAL"]
+  })
+  default = {}
+
+  validation {
+    condition     = var.digest.min_records >= 2
+    error_message = "The digest min_records must be at least 2."
+  }
+
+  validation {
+    condition     = var.digest.max_items >= 1
+    error_message = "The digest max_items must be at least 1."
+  }
+}
+
+variable "delivery_concurrency" {
+  description = "The maximum number of posts delivered concurrently to slack/teams within a single invocation; posts for the same alarm or finding are always delivered in order"
+  type        = number
+  default     = 4
+}
+
+variable "circuit_breaker" {
+  description = "Optionally fail the posts to a slack/teams webhook fast once it has failed repeatedly, rather than spending each invocation on a failing vendor. Once open, a single probe post is let through after open_seconds, closing the circuit if it succeeds. With the deferred_queue, the records left undelivered while the circuit is open are deferred to an SQS queue, drained at a bounded rate once the circuit is due to close"
+  type = object({
+    enabled = optional(bool, false)
+    # Whether the posts to a failing webhook fail fast
+    failure_threshold = optional(number, 5)
+    # The consecutive failed posts to a webhook which open its circuit
+    open_seconds = optional(number, 60)
+    # How long the circuit stays open before a probe post is let through
+    deferred_queue = optional(bool, false)
+    # Whether the records left undelivered while the circuit is open are deferred to an SQS queue, rather than failed
+    drain_batch_size = optional(number, 5)
+    # The most deferred records passed to the lambda function in a single invocation
+    drain_concurrency = optional(number, 2)
+    # The most concurrent invocations draining the deferred queue, at least two
+    drain_max_receive_count = optional(number, 5)
+    # How many times a deferred record is received before it is moved to the dead letter queue
+  })
+  default = {}
+
+  validation {
+    condition     = var.circuit_breaker.failure_threshold >= 1 && var.circuit_breaker.drain_concurrency >= 2
+    error_message = "The circuit_breaker failure_threshold must be at least one, and the drain_concurrency at least two."
+  }
+}
+
+variable "enable_stage_metrics" {
+  description = "Whether the latency of each stage, the payload size and the webhook response of each record are emitted as high resolution metrics, per action and channel"
+  type        = bool
+  default     = false
+}
+
+variable "profiling" {
+  description = "Optionally profile a sample of the invocations, logging a summary of the functions taking the most time (cpu) and the lines allocating the most memory (memory), or both (all)"
+  type = object({
+    mode = optional(string, "off")
+    # One of off, cpu, memory or all
+    sample_rate = optional(number, 1)
+    # Profile one in this many invocations, at random
+    top = optional(number, 15)
+    # The number of functions and allocation sites in each summary
+  })
+  default = {}
+
+  validation {
+    condition     = contains(["off", "cpu", "memory", "all"], var.profiling.mode) && var.profiling.sample_rate >= 1
+    error_message = "The profiling mode must be one of off, cpu, memory or all, and the sample_rate at least one."
+  }
+}
+
+variable "delivery_safety_margin_ms" {
+  description = "The time kept back from the lambda timeout; once the remaining time reaches it no new posts are started, and the records left unsent are reported failed to be retried, rather than the invocation timing out. The request timeouts are also capped to the remaining time"
+  type        = number
+  default     = 1000
+
+  validation {
+    condition     = var.delivery_safety_margin_ms >= 0
+    error_message = "The delivery_safety_margin_ms must be zero or more."
+  }
+}
+
+variable "webhook_connection" {
+  description = "Tuning for the pooled, keep-alive connections used to post to the slack/teams webhooks"
+  type = object({
+    connect_timeout_seconds = optional(number, 2)
+    # The maximum time to establish a connection to the webhook
+    read_timeout_seconds = optional(number, 5)
+    # The maximum time to wait for the webhook to respond
+    max_connections_per_host = optional(number)
+    # The number of connections kept alive per webhook host; defaults to the delivery concurrency
+  })
+  default = {}
+}
+
+variable "webhook_rate_limits" {
+  description = "The rate the posts to each slack/teams webhook are paced at. A post throttled by the vendor is retried after the Retry-After it asked for, within the max_wait_seconds; otherwise the record is failed to be retried later"
+  type = object({
+    slack_per_second = optional(number, 1)
+    # The sustained posts per second to a slack webhook, zero disables the pacing
+    slack_burst = optional(number, 4)
+    # The posts a slack webhook accepts in a burst above the sustained rate
+    teams_per_second = optional(number, 4)
+    # The sustained posts per second to a teams webhook, zero disables the pacing
+    teams_burst = optional(number, 4)
+    # The posts a teams webhook accepts in a burst above the sustained rate
+    max_wait_seconds = optional(number, 5)
+    # The longest a post waits on the rate, or a Retry-After; keep well within the lambda timeout
+    shared_table_name = optional(string)
+    # An optional DynamoDB table, keyed by the string "id" with the "expires_at" ttl attribute, counting the posts to each webhook per second across the lambda containers
+  })
+  default = {}
+}
+
+variable "webhook_url_cache_ttl_seconds" {
+  description = "How long a KMS encrypted webhook url is cached once decrypted, before decrypting again; the cache is also invalidated when the webhook rejects the url"
+  type        = number
+  default     = 900
+}
+
+variable "account_names_wait_seconds" {
+  description = "The longest each batch of notifications waits on the account id to name mapping to load before showing the raw account id instead; the mapping is loaded in the background while the lambda initialises"
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = var.account_names_wait_seconds >= 0
+    error_message = "The account_names_wait_seconds must be zero or greater"
+  }
+}
+
+variable "account_names_ttl_seconds" {
+  description = "How long the account id to name mapping is used before it is refreshed in the background; lookups keep using the previous mapping while it refreshes"
+  type        = number
+  default     = 3600
+
+  validation {
+    condition     = var.account_names_ttl_seconds >= 0
+    error_message = "The account_names_ttl_seconds must be zero or greater"
+  }
+}
+
+variable "account_names_negative_ttl_seconds" {
+  description = "How long an account id missing from the mapping is remembered as unknown; a new unknown account id triggers at most one refresh of the mapping within this window"
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = var.account_names_negative_ttl_seconds >= 0
+    error_message = "The account_names_negative_ttl_seconds must be zero or greater"
+  }
+}